@@ -0,0 +1,79 @@
+"""
+Arhiva dokumenata (pravni_alat.arhiva): brzina spremanja i zauzeće diska
+za velik broj prijedloga za ovrhu, spremljenih kao u sučelju i skupnoj
+obradi (HTML generatora, bez omotača iz pripremi_za_word).
+
+Uspoređuje zauzeće s izvornom veličinom i sa zasebnim zlib sažimanjem
+svakog dokumenta, a drugi prolaz s istim dokumentima pokazuje da se
+ponovljeni sadržaj ne zapisuje ponovno. Na kraju mjeri pretragu po OIB-u
+dužnika (jedan dokument) i vjerovnika (svi dokumenti, najnovijih 50).
+
+    python benchmarks/bench_arhiva.py --dokumenata 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat.arhiva import Arhiva
+from pravni_alat.dokumenti import generiraj_ovrhu_pro
+
+
+def argumenti(i):
+    trazbina = {'glavnica': 100.0 + i % 5000, 'datum_racuna': '01.01.2024.', 'dospjece': f"{1 + i % 28:02d}.02.2024.", 'kamata_do': None}
+    troskovi = {'stavka': 50.0, 'materijalni': 13.27, 'pdv': 15.82, 'pristojba': 0}
+    return ("Ivan Horvat, Zagreb", "<b>Vjerovnik d.o.o.</b><br>Adresa: Ilica 1, Zagreb<br>OIB: 12345678903", f"<b>Dužnik {i}</b><br>Adresa: Ulica {i}, Split<br>OIB: {10**10 + i}", trazbina, f"Račun br. {i}-2024", troskovi)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dokumenata", type=int, default=100_000)
+    parser.add_argument("--nacin", choices=["zlib", "lzma"], default="zlib")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as mapa:
+        arhiva = Arhiva(mapa, nacin=args.nacin)
+        izvorno = zasebno = 0
+        trajanje = 0.0
+        for prolaz in (1, 2):
+            for i in range(args.dokumenata):
+                ulaz = argumenti(i)
+                dokument = generiraj_ovrhu_pro(*ulaz)
+                if prolaz == 1:
+                    podaci = dokument.encode("utf-8")
+                    izvorno += len(podaci)
+                    zasebno += len(zlib.compress(podaci, 9))
+                pocetak = time.perf_counter()
+                arhiva.spremi('ovrha', dokument, {'argumenti': list(ulaz)})
+                trajanje += time.perf_counter() - pocetak
+            statistika = arhiva.statistika()
+            print(f"Prolaz {prolaz}:        {len(arhiva)} dokumenata, {statistika['na_disku'] / 1e6:.1f} MB segmenata, "
+                  f"{args.dokumenata / trajanje:,.0f} spremanja/s")
+            trajanje = 0.0
+        indeks = os.path.getsize(os.path.join(mapa, "indeks.sqlite3"))
+        print(f"Izvorno:         {izvorno / 1e6:.1f} MB, zasebni zlib po dokumentu {zasebno / 1e6:.1f} MB")
+        print(f"Arhiva:          {statistika['na_disku'] / 1e6:.1f} MB segmenata + {indeks / 1e6:.1f} MB indeksa "
+              f"({izvorno / (statistika['na_disku'] + indeks):.1f}x manje od izvornog)")
+        pocetak = time.perf_counter()
+        for id_ in range(1, min(len(arhiva), 10_000) + 1):
+            arhiva.dokument(id_)
+        print(f"Čitanje:         {min(len(arhiva), 10_000) / (time.perf_counter() - pocetak):,.0f} dokumenata/s")
+        for opis, oibi in (("dužnik", [str(10**10 + random.randrange(args.dokumenata)) for _ in range(1000)]), ("vjerovnik", ["12345678903"] * 100)):
+            trajanja = []
+            for oib in oibi:
+                pocetak = time.perf_counter()
+                pronadeno = arhiva.trazi(oib=oib)
+                trajanja.append(time.perf_counter() - pocetak)
+            print(f"Pretraga OIB ({opis}): medijan {statistics.median(trajanja) * 1e3:.2f} ms, "
+                  f"najviše {max(trajanja) * 1e3:.2f} ms, {len(pronadeno)} rezultata")
+        arhiva.zatvori()
+
+
+if __name__ == "__main__":
+    main()
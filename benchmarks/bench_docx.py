@@ -0,0 +1,48 @@
+"""
+Veličina i vrijeme izrade jednog dokumenta: dosadašnji HTML kao .doc
+(pripremi_za_word) naspram pravog .docx (pravni_alat.docx).
+
+    python benchmarks/bench_docx.py
+"""
+import os
+import sys
+import timeit
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat.docx import docx_iz_html
+from pravni_alat.dokumenti import generiraj_ovrhu_pro, generiraj_prilagodeni_ugovor, generiraj_tuzbu_pro, pripremi_za_word
+
+S1 = {'uloga': "Naručitelj", 'tekst': "<b>A d.o.o.</b><br>Adresa: Ilica 1, Zagreb<br>OIB: 12345678903"}
+S2 = {'uloga': "Izvođač", 'tekst': "<b>B d.o.o.</b><br>Adresa: Riva 2, Split<br>OIB: 98765432106"}
+TROSKOVI = {'stavka': 100.0, 'pdv': 25.0, 'pristojba': 50.0}
+
+
+def ugovor(clanaka):
+    struktura = [{'naslov': f"Dio {i + 1}", 'clanci': ["Ugovorne strane suglasno utvrđuju sve međusobne obveze.\n" * 4] * 20} for i in range(clanaka // 20)]
+    return generiraj_prilagodeni_ugovor("Ugovor o suradnji", "Zagreb", date(2024, 5, 5), None, S1, S2, "2024-1", struktura)
+
+
+DOKUMENTI = {
+    'tužba': generiraj_tuzbu_pro("OPĆINSKI GRAĐANSKI SUD U ZAGREBU", "", S1['tekst'], S2['tekst'], 1234.5, "Isplate",
+                                {'cinjenice': "Tuženik nije platio račun.\n" * 10, 'dokazi': "- Račun\n" * 3, 'datum_dospijeca': "01.02.2024."}, TROSKOVI),
+    'ovrha': generiraj_ovrhu_pro("JB", S1['tekst'], S2['tekst'], {'glavnica': 99.0, 'datum_racuna': "01.01.2024.", 'dospjece': "01.02.2024."}, "Račun 1/2024", TROSKOVI),
+    'ugovor, 20 članaka': ugovor(20),
+    'ugovor, 1000 članaka': ugovor(1000),
+}
+
+
+def main():
+    print(f"{'dokument':22s} {'.doc kB':>8s} {'.docx kB':>9s} {'.doc ms':>8s} {'.docx ms':>9s}")
+    for naziv, html in DOKUMENTI.items():
+        doc = pripremi_za_word(html).encode("utf-8")
+        docx = docx_iz_html(html)
+        ponavljanja = 200 if len(html) < 100_000 else 10
+        t_doc = min(timeit.repeat(lambda: pripremi_za_word(html).encode("utf-8"), number=1, repeat=ponavljanja)) * 1000
+        t_docx = min(timeit.repeat(lambda: docx_iz_html(html), number=1, repeat=ponavljanja)) * 1000
+        print(f"{naziv:22s} {len(doc) / 1024:8.1f} {len(docx) / 1024:9.1f} {t_doc:8.3f} {t_docx:9.3f}")
+
+
+if __name__ == "__main__":
+    main()
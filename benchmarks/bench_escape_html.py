@@ -0,0 +1,65 @@
+"""
+Cijena escapiranja korisničkog teksta (dokumenti.escape_html / format_text)
+na tekstovima veličine megabajta: nova format_text u odnosu na staru (samo
+novi redovi u <br>), jedan prolaz str.translate s unaprijed složenom
+tablicom i html.escape, za tekst bez posebnih znakova i tekst s njima. Uz to
+cijela tužba s `--mb` MB činjenica (generiranje + pripremi_za_word).
+
+    python benchmarks/bench_escape_html.py [--mb 1 4] [--ponavljanja 5]
+"""
+import argparse
+import html
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat.dokumenti import format_text, generiraj_tuzbu_pro, pripremi_za_word
+
+ODLOMAK = "Tuženik je dana 15.03.2024. primio robu po računu br. 10/2024, koju do danas nije platio unatoč opomeni od 02.05.2024.\n"
+ODLOMAK_POSEBNI = "Tuženik (Horvat & sin d.o.o.) primio je robu čija je vrijednost > 5.000,00 EUR, a rok plaćanja < 30 dana.\n"
+TABLICA = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", "\n": "<br>"})
+STRANKA = "<b>Ivan Horvat</b><br>Adresa: Ilica 1, Zagreb<br>OIB: 12345678903"
+
+
+def stara_format_text(text):
+    return text.replace('\n', '<br>') if text else ""
+
+
+NACINI = {
+    'bez escapiranja (staro)': stara_format_text,
+    'format_text': format_text,
+    'str.translate': lambda t: t.translate(TABLICA),
+    'html.escape': lambda t: html.escape(t, quote=False).replace('\n', '<br>'),
+}
+
+
+def ms(fn, ponavljanja):
+    return min(timeit.repeat(fn, number=1, repeat=ponavljanja)) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, nargs="+", default=[1, 4])
+    parser.add_argument("--ponavljanja", type=int, default=5)
+    args = parser.parse_args()
+
+    for mb in args.mb:
+        for opis, odlomak in (("bez &<>", ODLOMAK), ("s &<>", ODLOMAK_POSEBNI)):
+            tekst = odlomak * int(mb * 1e6 / len(odlomak.encode("utf-8")))
+            assert format_text(tekst) == NACINI['str.translate'](tekst)
+            osnova = ms(lambda: stara_format_text(tekst), args.ponavljanja)
+            redak = "  ".join(f"{ime} {ms(lambda fn=fn: fn(tekst), args.ponavljanja):7.2f} ms" for ime, fn in NACINI.items() if ime != 'bez escapiranja (staro)')
+            print(f"{mb:g} MB {opis:8s} staro {osnova:6.2f} ms  {redak}")
+
+        tekst = ODLOMAK * int(mb * 1e6 / len(ODLOMAK.encode("utf-8")))
+        argumenti = ("OPĆINSKI GRAĐANSKI SUD U ZAGREBU", "", STRANKA, STRANKA, 1234.5, "Isplate",
+                     {'cinjenice': tekst, 'dokazi': tekst, 'datum_dospijeca': "01.04.2024.", 'kamata_do': None}, {'stavka': 100.0})
+        tuzba = ms(lambda: pripremi_za_word(generiraj_tuzbu_pro(*argumenti)), args.ponavljanja)
+        escapiranje = ms(lambda: (format_text(tekst), format_text(tekst)), args.ponavljanja) - ms(lambda: (stara_format_text(tekst), stara_format_text(tekst)), args.ponavljanja)
+        print(f"{mb:g} MB tužba (činjenice + dokazi = {2 * mb:g} MB): {tuzba:.2f} ms, od toga escapiranje +{escapiranje:.2f} ms ({escapiranje / tuzba:+.1%})")
+
+
+if __name__ == "__main__":
+    main()
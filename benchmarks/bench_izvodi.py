@@ -0,0 +1,84 @@
+"""
+Uvoz izvoda (pravni_alat.izvodi): čitanje camt.053 izvoda s iterparse i
+povezivanje uplata s otvorenim računima preko indeksa referenci.
+
+Složi izvod (po potrebi sažet u gzip) s --uplata stavki za --racuna
+otvorenih računa, pa mjeri protok čitanja i usklađivanja te vršnu memoriju
+procesa. Samo čitanje radi u stalnoj memoriji; usklađivanje drži otvorene
+račune i povezane uplate (knjige dugovanja), ali ne i nepovezane uplate.
+
+    python benchmarks/bench_izvodi.py --uplata 1000000 --racuna 100000 --gzip
+"""
+import argparse
+import gzip
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat.izvodi import citaj_izvode, uskladi
+from pravni_alat.skupno import vrsni_rss_mb
+
+ZAGLAVLJE = """<?xml version="1.0" encoding="UTF-8"?>
+<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.02"><BkToCstmrStmt>
+<GrpHdr><MsgId>IZVOD-1</MsgId><CreDtTm>2024-12-31T12:00:00</CreDtTm></GrpHdr>
+<Stmt><Id>1</Id><Acct><Id><IBAN>HR1210010051863000160</IBAN></Id></Acct>
+"""
+STAVKA = """<Ntry><Amt Ccy="EUR">{iznos:.2f}</Amt><CdtDbtInd>CRDT</CdtDbtInd><RvslInd>false</RvslInd><Sts>BOOK</Sts>
+<BookgDt><Dt>{datum}</Dt></BookgDt><ValDt><Dt>{datum}</Dt></ValDt><NtryDtls><TxDtls>
+<AmtDtls><TxAmt><Amt Ccy="EUR">{iznos:.2f}</Amt></TxAmt></AmtDtls><RltdPties><Dbtr><Nm>Dužnik {duznik}</Nm></Dbtr></RltdPties>
+<RmtInf><Ustrd>Plaćanje računa</Ustrd><Strd><CdtrRefInf><Ref>HR01 {referenca}</Ref></CdtrRefInf></Strd></RmtInf></TxDtls></NtryDtls></Ntry>
+"""
+
+
+def racuni(broj):
+    for i in range(broj):
+        yield {'duznik': f"Dužnik {i % (broj // 3 + 1)}", 'oib': "", 'adresa': "", 'racun': f"{i}-2024", 'datum_racuna': date(2024, 1, 1),
+               'dospijece': date(2024, 1, 1) + timedelta(days=i % 300), 'iznos': 100.0 + i % 900, 'referenca': f"{i}-2024"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uplata", type=int, default=1_000_000)
+    parser.add_argument("--racuna", type=int, default=100_000)
+    parser.add_argument("--gzip", action="store_true", help="izvod sažet u .xml.gz")
+    args = parser.parse_args()
+
+    slucajno = random.Random(1)
+    with tempfile.TemporaryDirectory() as mapa:
+        ime = os.path.join(mapa, "izvod.xml.gz" if args.gzip else "izvod.xml")
+        pocetak = time.perf_counter()
+        with (gzip.open(ime, "wt", encoding="utf-8", compresslevel=1) if args.gzip else open(ime, "w", encoding="utf-8")) as f:
+            f.write(ZAGLAVLJE)
+            for i in range(args.uplata):
+                # Svaka deseta uplata nema poznatu referencu
+                racun = slucajno.randrange(args.racuna)
+                referenca = f"{racun}-2024" if i % 10 else f"9{i}-2023"
+                f.write(STAVKA.format(iznos=10 + i % 500, datum=date(2024, 1, 1) + timedelta(days=i % 360), duznik=racun, referenca=referenca))
+            f.write("</Stmt></BkToCstmrStmt></Document>\n")
+        velicina = os.path.getsize(ime)
+        print(f"Izvod:           {args.uplata:,} stavki, {velicina / 1e6:.1f} MB na disku ({time.perf_counter() - pocetak:.1f} s za izradu)")
+        rss_prije = vrsni_rss_mb()
+
+        pocetak = time.perf_counter()
+        procitano = sum(1 for _ in citaj_izvode(ime, ime))
+        trajanje = time.perf_counter() - pocetak
+        rss_citanja = vrsni_rss_mb()
+        print(f"Čitanje:         {procitano / trajanje:,.0f} uplata/s, {velicina / 1e6 / trajanje:.1f} MB/s izvoda na disku")
+
+        pocetak = time.perf_counter()
+        knjige, izvjestaj = uskladi(racuni(args.racuna), citaj_izvode(ime, ime))
+        trajanje = time.perf_counter() - pocetak
+        print(f"Usklađivanje:    {izvjestaj['uplata'] / trajanje:,.0f} uplata/s, povezano {izvjestaj['povezano']:,}, "
+              f"nepovezano {izvjestaj['nepovezano']:,}, dužnika {len(knjige):,}")
+        if rss_prije is not None:
+            print(f"Vršna memorija:  {rss_prije:.0f} MB prije čitanja, {rss_citanja:.0f} MB nakon čitanja, "
+                  f"{vrsni_rss_mb():.0f} MB nakon usklađivanja (knjige drže povezane uplate)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Knjižnica klauzula (pravni_alat.klauzule): izgradnja indeksa, učitavanje
+mapiranjem datoteke i latencija pretrage.
+
+Puni privremenu bazu sintetičkim klauzulama složenim od riječi iz stvarnih
+ugovornih odredbi i mjeri pretragu s jednim do tri pojma (medijan i 99.
+percentil), kao i pokretanje nad već zapisanim indeksom.
+
+    python benchmarks/bench_klauzule.py --klauzula 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat.klauzule import ZADANE_KLAUZULE, KnjiznicaKlauzula
+
+RIJECI = sorted({r.strip(".,()%") for _, _, tekst in ZADANE_KLAUZULE for r in tekst.split() if len(r) > 3})
+UPITI = ["nadležnosti", "ugovorna kazna", "povjerljivost podataka", "viša sila obavijest", "pisanom obliku", "naknadu štete", "sporove sud"]
+
+
+def klauzule(broj, seed=1):
+    rnd = random.Random(seed)
+    for i in range(broj):
+        yield (f"Klauzula {i}", rnd.choice(["Odgovornost", "Završne odredbe", "Povjerljivost"]), " ".join(rnd.choices(RIJECI, k=40)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--klauzula", type=int, default=100_000)
+    parser.add_argument("--upita", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as mapa:
+        baza = os.path.join(mapa, "klauzule.sqlite3")
+        knjiznica = KnjiznicaKlauzula(baza)
+        pocetak = time.perf_counter()
+        knjiznica.uvezi(klauzule(args.klauzula))
+        knjiznica.zapisi_indeks()
+        print(f"Uvoz i indeks:   {time.perf_counter() - pocetak:.2f} s ({len(knjiznica)} klauzula, indeks {os.path.getsize(knjiznica.putanja_indeksa) / 1e6:.1f} MB)")
+        knjiznica.zatvori()
+
+        pocetak = time.perf_counter()
+        knjiznica = KnjiznicaKlauzula(baza)
+        print(f"Pokretanje:      {(time.perf_counter() - pocetak) * 1000:.1f} ms (mmap postojećeg indeksa)")
+
+        rnd = random.Random(2)
+        trajanja = []
+        for _ in range(args.upita):
+            upit = rnd.choice(UPITI)
+            pocetak = time.perf_counter()
+            knjiznica.trazi(upit)
+            trajanja.append((time.perf_counter() - pocetak) * 1000)
+        trajanja.sort()
+        print(f"Pretraga:        medijan {statistics.median(trajanja):.3f} ms, p99 {trajanja[int(len(trajanja) * 0.99)]:.3f} ms")
+        knjiznica.zatvori()
+
+
+if __name__ == "__main__":
+    main()
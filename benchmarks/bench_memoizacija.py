@@ -0,0 +1,40 @@
+"""
+Ponovljeni "Generiraj" s istim unosom: generator + pripremi_za_word bez
+predmemorije i kroz pravni_alat.memoizacija.
+
+    python benchmarks/bench_memoizacija.py
+"""
+import os
+import sys
+import timeit
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat import dokumenti, memoizacija
+
+S1 = {'uloga': "Naručitelj", 'tekst': "<b>A d.o.o.</b>"}
+S2 = {'uloga': "Izvođač", 'tekst': "<b>B d.o.o.</b>"}
+
+SLUCAJEVI = {
+    'tuzba': ('generiraj_tuzbu_pro', ("OPĆINSKI GRAĐANSKI SUD U ZAGREBU", "", "<b>A</b>", "<b>B</b>", 1234.5, "Isplate",
+                                      {'cinjenice': "Tuženik nije platio.\n" * 50, 'dokazi': "- Račun\n" * 5, 'datum_dospijeca': "01.02.2024.", 'kamata_do': date(2025, 1, 1)},
+                                      {'stavka': 100.0, 'pdv': 25.0, 'pristojba': 50.0})),
+    'ugovor, 500 članaka': ('generiraj_prilagodeni_ugovor', ("Ugovor", "Zagreb", date(2024, 5, 5), None, S1, S2, "",
+                                                              [{'naslov': f"Dio {i}", 'clanci': ["Tekst članka.\n" * 8] * 50} for i in range(10)])),
+}
+
+
+def main():
+    print(f"{'dokument':24s} {'bez ms':>8s} {'s predm. ms':>12s}")
+    for naziv, (ime, argumenti) in SLUCAJEVI.items():
+        izvorni, memoizirani = getattr(dokumenti, ime), getattr(memoizacija, ime)
+        assert memoizacija.pripremi_za_word(memoizirani(*argumenti)) == dokumenti.pripremi_za_word(izvorni(*argumenti))
+        bez = min(timeit.repeat(lambda: dokumenti.pripremi_za_word(izvorni(*argumenti)), number=1, repeat=200)) * 1000
+        sa = min(timeit.repeat(lambda: memoizacija.pripremi_za_word(memoizirani(*argumenti)), number=1, repeat=200)) * 1000
+        print(f"{naziv:24s} {bez:8.3f} {sa:12.3f}")
+    print(memoizacija.PREDMEMORIJA_DOKUMENATA.brojaci())
+
+
+if __name__ == "__main__":
+    main()
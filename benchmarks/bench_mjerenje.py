@@ -0,0 +1,50 @@
+"""
+Cijena mjerenja (pravni_alat.mjerenje) po pozivu: prazan blok `with raspon(...)`
+i poziv funkcije omotane s mjeri(), isključeno i uključeno, u odnosu na
+blok i poziv bez mjerenja. Uz to trajanje ispisa svih histograma u
+formatu Prometheusa.
+
+    python benchmarks/bench_mjerenje.py [--poziva 1000000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat import mjerenje
+
+
+def prazna():
+    pass
+
+
+def ns_po_pozivu(izjava, poziva, okolina):
+    return min(timeit.repeat(izjava, globals=okolina, number=poziva, repeat=5)) / poziva * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--poziva", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    okolina = {'raspon': mjerenje.raspon, 'prazna': prazna}
+    osnova_bloka = ns_po_pozivu("pass", args.poziva, okolina)
+    osnova_poziva = ns_po_pozivu("prazna()", args.poziva, okolina)
+    print(f"Bez mjerenja:   blok {osnova_bloka:6.1f} ns, poziv {osnova_poziva:6.1f} ns")
+    for ukljuceno in (False, True):
+        mjerenje.UKLJUCENO = ukljuceno
+        okolina['mjerena'] = mjerenje.mjeri("generator", "prazna")(prazna)
+        blok = ns_po_pozivu("with raspon('modul', 'prazno'): pass", args.poziva, okolina) - osnova_bloka
+        poziv = ns_po_pozivu("mjerena()", args.poziva, okolina) - osnova_poziva
+        print(f"{'Uključeno' if ukljuceno else 'Isključeno'}:{' ' * (6 if ukljuceno else 5)}raspon +{blok:6.1f} ns, mjeri +{poziv:6.1f} ns po pozivu")
+
+    for i in range(200):
+        with mjerenje.raspon("generator", f"generator_{i}"):
+            pass
+    print(f"Prometheus:     {ns_po_pozivu('prometheus_tekst()', 100, vars(mjerenje)) / 1e6:.2f} ms za {len(mjerenje._HISTOGRAMI)} histograma")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Automatsko spremanje nacrta (pravni_alat.nacrti) za mnogo velikih nacrta:
+`--nacrta` ugovora po `--clanaka` članaka. Mjeri bilježenje stanja na kraju
+reruna (spremi() bez promjene i s jednim promijenjenim člankom), jedan
+odgođeni upis promjena svih nacrta, veličinu na disku u odnosu na cijeli
+nacrt kao JSON te vraćanje nacrta iz baze pri ponovnom spajanju.
+
+    python benchmarks/bench_nacrti.py [--nacrta 300] [--clanaka 200]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat.nacrti import STRUKTURA, Nacrti, polja_strukture, struktura_iz_polja
+
+CLANAK = ("Izvođač se obvezuje izvršiti ugovorene radove stručno i kvalitetno, u skladu s pravilima struke, "
+          "važećim propisima i tehničkim normama, te u roku iz članka {} ovoga Ugovora. ")
+
+
+def nacrt(broj, clanaka):
+    struktura = [{'naslov': f"Dio {i + 1}", 'clanci': [CLANAK.format(i * 20 + j) * (1 + (broj + j) % 3) for j in range(20)]} for i in range(clanaka // 20)]
+    polja = polja_strukture(struktura)
+    polja.update({'modul': "📝 Ugovori i Odluke", 'cust_naslov': f"UGOVOR {broj}", 'cust_mjesto': "Zagreb", 'cust_s1_ime': "Ana Anić", 'cust_s1_oib': "12345678903"})
+    return polja
+
+
+def velicina(putanja):
+    # Nakon prijenosa WAL-a u bazu (inače bi se podaci brojali dvaput)
+    veza = sqlite3.connect(putanja)
+    veza.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    veza.close()
+    return os.path.getsize(putanja)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nacrta", type=int, default=300)
+    parser.add_argument("--clanaka", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as mapa:
+        putanja = os.path.join(mapa, "nacrti.sqlite3")
+        # Velika odgoda: upisuje samo zapisi_sve(), da se izmjeri jedan skupni upis
+        spremnik = Nacrti(putanja, odgoda=3600, najdulje=3600)
+        nacrti = {f"nacrt{n}": nacrt(n, args.clanaka) for n in range(args.nacrta)}
+        json_bajtova = sum(len(json.dumps(p, ensure_ascii=False).encode("utf-8")) for p in nacrti.values())
+
+        pocetak = time.perf_counter()
+        for ime, polja in nacrti.items():
+            spremnik.spremi(ime, polja, zamijeni=(STRUKTURA,))
+        prvo = time.perf_counter() - pocetak
+        pocetak = time.perf_counter()
+        upisano = spremnik.zapisi_sve()
+        prvi_upis = time.perf_counter() - pocetak
+        na_disku = velicina(putanja)
+        print(f"Prvo spremanje:    {prvo / args.nacrta * 1e3:6.2f} ms po nacrtu, upis {upisano} polja {prvi_upis * 1e3:.0f} ms "
+              f"(jedna transakcija), na disku {na_disku / 1e6:.1f} MB / JSON {json_bajtova / 1e6:.1f} MB")
+
+        pocetak = time.perf_counter()
+        for ime, polja in nacrti.items():
+            spremnik.spremi(ime, polja, zamijeni=(STRUKTURA,))
+        bez_promjene = time.perf_counter() - pocetak
+        pocetak = time.perf_counter()
+        for ime, polja in nacrti.items():
+            polja[f"{STRUKTURA}0/0"] += "Dopuna."
+            spremnik.spremi(ime, polja, zamijeni=(STRUKTURA,))
+        jedna_promjena = time.perf_counter() - pocetak
+        pocetak = time.perf_counter()
+        upisano = spremnik.zapisi_sve()
+        upis = time.perf_counter() - pocetak
+        print(f"Rerun bez izmjene: {bez_promjene / args.nacrta * 1e3:6.2f} ms po nacrtu")
+        print(f"Izmjena članka:    {jedna_promjena / args.nacrta * 1e3:6.2f} ms po nacrtu, odgođeni upis {upisano} polja "
+              f"za {args.nacrta} nacrta {upis * 1e3:.1f} ms, disk +{(velicina(putanja) - na_disku) / 1e3:.0f} kB")
+        spremnik.zatvori()
+
+        # Ponovno spajanje nakon ponovnog pokretanja: nacrt nije u memoriji, čita se iz baze
+        spremnik = Nacrti(putanja)
+        trajanja = []
+        for ime in list(nacrti)[:50]:
+            pocetak = time.perf_counter()
+            struktura = struktura_iz_polja(spremnik.ucitaj(ime))
+            trajanja.append(time.perf_counter() - pocetak)
+            assert len(struktura) == args.clanaka // 20
+        trajanja.sort()
+        print(f"Vraćanje nacrta:   p50 {trajanja[len(trajanja) // 2] * 1e3:.2f} ms, max {trajanja[-1] * 1e3:.2f} ms ({args.clanaka} članaka)")
+        spremnik.zatvori()
+
+
+if __name__ == "__main__":
+    main()
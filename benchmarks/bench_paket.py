@@ -0,0 +1,54 @@
+"""
+Mjerenje ZIP paketa (pravni_alat.paket) s velikim brojem dokumenata.
+
+Generira zadani broj ZK prijedloga i zapisuje ih u jednu arhivu na disku.
+Ispisuje trajanje, veličinu arhive i vršnu memoriju Pythona (tracemalloc),
+koja ne ovisi o veličini dokumenata; raste samo središnji direktorij
+arhive (jedan ZipInfo po datoteci).
+
+    python benchmarks/bench_paket.py --dokumenata 20000 [--oblik doc|docx]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat.dokumenti import generiraj_zk_prijedlog
+from pravni_alat.paket import zapisi_paket
+
+
+def dokumenti(broj, oblik):
+    for i in range(broj):
+        html = generiraj_zk_prijedlog("OPĆINSKI SUD U ZAGREBU", f"<b>Predlagatelj {i}</b>", "<b>Protustranka d.o.o.</b>",
+                                      {'ko': "Centar", 'ulozak': str(1000 + i), 'cestica': f"{i}/1", 'opis': "stan"},
+                                      {'ugovor': f"Kupoprodajni ugovor {i}", 'tabularna': "Tabularna isprava"}, {'pristojba': 50.0})
+        yield f"{i:06d}_ZK_prijedlog.{oblik}", html
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dokumenata", type=int, default=20000)
+    parser.add_argument("--oblik", choices=["doc", "docx"], default="doc")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as mapa:
+        izlaz = os.path.join(mapa, "paket.zip")
+        for broj in (args.dokumenata // 10, args.dokumenata):
+            pocetak = time.perf_counter()
+            zapisi_paket(dokumenti(broj, args.oblik), izlaz, oblik=args.oblik)
+            trajanje = time.perf_counter() - pocetak
+            # Memorija se mjeri u zasebnom prolazu jer tracemalloc višestruko usporava izvođenje
+            tracemalloc.start()
+            zapisi_paket(dokumenti(broj, args.oblik), izlaz, oblik=args.oblik)
+            _, vrh = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{broj:7d} dokumenata: {trajanje:6.2f} s, {broj / trajanje:6.0f} dok/s, "
+                  f"ZIP {os.path.getsize(izlaz) / 2**20:6.1f} MB, vršna memorija {vrh / 2**20:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
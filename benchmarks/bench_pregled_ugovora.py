@@ -0,0 +1,51 @@
+"""
+Pregled personaliziranog ugovora nakon izmjene jednog članka: bez predmemorije
+(svaki članak se renderira iznova) i s LRUPredmemorija (samo izmijenjeni).
+
+    python benchmarks/bench_pregled_ugovora.py
+"""
+import os
+import sys
+import timeit
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat.dokumenti import generiraj_prilagodeni_ugovor_dijelovi
+from pravni_alat.predmemorija import LRUPredmemorija
+
+S1 = {'uloga': "Naručitelj", 'tekst': "<b>A d.o.o.</b>"}
+S2 = {'uloga': "Izvođač", 'tekst': "<b>B d.o.o.</b>"}
+
+
+def struktura(clanaka, po_dijelu=20):
+    return [{'naslov': f"Dio {i // po_dijelu + 1}", 'clanci': [f"Članak {j}: ugovorne strane suglasno utvrđuju sve obveze.\n" * 8 for j in range(i, min(i + po_dijelu, clanaka))]}
+            for i in range(0, clanaka, po_dijelu)]
+
+
+def pregled(argumenti, predmemorija=None):
+    return "".join(generiraj_prilagodeni_ugovor_dijelovi(*argumenti, predmemorija=predmemorija))
+
+
+def main():
+    print(f"{'članaka':>8s} {'bez ms':>8s} {'s predm. ms':>12s} {'pogoci':>8s}")
+    for clanaka in (50, 200, 1000):
+        sadrzaj = struktura(clanaka)
+        argumenti = ("Ugovor", "Zagreb", date(2024, 5, 5), None, S1, S2, "", sadrzaj)
+        predmemorija = LRUPredmemorija(kapacitet=2 * clanaka)
+        pregled(argumenti, predmemorija)
+        brojac = [0]
+
+        def izmjena():
+            # Korisnik tipka u jedan članak; ostali su nepromijenjeni
+            brojac[0] += 1
+            sadrzaj[0]['clanci'][0] = f"Izmijenjeni tekst {brojac[0]}"
+
+        bez = min(timeit.repeat(lambda: (izmjena(), pregled(argumenti)), number=1, repeat=50)) * 1000
+        sa = min(timeit.repeat(lambda: (izmjena(), pregled(argumenti, predmemorija)), number=1, repeat=50)) * 1000
+        assert pregled(argumenti) == pregled(argumenti, predmemorija)
+        print(f"{clanaka:8d} {bez:8.3f} {sa:12.3f} {predmemorija.pogoci:8d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Skaliranje paralelnog generiranja (pravni_alat.renderiranje) s brojem procesa.
+
+Za svaki broj radnika (1, 2, 4, ... do broja jezgri) generira isti skup
+mješovitih poslova (tužba, ovrha, ZK prijedlog, brisovna tužba) i ispisuje
+dokumente u sekundi i ubrzanje u odnosu na jedan proces.
+
+    python benchmarks/bench_renderiranje.py --poslova 20000 --paket 64
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat.renderiranje import renderiraj
+
+TROSKOVI = {'stavka': 100.0, 'pdv': 25.0, 'pristojba': 50.0}
+NEKRETNINA = {'ko': 'Centar', 'ulozak': '1234', 'cestica': '567/8', 'opis': 'kuća i dvorište'}
+
+
+def posao(i):
+    tuzitelj = f"<b>Tužitelj {i}</b><br>Adresa: Ilica {i}, Zagreb<br>OIB: 12345678901"
+    tuzenik = f"<b>Tuženik {i}</b><br>Adresa: Riva {i}, Split<br>OIB: 10987654321"
+    vrsta = ('tuzba', 'ovrha', 'zk_prijedlog', 'brisovna_tuzba')[i % 4]
+    if vrsta == 'tuzba':
+        argumenti = ["OPĆINSKI GRAĐANSKI SUD U ZAGREBU", "", tuzitelj, tuzenik, 1000.0 + i, "Isplate",
+                     {'cinjenice': "Tuženik nije platio.\n" * 20, 'dokazi': "- Račun", 'datum_dospijeca': "01.02.2024."}, TROSKOVI]
+    elif vrsta == 'ovrha':
+        argumenti = ["Ivan Horvat, Zagreb", tuzitelj, tuzenik,
+                     {'glavnica': 1000.0 + i, 'datum_racuna': "01.01.2024.", 'dospjece': "01.02.2024."}, f"Račun br. {i}", TROSKOVI]
+    elif vrsta == 'zk_prijedlog':
+        argumenti = ["OPĆINSKI SUD U ZAGREBU", tuzitelj, tuzenik, NEKRETNINA, {'ugovor': "Kupoprodajni ugovor", 'tabularna': "Tabularna izjava"}, TROSKOVI]
+    else:
+        argumenti = ["OPĆINSKI SUD U ZAGREBU", "", tuzitelj, tuzenik, NEKRETNINA,
+                     {'vps': 10000.0, 'z_broj': f"Z-{i}/2024", 'datum_uknjizbe': "01.03.2024.", 'isprava': "Ugovor",
+                      'razlog_nevaljanosti': "Krivotvoren potpis.", 'tuzenik_znao': True, 'mjesto': "Zagreb"}, TROSKOVI]
+    return {'vrsta': vrsta, 'argumenti': argumenti}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--poslova", type=int, default=20000)
+    parser.add_argument("--paket", type=int, default=64, help="poslova po zadatku")
+    parser.add_argument("--neporedano", action="store_true", help="rezultati čim su gotovi, ne redom ulaza")
+    parser.add_argument("--max-radnika", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    radnici = []
+    n = 1
+    while n < args.max_radnika:
+        radnici.append(n)
+        n *= 2
+    radnici.append(args.max_radnika)
+
+    osnova = None
+    for radnika in radnici:
+        pocetak = time.perf_counter()
+        gresaka = sum(1 for r in renderiraj((posao(i) for i in range(args.poslova)), radnika=radnika,
+                                            velicina_paketa=args.paket, poredano=not args.neporedano,
+                                            nacin_pokretanja="fork") if r.greska)
+        trajanje = time.perf_counter() - pocetak
+        brzina = args.poslova / trajanje
+        osnova = osnova or brzina
+        print(f"radnika={radnika:3d}  {brzina:9.0f} dok/s  ubrzanje {brzina / osnova:5.2f}x  grešaka {gresaka}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Procesni rokovi (pravni_alat.rokovi): izgradnja kalendara, rok za jednu
+dostavu i vektorizirani rokovi za niz dostavljenih odluka.
+
+Uspoređuje s izravnim računom (dan po dan, provjera vikenda i blagdana) i
+provjerava da daju isti posljednji dan roka.
+
+    python benchmarks/bench_rokovi.py --dostava 1000000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat.rokovi import Kalendar, blagdani, izracunaj_rok, izracunaj_rokove
+
+
+def rok_izravno(dostava, dana, neradni):
+    # Referentni račun: dan po dan
+    rok = dostava + timedelta(days=dana)
+    while rok.weekday() >= 5 or rok in neradni:
+        rok += timedelta(days=1)
+    return rok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dostava", type=int, default=1_000_000)
+    parser.add_argument("--dana", type=int, default=15)
+    args = parser.parse_args()
+
+    pocetak = time.perf_counter()
+    Kalendar()
+    print(f"Kalendar:        {(time.perf_counter() - pocetak) * 1000:.1f} ms (2002.-2100.)")
+
+    rnd = np.random.default_rng(1)
+    dostave = np.datetime64("2015-01-01") + rnd.integers(0, 4000, args.dostava)
+    kao_datumi = dostave.astype(object).tolist()
+    uzorak = kao_datumi[:min(len(kao_datumi), 100_000)]
+    neradni = {b for godina in range(2015, 2027) for b in blagdani(godina)}
+
+    pocetak = time.perf_counter()
+    izravno = [rok_izravno(d, args.dana, neradni) for d in uzorak]
+    t_izravno = time.perf_counter() - pocetak
+    pocetak = time.perf_counter()
+    pojedinacno = [izracunaj_rok(d, args.dana) for d in uzorak]
+    t_pojedinacno = time.perf_counter() - pocetak
+    pocetak = time.perf_counter()
+    vektorski = izracunaj_rokove(dostave, args.dana)
+    t_vektorski = time.perf_counter() - pocetak
+
+    assert izravno == pojedinacno == vektorski[:len(uzorak)].astype(object).tolist()
+    print(f"Izravno:         {len(uzorak) / t_izravno:,.0f} rokova/s")
+    print(f"Kalendar, jedan: {len(uzorak) / t_pojedinacno:,.0f} rokova/s")
+    print(f"Vektorizirano:   {args.dostava / t_vektorski:,.0f} rokova/s ({t_vektorski * 1000:.1f} ms za {args.dostava})")
+
+
+if __name__ == "__main__":
+    main()
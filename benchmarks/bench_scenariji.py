@@ -0,0 +1,239 @@
+"""
+Skup scenarija za sve generatore dokumenata, omotač za Word
+(pripremi_za_word, zapisi_docx) i obračun kamata, nad sintetičkim ulazima
+realnih i ekstremnih veličina: ugovori s 10 do 10.000 članaka, portfelji
+od 1.000 do 1.000.000 tražbina, tužbe s jednim do 2.000 odlomaka
+činjeničnih navoda.
+
+Za svaki scenarij ispisuje percentile latencije (p50, p90, p99), protok i
+vršnu memoriju jednog poziva (tracemalloc, zasebno od mjerenja vremena).
+Rezultati se spremaju kao JSON (--spremi), a uz --osnovica uspoređuju s
+ranije spremljenim rezultatima; skripta tada završava s kodom 1 ako je neki
+scenarij sporiji ili zauzima više memorije od osnovice za više od --prag,
+pa se može pokretati prije isporuke. Osnovicu treba snimiti na istom
+računalu na kojem se provjerava.
+
+    python benchmarks/bench_scenariji.py --spremi rezultati.json
+    python benchmarks/bench_scenariji.py --osnovica benchmarks/osnovica.json
+    python benchmarks/bench_scenariji.py --brzo --scenarij ugovor
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat import dokumenti
+from pravni_alat.docx import zapisi_docx
+from pravni_alat.kamate import izracunaj_kamate, izracunaj_kamatu
+from pravni_alat.knjiga import obracunaj_knjigu
+
+# priprema() vraća argumente (ne mjeri se), poziv(argumenti) je mjereni rad;
+# kolicina je broj jedinica (članaka, tražbina, dokumenata) u jednom pozivu.
+Scenarij = namedtuple("Scenarij", ["ime", "priprema", "poziv", "jedinica", "kolicina", "ekstremni"])
+
+ODLOMAK = ("Tuženik je dana {d}. sklopio s tužiteljem ugovor o isporuci robe te se obvezao platiti cijenu u roku od "
+           "trideset dana od isporuke. Tužitelj je robu isporučio, što je tuženik potvrdio potpisom otpremnice, "
+           "ali do podnošenja tužbe nije platio ni dio cijene unatoč opomenama od {d}. i {d2}. ")
+TROSKOVI = {'stavka': 250.0, 'materijalni': 13.27, 'pdv': 65.82, 'pristojba': 96.45}
+NEKRETNINA = {'ko': "Centar", 'ulozak': "1234", 'cestica': "567/1", 'opis': "kuća i dvorište"}
+
+
+# --- Sintetički ulazi ---
+
+def stranka(i, pravna=True):
+    if pravna:
+        return f"<b>Tvrtka {i} d.o.o.</b><br>Sjedište: Ilica {i}, Zagreb<br>OIB: {10**10 + i}, MBS: {80000000 + i}<br>Zastupana po: Ivan Horvat"
+    return f"<b>Ana Anić {i}</b><br>Adresa: Vukovarska {i}, Split<br>OIB: {20**7 + i}"
+
+
+def cinjenice(odlomaka, slucajno):
+    return "\n".join(ODLOMAK.format(d=slucajno.randrange(1, 28), d2=slucajno.randrange(1, 28)) for _ in range(odlomaka))
+
+
+def struktura_ugovora(clanaka, po_dijelu=20):
+    clanak = "Ugovorne strane suglasno utvrđuju prava i obveze iz ovog članka te se obvezuju postupati savjesno.\n"
+    return [{'naslov': f"Dio {i // po_dijelu + 1}", 'clanci': [f"{j}. " + clanak * (1 + j % 4) for j in range(i, min(i + po_dijelu, clanaka))]}
+            for i in range(0, clanaka, po_dijelu)]
+
+
+def portfelj(trazbina, slucajno_np):
+    glavnice = slucajno_np.uniform(50, 50000, trazbina).round(2)
+    dospijeca = np.datetime64("2023-01-01") + slucajno_np.integers(0, 900, trazbina).astype("timedelta64[D]")
+    obracuni = np.full(trazbina, np.datetime64("2025-06-30"))
+    return glavnice, dospijeca, obracuni
+
+
+def knjiga(racuna, slucajno):
+    racuni = [{'oznaka': f"R-{i}", 'iznos': 100.0 + i % 900, 'dospijece': date(2023, 1, 1) + timedelta(days=i % 900)} for i in range(racuna)]
+    uplate = [{'opis': f"U-{i}", 'iznos': slucajno.uniform(10, 500), 'datum': date(2023, 2, 1) + timedelta(days=i % 850)} for i in range(racuna)]
+    return racuni, uplate
+
+
+# --- Scenariji ---
+
+def tuzba(odlomaka, slucajno):
+    return ("Općinski građanski sud u Zagrebu", "Odvjetnik Ivo Ivić", stranka(1), stranka(2, False), 12500.0, "Isplate",
+            {'cinjenice': cinjenice(odlomaka, slucajno), 'dokazi': cinjenice(max(1, odlomaka // 10), slucajno),
+             'datum_dospijeca': "01.02.2023.", 'kamata_do': date(2025, 6, 30), 'kamata_vrsta': "trgovacki"}, TROSKOVI)
+
+
+def ugovor(clanaka):
+    return ("UGOVOR O POSLOVNOJ SURADNJI", "Zagreb", date(2024, 5, 5), date(2030, 1, 1),
+            {'uloga': "Naručitelj", 'tekst': stranka(1)}, {'uloga': "Izvođač", 'tekst': stranka(2)}, "2024-05", struktura_ugovora(clanaka))
+
+
+def scenariji():
+    slucajno = random.Random(2024)
+    slucajno_np = np.random.default_rng(2024)
+    s = []
+    for clanaka in (10, 100, 1000, 10000):
+        s.append(Scenarij(f"ugovor_prilagodeni_{clanaka}", lambda c=clanaka: ugovor(c),
+                          lambda a: dokumenti.pripremi_za_word(dokumenti.generiraj_prilagodeni_ugovor(*a)), "članaka", clanaka, clanaka >= 10000))
+    for odlomaka in (1, 20, 200, 2000):
+        s.append(Scenarij(f"tuzba_cinjenice_{odlomaka}", lambda o=odlomaka: tuzba(o, slucajno),
+                          lambda a: dokumenti.pripremi_za_word(dokumenti.generiraj_tuzbu_pro(*a)), "dokumenata", 1, odlomaka >= 2000))
+    jednostavni = {
+        'ovrha': (dokumenti.generiraj_ovrhu_pro, lambda: ("JB Marko Marić", stranka(1), stranka(2, False),
+                  {'glavnica': 1500.0, 'datum_racuna': "01.01.2024.", 'dospjece': "01.02.2024.", 'kamata_do': date(2025, 6, 30)}, "Račun br. 1-2024", TROSKOVI)),
+        'zalba': (dokumenti.generiraj_zalbu_pro, lambda: ("Općinski sud u Splitu", "Županijski sud u Splitu", {'tuzitelj': stranka(1), 'tuzenik': stranka(2, False)},
+                  {'broj': "P-123/2024", 'datum': "01.03.2025.", 'opseg': "u cijelosti", 'mjesto': "Split"},
+                  ["Zbog bitne povrede odredaba parničnog postupka", "Zbog pogrešne primjene materijalnog prava"], cinjenice(20, slucajno), TROSKOVI)),
+        'ugovor_standard': (dokumenti.generiraj_ugovor_standard, lambda: ("Kupoprodaja", stranka(1), stranka(2, False),
+                            {'mjesto': "Zagreb", 'predmet_clanak': cinjenice(3, slucajno), 'cijena_clanak': "Cijena iznosi 10.000,00 EUR.", 'rok_clanak': "Rok je 30 dana."},
+                            {'kapara': True, 'iznos_kapare': 1000.0, 'solemnizacija': True}, TROSKOVI)),
+        'ugovor_o_radu': (dokumenti.generiraj_ugovor_o_radu, lambda: (stranka(1), stranka(2, False),
+                          {'vrsta': "Određeno", 'datum_do': "31.12.2025.", 'razlog_odredeno': "zamjena", 'probni_rad': True, 'probni_rad_mj': 3, 'bruto_placa': 1800.0})),
+        'otkaz': (dokumenti.generiraj_otkaz, lambda: (stranka(1), stranka(2, False), {'tekst_obrazlozenja': cinjenice(5, slucajno)})),
+        'tabularna': (dokumenti.generiraj_tabularnu_doc, lambda: (stranka(1), stranka(2, False), "Centar", "567/1", "1234", "kuća", "01.01.2024.")),
+        'zk_prijedlog': (dokumenti.generiraj_zk_prijedlog, lambda: ("Općinski sud u Zagrebu", stranka(1), stranka(2, False), NEKRETNINA,
+                         {'ugovor': "Kupoprodajni ugovor od 01.01.2024.", 'tabularna': "Tabularna izjava od 01.01.2024."}, {'pristojba': 26.54})),
+        'brisovna_tuzba': (dokumenti.generiraj_brisovnu_tuzbu, lambda: ("Općinski sud u Zagrebu", "Odvjetnik Ivo Ivić", stranka(1), stranka(2, False), NEKRETNINA,
+                           {'vps': 50000.0, 'z_broj': "Z-1234/2020", 'datum_uknjizbe': "01.01.2020.", 'isprava': "Ugovor", 'datum_isprave': "01.12.2019.",
+                            'razlog_nevaljanosti': cinjenice(3, slucajno), 'tuzenik_znao': True, 'mjesto': "Zagreb"}, TROSKOVI)),
+    }
+    for ime, (generator, priprema) in jednostavni.items():
+        s.append(Scenarij(f"{ime}", priprema, lambda a, g=generator: dokumenti.pripremi_za_word(g(*a)), "dokumenata", 1, False))
+    for clanaka in (100, 1000):
+        s.append(Scenarij(f"pripremi_za_word_{clanaka}", lambda c=clanaka: dokumenti.generiraj_prilagodeni_ugovor(*ugovor(c)),
+                          dokumenti.pripremi_za_word, "članaka", clanaka, False))
+        s.append(Scenarij(f"docx_{clanaka}", lambda c=clanaka: dokumenti.pripremi_za_word(dokumenti.generiraj_prilagodeni_ugovor(*ugovor(c))),
+                          lambda html: zapisi_docx(html, io.BytesIO()), "članaka", clanaka, False))
+    s.append(Scenarij("kamata_jedna", lambda: (1500.0, date(2023, 3, 1), date(2025, 6, 30)), lambda a: izracunaj_kamatu(*a), "tražbina", 1, False))
+    for trazbina in (1000, 100_000, 1_000_000):
+        s.append(Scenarij(f"kamate_portfelj_{trazbina}", lambda t=trazbina: portfelj(t, slucajno_np),
+                          lambda a: izracunaj_kamate(*a, po_razdobljima=False), "tražbina", trazbina, trazbina >= 1_000_000))
+    for trazbina in (1000, 100_000):
+        s.append(Scenarij(f"kamate_razdoblja_{trazbina}", lambda t=trazbina: portfelj(t, slucajno_np),
+                          lambda a: izracunaj_kamate(*a), "tražbina", trazbina, trazbina >= 100_000))
+    for racuna in (10, 1000):
+        s.append(Scenarij(f"knjiga_{racuna}", lambda r=racuna: knjiga(r, slucajno),
+                          lambda a: obracunaj_knjigu(*a, date(2025, 6, 30)), "računa", racuna, False))
+    return s
+
+
+# --- Mjerenje ---
+
+def izmjeri(scenarij, najmanje, najvise, trajanje_s):
+    argumenti = scenarij.priprema()
+    scenarij.poziv(argumenti)  # zagrijavanje (uvozi, predmemorije predložaka)
+    latencije = []
+    kraj = time.perf_counter() + trajanje_s
+    while len(latencije) < najvise and (len(latencije) < najmanje or time.perf_counter() < kraj):
+        pocetak = time.perf_counter()
+        scenarij.poziv(argumenti)
+        latencije.append(time.perf_counter() - pocetak)
+    tracemalloc.start()
+    scenarij.poziv(argumenti)
+    _, vrsna = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    centili = statistics.quantiles(latencije, n=100, method="inclusive") if len(latencije) > 1 else latencije * 99
+    return {
+        'poziva': len(latencije),
+        'p50_ms': statistics.median(latencije) * 1e3,
+        'p90_ms': centili[89] * 1e3,
+        'p99_ms': centili[98] * 1e3,
+        'max_ms': max(latencije) * 1e3,
+        'protok': scenarij.kolicina / statistics.mean(latencije),
+        'jedinica': scenarij.jedinica,
+        'vrsna_memorija_mb': vrsna / 1e6,
+    }
+
+
+def usporedi(rezultati, osnovica, prag):
+    """Regresije: (ime, mjera, osnovica, sada) za scenarije sporije ili veće od osnovice za više od praga."""
+    regresije = []
+    for ime, sada in rezultati.items():
+        prije = osnovica.get(ime)
+        if prije is None:
+            continue
+        # Apsolutni pragovi štite mikrosekundne scenarije i male alokacije od šuma
+        if sada['p50_ms'] > prije['p50_ms'] * (1 + prag) and sada['p50_ms'] - prije['p50_ms'] > 0.05:
+            regresije.append((ime, 'p50_ms', prije['p50_ms'], sada['p50_ms']))
+        if sada['vrsna_memorija_mb'] > prije['vrsna_memorija_mb'] * (1 + prag) and sada['vrsna_memorija_mb'] - prije['vrsna_memorija_mb'] > 0.5:
+            regresije.append((ime, 'vrsna_memorija_mb', prije['vrsna_memorija_mb'], sada['vrsna_memorija_mb']))
+    return regresije
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarij", action="append", default=[], help="samo scenariji čije ime sadrži ovaj tekst (može više puta)")
+    parser.add_argument("--brzo", action="store_true", help="bez ekstremnih veličina (10.000 članaka, 1.000.000 tražbina...)")
+    parser.add_argument("--najmanje", type=int, default=5, help="najmanje poziva po scenariju")
+    parser.add_argument("--najvise", type=int, default=500, help="najviše poziva po scenariju")
+    parser.add_argument("--trajanje", type=float, default=1.0, help="sekundi mjerenja po scenariju (nakon --najmanje poziva)")
+    parser.add_argument("--spremi", help="JSON datoteka za rezultate")
+    parser.add_argument("--osnovica", help="JSON s ranije spremljenim rezultatima za usporedbu")
+    parser.add_argument("--prag", type=float, default=0.25, help="dopušteno pogoršanje u odnosu na osnovicu (0.25 = 25 %%)")
+    args = parser.parse_args()
+
+    osnovica = {}
+    if args.osnovica:
+        with open(args.osnovica, encoding="utf-8") as f:
+            osnovica = json.load(f)['scenariji']
+
+    rezultati = {}
+    print(f"{'scenarij':30s} {'p50 ms':>10s} {'p90 ms':>10s} {'p99 ms':>10s} {'protok':>22s} {'memorija':>10s}" + ("   Δ p50" if osnovica else ""))
+    for scenarij in scenariji():
+        if args.scenarij and not any(dio in scenarij.ime for dio in args.scenarij):
+            continue
+        if args.brzo and scenarij.ekstremni:
+            continue
+        r = rezultati[scenarij.ime] = izmjeri(scenarij, args.najmanje, args.najvise, args.trajanje)
+        prije = osnovica.get(scenarij.ime)
+        razlika = f"  {(r['p50_ms'] / prije['p50_ms'] - 1) * 100:+6.1f} %" if prije else ""
+        print(f"{scenarij.ime:30s} {r['p50_ms']:10.3f} {r['p90_ms']:10.3f} {r['p99_ms']:10.3f} {r['protok']:12,.0f} {r['jedinica'] + '/s':>9s} "
+              f"{r['vrsna_memorija_mb']:7.1f} MB{razlika}")
+
+    if args.spremi:
+        meta = {
+            'vrijeme': datetime.now().isoformat(timespec="seconds"), 'python': platform.python_version(), 'numpy': np.__version__,
+            'platforma': platform.platform(), 'procesor': platform.processor() or platform.machine(), 'jezgri': os.cpu_count(),
+        }
+        with open(args.spremi, "w", encoding="utf-8") as f:
+            json.dump({'meta': meta, 'scenariji': rezultati}, f, ensure_ascii=False, indent=1, sort_keys=True)
+        print(f"Rezultati spremljeni u {args.spremi}")
+
+    if osnovica:
+        regresije = usporedi(rezultati, osnovica, args.prag)
+        for ime, mjera, prije, sada in regresije:
+            print(f"REGRESIJA {ime}: {mjera} {prije:.3f} -> {sada:.3f} ({(sada / prije - 1) * 100:+.0f} %)")
+        nema = sorted(set(osnovica) - set(rezultati))
+        if nema and not (args.scenarij or args.brzo):
+            print(f"Scenariji iz osnovice koji nisu izmjereni: {', '.join(nema)}")
+        sys.exit(1 if regresije else 0)
+
+
+if __name__ == "__main__":
+    main()
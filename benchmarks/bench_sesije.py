@@ -0,0 +1,238 @@
+"""
+Opterećenje aplikacije: N simuliranih sesija bez preglednika prolazi
+skriptirane tokove rada (streamlit.testing.v1.AppTest) i mjeri trajanje
+svakog reruna po modulu i koraku. Svaka promjena widgeta ponovno izvršava
+cijelu skriptu (bočna traka, CSS, obrasci modula), pa razdioba trajanja
+reruna pokazuje koliko sesija poslužitelj podnosi i koje su grane spore.
+
+Tokovi:
+  tuzba   unos stranaka, VPS-a i činjeničnih navoda od više odlomaka, generiranje tužbe
+  ugovor  personalizirani ugovor koji raste do --clanaka članaka (20 po dijelu), generiranje
+  ovrhe   skupni način: CSV s --ovrha redova, generiranje ZIP-a u pozadini i čekanje rezultata
+
+AppTest za vrijeme reruna zamjenjuje globalni Runtime, pa sesije jednog
+procesa idu jedna za drugom; --procesa pokreće više procesa istodobno, kao
+više radnika poslužitelja nad istom bazom, arhivom i redom zadataka.
+Izmjereno vrijeme uključuje i AppTestovo raščlanjivanje stabla elemenata,
+pa je gornja granica onoga što poslužitelj troši po reranu.
+
+Ako nisu zadani, PRAVNI_ALAT_BAZA, PRAVNI_ALAT_ARHIVA i PRAVNI_ALAT_ZADACI
+usmjeravaju se u privremenu mapu koja se briše na kraju.
+
+    python benchmarks/bench_sesije.py --sesija 12 --procesa 4
+    python benchmarks/bench_sesije.py --tok ugovor --clanaka 200 --json sesije.json
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+APLIKACIJA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "zatezne_kamate_appV10.py")
+CLANAKA_PO_DIJELU = 20
+# Koliko dugo tok ovrha čeka pozadinski zadatak i koliko često osvježava stranicu (kao fragment napretka)
+NAJDULJE_CEKANJE_S = 600
+RAZMAK_OSVJEZAVANJA_S = 1.0
+
+ODLOMAK = ("Tuženik je s tužiteljem sklopio ugovor o isporuci robe i obvezao se platiti cijenu u roku od trideset dana "
+           "od isporuke. Tužitelj je robu isporučio, što je tuženik potvrdio potpisom otpremnice, ali do podnošenja "
+           "tužbe nije platio ni dio cijene unatoč opomenama.")
+
+
+class Sesija:
+    """Jedna simulirana sesija: AppTest i popis mjerenja (tok, modul, korak, sekundi)."""
+
+    def __init__(self, tok, broj, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.tok, self.broj = tok, broj
+        self.at = AppTest.from_file(APLIKACIJA, default_timeout=timeout)
+        self.modul = "Ugovori i Odluke"  # zadani izbor u bočnoj traci
+        self.mjerenja = []
+
+    def rerun(self, korak):
+        pocetak = time.perf_counter()
+        self.at.run()
+        self.mjerenja.append((self.tok, self.modul, korak, time.perf_counter() - pocetak))
+        if self.at.exception:
+            raise RuntimeError(f"{self.modul} / {korak}: {self.at.exception[0].message}")
+
+    def widget(self, vrsta, oznaka=None, kljuc=None):
+        if kljuc is not None:
+            return getattr(self.at, vrsta)(key=kljuc)
+        return next(w for w in getattr(self.at, vrsta) if w.label.startswith(oznaka))
+
+    def unesi(self, vrsta, vrijednost, oznaka=None, kljuc=None, korak="unos"):
+        self.widget(vrsta, oznaka, kljuc).set_value(vrijednost)
+        self.rerun(korak)
+
+    def klikni(self, oznaka=None, kljuc=None, korak="gumb"):
+        self.widget("button", oznaka, kljuc).click()
+        self.rerun(korak)
+
+    def provjeri_dokument(self):
+        # Generiranje je uspjelo ako je ponuđeno preuzimanje; st.error s porukom nije iznimka pa se provjerava zasebno
+        if not self.at.get("download_button"):
+            raise RuntimeError(f"{self.modul}: nema dokumenta za preuzimanje {[e.value for e in self.at.error]}")
+
+    def otvori_modul(self, modul):
+        radio = self.at.sidebar.radio[0]
+        self.modul = modul
+        radio.set_value(next(o for o in radio.options if modul in o))
+        self.rerun("otvaranje modula")
+
+    def stranka(self, prefiks):
+        self.unesi("text_input", f"Ana Anić {self.broj}", kljuc=f"{prefiks}_ime")
+        self.unesi("text_input", f"{12345678900 + self.broj}"[-11:], kljuc=f"{prefiks}_oib")
+        self.unesi("text_input", f"Vukovarska {self.broj}, Split", kljuc=f"{prefiks}_adresa")
+
+
+def tok_tuzba(s, args):
+    s.otvori_modul("Tužbe")
+    s.stranka("t1")
+    s.stranka("t2")
+    s.unesi("number_input", 1000.0 + s.broj * 10, oznaka="Vrijednost spora")
+    s.unesi("text_area", "\n\n".join([ODLOMAK] * args.odlomaka), oznaka="I. Činjenice")
+    s.unesi("text_area", "\n".join(f"- Račun broj {i}/2024" for i in range(1, 6)), oznaka="II. Dokazi")
+    s.klikni("Generiraj Tužbu", korak="generiranje")
+    s.provjeri_dokument()
+
+
+def tok_ugovor(s, args):
+    s.stranka("cust_s1")
+    s.stranka("cust_s2")
+    for n in range(args.clanaka):
+        dio, clanak = divmod(n, CLANAKA_PO_DIJELU)
+        if n and not clanak:
+            s.klikni("➕ DODAJ NOVI DIO", korak="dodavanje dijela")
+            s.unesi("text_input", f"Dio {dio + 1}", kljuc=f"naslov_{dio}")
+        elif n:
+            s.klikni(kljuc=f"add_art_{dio}", korak="dodavanje članka")
+        s.unesi("text_area", f"Članak {n + 1}. {ODLOMAK}", kljuc=f"cl_{dio}_{clanak}", korak="unos članka")
+    s.klikni("Generiraj Personalizirani Ugovor", korak="generiranje")
+    s.provjeri_dokument()
+
+
+def csv_ovrha(broj, redova):
+    izlaz = io.StringIO()
+    pisac = csv.writer(izlaz, delimiter=";")
+    pisac.writerow(["jb", "ovrhovoditelj", "ovrhovoditelj_oib", "ovrhovoditelj_adresa", "ovrsenik", "ovrsenik_oib", "ovrsenik_adresa",
+                    "isprava", "datum_racuna", "glavnica", "dospijece"])
+    for i in range(redova):
+        pisac.writerow(["Ivan Horvat, Zagreb", f"Tvrtka {broj} d.o.o.", "", "Ilica 1, Zagreb", f"Dužnik {broj}-{i}", "", f"Vukovarska {i}, Split",
+                        f"Račun br. {i}-{broj}", "01.02.2024.", f"{100 + i % 900},00", "01.03.2024."])
+    return izlaz.getvalue().encode("utf-8")
+
+
+def tok_ovrhe(s, args):
+    s.otvori_modul("Ovršni")
+    s.unesi("radio", "Skupno (CSV/XLSX)", oznaka="Način rada")
+    s.widget("file_uploader", "CSV ili XLSX").set_value((f"ovrhe_{s.broj}.csv", csv_ovrha(s.broj, args.ovrha), "text/csv"))
+    s.rerun("učitavanje datoteke")
+    s.klikni("Generiraj ZIP", korak="generiranje")
+    kraj = time.monotonic() + NAJDULJE_CEKANJE_S
+    while not s.at.get("download_button"):
+        if s.at.error:
+            raise RuntimeError(f"{s.modul}: {s.at.error[0].value}")
+        if time.monotonic() > kraj:
+            raise RuntimeError(f"{s.modul}: zadatak nije završio za {NAJDULJE_CEKANJE_S} s")
+        time.sleep(RAZMAK_OSVJEZAVANJA_S)
+        s.rerun("čekanje rezultata")
+
+
+TOKOVI = {'tuzba': tok_tuzba, 'ugovor': tok_ugovor, 'ovrhe': tok_ovrhe}
+
+
+def sesije(popis, args):
+    """
+    Izvodi sesije [(tok, broj)] jednu za drugom u ovom procesu; vraća
+    [(tok, mjerenja, greška ili None, sekundi)]. Proces dobiva sve svoje
+    sesije odjednom jer AppTest izvršava aplikaciju kao __main__, pa se
+    sljedeći zadaci iz ProcessPoolExecutora više ne bi mogli raspakirati.
+    """
+    rezultati = []
+    for tok, broj in popis:
+        pocetak = time.perf_counter()
+        s = Sesija(tok, broj, args.timeout)
+        greska = None
+        try:
+            s.rerun("prvo učitavanje")
+            TOKOVI[tok](s, args)
+        except Exception as e:
+            greska = f"sesija {broj} ({tok}): {e}"
+        rezultati.append((tok, s.mjerenja, greska, time.perf_counter() - pocetak))
+    return rezultati
+
+
+def sazetak(trajanja):
+    ms = sorted(t * 1e3 for t in trajanja)
+    centili = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else ms * 99
+    return {'reruna': len(ms), 'p50_ms': statistics.median(ms), 'p90_ms': centili[89], 'p99_ms': centili[98], 'max_ms': ms[-1], 'ukupno_s': sum(ms) / 1e3}
+
+
+def ispisi(naslov, skupine):
+    print(f"\n{naslov:46s} {'reruna':>7s} {'p50 ms':>9s} {'p90 ms':>9s} {'p99 ms':>9s} {'max ms':>9s} {'ukupno s':>9s}")
+    for ime, r in sorted(skupine.items(), key=lambda s: -s[1]['ukupno_s']):
+        print(f"{ime:46s} {r['reruna']:7d} {r['p50_ms']:9.1f} {r['p90_ms']:9.1f} {r['p99_ms']:9.1f} {r['max_ms']:9.1f} {r['ukupno_s']:9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sesija", type=int, default=6, help="broj simuliranih sesija (tokovi se izmjenjuju)")
+    parser.add_argument("--procesa", type=int, default=os.cpu_count() or 1, help="istodobnih procesa")
+    parser.add_argument("--tok", action="append", choices=TOKOVI, help="tok rada (može više puta; zadano svi)")
+    parser.add_argument("--clanaka", type=int, default=200, help="članaka u personaliziranom ugovoru")
+    parser.add_argument("--odlomaka", type=int, default=12, help="odlomaka činjeničnih navoda u tužbi")
+    parser.add_argument("--ovrha", type=int, default=200, help="redova u CSV-u skupne ovrhe")
+    parser.add_argument("--timeout", type=float, default=120, help="najdulje trajanje jednog reruna (s)")
+    parser.add_argument("--json", help="JSON datoteka za razdiobe po modulu i koraku")
+    args = parser.parse_args()
+    tokovi = args.tok or list(TOKOVI)
+
+    with tempfile.TemporaryDirectory() as mapa:
+        for varijabla, ime in (("PRAVNI_ALAT_BAZA", "baza.sqlite3"), ("PRAVNI_ALAT_ARHIVA", "arhiva"), ("PRAVNI_ALAT_ZADACI", "zadaci")):
+            os.environ.setdefault(varijabla, os.path.join(mapa, ime))
+        mjerenja, greske, trajanja_sesija = [], [], defaultdict(list)
+        pocetak = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.procesa) as izvrsitelj:
+            popis = [(tokovi[i % len(tokovi)], i) for i in range(args.sesija)]
+            buduci = [izvrsitelj.submit(sesije, popis[p::args.procesa], args) for p in range(min(args.procesa, args.sesija))]
+            for gotov in as_completed(buduci):
+                for tok, m, greska, trajanje in gotov.result():
+                    mjerenja.extend(m)
+                    trajanja_sesija[tok].append(trajanje)
+                    if greska:
+                        greske.append(greska)
+                        print(f"GREŠKA {greska}", file=sys.stderr)
+        ukupno = time.perf_counter() - pocetak
+
+    po_koraku, po_modulu = defaultdict(list), defaultdict(list)
+    for tok, modul, korak, trajanje in mjerenja:
+        po_koraku[f"{modul} / {korak}"].append(trajanje)
+        po_modulu[modul].append(trajanje)
+    po_koraku = {ime: sazetak(t) for ime, t in po_koraku.items()}
+    po_modulu = {ime: sazetak(t) for ime, t in po_modulu.items()}
+
+    print(f"Sesija: {args.sesija} ({', '.join(f'{t} {len(trajanja_sesija[t])}' for t in tokovi)}) u {args.procesa} procesa, "
+          f"{len(mjerenja):,} reruna za {ukupno:.1f} s ({len(mjerenja) / ukupno:.1f} reruna/s), grešaka {len(greske)}")
+    for tok in tokovi:
+        if trajanja_sesija[tok]:
+            print(f"  {tok:8s} sesija traje {statistics.median(trajanja_sesija[tok]):.1f} s (medijan)")
+    ispisi("modul", po_modulu)
+    ispisi("modul / korak", po_koraku)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({'postavke': vars(args) | {'tok': tokovi}, 'ukupno_s': ukupno, 'greske': greske, 'po_modulu': po_modulu, 'po_koraku': po_koraku},
+                      f, ensure_ascii=False, indent=1)
+    sys.exit(1 if greske else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Mjerenje skupne izrade prijedloga za ovrhu (pravni_alat.skupno).
+
+Generira sintetičku CSV datoteku sa zadanim brojem redova, provodi je kroz
+skupna_ovrha i ispisuje redove u sekundi i vršni RSS procesa.
+
+    python benchmarks/bench_skupna_ovrha.py --redova 50000 [--radnika 8] [--oblik doc]
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat.skupno import STUPCI_OVRHE, citaj_redove, skupna_ovrha, vrsni_rss_mb
+
+
+def zapisi_csv(putanja, redova, seed=1):
+    rnd = random.Random(seed)
+    with open(putanja, "w", encoding="utf-8", newline="") as f:
+        pisac = csv.writer(f, delimiter=";")
+        pisac.writerow(STUPCI_OVRHE)
+        for i in range(redova):
+            dospijece = date(2024, 1, 1) + timedelta(days=rnd.randrange(600))
+            pisac.writerow([
+                "Ivan Horvat, Zagreb",
+                "Vjerovnik d.o.o.", "12345678901", "Ilica 1, Zagreb",
+                f"Dužnik {i}", f"{rnd.randrange(10**10, 10**11)}", f"Ulica {i}, Split",
+                f"Račun br. {i}-2024", (dospijece - timedelta(days=15)).strftime("%d.%m.%Y."),
+                f"{rnd.uniform(50, 50000):.2f}".replace(".", ","), dospijece.strftime("%d.%m.%Y."),
+                "100,00", "40,00", "da",
+            ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redova", type=int, default=50000)
+    parser.add_argument("--radnika", type=int, default=1, help="broj procesa za generiranje (pravni_alat.renderiranje)")
+    parser.add_argument("--oblik", choices=["docx", "doc"], default="docx")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as mapa:
+        ulaz = os.path.join(mapa, "ovrhe.csv")
+        izlaz = os.path.join(mapa, "ovrhe.zip")
+        zapisi_csv(ulaz, args.redova)
+        rss_prije = vrsni_rss_mb()
+        with open(ulaz, "rb") as f:
+            izvjestaj = skupna_ovrha(citaj_redove(f, ulaz), izlaz, radnika=args.radnika, oblik=args.oblik)
+        print(f"Redova:           {izvjestaj['redova']} (grešaka: {izvjestaj['gresaka']})")
+        print(f"Trajanje:         {izvjestaj['trajanje_s']:.2f} s")
+        print(f"Redova u sekundi: {izvjestaj['redova_u_sekundi']:.0f}")
+        print(f"Ulaz / ZIP:       {os.path.getsize(ulaz) / 2**20:.1f} MB / {os.path.getsize(izlaz) / 2**20:.1f} MB")
+        if izvjestaj['vrsni_rss_mb'] is not None:
+            print(f"Vršni RSS:        {izvjestaj['vrsni_rss_mb']:.1f} MB (prije obrade {rss_prije:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Imenik stranaka (pravni_alat.stranke): uvoz, pretraga po početku naziva i
+OIB-a te vektorizirana provjera OIB-a.
+
+Puni privremenu bazu sa zadanim brojem sintetičkih stranaka i mjeri
+latenciju pretrage (medijan i 99. percentil) kakvu radi obrazac pri unosu.
+
+    python benchmarks/bench_stranke.py --stranaka 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat.stranke import RegistarStranaka, provjeri_oib, provjeri_oibe
+
+IMENA = ["Ivan", "Ana", "Marko", "Petra", "Željko", "Đurđa", "Luka", "Iva", "Šime", "Čedomir"]
+PREZIMENA = ["Horvat", "Kovačević", "Babić", "Marić", "Jurić", "Novak", "Knežević", "Vuković", "Đurđević", "Šarić"]
+
+
+def oib(rnd):
+    prvih10 = f"{rnd.randrange(10**9, 10**10)}"
+    ostatak = 10
+    for z in prvih10:
+        ostatak = (ostatak + int(z)) % 10 or 10
+        ostatak = ostatak * 2 % 11
+    return prvih10 + str((11 - ostatak) % 10)
+
+
+def stranke(broj, seed=1):
+    rnd = random.Random(seed)
+    for i in range(broj):
+        yield {'tip': "Fizička", 'naziv': f"{rnd.choice(PREZIMENA)} {rnd.choice(IMENA)} {i}", 'oib': oib(rnd), 'adresa': f"Ulica {i}, Zagreb"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stranaka", type=int, default=1_000_000)
+    parser.add_argument("--upita", type=int, default=2000)
+    args = parser.parse_args()
+
+    popis = list(stranke(args.stranaka))
+    oibi = [s['oib'] for s in popis]
+    pocetak = time.perf_counter()
+    skalarno = sum(provjeri_oib(o) for o in oibi)
+    t_skalarno = time.perf_counter() - pocetak
+    pocetak = time.perf_counter()
+    vektorski = int(provjeri_oibe(oibi).sum())
+    t_vektorski = time.perf_counter() - pocetak
+    assert skalarno == vektorski == len(oibi)
+    print(f"Provjera OIB-a:  petlja {t_skalarno:.2f} s, vektorizirano {t_vektorski:.2f} s ({len(oibi)} OIB-a)")
+
+    with tempfile.TemporaryDirectory() as mapa:
+        registar = RegistarStranaka(os.path.join(mapa, "stranke.sqlite3"))
+        pocetak = time.perf_counter()
+        registar.uvezi(popis)
+        print(f"Uvoz:            {time.perf_counter() - pocetak:.2f} s ({len(registar)} stranaka)")
+
+        rnd = random.Random(2)
+        upiti = [rnd.choice(PREZIMENA)[:rnd.randrange(2, 6)].lower() if i % 2 else rnd.choice(oibi)[:6] for i in range(args.upita)]
+        trajanja = []
+        for upit in upiti:
+            pocetak = time.perf_counter()
+            registar.trazi(upit)
+            trajanja.append((time.perf_counter() - pocetak) * 1000)
+        trajanja.sort()
+        print(f"Pretraga:        medijan {statistics.median(trajanja):.3f} ms, p99 {trajanja[int(len(trajanja) * 0.99)]:.3f} ms")
+        registar.zatvori()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Tarifa troškova (pravni_alat.tarifa): jedan dokument (bisect) naspram
+cijelog portfelja tražbina u jednom pozivu (NumPy searchsorted).
+
+Provjerava i da oba puta daju iste iznose do centa.
+
+    python benchmarks/bench_tarifa.py --trazbina 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat.tarifa import TARIFA, obracunaj_troskove, troskovnik
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trazbina", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rnd = np.random.default_rng(1)
+    vpsovi = np.round(rnd.lognormal(7, 1.5, args.trazbina), 2)
+    vrste = rnd.choice(list(TARIFA), args.trazbina)
+
+    pocetak = time.perf_counter()
+    pojedinacno = [troskovnik(vrsta, vps) for vrsta, vps in zip(vrste.tolist(), vpsovi.tolist())]
+    t_petlja = time.perf_counter() - pocetak
+    pocetak = time.perf_counter()
+    portfelj = obracunaj_troskove(vrste, vpsovi)
+    t_portfelj = time.perf_counter() - pocetak
+
+    for kljuc in ("stavka", "materijalni", "pdv", "pristojba"):
+        assert np.array_equal(np.array([t[kljuc] for t in pojedinacno]), getattr(portfelj, kljuc)), kljuc
+    print(f"Pojedinačno:     {t_petlja:.2f} s ({args.trazbina / t_petlja:,.0f} tražbina/s)")
+    print(f"Portfelj:        {t_portfelj:.3f} s ({args.trazbina / t_portfelj:,.0f} tražbina/s), ukupno {portfelj.ukupno.sum():,.2f} EUR")
+
+
+if __name__ == "__main__":
+    main()
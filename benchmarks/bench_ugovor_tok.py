@@ -0,0 +1,59 @@
+"""
+Vršna memorija personaliziranog ugovora: cijeli string + pripremi_za_word
+naspram zapisa dio po dio (generiraj_prilagodeni_ugovor_dijelovi) u datoteku.
+
+    python benchmarks/bench_ugovor_tok.py
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pravni_alat.dokumenti import (
+    generiraj_prilagodeni_ugovor, generiraj_prilagodeni_ugovor_dijelovi, pripremi_za_word, pripremi_za_word_dijelovi,
+    zapisi_dijelove,
+)
+
+S1 = {'uloga': "Naručitelj", 'tekst': "<b>A d.o.o.</b>"}
+S2 = {'uloga': "Izvođač", 'tekst': "<b>B d.o.o.</b>"}
+
+
+def struktura(clanaka, po_dijelu=50):
+    tekst = "Ugovorne strane suglasno utvrđuju da se ovaj članak primjenjuje na sve obveze.\n" * 4
+    return [{'naslov': f"Dio {i // po_dijelu + 1}", 'clanci': [tekst] * min(po_dijelu, clanaka - i)} for i in range(0, clanaka, po_dijelu)]
+
+
+def cijeli(argumenti, putanja):
+    with open(putanja, "wb") as f:
+        f.write(pripremi_za_word(generiraj_prilagodeni_ugovor(*argumenti)).encode("utf-8"))
+
+
+def tok(argumenti, putanja):
+    with open(putanja, "wb") as f:
+        zapisi_dijelove(pripremi_za_word_dijelovi(generiraj_prilagodeni_ugovor_dijelovi(*argumenti)), f)
+
+
+def vrsna_memorija_mb(fn, argumenti, putanja):
+    tracemalloc.start()
+    fn(argumenti, putanja)
+    _, vrh = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return vrh / 2**20
+
+
+def main():
+    with tempfile.TemporaryDirectory() as mapa:
+        putanja = os.path.join(mapa, "ugovor.doc")
+        print(f"{'članaka':>8s} {'datoteka MB':>12s} {'cijeli MB':>10s} {'tok MB':>8s}")
+        for clanaka in (100, 1000, 10000, 50000):
+            argumenti = ("Ugovor o suradnji", "Zagreb", date(2024, 5, 5), None, S1, S2, "2024-1", struktura(clanaka))
+            staro = vrsna_memorija_mb(cijeli, argumenti, putanja)
+            novo = vrsna_memorija_mb(tok, argumenti, putanja)
+            print(f"{clanaka:8d} {os.path.getsize(putanja) / 2**20:12.1f} {staro:10.2f} {novo:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
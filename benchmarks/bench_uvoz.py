@@ -0,0 +1,66 @@
+"""
+Vrijeme hladnog uvoza jezgre (pravni_alat) i provjera da ne povlači Streamlit.
+
+Svaki modul uvozi se u novom procesu (python -X importtime) više puta i
+uzima se medijan. Skripta završava s kodom 1 ako neki modul prekorači
+budžet ili uveze zabranjeni paket, pa se može pokretati prije isporuke.
+
+    python benchmarks/bench_uvoz.py [--ponavljanja 7]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+KORIJEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# modul: (budžet u ms, paketi koje uvoz ne smije povući)
+BUDZET = {
+    'pravni_alat': (5, ['streamlit', 'numpy']),
+    'pravni_alat.dokumenti': (30, ['streamlit', 'numpy']),
+    'pravni_alat.renderiranje': (80, ['streamlit', 'numpy']),
+    'pravni_alat.skupno': (100, ['streamlit', 'numpy']),
+    'pravni_alat.stranke': (30, ['streamlit', 'numpy']),
+    'pravni_alat.izvodi': (100, ['streamlit', 'numpy']),
+    'pravni_alat.klauzule': (30, ['streamlit', 'numpy']),
+    'pravni_alat.tarifa': (10, ['streamlit', 'numpy']),
+    'pravni_alat.arhiva': (30, ['streamlit', 'numpy']),
+    'pravni_alat.zadaci': (30, ['streamlit', 'numpy']),
+    'pravni_alat.mjerenje': (10, ['streamlit', 'numpy']),
+    'pravni_alat.nacrti': (30, ['streamlit', 'numpy']),
+    'pravni_alat.kamate': (300, ['streamlit']),
+    'pravni_alat.rokovi': (300, ['streamlit']),
+}
+
+
+def izmjeri(modul, zabranjeni):
+    provjera = f"import sys, {modul}; print(','.join(m for m in {zabranjeni!r} if m in sys.modules))"
+    izlaz = subprocess.run([sys.executable, "-X", "importtime", "-c", provjera], cwd=KORIJEN,
+                           capture_output=True, text=True, check=True)
+    for redak in izlaz.stderr.splitlines():
+        dijelovi = [d.strip() for d in redak.split("|")]
+        if len(dijelovi) == 3 and dijelovi[2] == modul:
+            return int(dijelovi[1]) / 1000, izlaz.stdout.strip()
+    raise RuntimeError(f"Nema mjerenja za {modul}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ponavljanja", type=int, default=7)
+    args = parser.parse_args()
+
+    u_redu = True
+    for modul, (budzet_ms, zabranjeni) in BUDZET.items():
+        mjerenja = [izmjeri(modul, zabranjeni) for _ in range(args.ponavljanja)]
+        medijan = statistics.median(ms for ms, _ in mjerenja)
+        povuceni = mjerenja[-1][1]
+        status = "OK" if medijan <= budzet_ms and not povuceni else "PREKORAČENO"
+        u_redu &= status == "OK"
+        print(f"{modul:28s} {medijan:7.1f} ms (budžet {budzet_ms} ms)  {status}"
+              + (f"  uvozi: {povuceni}" if povuceni else ""))
+    sys.exit(0 if u_redu else 1)
+
+
+if __name__ == "__main__":
+    main()
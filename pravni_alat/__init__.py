@@ -0,0 +1,49 @@
+"""
+Pravni alat - jezgra (obračuni i generatori) odvojena od Streamlit sučelja.
+
+Paket nikad ne uvozi Streamlit. Podmoduli se učitavaju tek kad se zatraži
+neko njihovo ime (pravni_alat.generiraj_tuzbu_pro, pravni_alat.izracunaj_kamate...),
+pa je `import pravni_alat` gotovo besplatan i radni procesi brzo kreću.
+"""
+import importlib
+
+_IZVOZI = {
+    'arhiva': ['ZADANA_ARHIVA', 'Arhiva'],
+    'docx': ['DOCX_MIME', 'docx_iz_html', 'zapisi_docx'],
+    'dokumenti': [
+        'css_stilovi', 'pripremi_za_word', 'pripremi_za_word_dijelovi', 'zapisi_dijelove', 'escape_html', 'format_text',
+        'formatiraj_troskovnik', 'formatiraj_specifikaciju',
+        'generiraj_prilagodeni_ugovor', 'generiraj_prilagodeni_ugovor_dijelovi', 'generiraj_tuzbu_pro',
+        'generiraj_ovrhu_pro', 'generiraj_zalbu_pro', 'generiraj_ugovor_standard', 'generiraj_ugovor_o_radu', 'generiraj_otkaz', 'generiraj_tabularnu_doc',
+        'generiraj_zk_prijedlog', 'generiraj_brisovnu_tuzbu',
+    ],
+    'izvodi': ['citaj_izvode', 'citaj_racune', 'uskladi', 'redovi_za_ovrhu', 'obracunaj_knjige', 'uvezi'],
+    'kamate': ['ZADANA_TABLICA', 'TablicaStopa', 'izracunaj_kamate', 'izracunaj_kamatu'],
+    'klauzule': ['KnjiznicaKlauzula', 'pojmovi'],
+    'knjiga': ['obracunaj_knjigu'],
+    'memoizacija': ['PREDMEMORIJA_DOKUMENATA'],
+    'mjerenje': ['raspon', 'mjeri', 'rerun', 'prometheus_tekst', 'pokreni_posluzitelj'],
+    'nacrti': ['Nacrti', 'polja_strukture', 'struktura_iz_polja'],
+    'paket': ['zapisi_paket', 'zapisi_dokument'],
+    'predmemorija': ['LRUPredmemorija', 'memoiziraj'],
+    'renderiranje': ['renderiraj'],
+    'rokovi': ['ZADANI_KALENDAR', 'Kalendar', 'blagdani', 'izracunaj_rok', 'izracunaj_rokove'],
+    'skupno': ['skupna_ovrha', 'skupna_ovrha_iz_datoteke', 'citaj_redove'],
+    'stranke': ['RegistarStranaka', 'provjeri_oib', 'provjeri_oibe', 'svedi_naziv'],
+    'tarifa': ['TARIFA', 'Ljestvica', 'troskovnik', 'obracunaj_troskove'],
+    'zadaci': ['RedZadataka'],
+}
+_MODUL_IMENA = {ime: modul for modul, imena in _IZVOZI.items() for ime in imena}
+
+__all__ = sorted(_MODUL_IMENA)
+
+
+def __getattr__(ime):
+    modul = _MODUL_IMENA.get(ime)
+    if modul is None:
+        raise AttributeError(f"module 'pravni_alat' has no attribute '{ime}'")
+    return getattr(importlib.import_module(f"pravni_alat.{modul}"), ime)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,407 @@
+"""
+Arhiva generiranih dokumenata i ulaza iz kojih su nastali.
+
+Arhivira se HTML kakav vraćaju generatori (bez omotača iz pripremi_za_word),
+adresirano sažetkom (BLAKE2b): dokument i ulazi zapisuju se samo ako isti
+već ne postoje, pa ponovljeno generiranje istog dokumenta ne troši mjesto.
+Dokument se sažima zlibom uz rječnik složen od statičnih dijelova
+predložaka, pa i mali dokumenti zauzimaju tek onoliko koliko se razlikuju
+od predloška.
+
+Dijelovi se samo dopisuju na kraj segmentnih datoteka (svaki proces ima
+svoj aktivni segment), a položaj dijela i popis dokumenata vode se u SQLite
+indeksu u istoj mapi.
+
+Zapis u segmentu: oznaka, sažetak (32 B), način sažimanja, duljina, podaci.
+
+Pri spremanju se iz ulaza izvlače ključevi pretraživanja (OIB-i iz blokova
+stranaka, poslovni broj presude, Z-broj uknjižbe, k.o. i čestica) u tablicu
+poredanu po (polje, vrijednost, dokument), pa je pretraga jedno traženje u
+B-stablu indeksa bez prolaska kroz dokumente.
+"""
+import hashlib
+import json
+import lzma
+import os
+import re
+import struct
+import threading
+import time
+import types
+import zlib
+from datetime import date, datetime
+
+from pravni_alat.baza import otvori
+from pravni_alat.stranke import svedi_naziv
+
+ZADANA_ARHIVA = os.environ.get("PRAVNI_ALAT_ARHIVA", "pravni_alat_arhiva")
+
+# Segment se zatvara i otvara novi kad prijeđe ovu veličinu
+MAKS_SEGMENTA = 64 * 1024 * 1024
+
+_SHEMA = """
+CREATE TABLE IF NOT EXISTS sadrzaj (
+    kljuc BLOB PRIMARY KEY,
+    segment TEXT NOT NULL,
+    pomak INTEGER NOT NULL,
+    duljina INTEGER NOT NULL,
+    nacin INTEGER NOT NULL,
+    rjecnik BLOB,
+    izvorno INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS dokumenti (
+    id INTEGER PRIMARY KEY,
+    otisak BLOB NOT NULL UNIQUE,
+    vrsta TEXT NOT NULL,
+    ime TEXT,
+    stvoreno TEXT NOT NULL,
+    dijelovi BLOB NOT NULL,
+    ulazi BLOB
+);
+CREATE TABLE IF NOT EXISTS kljucevi (
+    polje TEXT NOT NULL,
+    vrijednost TEXT NOT NULL,
+    dokument INTEGER NOT NULL,
+    PRIMARY KEY (polje, vrijednost, dokument)
+) WITHOUT ROWID;
+"""
+# Povećava se kad se promijeni izvlačenje ključeva; starija arhiva se tada ponovno indeksira
+_VERZIJA_KLJUCEVA = 1
+
+_ZAPIS = struct.Struct("<4s32sBI")
+_OZNAKA = b"PAD1"
+ZLIB, LZMA, ZLIB_RJECNIK = 0, 1, 2
+_DULJINA_KLJUCA = 32
+_STUPCI = ("id", "vrsta", "ime", "stvoreno")
+
+
+def kljuc_sadrzaja(podaci):
+    return hashlib.blake2b(podaci, digest_size=_DULJINA_KLJUCA).digest()
+
+
+def _u_json(vrijednost):
+    # Datumi se vraćaju kao datumi (ponovno generiranje), NumPy brojevi kao brojevi
+    if isinstance(vrijednost, datetime):
+        return {"$datum_vrijeme": vrijednost.isoformat()}
+    if isinstance(vrijednost, date):
+        return {"$datum": vrijednost.isoformat()}
+    if hasattr(vrijednost, "item"):
+        return vrijednost.item()
+    return str(vrijednost)
+
+
+def _iz_json(objekt):
+    if len(objekt) == 1:
+        if "$datum" in objekt:
+            return date.fromisoformat(objekt["$datum"])
+        if "$datum_vrijeme" in objekt:
+            return datetime.fromisoformat(objekt["$datum_vrijeme"])
+    return objekt
+
+
+def ulazi_u_bajtove(ulazi):
+    """Kanonski JSON (poredani ključevi), pa isti ulazi daju isti sažetak."""
+    return json.dumps(ulazi, sort_keys=True, ensure_ascii=False, default=_u_json, separators=(",", ":")).encode("utf-8")
+
+
+_OIB = re.compile(r"OIB\W*(\d{11})(?!\d)", re.IGNORECASE)
+
+
+def svedi_oznaku(oznaka):
+    """Poslovni broj ili Z-broj u obliku za indeks: "p 123 / 2024", "P123/2024" i "P – 123/2024" -> "P-123/2024"."""
+    oznaka = re.sub(r"\s*/\s*", "/", str(oznaka or "").replace("\u2013", "-").upper().strip(" .-"))
+    return re.sub(r"(?<=[^\W\d_])(?=\d)", "-", re.sub(r"[\s-]+", "-", oznaka))
+
+
+def kljuc_nekretnine(ko, cestica=""):
+    """"k.o.|čestica" za indeks; bez čestice je to prefiks svih čestica u k.o."""
+    return f"{svedi_naziv(ko)}|{svedi_oznaku(cestica)}"
+
+
+def _tekstovi(vrijednost):
+    if isinstance(vrijednost, str):
+        yield vrijednost
+    elif isinstance(vrijednost, dict):
+        for v in vrijednost.values():
+            yield from _tekstovi(v)
+    elif isinstance(vrijednost, (list, tuple)):
+        for v in vrijednost:
+            yield from _tekstovi(v)
+
+
+def _nekretnina(nekretnina, cestica=None):
+    ko, cestica = (nekretnina.get('ko'), nekretnina.get('cestica')) if isinstance(nekretnina, dict) else (nekretnina, cestica)
+    return [('nekretnina', kljuc_nekretnine(ko, cestica))] if svedi_naziv(ko) and svedi_oznaku(cestica) else []
+
+
+# vrsta dokumenta: argumenti generatora -> [(polje, vrijednost)]
+_POLJA_PO_VRSTI = {
+    'zalba': lambda a: [('poslovni_broj', svedi_oznaku(a[3].get('broj')))],
+    'zk_prijedlog': lambda a: _nekretnina(a[3]),
+    'brisovna_tuzba': lambda a: _nekretnina(a[4]) + [('z_broj', svedi_oznaku(a[5].get('z_broj')))],
+    'tabularna': lambda a: _nekretnina(a[2], a[3]),
+}
+
+
+def kljucevi_pretrage(vrsta, ulazi):
+    """Ključevi pretraživanja iz ulaza dokumenta: OIB-i iz svih tekstova i polja specifična za vrstu."""
+    kljucevi = {('oib', oib) for tekst in _tekstovi(ulazi) for oib in _OIB.findall(tekst)}
+    argumenti = ulazi.get('argumenti') if isinstance(ulazi, dict) else None
+    if vrsta in _POLJA_PO_VRSTI and argumenti:
+        try:
+            kljucevi.update((polje, v) for polje, v in _POLJA_PO_VRSTI[vrsta](argumenti) if v)
+        except (IndexError, KeyError, AttributeError, TypeError):
+            pass  # ulazi drugačijeg oblika (npr. iz starije verzije generatora) daju samo OIB-e
+    return sorted(kljucevi)
+
+
+def _rjecnik_predlozaka():
+    # Statični HTML generatora (konstante njihovih f-stringova); zlib koristi najviše zadnjih 32 KB
+    from pravni_alat import dokumenti
+
+    def konstante(kod):
+        for c in kod.co_consts:
+            if isinstance(c, types.CodeType):
+                yield from konstante(c)  # npr. generator redaka specifikacije
+            elif isinstance(c, str) and "<" in c:
+                yield c
+
+    generatori = [v for ime, v in sorted(vars(dokumenti).items())
+                  if ime.startswith(("generiraj_", "formatiraj_", "obracun_", "_tekst_clanka")) and callable(v)]
+    return "".join(c for g in generatori for c in konstante(g.__code__)).encode("utf-8")[-32768:]
+
+
+class Arhiva:
+    """Arhiva u mapi `putanja`: segmentne datoteke i SQLite indeks."""
+
+    def __init__(self, putanja=None, nacin="zlib"):
+        if nacin not in ("zlib", "lzma"):
+            raise ValueError(f"Nepoznat način sažimanja: {nacin}")
+        self.putanja = putanja or ZADANA_ARHIVA
+        os.makedirs(os.path.join(self.putanja, "segmenti"), exist_ok=True)
+        self._veza = otvori(os.path.join(self.putanja, "indeks.sqlite3"))
+        self._veza.executescript(_SHEMA)
+        self._brava = threading.Lock()
+        self.nacin = nacin
+        self._segment = None
+        self._poznati = set()  # ključ rječnika (bez upita u indeks za svaki dokument)
+        self._rjecnici = {}  # ključ rječnika -> bajtovi
+        self._rjecnik = None
+        if self._veza.execute("PRAGMA user_version").fetchone()[0] < _VERZIJA_KLJUCEVA:
+            self.reindeksiraj()
+
+    def _pripremi(self):
+        # Rječnik se zapisuje jednom, pri prvom spremanju
+        if self._rjecnik is None:
+            rjecnik = _rjecnik_predlozaka()
+            self._rjecnik = self._spremi_dio(rjecnik, ZLIB)
+            self._rjecnici[self._rjecnik] = rjecnik
+            self._poznati = {self._rjecnik}
+
+    def _aktivni_segment(self):
+        if self._segment is None or self._segment.tell() >= MAKS_SEGMENTA:
+            if self._segment is not None:
+                self._segment.close()
+            ime = f"{time.time_ns()}-{os.getpid()}.seg"
+            self._segment = open(os.path.join(self.putanja, "segmenti", ime), "ab")
+        return self._segment
+
+    def _sazimac(self, nacin, rjecnik=None):
+        if nacin == LZMA:
+            return lzma.LZMACompressor(preset=6)
+        if nacin == ZLIB_RJECNIK:
+            return zlib.compressobj(9, zdict=self._rjecnici[rjecnik])
+        return zlib.compressobj(9)
+
+    def _nacin_dokumenta(self):
+        return (LZMA, None) if self.nacin == "lzma" else (ZLIB_RJECNIK, self._rjecnik)
+
+    def _postoji(self, kljuc):
+        return kljuc in self._poznati or self._veza.execute("SELECT 1 FROM sadrzaj WHERE kljuc = ?", (kljuc,)).fetchone() is not None
+
+    def _spremi_dio(self, podaci, nacin, rjecnik=None):
+        kljuc = kljuc_sadrzaja(podaci)
+        if self._postoji(kljuc):
+            return kljuc
+        sazimac = self._sazimac(nacin, rjecnik)
+        return self._zapisi_dio(kljuc, sazimac.compress(podaci) + sazimac.flush(), nacin, rjecnik, len(podaci))
+
+    def _zapisi_dio(self, kljuc, sazeto, nacin, rjecnik, izvorno):
+        segment = self._aktivni_segment()
+        pomak = segment.tell()
+        # Jedan write po zapisu, zatim flush: indeks nikad ne pokazuje na nezapisane bajtove
+        segment.write(_ZAPIS.pack(_OZNAKA, kljuc, nacin, len(sazeto)) + sazeto)
+        segment.flush()
+        self._veza.execute(
+            "INSERT OR IGNORE INTO sadrzaj (kljuc, segment, pomak, duljina, nacin, rjecnik, izvorno) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (kljuc, os.path.basename(segment.name), pomak + _ZAPIS.size, len(sazeto), nacin, rjecnik, izvorno))
+        return kljuc
+
+    def _u_transakciji(self, posao):
+        with self._brava:
+            try:
+                with self._veza:
+                    self._pripremi()
+                    return posao()
+            except Exception:
+                # Transakcija je poništena pa se ne zna što je od ovog poziva ostalo u indeksu
+                self._poznati.clear()
+                self._rjecnik = None
+                raise
+
+    def spremi(self, vrsta, dokument, ulazi=None, ime=None):
+        """
+        Sprema dokument (HTML) i ulaze (JSON-serijalizabilni, datumi dopušteni).
+        Vraća id dokumenta; isti dokument s istim ulazima vraća postojeći id.
+        """
+        podaci = dokument.encode("utf-8")
+        return self._u_transakciji(lambda: self._upisi_dokument(vrsta, self._spremi_dio(podaci, *self._nacin_dokumenta()), ulazi, ime))
+
+    def prati(self, vrsta, dijelovi, ulazi=None, ime=None):
+        """
+        Propušta dijelove dokumenta (str) dalje, npr. u zapisi_docx, i usput
+        ih sažima, pa se dokument ne spaja u jedan string. Kad niz završi,
+        dokument se sprema kao sa spremi(); niz prekinut prije kraja ne sprema se.
+        """
+        # Rječnik mora biti u arhivi prije sažimanja prvog dijela (ključ mu ovisi samo o sadržaju)
+        self._u_transakciji(lambda: None)
+        nacin, rjecnik = self._nacin_dokumenta()
+        sazetak = hashlib.blake2b(digest_size=_DULJINA_KLJUCA)
+        sazimac = self._sazimac(nacin, rjecnik)
+        sazeto, izvorno = [], 0
+        for dio in dijelovi:
+            yield dio
+            podaci = dio.encode("utf-8")
+            sazetak.update(podaci)
+            sazeto.append(sazimac.compress(podaci))
+            izvorno += len(podaci)
+        sazeto.append(sazimac.flush())
+        kljuc = sazetak.digest()
+
+        def upisi():
+            if not self._postoji(kljuc):
+                self._zapisi_dio(kljuc, b"".join(sazeto), nacin, rjecnik, izvorno)
+            return self._upisi_dokument(vrsta, kljuc, ulazi, ime)
+        self._u_transakciji(upisi)
+
+    def _upisi_dokument(self, vrsta, kljuc_dokumenta, ulazi, ime):
+        # Stupac dijelovi je niz ključeva; dokumenti iz starijih verzija mogu biti rastavljeni na više dijelova
+        kljuc_ulaza = self._spremi_dio(ulazi_u_bajtove(ulazi), ZLIB) if ulazi is not None else None
+        otisak = kljuc_sadrzaja(vrsta.encode("utf-8") + b"\0" + kljuc_dokumenta + (kljuc_ulaza or b""))
+        novi = self._veza.execute(
+            "INSERT OR IGNORE INTO dokumenti (otisak, vrsta, ime, stvoreno, dijelovi, ulazi) VALUES (?, ?, ?, ?, ?, ?)",
+            (otisak, vrsta, ime, datetime.now().isoformat(timespec="seconds"), kljuc_dokumenta, kljuc_ulaza)).rowcount
+        id_ = self._veza.execute("SELECT id FROM dokumenti WHERE otisak = ?", (otisak,)).fetchone()[0]
+        if novi and ulazi is not None:
+            self._indeksiraj(id_, vrsta, ulazi)
+        return id_
+
+    def _indeksiraj(self, id_, vrsta, ulazi):
+        self._veza.executemany("INSERT OR IGNORE INTO kljucevi (polje, vrijednost, dokument) VALUES (?, ?, ?)",
+                               [(polje, vrijednost, id_) for polje, vrijednost in kljucevi_pretrage(vrsta, ulazi)])
+
+    def reindeksiraj(self):
+        """Ponovno izvlači ključeve pretraživanja iz ulaza svih dokumenata (arhiva iz starije verzije)."""
+        with self._brava, self._veza:
+            self._veza.execute("DELETE FROM kljucevi")
+            for id_, vrsta, kljuc_ulaza in self._veza.execute("SELECT id, vrsta, ulazi FROM dokumenti WHERE ulazi IS NOT NULL").fetchall():
+                self._indeksiraj(id_, vrsta, json.loads(self._procitaj(kljuc_ulaza), object_hook=_iz_json))
+            self._veza.execute(f"PRAGMA user_version = {_VERZIJA_KLJUCEVA}")
+
+    def _procitaj(self, kljuc):
+        red = self._veza.execute("SELECT segment, pomak, duljina, nacin, rjecnik FROM sadrzaj WHERE kljuc = ?", (kljuc,)).fetchone()
+        if red is None:
+            raise KeyError(f"Dio {kljuc.hex()} nije u arhivi.")
+        segment, pomak, duljina, nacin, rjecnik = red
+        with open(os.path.join(self.putanja, "segmenti", segment), "rb") as f:
+            f.seek(pomak)
+            sazeto = f.read(duljina)
+        if nacin == LZMA:
+            podaci = lzma.decompress(sazeto)
+        elif nacin == ZLIB_RJECNIK:
+            if rjecnik not in self._rjecnici:
+                self._rjecnici[rjecnik] = self._procitaj(rjecnik)
+            rastavljac = zlib.decompressobj(zdict=self._rjecnici[rjecnik])
+            podaci = rastavljac.decompress(sazeto) + rastavljac.flush()
+        else:
+            podaci = zlib.decompress(sazeto)
+        if kljuc_sadrzaja(podaci) != kljuc:
+            raise ValueError(f"Dio {kljuc.hex()} je oštećen (sažetak se ne podudara).")
+        return podaci
+
+    def _red(self, id_):
+        red = self._veza.execute("SELECT dijelovi, ulazi FROM dokumenti WHERE id = ?", (id_,)).fetchone()
+        if red is None:
+            raise KeyError(f"Dokument {id_} nije u arhivi.")
+        return red
+
+    def dokument(self, id_):
+        """HTML dokumenta, složen iz dijelova."""
+        with self._brava:
+            dijelovi, _ = self._red(id_)
+            return b"".join(self._procitaj(dijelovi[i:i + _DULJINA_KLJUCA]) for i in range(0, len(dijelovi), _DULJINA_KLJUCA)).decode("utf-8")
+
+    def ulazi(self, id_):
+        """Ulazi s kojima je dokument generiran (datumi kao date), ili None."""
+        with self._brava:
+            _, kljuc_ulaza = self._red(id_)
+            return json.loads(self._procitaj(kljuc_ulaza), object_hook=_iz_json) if kljuc_ulaza else None
+
+    def popis(self, ograniceno=50, vrsta=None):
+        """Najnoviji dokumenti (id, vrsta, ime, stvoreno)."""
+        uvjet, parametri = ("WHERE vrsta = ?", (vrsta, ograniceno)) if vrsta else ("", (ograniceno,))
+        with self._brava:
+            redovi = self._veza.execute(f"SELECT {', '.join(_STUPCI)} FROM dokumenti {uvjet} ORDER BY id DESC LIMIT ?", parametri).fetchall()
+        return [dict(zip(_STUPCI, red)) for red in redovi]
+
+    def trazi(self, oib=None, poslovni_broj=None, z_broj=None, ko=None, cestica=None, ograniceno=50):
+        """
+        Najnoviji dokumenti koji zadovoljavaju sve zadane uvjete. Bez čestice
+        k.o. vraća dokumente za sve čestice u toj k.o.
+        """
+        uvjeti = [('oib', str(v).strip()) for v in [oib] if v] + [('poslovni_broj', svedi_oznaku(v)) for v in [poslovni_broj] if v]
+        uvjeti += [('z_broj', svedi_oznaku(v)) for v in [z_broj] if v]
+        if cestica and not ko:
+            raise ValueError("Za pretragu po čestici potrebna je i katastarska općina.")
+        upiti, parametri = [], []
+        for polje, vrijednost in uvjeti:
+            upiti.append("SELECT dokument FROM kljucevi WHERE polje = ? AND vrijednost = ?")
+            parametri += [polje, vrijednost]
+        if ko:
+            vrijednost = kljuc_nekretnine(ko, cestica)
+            if cestica:
+                upiti.append("SELECT dokument FROM kljucevi WHERE polje = 'nekretnina' AND vrijednost = ?")
+                parametri.append(vrijednost)
+            else:
+                # "|" + 1 = "}": raspon [k.o.|, k.o.}) obuhvaća sve čestice te k.o.
+                upiti.append("SELECT dokument FROM kljucevi WHERE polje = 'nekretnina' AND vrijednost >= ? AND vrijednost < ?")
+                parametri += [vrijednost, vrijednost[:-1] + "}"]
+        if not upiti:
+            return []
+        with self._brava:
+            ids = [r[0] for r in self._veza.execute(f"{' INTERSECT '.join(upiti)} ORDER BY 1 DESC LIMIT ?", parametri + [ograniceno])]
+            redovi = self._veza.execute(f"SELECT {', '.join(_STUPCI)} FROM dokumenti WHERE id IN ({', '.join('?' * len(ids))}) ORDER BY id DESC", ids).fetchall()
+        return [dict(zip(_STUPCI, red)) for red in redovi]
+
+    def statistika(self):
+        """Broj dokumenata i dijelova, izvorna veličina i zauzeće segmenata (bajtovi)."""
+        with self._brava:
+            dokumenata = self._veza.execute("SELECT COUNT(*) FROM dokumenti").fetchone()[0]
+            dijelova, sazeto, izvorno = self._veza.execute("SELECT COUNT(*), COALESCE(SUM(duljina), 0), COALESCE(SUM(izvorno), 0) FROM sadrzaj").fetchone()
+        mapa = os.path.join(self.putanja, "segmenti")
+        na_disku = sum(os.path.getsize(os.path.join(mapa, s)) for s in os.listdir(mapa))
+        return {'dokumenata': dokumenata, 'dijelova': dijelova, 'izvorno': izvorno, 'sazeto': sazeto, 'na_disku': na_disku}
+
+    def __len__(self):
+        with self._brava:
+            return self._veza.execute("SELECT COUNT(*) FROM dokumenti").fetchone()[0]
+
+    def __reduce__(self):
+        # U drugi proces (npr. zadatak u pozadini) prenosi se samo mapa; tamo arhiva ima svoju vezu i svoj segment
+        return Arhiva, (self.putanja, self.nacin)
+
+    def zatvori(self):
+        with self._brava:
+            if self._segment is not None:
+                self._segment.close()
+            self._veza.close()
@@ -0,0 +1,22 @@
+"""
+Zajednička lokalna SQLite baza (imenik stranaka i ostali trajni podaci).
+
+Putanja se zadaje varijablom okoline PRAVNI_ALAT_BAZA; zadano je datoteka
+pravni_alat.sqlite3 u radnoj mapi. Veza je jedna po objektu i dijele je
+Streamlit dretve, pa se pristup serijalizira bravom u pozivatelju.
+"""
+import os
+import sqlite3
+
+ZADANA_BAZA = os.environ.get("PRAVNI_ALAT_BAZA", "pravni_alat.sqlite3")
+
+
+def otvori(putanja=None):
+    """Otvara vezu (WAL, bez provjere dretve) i stvara mapu baze ako ne postoji."""
+    putanja = putanja or ZADANA_BAZA
+    if putanja != ":memory:" and os.path.dirname(putanja):
+        os.makedirs(os.path.dirname(putanja), exist_ok=True)
+    veza = sqlite3.connect(putanja, check_same_thread=False)
+    veza.execute("PRAGMA journal_mode=WAL")
+    veza.execute("PRAGMA synchronous=NORMAL")
+    return veza
@@ -0,0 +1,313 @@
+"""
+Pravi Word dokument (.docx, OOXML) iz HTML-a koji slažu generatori.
+
+Statični dijelovi paketa (vrste sadržaja, veze, stilovi, postavke) slože se
+i sažmu jednom, pri uvozu modula, u kostur ZIP arhive u memoriji. Za svaki
+dokument kostur se samo kopira i u njega se dopisuje word/document.xml, koji
+se piše u tok dio po dio dok se HTML raščlanjuje (tablica cijela, kad se
+zatvori, jer w:tblGrid mora prethoditi redovima).
+
+Pretvorba pokriva podskup HTML-a koji generatori koriste: div s klasama iz
+css_stilovi (header-doc, section-title, justified, doc-body, party-info,
+clausula, signature-block), b/i/span, br, table/tr/td i ol/li.
+"""
+import io
+import re
+import zipfile
+from html.parser import HTMLParser
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+_VRSTE_SADRZAJA = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"><Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/><Default Extension="xml" ContentType="application/xml"/><Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/><Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/><Override PartName="/word/settings.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/></Types>"""
+
+_VEZE_PAKETA = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/></Relationships>"""
+
+_VEZE_DOKUMENTA = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/><Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/settings" Target="settings.xml"/></Relationships>"""
+
+_POSTAVKE = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:settings xmlns:w="{_W}"><w:defaultTabStop w:val="708"/><w:characterSpacingControl w:val="doNotCompress"/><w:compat><w:compatSetting w:name="compatibilityMode" w:uri="http://schemas.microsoft.com/office/word" w:val="15"/></w:compat></w:settings>"""
+
+# Stilovi odgovaraju klasama iz css_stilovi (Times New Roman 12 pt, prored 1,15).
+_STILOVI = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles xmlns:w="{_W}"><w:docDefaults><w:rPrDefault><w:rPr><w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman" w:cs="Times New Roman" w:eastAsia="Times New Roman"/><w:sz w:val="24"/><w:szCs w:val="24"/><w:lang w:val="hr-HR"/></w:rPr></w:rPrDefault><w:pPrDefault><w:pPr><w:spacing w:after="0" w:line="276" w:lineRule="auto"/></w:pPr></w:pPrDefault></w:docDefaults>
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/></w:style>
+<w:style w:type="paragraph" w:styleId="Naslov"><w:name w:val="Naslov dokumenta"/><w:basedOn w:val="Normal"/><w:qFormat/><w:pPr><w:keepNext/><w:spacing w:before="200" w:after="400"/><w:jc w:val="center"/></w:pPr><w:rPr><w:b/><w:caps/><w:sz w:val="28"/><w:szCs w:val="28"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Odjeljak"><w:name w:val="Naslov odjeljka"/><w:basedOn w:val="Normal"/><w:qFormat/><w:pPr><w:keepNext/><w:spacing w:before="300" w:after="100"/></w:pPr><w:rPr><w:b/><w:caps/><w:sz w:val="22"/><w:szCs w:val="22"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Tekst"><w:name w:val="Tekst"/><w:basedOn w:val="Normal"/><w:qFormat/><w:pPr><w:jc w:val="both"/></w:pPr></w:style>
+<w:style w:type="paragraph" w:styleId="TekstTijela"><w:name w:val="Tekst tijela"/><w:basedOn w:val="Tekst"/><w:pPr><w:spacing w:after="200"/></w:pPr></w:style>
+<w:style w:type="paragraph" w:styleId="Stranka"><w:name w:val="Stranka"/><w:basedOn w:val="Normal"/><w:pPr><w:spacing w:after="300"/></w:pPr></w:style>
+<w:style w:type="paragraph" w:styleId="Klauzula"><w:name w:val="Klauzula"/><w:basedOn w:val="Tekst"/><w:pPr><w:pBdr><w:left w:val="single" w:sz="18" w:space="8" w:color="333333"/></w:pBdr><w:shd w:val="clear" w:color="auto" w:fill="F9F9F9"/><w:spacing w:before="200" w:after="200"/></w:pPr><w:rPr><w:b/><w:i/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Potpis"><w:name w:val="Potpis"/><w:basedOn w:val="Normal"/><w:pPr><w:keepLines/><w:spacing w:before="600"/><w:jc w:val="center"/></w:pPr></w:style>
+<w:style w:type="table" w:default="1" w:styleId="NormalnaTablica"><w:name w:val="Normal Table"/><w:tblPr><w:tblInd w:w="0" w:type="dxa"/><w:tblCellMar><w:top w:w="0" w:type="dxa"/><w:left w:w="108" w:type="dxa"/><w:bottom w:w="0" w:type="dxa"/><w:right w:w="108" w:type="dxa"/></w:tblCellMar></w:tblPr></w:style>
+</w:styles>"""
+
+_POCETAK_DOKUMENTA = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="{_W}"><w:body>""".encode("utf-8")
+
+# A4, margine 2,5 cm; širina teksta (dxa) je osnovica za širine stupaca tablica
+_SIRINA_TEKSTA = 11906 - 2 * 1418
+_KRAJ_DOKUMENTA = b"""<w:sectPr><w:pgSz w:w="11906" w:h="16838"/><w:pgMar w:top="1418" w:right="1418" w:bottom="1418" w:left="1418" w:header="709" w:footer="709" w:gutter="0"/></w:sectPr></w:body></w:document>"""
+
+
+_STATICNI_DIJELOVI = [
+    ("[Content_Types].xml", _VRSTE_SADRZAJA.encode("utf-8")),
+    ("_rels/.rels", _VEZE_PAKETA.encode("utf-8")),
+    ("word/_rels/document.xml.rels", _VEZE_DOKUMENTA.encode("utf-8")),
+    ("word/styles.xml", _STILOVI.encode("utf-8")),
+    ("word/settings.xml", _POSTAVKE.encode("utf-8")),
+]
+
+
+def _izgradi_kostur():
+    tok = io.BytesIO()
+    with zipfile.ZipFile(tok, "w", compression=zipfile.ZIP_DEFLATED) as paket:
+        for ime, sadrzaj in _STATICNI_DIJELOVI:
+            paket.writestr(ime, sadrzaj)
+    return tok.getvalue()
+
+
+_KOSTUR = _izgradi_kostur()
+
+_STIL_KLASE = {
+    'header-doc': "Naslov",
+    'section-title': "Odjeljak",
+    'justified': "Tekst",
+    'doc-body': "TekstTijela",
+    'party-info': "Stranka",
+    'clausula': "Klauzula",
+    'signature-block': "Potpis",
+}
+_PORAVNANJE = {'center': "center", 'right': "right", 'left': "left", 'justify': "both"}
+_BLOKOVI = {"div", "p", "table", "tr", "td", "th", "ol", "ul", "li"}
+
+_NEDOZVOLJENI_ZNAKOVI = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_RAZMACI = re.compile(r"\s+")
+
+
+def _xml(tekst):
+    return _NEDOZVOLJENI_ZNAKOVI.sub("", tekst).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _css(stil):
+    svojstva = {}
+    for deklaracija in (stil or "").split(";"):
+        ime, _, vrijednost = deklaracija.partition(":")
+        if vrijednost:
+            svojstva[ime.strip().lower()] = vrijednost.strip().lower()
+    return svojstva
+
+
+def _mreza(redovi):
+    # w:tblGrid: stupaca koliko ima najširi red (uz colspan), širine iz prvog takvog reda bez spajanja
+    stupaca = max((sum(raspon for _, raspon in red) for red in redovi), default=0)
+    sirine = next(([s for s, _ in red] for red in redovi if len(red) == stupaca), [None] * stupaca)
+    zadano = sum(s for s in sirine if s is not None)
+    ostatak = max(100 - zadano, 0) / max(sirine.count(None), 1)
+    stupci = "".join(f'<w:gridCol w:w="{round((ostatak if s is None else s) * _SIRINA_TEKSTA / 100)}"/>' for s in sirine)
+    return f"<w:tblGrid>{stupci}</w:tblGrid>"
+
+
+def _velicina(vrijednost):
+    # Word mjeri u polovicama točke; 1 px = 0,75 pt.
+    broj = re.match(r"[\d.]+", vrijednost or "")
+    if not broj:
+        return None
+    return round(float(broj.group()) * (1.5 if vrijednost.endswith("px") else 2))
+
+
+class _Pretvarac(HTMLParser):
+    """Raščlanjuje HTML generatora i piše odlomke i tablice WordprocessingML-a u `pisi`."""
+
+    def __init__(self, pisi):
+        super().__init__(convert_charrefs=True)
+        self.pisi = pisi
+        self.stog = []  # (oznaka, svojstva) otvorenih elemenata
+        self.odlomak = None  # popis runova trenutnog odlomka
+        self.svojstva_odlomka = ""
+        self.celija_ima_odlomak = []
+        self.brojaci_lista = []
+        # Tablica se drži u memoriji do </table>: w:tblGrid ide prije prvog reda, a broj stupaca
+        # poznat je tek nakon svih redova. Po otvorenoj tablici: (tblPr, redovi, dijelovi, prethodni pisi)
+        self.tablice = []
+
+    # --- svojstva iz stoga otvorenih elemenata ---
+
+    def _svojstvo(self, kljuc):
+        for _, svojstva in reversed(self.stog):
+            if kljuc in svojstva:
+                return svojstva[kljuc]
+        return None
+
+    def _rpr(self):
+        dijelovi = []
+        podebljano, koso, velicina, font = self._svojstvo('b'), self._svojstvo('i'), self._svojstvo('sz'), self._svojstvo('font')
+        if font:
+            dijelovi.append(f'<w:rFonts w:ascii="{font}" w:hAnsi="{font}" w:cs="{font}"/>')
+        if podebljano is not None:
+            dijelovi.append("<w:b/>" if podebljano else '<w:b w:val="0"/>')
+        if koso:
+            dijelovi.append("<w:i/>")
+        if velicina:
+            dijelovi.append(f'<w:sz w:val="{velicina}"/><w:szCs w:val="{velicina}"/>')
+        return f"<w:rPr>{''.join(dijelovi)}</w:rPr>" if dijelovi else ""
+
+    # --- odlomci ---
+
+    def _otvori_odlomak(self):
+        stil, poravnanje = self._svojstvo('stil'), self._svojstvo('jc')
+        pstil = f'<w:pStyle w:val="{stil}"/>' if stil else ""
+        jc = f'<w:jc w:val="{poravnanje}"/>' if poravnanje else ""
+        self.svojstva_odlomka = f"<w:pPr>{pstil}{jc}</w:pPr>" if pstil or jc else ""
+        self.odlomak = []
+        if self.brojaci_lista and self._svojstvo('li'):
+            self.brojaci_lista[-1] += 1
+            self.odlomak.append(f'<w:r><w:t xml:space="preserve">{self.brojaci_lista[-1]}. </w:t></w:r>')
+
+    def _zatvori_odlomak(self):
+        if self.odlomak is None:
+            return
+        # Odlomak od samih razmaka između blokova ne ostavlja trag
+        if self.odlomak:
+            self.pisi(f"<w:p>{self.svojstva_odlomka}{''.join(self.odlomak)}</w:p>".encode("utf-8"))
+            if self.celija_ima_odlomak:
+                self.celija_ima_odlomak[-1] = True
+        self.odlomak = None
+
+    # --- HTMLParser ---
+
+    def handle_starttag(self, oznaka, atributi):
+        atributi = dict(atributi)
+        if oznaka == "br":
+            if self.odlomak is None:
+                self._otvori_odlomak()
+            self.odlomak.append("<w:r><w:br/></w:r>")
+            return
+        svojstva = {}
+        for klasa in (atributi.get("class") or "").split():
+            if klasa in _STIL_KLASE:
+                svojstva['stil'] = _STIL_KLASE[klasa]
+            elif klasa == "cost-table":
+                svojstva['font'], svojstva['sz'] = "Courier New", 20
+        css = _css(atributi.get("style"))
+        poravnanje = css.get("text-align") or (atributi.get("align") or "").lower()
+        if poravnanje in _PORAVNANJE:
+            svojstva['jc'] = _PORAVNANJE[poravnanje]
+        if "font-weight" in css:
+            svojstva['b'] = css["font-weight"] in ("bold", "bolder", "700", "800", "900")
+        if css.get("font-style") == "italic":
+            svojstva['i'] = True
+        if _velicina(css.get("font-size")):
+            svojstva['sz'] = _velicina(css["font-size"])
+        if oznaka in ("b", "strong"):
+            svojstva['b'] = True
+        elif oznaka in ("i", "em"):
+            svojstva['i'] = True
+        elif oznaka == "li":
+            svojstva['li'] = True
+
+        if oznaka in _BLOKOVI:
+            self._zatvori_odlomak()
+            if oznaka == "table":
+                rubovi = '<w:tblBorders><w:insideH w:val="single" w:sz="4" w:color="DDDDDD"/><w:bottom w:val="single" w:sz="4" w:color="DDDDDD"/></w:tblBorders>' if 'font' in svojstva else ""
+                self.tablice.append((f'<w:tblPr><w:tblW w:w="5000" w:type="pct"/>{rubovi}</w:tblPr>', [], [], self.pisi))
+                self.pisi = self.tablice[-1][2].append
+            elif oznaka == "tr":
+                if self.tablice:
+                    self.tablice[-1][1].append([])
+                self.pisi(b"<w:tr>")
+            elif oznaka in ("td", "th"):
+                sirina = re.match(r"(\d+)%", atributi.get("width") or "")
+                sirina = int(sirina.group(1)) if sirina else None
+                raspon = int(atributi["colspan"]) if (atributi.get("colspan") or "").isdigit() and int(atributi["colspan"]) > 1 else 1
+                if self.tablice and self.tablice[-1][1]:
+                    self.tablice[-1][1][-1].append((sirina if raspon == 1 else None, raspon))
+                tcw = f'<w:tcW w:w="{sirina * 50}" w:type="pct"/>' if sirina is not None else ""
+                spajanje = f'<w:gridSpan w:val="{raspon}"/>' if raspon > 1 else ""
+                self.pisi(f"<w:tc><w:tcPr>{tcw}{spajanje}</w:tcPr>".encode("utf-8"))
+                self.celija_ima_odlomak.append(False)
+            elif oznaka in ("ol", "ul"):
+                self.brojaci_lista.append(0)
+        self.stog.append((oznaka, svojstva))
+
+    def handle_endtag(self, oznaka):
+        if not any(o == oznaka for o, _ in self.stog):
+            return
+        if oznaka in _BLOKOVI:
+            self._zatvori_odlomak()
+        # Zatvara i elemente koje HTML nije eksplicitno zatvorio
+        while self.stog:
+            otvorena, _ = self.stog.pop()
+            if otvorena in ("td", "th"):
+                if not self.celija_ima_odlomak.pop():
+                    self.pisi(b"<w:p/>")
+                self.pisi(b"</w:tc>")
+            elif otvorena == "tr":
+                self.pisi(b"</w:tr>")
+            elif otvorena == "table":
+                tblpr, redovi, dijelovi, self.pisi = self.tablice.pop()
+                self.pisi(f"<w:tbl>{tblpr}{_mreza(redovi)}".encode("utf-8") + b"".join(dijelovi) + b"</w:tbl>")
+            elif otvorena in ("ol", "ul"):
+                self.brojaci_lista.pop()
+            if otvorena == oznaka:
+                break
+
+    def handle_data(self, tekst):
+        tekst = _RAZMACI.sub(" ", tekst)
+        if self.odlomak is None:
+            tekst = tekst.lstrip()
+            if not tekst:
+                return
+            self._otvori_odlomak()
+        elif not self.odlomak or self.odlomak[-1] == "<w:r><w:br/></w:r>":
+            tekst = tekst.lstrip()
+        if tekst:
+            self.odlomak.append(f'<w:r>{self._rpr()}<w:t xml:space="preserve">{_xml(tekst)}</w:t></w:r>')
+
+    def zavrsi(self):
+        self.close()
+        self._zatvori_odlomak()
+        while self.stog:
+            self.handle_endtag(self.stog[-1][0])
+
+
+def _zapisi_dokument_xml(paket, html_sadrzaj):
+    with paket.open("word/document.xml", "w") as dokument:
+        dokument.write(_POCETAK_DOKUMENTA)
+        pretvarac = _Pretvarac(dokument.write)
+        for dio in ([html_sadrzaj] if isinstance(html_sadrzaj, str) else html_sadrzaj):
+            pretvarac.feed(dio)
+        pretvarac.zavrsi()
+        dokument.write(_KRAJ_DOKUMENTA)
+
+
+def zapisi_docx(html_sadrzaj, izlaz):
+    """
+    Zapisuje .docx u izlaz (putanja ili binarni tok).
+    html_sadrzaj je HTML string ili niz njegovih dijelova (npr. generiraj_prilagodeni_ugovor_dijelovi).
+    """
+    if isinstance(izlaz, (str, bytes)) or hasattr(izlaz, "__fspath__"):
+        with open(izlaz, "w+b") as tok:
+            return zapisi_docx(html_sadrzaj, tok)
+    if izlaz.seekable():
+        izlaz.write(_KOSTUR)
+        with zipfile.ZipFile(izlaz, "a", compression=zipfile.ZIP_DEFLATED) as paket:
+            _zapisi_dokument_xml(paket, html_sadrzaj)
+    else:
+        # Tok bez pozicioniranja (npr. datoteka unutar druge ZIP arhive): kostur se ne može
+        # dopuniti pa se statični dijelovi (već složeni pri uvozu) zapisuju iznova.
+        with zipfile.ZipFile(izlaz, "w", compression=zipfile.ZIP_DEFLATED) as paket:
+            for ime, sadrzaj in _STATICNI_DIJELOVI:
+                paket.writestr(ime, sadrzaj)
+            _zapisi_dokument_xml(paket, html_sadrzaj)
+
+
+def docx_iz_html(html_sadrzaj):
+    """Vraća .docx kao bajtove."""
+    tok = io.BytesIO()
+    zapisi_docx(html_sadrzaj, tok)
+    return tok.getvalue()
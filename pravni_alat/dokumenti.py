@@ -0,0 +1,399 @@
+"""
+Generatori pravnih dokumenata (HTML) i pomoćne funkcije za njihovo oblikovanje.
+Modul ne ovisi o Streamlitu (ni o NumPyju pri uvozu) pa ga skupne obrade i
+radni procesi mogu uvesti brzo, bez pokretanja sučelja.
+"""
+from datetime import date, datetime
+
+# -----------------------------------------------------------------------------
+# 1. CSS
+# -----------------------------------------------------------------------------
+# CSS - Dizajn prilagođen za Word
+css_stilovi = """
+<style>
+    body {
+        font-family: 'Times New Roman', serif;
+        font-size: 12pt;
+        line-height: 1.15;
+    }
+    .legal-doc { 
+        background-color: white; 
+        padding: 60px; 
+        color: black;
+        border: 1px solid #ddd;
+        box-shadow: 0 0 10px rgba(0,0,0,0.1);
+    }
+    .header-doc { 
+        text-align: center; 
+        font-weight: bold; 
+        font-size: 14pt;
+        margin-bottom: 20px; 
+        text-transform: uppercase;
+        font-family: 'Times New Roman', serif;
+    }
+    
+    .party-info {
+        text-align: left; 
+        margin-bottom: 15px;
+        font-family: 'Times New Roman', serif;
+    }
+
+    .doc-body {
+        text-align: justify;
+        text-justify: inter-word;
+        margin-bottom: 10px;
+        font-family: 'Times New Roman', serif;
+    }
+
+    .justified {
+        text-align: justify;
+        text-justify: inter-word;
+    }
+
+    .section-title {
+        font-weight: bold;
+        margin-top: 15px;
+        margin-bottom: 5px;
+        font-family: 'Times New Roman', serif;
+        text-transform: uppercase;
+        font-size: 11pt;
+    }
+    
+    .cost-table {
+        margin-top: 20px;
+        border-collapse: collapse;
+        width: 100%;
+        font-family: 'Courier New', monospace;
+        font-size: 10pt;
+    }
+    .cost-table td {
+        border-bottom: 1px solid #ddd;
+        padding: 5px;
+    }
+    
+    .clausula {
+        font-weight: bold;
+        font-style: italic;
+        background-color: #f9f9f9;
+        padding: 10px;
+        border-left: 3px solid #333;
+    }
+    
+    .signature-row {
+        display: flex;
+        justify-content: space-between;
+        margin-top: 50px;
+    }
+    .signature-block {
+        text-align: center;
+        width: 45%;
+    }
+</style>
+"""
+
+# -----------------------------------------------------------------------------
+# 2. POMOĆNE FUNKCIJE
+# -----------------------------------------------------------------------------
+
+def pripremi_za_word(html_sadrzaj):
+    return f"""
+    <html xmlns:o='urn:schemas-microsoft-com:office:office' xmlns:w='urn:schemas-microsoft-com:office:word' xmlns='http://www.w3.org/TR/REC-html40'>
+    <head>
+        <meta charset="utf-8">
+        <title>Dokument</title>
+        {css_stilovi}
+        <xml>
+            <w:WordDocument>
+                <w:View>Print</w:View>
+                <w:Zoom>100</w:Zoom>
+                <w:DoNotOptimizeForBrowser/>
+            </w:WordDocument>
+        </xml>
+    </head>
+    <body>
+        <div class="legal-doc">
+            {html_sadrzaj}
+        </div>
+    </body>
+    </html>
+    """
+
+# Statični početak i kraj omotača, za omatanje dokumenta koji se piše dio po dio
+_WORD_POCETAK, _, _WORD_KRAJ = pripremi_za_word("\0").partition("\0")
+
+def pripremi_za_word_dijelovi(html_dijelovi):
+    """Kao pripremi_za_word, ali omata niz dijelova dokumenta i vraća ga dio po dio."""
+    yield _WORD_POCETAK
+    yield from html_dijelovi
+    yield _WORD_KRAJ
+
+def zapisi_dijelove(dijelovi, tok):
+    """Zapisuje dijelove dokumenta u binarni tok (UTF-8) bez spajanja u jedan string. Vraća broj bajtova."""
+    ukupno = 0
+    for dio in dijelovi:
+        ukupno += tok.write(dio.encode("utf-8"))
+    return ukupno
+
+# Sav korisnički tekst (imena, mjesta, brojevi predmeta, članci, obrazloženja) prolazi kroz escape_html
+# ili format_text prije umetanja u dokument. Umeće se samo kao sadržaj elemenata, nikad u atribute,
+# pa su dovoljni &, < i > ('&' prvi). Provjera `in` (memchr) je ~20x brža od replace bez pogotka, pa
+# običan tekst bez tih znakova ne kopira se ni jednom; str.translate s višeznakovnim zamjenama ide
+# znak po znak i na MB teksta je ~10x sporiji od ovoga.
+def escape_html(text):
+    """Tekst siguran za umetanje u HTML dokumenta (None daje prazan tekst)."""
+    if text is None:
+        return ""
+    text = str(text)
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+def format_text(text):
+    """Kao escape_html, uz nove retke pretvorene u <br> (za višeredni tekst)."""
+    if text:
+        return escape_html(text).replace('\n', '<br>')
+    return ""
+
+def formatiraj_troskovnik(troskovi):
+    if not troskovi: return ""
+    stavka = troskovi.get('stavka', 0.0)
+    pdv = troskovi.get('pdv', 0.0)
+    materijalni = troskovi.get('materijalni', 0.0)
+    pristojba = troskovi.get('pristojba', 0.0)
+    ukupno = stavka + pdv + materijalni + pristojba
+    
+    html = f"""
+    <div class='section-title' style='margin-top: 30px;'>POPIS TROŠKOVA POSTUPKA:</div>
+    <table class='cost-table'>
+        <tr><td width="70%">1. Sastav podneska/isprave (Tbr. Tarife):</td><td width="30%" align="right">{stavka:.2f} EUR</td></tr>
+    """
+    # ISPRAVAK: Zamijenjeni vanjski navodnici u jednostruke da se ne sudaraju s HTML navodnicima
+    if pdv > 0: html += f'<tr><td>2. PDV (25%) na stavku 1.:</td><td align="right">{pdv:.2f} EUR</td></tr>'
+    if materijalni > 0: html += f'<tr><td>3. Materijalni troškovi / JB Nagrada:</td><td align="right">{materijalni:.2f} EUR</td></tr>'
+    if pristojba > 0: html += f'<tr><td>4. Sudska pristojba:</td><td align="right">{pristojba:.2f} EUR</td></tr>'
+    html += f'<tr style="font-weight: bold; background-color: #f0f0f0;"><td style="padding: 10px;">UKUPNO:</td><td style="padding: 10px;" align="right">{ukupno:.2f} EUR</td></tr></table>'
+    return html
+
+def formatiraj_specifikaciju(knjiga):
+    if not knjiga: return ""
+    redovi = "".join(
+        f"<tr><td>{r['Datum']}</td><td>{r['Događaj']}</td><td align=\"right\">{r['Iznos (EUR)']:.2f}</td><td align=\"right\">{r['Kamata razdoblja (EUR)']:.2f}</td><td align=\"right\">{r['Glavnica (EUR)']:.2f}</td><td align=\"right\">{r['Kamata (EUR)']:.2f}</td></tr>"
+        for r in knjiga['specifikacija'])
+    return f"""
+    <div class='section-title' style='margin-top: 30px;'>SPECIFIKACIJA DUGA I ZATEZNE KAMATE (stanje na dan {knjiga['obracun'].strftime('%d.%m.%Y.')}):</div>
+    <table class='cost-table'>
+        <tr style="font-weight: bold;"><td>Datum</td><td>Događaj</td><td align="right">Iznos</td><td align="right">Kamata razdoblja</td><td align="right">Glavnica</td><td align="right">Kamata</td></tr>
+        {redovi}
+        <tr style="font-weight: bold; background-color: #f0f0f0;"><td colspan="4" style="padding: 10px;">PREOSTALI DUG (glavnica + kamata):</td><td style="padding: 10px;" align="right">{knjiga['glavnica']:.2f} EUR</td><td style="padding: 10px;" align="right">{knjiga['kamata']:.2f} EUR</td></tr>
+    </table>
+    """
+
+def obracun_kamate_html(glavnica, dospijece, kamata_do, vrsta="ostali"):
+    # Zakonska zatezna kamata do zadanog dana, izravno iz indeksa stopa (dva dohvata).
+    # Uvoz na zahtjev: NumPy se učitava tek kad dokument stvarno traži obračun.
+    from pravni_alat.kamate import ZADANA_TABLICA
+    od = datetime.strptime(dospijece, '%d.%m.%Y.').date()
+    kamata = float(ZADANA_TABLICA.kamata(glavnica, od, kamata_do, vrsta))
+    return f"<div class='justified'><br>Zakonska zatezna kamata na iznos od {glavnica:,.2f} EUR obračunata od {dospijece} do {kamata_do.strftime('%d.%m.%Y.')} iznosi <b>{kamata:,.2f} EUR</b> (stope po polugodištima, tablica {ZADANA_TABLICA.verzija}).</div>"
+
+# -----------------------------------------------------------------------------
+# 3. GENERATORI DOKUMENATA (PRO VERZIJE)
+# -----------------------------------------------------------------------------
+
+# === NOVI GENERATOR: PRILAGOĐENI UGOVOR ===
+def generiraj_prilagodeni_ugovor(naslov, mjesto, datum, rok_vazenja, s1, s2, urbroj, struktura):
+    """
+    Generira ugovor na temelju dinamičke strukture koju je korisnik složio.
+    """
+    return "".join(generiraj_prilagodeni_ugovor_dijelovi(naslov, mjesto, datum, rok_vazenja, s1, s2, urbroj, struktura))
+
+# Članak je razdvojen na broj i tekst: tekst se može predmemorirati, a broj se mijenja pri dodavanju/brisanju članaka
+def _tekst_clanka(tekst_clanka, predmemorija):
+    if predmemorija is None:
+        return f"""
+                <div class='justified'>{format_text(tekst_clanka)}</div>
+                """
+    return predmemorija.dohvati(tekst_clanka, lambda: _tekst_clanka(tekst_clanka, None))
+
+def generiraj_prilagodeni_ugovor_dijelovi(naslov, mjesto, datum, rok_vazenja, s1, s2, urbroj, struktura, predmemorija=None):
+    """
+    Isti ugovor kao generiraj_prilagodeni_ugovor, ali vraćen dio po dio
+    (zaglavlje, naslovi dijelova, članci, potpisi) da se može pisati izravno u datoteku.
+    Uz predmemorija (LRUPredmemorija) tekst svakog članka renderira se samo kad se promijeni;
+    brojevi članaka i oznake dijelova uvijek se slažu iznova.
+    """
+    datum_str = datum.strftime("%d.%m.%Y.")
+    rok_str = f"<br>Ugovor vrijedi do: <b>{rok_vazenja.strftime('%d.%m.%Y.')}</b>" if rok_vazenja else "<br>Ugovor se sklapa na neodređeno vrijeme."
+    urbroj_str = f"<div style='text-align: right; font-size: 10pt;'>UrBroj: {escape_html(urbroj)}</div><br>" if urbroj else ""
+
+    yield f"""
+    {urbroj_str}
+    <div class='header-doc'>{escape_html(naslov.upper())}</div>
+    <div class='justified'>
+    Sklopljen u mjestu <b>{escape_html(mjesto)}</b>, dana {datum_str} godine.
+    <br><br>
+    <b>IZMEĐU:</b>
+    <br><br>
+    1. <b>{escape_html(s1['uloga'])}:</b><br>
+    {s1['tekst']}
+    <br><br>
+    2. <b>{escape_html(s2['uloga'])}:</b><br>
+    {s2['tekst']}
+    <br><br>
+    {rok_str}
+    </div>
+    <br>
+    """
+
+    # Dinamičko generiranje članaka
+    brojac_clanka = 1
+    rimski_brojevi = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X", "XI", "XII"]
+
+    for i, dio in enumerate(struktura):
+        # Naslov dijela (npr. I. OPĆI UVJETI)
+        oznaka_dijela = rimski_brojevi[i] if i < len(rimski_brojevi) else f"{i+1}"
+
+        # Prikaz naslova dijela (ako postoji)
+        if dio['naslov']:
+            yield f"<div class='header-doc' style='font-size: 12pt; margin-top: 30px; margin-bottom: 10px;'>{oznaka_dijela}. {escape_html(dio['naslov'].upper())}</div>"
+
+        # Članci unutar dijela
+        for tekst_clanka in dio['clanci']:
+            if tekst_clanka.strip(): # Samo ako ima teksta
+                yield f"""
+                <div class='section-title' style='text-align: center;'>Članak {brojac_clanka}.</div>{_tekst_clanka(tekst_clanka, predmemorija)}"""
+                brojac_clanka += 1
+
+    # Potpisi
+    yield f"""
+    <div class='signature-row'>
+        <div class='signature-block'>
+            <b>{escape_html(s1['uloga'].upper())}</b>
+            <br><br><br>
+            ______________________
+        </div>
+        <div class='signature-block'>
+            <b>{escape_html(s2['uloga'].upper())}</b>
+            <br><br><br>
+            ______________________
+        </div>
+    </div>
+    """
+
+# === OSTALI GENERATORI ===
+def generiraj_tuzbu_pro(sud, zastupanje, tuzitelj, tuzenik, vps, vrsta, data, troskovi_dict):
+    troskovnik_html = formatiraj_troskovnik(troskovi_dict)
+    kamata_html = obracun_kamate_html(vps, data['datum_dospijeca'], data['kamata_do'], data.get('kamata_vrsta', 'ostali')) if data.get('kamata_do') else ""
+    kamata_html += formatiraj_specifikaciju(data.get('specifikacija'))
+    return f"""
+    <div style="font-weight: bold; font-size: 14px;">{escape_html(sud.upper())}</div>
+    <div style="font-size: 12px;">{zastupanje}</div>
+    <br>
+    <div class='justified'>
+    <b>TUŽITELJ:</b> {tuzitelj}<br>
+    <b>TUŽENIK:</b> {tuzenik}
+    <br><br>
+    <b>Radi:</b> {escape_html(vrsta)}<br>
+    <b>Vrijednost predmeta spora (VPS): {vps:,.2f} EUR</b>
+    </div>
+    <br>
+    <div class='header-doc'>TUŽBA</div>
+    <div class='section-title'>I. ČINJENIČNI NAVODI</div>
+    <div class='justified'>{format_text(data['cinjenice'])}</div>
+    <div class='section-title'>II. DOKAZI</div>
+    <div class='justified'>Predlaže se izvođenje sljedećih dokaza:<br>{format_text(data['dokazi'])}</div>
+    <div class='section-title'>III. TUŽBENI ZAHTJEV</div>
+    <div class='justified'>Slijedom navedenog, budući da Tuženik nije podmirio svoju dospjelu obvezu, Tužitelj predlaže da naslovni Sud donese sljedeću<br><br>
+    <div style="text-align: center; font-weight: bold;">PRESUDU</div><br>
+    <b>I. Nalaže se Tuženiku</b> da Tužitelju isplati iznos od <b>{vps:,.2f} EUR</b> zajedno sa zakonskom zateznom kamatom koja teče od dana dospijeća {data['datum_dospijeca']} pa do isplate, po stopi određenoj zakonom.<br><br>
+    <b>II. Nalaže se Tuženiku</b> da Tužitelju naknadi troškove ovog parničnog postupka, u roku od 15 dana, zajedno sa zateznom kamatom od dana donošenja presude do isplate.
+    </div>
+    {kamata_html}{troskovnik_html}
+    <br><br>
+    <div class='signature-row'><div style='display:inline-block; width: 50%;'><b>PRILOZI:</b><br>1. Punomoć<br>2. Dokaz o uplati pristojbe<br>3. Dokazi navedeni u točki II.</div> 
+    <div class='signature-block'><b>TUŽITELJ</b><br>(po punomoćniku)<br><br>______________________</div></div>
+    """
+
+def generiraj_ovrhu_pro(jb, ovrhovoditelj, ovrsenik, trazbina, isprava, troskovi_dict):
+    troskovnik_html = formatiraj_troskovnik(troskovi_dict)
+    ukupno_trosak = troskovi_dict.get('stavka', 0) + troskovi_dict.get('pdv', 0) + troskovi_dict.get('materijalni', 0) + troskovi_dict.get('pristojba', 0)
+    kamata_html = obracun_kamate_html(trazbina['glavnica'], trazbina['dospjece'], trazbina['kamata_do'], trazbina.get('kamata_vrsta', 'ostali')) if trazbina.get('kamata_do') else ""
+    kamata_html += formatiraj_specifikaciju(trazbina.get('specifikacija'))
+    return f"""
+    <div style="font-weight: bold;">JAVNOM BILJEŽNIKU {escape_html(jb.upper())}</div>
+    <br>
+    <div class='justified'><b>OVRHOVODITELJ:</b> {ovrhovoditelj}<br><b>OVRŠENIK:</b> {ovrsenik}<br><br><b>Radi:</b> Ovrhe na temelju vjerodostojne isprave<br><b>Vrijednost tražbine: {trazbina['glavnica']:,.2f} EUR</b></div>
+    <br><div class='header-doc'>PRIJEDLOG ZA OVRHU<br><span style='font-size:11pt; font-weight:normal'>na temelju vjerodostojne isprave</span></div>
+    <div class='justified'>Na temelju vjerodostojne isprave – <b>{escape_html(isprava)}</b> od dana {trazbina['datum_racuna']}, iz koje proizlazi dospjela tražbina Ovrhovoditelja prema Ovršeniku, Ovrhovoditelj predlaže da Javni bilježnik donese sljedeće:</div>
+    <div style='border: 2px solid black; padding: 15px; margin: 20px 0;'><div class='header-doc' style='margin:0;'>RJEŠENJE O OVRSI</div><div style='text-align:center; font-size:10pt;'>(na temelju vjerodostojne isprave)</div><br>
+    <div class='justified'><b>I. NALAŽE SE Ovršeniku</b> da Ovrhovoditelju u roku od osam dana od dana dostave ovog rješenja namiri tražbinu u iznosu od <b>{trazbina['glavnica']:,.2f} EUR</b>, zajedno sa zakonskim zateznim kamatama koje teku od dana dospijeća <b>{trazbina['dospjece']}</b> pa do isplate, kao i da mu naknadi troškove ovog postupka u iznosu od <b>{ukupno_trosak:.2f} EUR</b>.<br><br>
+    <b>II. ODREĐUJE SE OVRHA</b> radi naplate tražbine iz točke I. ovog rješenja i troškova postupka. Ovrha će se provesti na novčanim sredstvima Ovršenika po svim računima kod banaka, te na cjelokupnoj imovini Ovršenika.</div></div>
+    {kamata_html}{troskovnik_html}
+    <br><br><div class='signature-row'><div style='display:inline-block; width: 50%;'></div><div class='signature-block'><b>OVRHOVODITELJ</b><br><br><br>______________________</div></div>
+    """
+
+def generiraj_zalbu_pro(sud_prvi, sud_drugi, stranke, podaci_o_presudi, razlozi, tekst_obrazlozenja, troskovnik):
+    troskovnik_html = formatiraj_troskovnik(troskovnik)
+    danas = date.today().strftime("%d.%m.%Y.")
+    razlozi_html = "<ul>" + "".join([f"<li>{escape_html(r)}</li>" for r in razlozi]) + "</ul>"
+    return f"""
+    <div style="font-weight: bold; font-size: 14px;">{escape_html(sud_drugi.upper())}</div><div>(kao drugostupanjskom sudu)</div><br><div>putem</div><br><div style="font-weight: bold;">{escape_html(sud_prvi.upper())}</div><div>(kao prvostupanjskog suda)</div><br><br>
+    <div class='justified'><b>PRAVNA STVAR:</b><br><b>TUŽITELJ:</b> {escape_html(stranke['tuzitelj'])}<br><b>TUŽENIK:</b> {escape_html(stranke['tuzenik'])}<br><b>Poslovni broj: {escape_html(podaci_o_presudi['broj'])}</b></div><br>
+    <div class='header-doc'>ŽALBA</div><div style="text-align: center;">protiv presude {escape_html(sud_prvi)} poslovni broj {escape_html(podaci_o_presudi['broj'])} od dana {escape_html(podaci_o_presudi['datum'])}</div><br>
+    <div class='justified'>Žalitelj ovime pravovremeno, u otvorenom zakonskom roku, podnosi žalbu protiv navedene presude {escape_html(podaci_o_presudi['opseg'])} zbog sljedećih zakonskih razloga (čl. 353. ZPP):</div>
+    {razlozi_html}
+    <div class='section-title'>I. OBRAZLOŽENJE</div><div class='justified'>{format_text(tekst_obrazlozenja)}</div>
+    <div class='section-title'>II. PRIJEDLOG</div><div class='justified'>Slijedom navedenog, predlaže se da naslovni drugostupanjski sud ovu žalbu uvaži, pobijanu presudu ukine i predmet vrati prvostupanjskom sudu na ponovno suđenje.</div>
+    {troskovnik_html}
+    <br><br><div style="text-align: right;">U {escape_html(podaci_o_presudi['mjesto'])}, dana {danas}</div>
+    <table width="100%"><tr><td width="50%"></td><td width="50%" align="center"><b>ŽALITELJ</b><br>(po punomoćniku)<br><br>______________________</td></tr></table>
+    """
+
+def generiraj_ugovor_standard(tip_ugovora, stranka1, stranka2, podaci, opcije, troskovi_dict=None):
+    datum = date.today().strftime("%d.%m.%Y.")
+    dodatni_tekst = f"<br><b>Kapara:</b> Ugovorne strane potvrđuju da je Kupac isplatio kaparu u iznosu od {opcije['iznos_kapare']} EUR." if opcije.get('kapara') else ""
+    solemnizacija_clanak = """<div class='section-title'>Članak (Solemnizacija)</div><div class='doc-body'>Ugovorne strane suglasne su da se ovaj Ugovor solemnizira (potvrdi) kod Javnog bilježnika.</div>""" if opcije.get('solemnizacija') else ""
+    titles = {"Kupoprodaja": ("UGOVOR O KUPOPRODAJI", "PRODAVATELJ", "KUPAC"), "Najam/Zakup": ("UGOVOR O NAJMU", "NAJMODAVAC", "NAJMOPRIMAC"), "Ugovor o djelu (Usluga)": ("UGOVOR O DJELU", "NARUČITELJ", "IZVOĐAČ"), "Zajam": ("UGOVOR O ZAJMU", "ZAJMODAVAC", "ZAJMOPRIMAC")}
+    naslov, u1, u2 = titles[tip_ugovora]
+    trosak_prikaz = formatiraj_troskovnik(troskovi_dict) if troskovi_dict else ""
+    return f"""<div class='header-doc'>{naslov}</div><div class='doc-body'>Sklopljen u {escape_html(podaci['mjesto'])}, dana {datum}, između:</div><div class='party-info'>1. <b>{u1}:</b><br>{stranka1}<br><br>2. <b>{u2}:</b><br>{stranka2}</div><div class='section-title'>Članak 1.</div><div class='doc-body'>{format_text(podaci['predmet_clanak'])}</div><div class='section-title'>Članak 2.</div><div class='doc-body'>{format_text(podaci['cijena_clanak'])}{dodatni_tekst}</div><div class='section-title'>Članak 3.</div><div class='doc-body'>{format_text(podaci['rok_clanak'])}</div>{solemnizacija_clanak}<br><br>{trosak_prikaz}<br><table width="100%"><tr><td width="50%" align="center"><b>{u1}</b><br><br>__________</td><td width="50%" align="center"><b>{u2}</b><br><br>__________</td></tr></table>"""
+
+def generiraj_ugovor_o_radu(poslodavac, radnik, podaci):
+    datum = date.today().strftime("%d.%m.%Y.")
+    vrsta_tekst = "NA NEODREĐENO VRIJEME"
+    clanak_trajanje = "Ugovor se sklapa na neodređeno vrijeme."
+    if podaci.get('vrsta') == "Određeno":
+        vrsta_tekst = "NA ODREĐENO VRIJEME"
+        clanak_trajanje = f"Ugovor se sklapa na određeno vrijeme do {escape_html(podaci.get('datum_do', '_______'))}, zbog: {escape_html(podaci.get('razlog_odredeno', 'povećanog opsega posla'))}."
+    probni_rad_txt = f"Ugovara se probni rad u trajanju od {podaci.get('probni_rad_mj', 3)} mjeseca/mjeseci." if podaci.get('probni_rad') else ""
+    return f"""
+    <div class='header-doc'>UGOVOR O RADU<br><span style='font-size: 12pt; font-weight: normal;'>{vrsta_tekst}</span></div>
+    <div class='justified'>Sklopljen u {escape_html(podaci.get('mjesto_sklapanja', 'Zagrebu'))}, dana {datum} godine, između:<br><br>1. <b>POSLODAVAC:</b><br>{poslodavac}<br><br>2. <b>RADNIK:</b><br>{radnik}</div>
+    <div class='section-title'>Članak 1. (Predmet i početak rada)</div><div class='justified'>Radnik počinje s radom dana <b>{escape_html(podaci.get('datum_start', '_______'))}</b>. {clanak_trajanje} {probni_rad_txt}</div>
+    <div class='section-title'>Članak 2. (Mjesto i opis poslova)</div><div class='justified'>Radnik će obavljati poslove na radnom mjestu: <b>{escape_html(podaci.get('naziv_radnog_mjesta', '_______'))}</b>.<br><b>Opis poslova:</b> {format_text(podaci.get('opis_posla', 'Opisani u opisu radnog mjesta kod Poslodavca'))}.<br>Mjesto rada je: {escape_html(podaci.get('mjesto_rada', 'u sjedištu Poslodavca i na terenu po potrebi'))}.</div>
+    <div class='section-title'>Članak 3. (Radno vrijeme i odmori)</div><div class='justified'>Radnik će raditi u punom radnom vremenu od {podaci.get('radno_vrijeme', 40)} sati tjedno. Radnik ima pravo na dnevni odmor (stanku) u trajanju od 30 minuta.</div>
+    <div class='section-title'>Članak 4. (Plaća i naknade)</div><div class='justified'>Za obavljeni rad Poslodavac će Radniku isplaćivati osnovnu bruto plaću u iznosu od <b>{podaci.get('bruto_placa', 0):.2f} EUR</b> mjesečno.</div>
+    <div class='section-title'>Članak 5. (Godišnji odmor)</div><div class='justified'>Radnik ima pravo na plaćeni godišnji odmor u trajanju od najmanje {podaci.get('godisnji_odmor', 20)} radnih dana.</div>
+    <div class='section-title'>Članak 6. (Završne odredbe)</div><div class='justified'>Ovaj Ugovor sastavljen je u 3 (tri) istovjetna primjerka.</div>
+    <div class='signature-row'><div class='signature-block'><b>ZA POSLODAVCA</b><br><br><br>______________________</div><div class='signature-block'><b>RADNIK</b><br><br><br>______________________</div></div>
+    """
+
+def generiraj_otkaz(poslodavac, radnik, podaci):
+    return f"""<div class='header-doc'>ODLUKA O OTKAZU</div><div class='doc-body'>1. Otkazuje se ugovor radniku {radnik}.</div><div class='section-title'>Obrazloženje</div><div class='doc-body'>{format_text(podaci['tekst_obrazlozenja'])}</div><br><br><table width="100%"><tr><td align="center"><b>POSLODAVAC</b><br>__________</td></tr></table>"""
+
+def generiraj_tabularnu_doc(prod, kup, ko, cest, ul, opis, dat):
+    return f"""<div class='header-doc'>TABULARNA IZJAVA<br><span style='font-size: 11pt; font-weight: normal;'>(Clausula Intabulandi)</span></div><div class='party-info'><b>PRODAVATELJ:</b><br>{prod}</div><div class='party-info'><b>KUPAC:</b><br>{kup}</div><div class='doc-body'>Temeljem Ugovora od {escape_html(dat)} za nekretninu u K.O. {escape_html(ko)}, k.č.br {escape_html(cest)}. {f'<br>Opis u naravi: {format_text(opis)}' if opis else ''}</div><div class='doc-body clausula'>Ja, PRODAVATELJ, ovime izričito ovlašćujem KUPCA da zatraži uknjižbu prava vlasništva.</div><br><br><table width="100%"><tr><td width="40%"></td><td width="60%" align="center"><b>PRODAVATELJ</b><br>(Ovjera JB)<br><br>_________________</td></tr></table>"""
+
+def generiraj_zk_prijedlog(sud, predlagatelj, protustranka, nekretnina, dokumenti, troskovi_dict):
+    troskovnik_html = formatiraj_troskovnik(troskovi_dict)
+    return f"""<div style="font-weight: bold; font-size: 14px;">{escape_html(sud.upper())}</div><div style="font-size: 12px;">Zemljišnoknjižni odjel</div><br><br><div class='party-info'><b>PREDLAGATELJ:</b><br>{predlagatelj}</div><div class='party-info'><b>PROTUSTRANKA:</b><br>{protustranka}</div><br><div class='header-doc'>ZEMLJIŠNOKNJIŽNI PRIJEDLOG<br><span style='font-size: 12pt; font-weight: normal;'>za uknjižbu prava vlasništva</span></div><div class='doc-body'>Predlagatelj predlaže da naslovni sud, na temelju priloženih isprava, u zemljišnim knjigama za nekretninu upisanu kao:<br><br><b>Katastarska općina (k.o.):</b> {escape_html(nekretnina['ko'])}<br><b>Broj zk. uloška:</b> {escape_html(nekretnina['ulozak'])}<br><b>Broj čestice (k.č.br.):</b> {escape_html(nekretnina['cestica'])}{f", u naravi {format_text(nekretnina['opis'])}" if nekretnina['opis'] else ""}<br><br>provede upis, odnosno dozvoli:</div><div class='section-title' style='text-align: center; border: 1px solid black; padding: 10px; margin: 20px 0;'>UKNJIŽBU PRAVA VLASNIŠTVA<br>u korist Predlagatelja (u cijelosti / 1/1 dijela).</div><div class='doc-body'>Predlagatelj prilaže izvornike/ovjerene preslike isprava koje su temelj za upis.</div><div class='section-title'>POPIS PRILOGA:</div><div class='doc-body'><ol><li>{escape_html(dokumenti['ugovor'])}</li><li>{escape_html(dokumenti['tabularna'])}</li><li>Dokaz o uplati sudske pristojbe</li><li>Dokaz o državljanstvu / OIB (preslika osobne iskaznice)</li></ol></div>{troskovnik_html}<br><br><table width="100%" border="0"><tr><td width="50%"></td><td width="50%" align="center"><b>PREDLAGATELJ</b><br>(potpis nije nužno ovjeravati)<br><br>______________________</td></tr></table>"""
+
+def generiraj_brisovnu_tuzbu(sud, zastupanje, tuzitelj, tuzenik, nekretnina, podaci_spora, troskovi_dict):
+    datum = date.today().strftime("%d.%m.%Y.")
+    troskovnik_html = formatiraj_troskovnik(troskovi_dict)
+    tekst_savjesnost = "Tuženik je prilikom stjecanja bio nesavjestan..." if podaci_spora['tuzenik_znao'] else "Tužba se podnosi u zakonskom roku..."
+    return f"""<div style="font-weight: bold; font-size: 14px; text-align: left;">{escape_html(sud.upper())}</div><div style="font-size: 12px; text-align: left;">{zastupanje}</div><br><div class='party-info'><b>PRAVNA STVAR:</b><br><b>TUŽITELJ:</b> {tuzitelj}<br><b>TUŽENIK:</b> {tuzenik}</div><div class='party-info'><b>Radi:</b> Brisanja uknjižbe i uspostave prijašnjeg ZK stanja<br><b>Vrijednost predmeta spora (VPS): {podaci_spora['vps']:,.2f} EUR</b></div><br><div class='header-doc'>BRISOVNA TUŽBA</div><div class='section-title'>I. ČINJENIČNI NAVODI</div><div class='doc-body'>Tužitelj je bio isključivi vlasnik nekretnine upisane u <b>zk.ul. {escape_html(nekretnina['ulozak'])}, k.o. {escape_html(nekretnina['ko'])}, k.č.br. {escape_html(nekretnina['cestica'])}</b>.<br><br>Dana {escape_html(podaci_spora['datum_uknjizbe'])}, u zemljišnim knjigama naslovnog suda, pod brojem <b>{escape_html(podaci_spora['z_broj'])}</b>, provedena je nevaljana uknjižba prava vlasništva u korist Tuženika na temelju isprave: {escape_html(podaci_spora['isprava'])}.<br><br>Tužitelj tvrdi da je navedena isprava ništetna iz sljedećih razloga:<br><i>{format_text(podaci_spora['razlog_nevaljanosti'])}</i><br><br>{tekst_savjesnost}</div><div class='section-title'>DOKAZI:</div><div class='doc-body'>1. ZK izvadak.<br>2. Uvid u ZK spis broj {escape_html(podaci_spora['z_broj'])}.<br>3. {escape_html(podaci_spora['isprava'])}.</div><div class='section-title'>II. TUŽBENI ZAHTJEV</div><div class='doc-body'>Slijedom navedenog, Tužitelj predlaže da Sud donese sljedeću</div><div style="text-align: center; font-weight: bold; margin: 10px 0;">PRESUDU</div><div class='doc-body'><b>I. Utvrđuje se da je ništetan</b> {escape_html(podaci_spora['isprava'])}.<br><br><b>II. Utvrđuje se da je nevaljana uknjižba</b> prava vlasništva u korist tuženika, provedena pod brojem {escape_html(podaci_spora['z_broj'])}.<br><br><b>III. Nalaže se brisanje uknjižbe</b> i uspostava prijašnjeg stanja.<br><br><b>IV.</b> Nalaže se Tuženiku naknaditi trošak.</div>{troskovnik_html}<br><br><div style="text-align:right;">U {escape_html(podaci_spora['mjesto'])}, dana {datum}</div><table width="100%" border="0"><tr><td width="50%"></td><td width="50%" align="center"><b>TUŽITELJ</b><br><br><br>______________________</td></tr></table>"""
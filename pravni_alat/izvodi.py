@@ -0,0 +1,342 @@
+"""
+Uvoz računa iz knjigovodstva i uplata s bankovnih izvoda (ISO 20022
+camt.053 XML ili CSV) te usklađivanje uplata s otvorenim računima.
+
+Izvodi se čitaju tok po tok: XML se parsira s iterparse, a svaka obrađena
+stavka (Ntry) i svaki završeni izvod (Stmt) odmah se uklanjaju iz stabla,
+pa memorija ne raste s veličinom datoteke ni brojem izvoda u njoj; ZIP i
+gzip arhive izvoda čitaju se bez raspakiranja na disk. U memoriji su
+samo otvoreni računi, u hash indeksu po referenci (poziv na broj i broj
+računa), pa je povezivanje uplate jedno traženje u rječniku.
+
+Rezultat su knjige dugovanja po dužniku u obliku za obracunaj_knjigu i
+redovi za skupnu ovrhu (STUPCI_OVRHE).
+"""
+import csv
+import gzip
+import io
+import re
+import zipfile
+from datetime import date
+from xml.etree.ElementTree import iterparse
+
+from pravni_alat.skupno import STUPCI_OVRHE, citaj_csv, procitaj_datum, procitaj_iznos
+from pravni_alat.stranke import svedi_naziv
+
+# Nazivi stupaca koje prihvaćamo u izvozu računa i CSV izvodu (prvi je kanonski)
+STUPCI_RACUNA = {
+    'duznik': ['duznik', 'dužnik', 'kupac', 'ovrsenik', 'naziv'],
+    'oib': ['oib', 'ovrsenik_oib', 'oib_kupca'],
+    'adresa': ['adresa', 'ovrsenik_adresa'],
+    'racun': ['racun', 'račun', 'broj_racuna', 'broj računa', 'oznaka'],
+    'datum_racuna': ['datum_racuna', 'datum računa', 'datum'],
+    'dospijece': ['dospijece', 'dospijeće', 'datum_dospijeca'],
+    'iznos': ['iznos', 'glavnica', 'iznos_racuna'],
+    'referenca': ['referenca', 'poziv_na_broj', 'poziv na broj'],
+}
+STUPCI_IZVODA = {
+    'datum': ['datum', 'datum_valute', 'datum valute', 'datum_izvrsenja', 'datum izvršenja'],
+    'iznos': ['potrazuje', 'potražuje', 'uplata', 'iznos'],
+    'referenca': ['referenca', 'poziv_na_broj', 'poziv na broj', 'poziv na broj primatelja'],
+    'platitelj': ['platitelj', 'naziv_platitelja', 'naziv platitelja'],
+    'opis': ['opis', 'opis_placanja', 'opis plaćanja', 'svrha'],
+}
+
+# Model poziva na broj (HR00-HR99) i ISO 11649 (RF + kontrolni broj) nisu dio reference
+_MODEL = re.compile(r"^(HR\d\d|RF\d\d)")
+_RIJECI = re.compile(r"[\s,;:()]+")
+
+
+def svedi_referencu(referenca):
+    """Referenca za indeks: bez modela, razmaka i točke na kraju ("HR01 123-2024" -> "123-2024")."""
+    tekst = "".join(str(referenca or "").upper().split()).rstrip(".")
+    return _MODEL.sub("", tekst)
+
+
+def _stupci(zaglavlje, nazivi):
+    # kanonski naziv -> stvarni stupac u datoteci (prvi koji postoji)
+    return {kanonski: next(s for s in moguci if s in zaglavlje) for kanonski, moguci in nazivi.items() if any(s in zaglavlje for s in moguci)}
+
+
+def citaj_racune(redovi):
+    """
+    Otvoreni računi iz izvoza knjigovodstva (redovi iz citaj_redove). Obavezni
+    su dužnik, iznos i dospijeće; neispravan red prekida uvoz s brojem reda.
+    """
+    stupci = None
+    for broj, red in enumerate(redovi, start=2):
+        if stupci is None:
+            stupci = _stupci(red, STUPCI_RACUNA)
+            nedostaje = [s for s in ('duznik', 'iznos', 'dospijece') if s not in stupci]
+            if nedostaje:
+                raise ValueError(f"Izvoz računa nema stupce: {', '.join(nedostaje)}")
+        vrijednosti = {k: red.get(s) for k, s in stupci.items()}
+        try:
+            dospijece = procitaj_datum(vrijednosti['dospijece'])
+            yield {
+                'duznik': str(vrijednosti['duznik'] or "").strip(),
+                'oib': str(vrijednosti.get('oib') or "").strip(),
+                'adresa': str(vrijednosti.get('adresa') or "").strip(),
+                'racun': str(vrijednosti.get('racun') or "").strip(),
+                'datum_racuna': procitaj_datum(vrijednosti['datum_racuna']) if vrijednosti.get('datum_racuna') else dospijece,
+                'dospijece': dospijece,
+                'iznos': procitaj_iznos(vrijednosti['iznos']),
+                'referenca': str(vrijednosti.get('referenca') or "").strip(),
+            }
+        except ValueError as e:
+            raise ValueError(f"Red {broj} izvoza računa: {e}") from None
+
+
+def citaj_izvod_csv(datoteka):
+    """Uplate iz CSV izvoda; redovi bez iznosa u korist računa (isplate) se preskaču."""
+    stupci = None
+    for red in citaj_csv(datoteka):
+        if stupci is None:
+            stupci = _stupci(red, STUPCI_IZVODA)
+            if 'datum' not in stupci or 'iznos' not in stupci:
+                raise ValueError("CSV izvod mora imati stupce datum i iznos (ili potražuje).")
+        iznos = procitaj_iznos(red.get(stupci['iznos']))
+        if iznos > 0:
+            yield {
+                'datum': procitaj_datum(red.get(stupci['datum'])),
+                'iznos': iznos,
+                'referenca': red.get(stupci.get('referenca'), "") or "",
+                'platitelj': red.get(stupci.get('platitelj'), "") or "",
+                'opis': red.get(stupci.get('opis'), "") or "",
+            }
+
+
+def citaj_camt053(datoteka):
+    """
+    Uplate iz camt.053 izvoda (verzije .001.02 do .001.08): knjižene stavke u
+    korist računa, po jedna za svaku transakciju u skupnoj stavci. Storno
+    uplate (RvslInd uz DBIT) vraćaju se s negativnim iznosom.
+    """
+    t = None
+    otvoreni = []  # elementi od korijena do trenutnog
+    for dogadaj, element in iterparse(datoteka, events=("start", "end")):
+        if dogadaj == "start":
+            if t is None:
+                t = _Oznake(element.tag[:element.tag.index("}") + 1] if element.tag.startswith("{") else "")
+            otvoreni.append(element)
+            continue
+        otvoreni.pop()
+        if element.tag == t.Ntry:
+            yield from _uplate_stavke(element, t)
+        elif len(otvoreni) != 2:
+            continue
+        # Obrađena stavka, završeni izvod (Stmt/Rpt/Ntfctn) i zaglavlje (GrpHdr) uklanjaju se iz stabla
+        element.clear()
+        otvoreni[-1].remove(element)
+
+
+class _Oznake:
+    # Puni nazivi elemenata i putanje s prostorom imena izvoda, složeni jednom po izvodu
+    PUTANJE = {
+        'iznos': "Amt", 'smjer': "CdtDbtInd", 'storno': "RvslInd", 'status': "Sts", 'status_kod': "Sts/Cd",
+        'valuta': "ValDt/Dt", 'valuta_vrijeme': "ValDt/DtTm", 'knjizenje': "BookgDt/Dt", 'knjizenje_vrijeme': "BookgDt/DtTm",
+        'iznos_tx': "AmtDtls/TxAmt/Amt", 'referenca': "RmtInf/Strd/CdtrRefInf/Ref", 'opis': "RmtInf/Ustrd", 'dodatno': "AddtlNtryInf",
+        'platitelj': "RltdPties/Dbtr/Nm", 'platitelj_strana': "RltdPties/Dbtr/Pty/Nm",
+    }
+
+    def __init__(self, ns):
+        self.Ntry, self.TxDtls = f"{ns}Ntry", f"{ns}TxDtls"
+        for ime, putanja in self.PUTANJE.items():
+            setattr(self, ime, "/".join(ns + dio for dio in putanja.split("/")))
+
+
+def _uplate_stavke(ntry, t):
+    status = (ntry.findtext(t.status_kod) or ntry.findtext(t.status) or "BOOK").strip()
+    smjer = ntry.findtext(t.smjer)
+    storno = (ntry.findtext(t.storno) or "").strip().lower() == "true"
+    if status != "BOOK" or (smjer == "CRDT") == storno:
+        return
+    predznak = -1 if storno else 1
+    tekst = ntry.findtext(t.valuta) or ntry.findtext(t.valuta_vrijeme) or ntry.findtext(t.knjizenje) or ntry.findtext(t.knjizenje_vrijeme)
+    datum = date.fromisoformat(tekst.strip()[:10])
+    transakcije = list(ntry.iter(t.TxDtls))
+    iznosi = []
+    for tx in transakcije:
+        iznos = tx.find(t.iznos)
+        iznosi.append(iznos if iznos is not None else tx.find(t.iznos_tx))
+    if not transakcije or any(iznos is None for iznos in iznosi):
+        # Bez iznosa po transakciji skupna stavka je jedna uplata s podacima prve transakcije
+        transakcije, iznosi = [transakcije[0] if transakcije else ntry], [ntry.find(t.iznos)]
+    for tx, iznos in zip(transakcije, iznosi):
+        if iznos.get("Ccy", "EUR") != "EUR":
+            continue
+        yield {
+            'datum': datum,
+            'iznos': predznak * float(iznos.text),
+            'referenca': tx.findtext(t.referenca) or "",
+            'platitelj': tx.findtext(t.platitelj) or tx.findtext(t.platitelj_strana) or "",
+            'opis': " ".join(u.text or "" for u in tx.iterfind(t.opis)) or ntry.findtext(t.dodatno) or "",
+        }
+
+
+def citaj_izvode(datoteka, ime):
+    """Uplate iz izvoda po nastavku imena: .xml (camt.053), .csv, .gz i .zip (svaka datoteka u arhivi redom)."""
+    ime = ime.lower()
+    if ime.endswith(".zip"):
+        with zipfile.ZipFile(datoteka) as arhiva:
+            for clan in sorted(arhiva.namelist()):
+                if not clan.endswith("/"):
+                    with arhiva.open(clan) as tok:
+                        yield from citaj_izvode(tok, clan)
+    elif ime.endswith(".gz"):
+        with gzip.open(datoteka) as tok:
+            yield from citaj_izvode(tok, ime[:-3])
+    elif ime.endswith(".xml"):
+        yield from citaj_camt053(datoteka)
+    elif ime.endswith((".csv", ".txt")):
+        yield from citaj_izvod_csv(datoteka)
+    else:
+        raise ValueError(f"Nepoznata vrsta izvoda: {ime}")
+
+
+def _kljuc_duznika(racun):
+    return racun['oib'] or svedi_naziv(racun['duznik'])
+
+
+def uskladi(racuni, uplate, nepovezane=None):
+    """
+    Povezuje uplate s računima po referenci, a ako je nema, po riječima opisa
+    plaćanja (broj računa u opisu). Nepovezane uplate se ne pamte nego se
+    predaju pozivu nepovezane(uplata), npr. pisaču CSV datoteke.
+    Vraća (knjige, izvješće); knjige su {dužnik: {'duznik', 'oib', 'adresa',
+    'racuni', 'uplate'}} s racuni/uplate u obliku za obracunaj_knjigu.
+    """
+    knjige = {}
+    indeks = {}  # referenca -> račun; None ako je referenca dvoznačna
+    for racun in racuni:
+        kljuc = _kljuc_duznika(racun)
+        knjiga = knjige.get(kljuc)
+        if knjiga is None:
+            knjiga = knjige[kljuc] = {'duznik': racun['duznik'], 'oib': racun['oib'], 'adresa': racun['adresa'], 'racuni': [], 'uplate': []}
+        stavka = {'oznaka': racun['racun'], 'iznos': racun['iznos'], 'dospijece': racun['dospijece'], 'datum_racuna': racun['datum_racuna'], 'placeno': 0.0, 'knjiga': kljuc}
+        knjiga['racuni'].append(stavka)
+        for referenca in {svedi_referencu(racun['referenca']), svedi_referencu(racun['racun'])} - {""}:
+            indeks[referenca] = stavka if referenca not in indeks else None
+
+    izvjestaj = {'racuna': sum(len(k['racuni']) for k in knjige.values()), 'duznika': len(knjige), 'uplata': 0, 'povezano': 0, 'nepovezano': 0, 'iznos_nepovezano': 0.0, 'stornirano': 0,
+                 'dvoznacnih_referenci': sum(1 for v in indeks.values() if v is None)}
+    for uplata in uplate:
+        izvjestaj['uplata'] += 1
+        stavka = indeks.get(svedi_referencu(uplata['referenca']))
+        if stavka is None:
+            stavka = next((indeks[r] for r in map(svedi_referencu, _RIJECI.split(uplata['opis'])) if indeks.get(r) is not None), None)
+        if stavka is not None and uplata['iznos'] < 0:
+            # Storno poništava raniju uplatu istog iznosa za isti račun
+            uplate_knjige = knjige[stavka['knjiga']]['uplate']
+            ponistena = next((i for i in range(len(uplate_knjige) - 1, -1, -1)
+                              if uplate_knjige[i]['racun'] == stavka['oznaka'] and uplate_knjige[i]['iznos'] == -uplata['iznos']), None)
+            if ponistena is not None:
+                stavka['placeno'] += uplata['iznos']
+                del uplate_knjige[ponistena]
+                izvjestaj['stornirano'] += 1
+                continue
+            stavka = None
+        if stavka is None:
+            izvjestaj['nepovezano'] += 1
+            izvjestaj['iznos_nepovezano'] += uplata['iznos']
+            if nepovezane:
+                nepovezane(uplata)
+            continue
+        izvjestaj['povezano'] += 1
+        stavka['placeno'] += uplata['iznos']
+        opis = f"{uplata['platitelj']} ({stavka['oznaka']})" if uplata['platitelj'] else stavka['oznaka']
+        knjige[stavka['knjiga']]['uplate'].append({'datum': uplata['datum'], 'iznos': uplata['iznos'], 'opis': opis, 'racun': stavka['oznaka']})
+    return knjige, izvjestaj
+
+
+def redovi_za_ovrhu(knjige, obracun, ovrhovoditelj=None):
+    """
+    Redovi za skupna_ovrha (STUPCI_OVRHE): po jedan za svaki dospjeli račun s
+    neplaćenim ostatkom (iznos umanjen za uplate povezane s tim računom).
+    Kamata do djelomične uplate nije u ostatku; nju daje obracunaj_knjige.
+    ovrhovoditelj: {'ovrhovoditelj', 'ovrhovoditelj_oib', 'ovrhovoditelj_adresa', 'jb', ...}.
+    """
+    for knjiga in knjige.values():
+        for racun in knjiga['racuni']:
+            ostatak = round(racun['iznos'] - racun['placeno'], 2)
+            if ostatak > 0 and racun['dospijece'] < obracun:
+                red = dict.fromkeys(STUPCI_OVRHE, "")
+                red.update(ovrhovoditelj or {})
+                red.update({
+                    'ovrsenik': knjiga['duznik'], 'ovrsenik_oib': knjiga['oib'], 'ovrsenik_adresa': knjiga['adresa'],
+                    'isprava': f"Račun br. {racun['oznaka']}" if racun['oznaka'] else "Račun",
+                    'datum_racuna': racun['datum_racuna'].strftime('%d.%m.%Y.'), 'glavnica': f"{ostatak:.2f}",
+                    'dospijece': racun['dospijece'].strftime('%d.%m.%Y.'),
+                })
+                yield red
+
+
+def obracunaj_knjige(knjige, obracun, vrsta="ostali", greske=None):
+    """
+    Stanje svake knjige na dan obračuna: (ključ dužnika, knjiga, rezultat obracunaj_knjigu).
+    Uz greske(ključ, knjiga, poruka) knjiga koja se ne može obračunati (npr. račun
+    dospio prije početka tablice stopa) predaje se tom pozivu umjesto da prekine obračun.
+    """
+    from pravni_alat.knjiga import obracunaj_knjigu
+
+    for kljuc, knjiga in knjige.items():
+        try:
+            stanje = obracunaj_knjigu(knjiga['racuni'], knjiga['uplate'], obracun, vrsta=vrsta)
+        except ValueError as e:
+            if greske is None:
+                raise
+            greske(kljuc, knjiga, str(e))
+            continue
+        yield kljuc, knjiga, stanje
+
+
+def uvezi(racuni, izvodi, izlaz, obracun, ovrhovoditelj=None, vrsta="ostali", napredak=None):
+    """
+    Cijeli uvoz: računi (redovi izvoza), izvodi [(datoteka, ime)], a u ZIP
+    `izlaz` zapisuje ovrhe.csv (ulaz za skupnu ovrhu) i nepovezane_uplate.csv.
+    Vraća izvješće usklađivanja i sažetak po dužniku (glavnica, kamata, uplaćeno);
+    dužnik čija se knjiga ne može obračunati ostaje u sažetku s napomenom.
+    """
+    with zipfile.ZipFile(izlaz, "w", compression=zipfile.ZIP_DEFLATED) as arhiva:
+        with arhiva.open("nepovezane_uplate.csv", "w") as f:
+            tekst = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+            pisac = csv.writer(tekst, delimiter=";")
+            pisac.writerow(["datum", "iznos", "referenca", "platitelj", "opis"])
+            brojac = [0]
+
+            def uplate():
+                for datoteka, ime in izvodi:
+                    for uplata in citaj_izvode(datoteka, ime):
+                        brojac[0] += 1
+                        if napredak and brojac[0] % 10000 == 0:
+                            napredak(brojac[0])
+                        yield uplata
+
+            knjige, izvjestaj = uskladi(citaj_racune(racuni), uplate(), nepovezane=lambda u: pisac.writerow(
+                [u['datum'].strftime('%d.%m.%Y.'), f"{u['iznos']:.2f}", u['referenca'], u['platitelj'], u['opis']]))
+            tekst.flush()
+            tekst.detach()
+        with arhiva.open("ovrhe.csv", "w") as f:
+            tekst = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+            pisac = csv.DictWriter(tekst, fieldnames=STUPCI_OVRHE, delimiter=";", extrasaction="ignore")
+            pisac.writeheader()
+            izvjestaj['redova_ovrhe'] = 0
+            for red in redovi_za_ovrhu(knjige, obracun, ovrhovoditelj):
+                pisac.writerow(red)
+                izvjestaj['redova_ovrhe'] += 1
+            tekst.flush()
+            tekst.detach()
+
+    def red_sazetka(knjiga, glavnica=None, kamata=None, napomena=""):
+        return {'dužnik': knjiga['duznik'], 'OIB': knjiga['oib'], 'računa': len(knjiga['racuni']), 'uplata': len(knjiga['uplate']),
+                'uplaćeno': round(sum(u['iznos'] for u in knjiga['uplate']), 2), 'glavnica': glavnica, 'kamata': kamata, 'napomena': napomena}
+
+    def neobracunata(_, knjiga, poruka):
+        sazetak.append(red_sazetka(knjiga, napomena=poruka))
+        izvjestaj['neobracunato'] += 1
+
+    sazetak = []
+    izvjestaj['neobracunato'] = 0
+    for _, knjiga, stanje in obracunaj_knjige(knjige, obracun, vrsta, greske=neobracunata):
+        sazetak.append(red_sazetka(knjiga, round(stanje['glavnica'], 2), round(stanje['kamata'], 2)))
+    return {'izvjestaj': izvjestaj, 'sazetak': sazetak}
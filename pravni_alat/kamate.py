@@ -0,0 +1,168 @@
+"""
+Obračun zakonske zatezne kamate po polugodišnjim razdobljima (čl. 29. ZOO).
+
+Stopa se mijenja svakog polugodišta, pa se kamata računa zasebno za svako
+razdoblje koje pada u interval [dospijeće, obračun). Sve funkcije primaju
+nizove (NumPy) pa jedan poziv obračunava tisuće tražbina odjednom.
+
+Za ukupni iznos tablica drži indeks kumulativnih "stopa-dana" po rednom broju
+dana, pa je kamata za bilo koji interval dva dohvata i jedno oduzimanje,
+neovisno o broju razdoblja.
+"""
+from collections import namedtuple
+from datetime import date
+
+import numpy as np
+
+VRSTE_ODNOSA = ("ostali", "trgovacki")
+
+# Početak razdoblja, stopa u ostalim odnosima, stopa u trgovačkim ugovorima (%).
+# Od 1.1.2023. stopa = kamatna stopa ESB-a na posljednje glavne operacije
+# refinanciranja + 3 p.p. (ostali odnosi), odnosno + 8 p.p. (trgovački ugovori).
+# Posljednje razdoblje vrijedi dok se ne doda novo (TablicaStopa.dodaj_razdoblje).
+RAZDOBLJA_STOPA = [
+    (date(2023, 1, 1), 5.50, 10.50),
+    (date(2023, 7, 1), 7.00, 12.00),
+    (date(2024, 1, 1), 7.50, 12.50),
+    (date(2024, 7, 1), 7.25, 12.25),
+    (date(2025, 1, 1), 6.15, 11.15),
+    (date(2025, 7, 1), 5.15, 10.15),
+]
+
+ObracunKamata = namedtuple("ObracunKamata", ["ukupno", "po_razdobljima", "dani", "verzija", "nepokriveno"])
+
+
+def u_dane(datumi):
+    """Pretvara datum(e) (date, 'YYYY-MM-DD', datetime64) u redne brojeve dana (int64)."""
+    return np.asarray(datumi, dtype="datetime64[D]").astype(np.int64)
+
+
+class TablicaStopa:
+    """
+    Verzionirana tablica razdoblja i stopa zatezne kamate.
+    Verzija je datum početka posljednjeg razdoblja pa se iz rezultata obračuna
+    uvijek vidi prema kojoj je tablici izračunat.
+
+    kumulativ[vrsta][k] je zbroj dnevnih stopa za dane [prvi početak, prvi
+    početak + k) i pokriva sve do početka posljednjeg razdoblja; dalje se
+    produljuje posljednjom stopom, bez spremanja.
+    """
+
+    def __init__(self, razdoblja):
+        if not razdoblja:
+            raise ValueError("Tablica stopa mora imati barem jedno razdoblje.")
+        self.razdoblja = []
+        self.pocetci = np.empty(0, dtype=np.int64)
+        self.stope = {vrsta: np.empty(0) for vrsta in VRSTE_ODNOSA}
+        self.kumulativ = {vrsta: np.zeros(1) for vrsta in VRSTE_ODNOSA}
+        for pocetak, stopa_ostali, stopa_trgovacki in razdoblja:
+            self.dodaj_razdoblje(pocetak, stopa_ostali, stopa_trgovacki)
+
+    @property
+    def verzija(self):
+        return self.razdoblja[-1][0].isoformat()
+
+    def dodaj_razdoblje(self, pocetak, stopa_ostali, stopa_trgovacki):
+        dan = int(u_dane(pocetak))
+        if len(self.pocetci) and dan <= self.pocetci[-1]:
+            raise ValueError(f"Novo razdoblje ({pocetak}) mora početi nakon posljednjeg ({self.razdoblja[-1][0]}).")
+        if len(self.pocetci):
+            # Inkrementalno: dosad otvoreno razdoblje zatvara se danom `dan`,
+            # pa se indeks produljuje samo za njegove dane.
+            broj_dana = dan - self.pocetci[-1]
+            for vrsta, kum in self.kumulativ.items():
+                nastavak = kum[-1] + self.stope[vrsta][-1] * np.arange(1, broj_dana + 1)
+                self.kumulativ[vrsta] = np.concatenate((kum, nastavak))
+        self.razdoblja.append((pocetak, stopa_ostali, stopa_trgovacki))
+        self.pocetci = np.append(self.pocetci, dan)
+        self.stope["ostali"] = np.append(self.stope["ostali"], stopa_ostali)
+        self.stope["trgovacki"] = np.append(self.stope["trgovacki"], stopa_trgovacki)
+
+    @property
+    def pocetak(self):
+        return self.razdoblja[0][0]
+
+    def krajevi(self):
+        # Kraj razdoblja je početak sljedećeg; posljednje je otvoreno.
+        return np.append(self.pocetci[1:], np.iinfo(np.int64).max)
+
+    def stopa_dani(self, dani, vrsta="ostali"):
+        """Kumulativ stopa-dana od početka tablice do dana `dani` (redni broj, bez tog dana)."""
+        pomak = np.asarray(dani, dtype=np.int64) - self.pocetci[0]
+        if np.any(pomak < 0):
+            raise ValueError(f"Tablica stopa ne pokriva razdoblje prije {self.razdoblja[0][0].strftime('%d.%m.%Y.')}")
+        kum = self.kumulativ[vrsta]
+        zadnji = len(kum) - 1
+        return np.where(pomak <= zadnji,
+                        kum[np.minimum(pomak, zadnji)],
+                        kum[zadnji] + (pomak - zadnji) * self.stope[vrsta][-1])
+
+    def kamata(self, glavnice, dospijeca, obracuni, vrsta="ostali"):
+        """Ukupna kamata za interval [dospijeće, obračun) preko indeksa, O(1) po tražbini."""
+        od = u_dane(dospijeca)
+        do = u_dane(obracuni)
+        # Intervali bez dana kamate ne smiju pasti na provjeri pokrivenosti indeksa.
+        prazno = do <= od
+        od = np.where(prazno, self.pocetci[0], od)
+        do = np.where(prazno, self.pocetci[0], do)
+        return np.asarray(glavnice, dtype=float) * (self.stopa_dani(do, vrsta) - self.stopa_dani(od, vrsta)) / 36500
+
+
+ZADANA_TABLICA = TablicaStopa(RAZDOBLJA_STOPA)
+
+
+def izracunaj_kamate(glavnice, dospijeca, obracuni, vrsta="ostali", tablica=None, po_razdobljima=True):
+    """
+    Obračun za niz tražbina (glavnica, dospijeće, datum obračuna).
+    Vraća ObracunKamata: ukupno (n,), po_razdobljima (n, P) u EUR i dani (n, P).
+    Kamata teče za dane u intervalu [dospijeće, obračun), proporcionalnom
+    metodom (glavnica * stopa * dani / 36500).
+    Uz po_razdobljima=False računa se samo ukupno (preko indeksa), bez
+    matrice n x P.
+    Tražbina koja dospijeva prije početka tablice ne obračunava se, ali ne
+    ruši obračun ostalih: u nepokriveno (n,) je True, a iznosi su joj NaN.
+    """
+    tablica = tablica or ZADANA_TABLICA
+    if vrsta not in VRSTE_ODNOSA:
+        raise ValueError(f"Nepoznata vrsta odnosa: {vrsta}")
+    glavnice = np.atleast_1d(np.asarray(glavnice, dtype=float))
+    od = np.atleast_1d(u_dane(dospijeca))
+    do = np.atleast_1d(u_dane(obracuni))
+    nepokriveno = (od < tablica.pocetci[0]) & (od < do)
+    if nepokriveno.any():
+        # Prazan interval: indeks se ne traži, a iznos se poslije zamjenjuje s NaN
+        od = np.where(nepokriveno, do, od)
+
+    ukupno = tablica.kamata(glavnice, od, do, vrsta)
+    ukupno[nepokriveno] = np.nan
+    if not po_razdobljima:
+        return ObracunKamata(ukupno, None, None, tablica.verzija, nepokriveno)
+
+    dani = np.minimum(do[:, None], tablica.krajevi()[None, :]) - np.maximum(od[:, None], tablica.pocetci[None, :])
+    np.clip(dani, 0, None, out=dani)
+    po_razdobljima = glavnice[:, None] * tablica.stope[vrsta][None, :] * dani / 36500
+    po_razdobljima[nepokriveno] = np.nan
+    return ObracunKamata(ukupno, po_razdobljima, dani, tablica.verzija, nepokriveno)
+
+
+def izracunaj_kamatu(glavnica, dospijece, obracun, vrsta="ostali", tablica=None):
+    """
+    Obračun jedne tražbine za prikaz u sučelju.
+    Vraća (ukupna kamata, popis razdoblja s obračunatim danima).
+    """
+    tablica = tablica or ZADANA_TABLICA
+    rezultat = izracunaj_kamate([glavnica], [dospijece], [obracun], vrsta, tablica)
+    if rezultat.nepokriveno[0]:
+        raise ValueError(f"Tablica stopa ne pokriva razdoblje prije {tablica.pocetak.strftime('%d.%m.%Y.')} "
+                         f"(dospijeće {np.datetime64(dospijece, 'D').astype(object).strftime('%d.%m.%Y.')}).")
+    stupac = VRSTE_ODNOSA.index(vrsta) + 1
+    razdoblja = []
+    for p, dana in enumerate(rezultat.dani[0]):
+        if dana > 0:
+            razdoblja.append({
+                'Razdoblje od': tablica.razdoblja[p][0].strftime('%d.%m.%Y.'),
+                'Stopa (%)': tablica.razdoblja[p][stupac],
+                'Dana': int(dana),
+                'Kamata (EUR)': round(float(rezultat.po_razdobljima[0, p]), 2),
+            })
+    return float(rezultat.ukupno[0]), razdoblja
@@ -0,0 +1,269 @@
+"""
+Knjižnica standardnih klauzula s invertiranim indeksom za pretraživanje.
+
+Klauzule se čuvaju u zajedničkoj SQLite bazi, a indeks (pojam -> popis id-ova
+klauzula) u zasebnoj sažetoj datoteci koja se pri pokretanju mapira u
+memoriju (mmap) umjesto da se gradi iznova. Klauzule dodane nakon zadnjeg
+zapisa indeksa drže se u malom indeksu u memoriji i pretražuju zajedno s
+mapiranim; kad ih se skupi dovoljno, indeks se ponovno zapisuje.
+
+Pojmovi se svode na mala slova bez dijakritika i skraćuju za česte hrvatske
+nastavke, pa "nadležnost", "nadleznosti" i "nadležnošću" daju isti pojam.
+
+Oblik datoteke indeksa (little-endian, poravnato na 4 bajta):
+    zaglavlje: oznaka, broj pojmova, zadnji indeksirani id
+    pomaci pojmova (u32 x (pojmova + 1)), pomaci popisa (u32 x (pojmova + 1))
+    pojmovi (UTF-8, poredani), popisi id-ova (u32, rastuće)
+"""
+import mmap
+import os
+import re
+import struct
+import threading
+from bisect import bisect_left
+from functools import lru_cache
+
+from pravni_alat.baza import ZADANA_BAZA, otvori
+from pravni_alat.stranke import svedi_naziv
+
+_SHEMA = """
+CREATE TABLE IF NOT EXISTS klauzule (
+    id INTEGER PRIMARY KEY,
+    naslov TEXT NOT NULL,
+    kategorija TEXT NOT NULL DEFAULT '',
+    tekst TEXT NOT NULL
+);
+"""
+
+_OZNAKA = b"PAKLIDX1"
+_ZAGLAVLJE = struct.Struct("<8sII")
+
+# Koliko klauzula smije biti samo u memorijskom indeksu prije ponovnog zapisa datoteke
+PRAG_ZAPISA = 1000
+
+_RIJEC = re.compile(r"\w+")
+# Nastavci se traže nad svedenim tekstom (bez dijakritika), najdulji prvi;
+# osnova mora ostati duga barem 3 slova. "-ošću" (nadležnošću) vraća se na "-ost".
+_NASTAVCI = sorted([
+    "ovima", "evima", "ima", "ama", "ega", "emu", "oga", "omu", "iji", "ija", "iju",
+    "om", "em", "og", "oj", "ih", "im", "a", "e", "i", "o", "u",
+], key=len, reverse=True)
+
+ZADANE_KLAUZULE = [
+    ("Povjerljivost", "Povjerljivost", "Ugovorne strane obvezuju se čuvati kao poslovnu tajnu sve podatke i informacije koje saznaju u vezi s izvršenjem ovog Ugovora te ih bez prethodne pisane suglasnosti druge strane neće otkriti trećim osobama, osim ako je to propisano zakonom. Obveza čuvanja povjerljivosti traje i nakon prestanka ovog Ugovora."),
+    ("Nadležnost suda", "Završne odredbe", "Ugovorne strane suglasno utvrđuju da će sve sporove koji proizlaze iz ovog Ugovora nastojati riješiti mirnim putem. Ako to ne bude moguće, za rješavanje sporova nadležan je stvarno nadležni sud u Zagrebu."),
+    ("Ugovorna kazna", "Odgovornost", "Ako Izvođač zakasni s ispunjenjem obveze, dužan je Naručitelju platiti ugovornu kaznu u iznosu od 0,5 % ugovorene cijene za svaki dan zakašnjenja, a najviše do 10 % ugovorene cijene. Plaćanjem ugovorne kazne ne isključuje se pravo na naknadu štete u iznosu većem od ugovorne kazne."),
+    ("Viša sila", "Odgovornost", "Ugovorne strane ne odgovaraju za neispunjenje obveza iz ovog Ugovora uzrokovano višom silom. Strana pogođena višom silom dužna je o tome bez odgode pisano obavijestiti drugu stranu."),
+    ("Izmjene ugovora", "Završne odredbe", "Sve izmjene i dopune ovog Ugovora valjane su samo ako su sastavljene u pisanom obliku i potpisane od obiju ugovornih strana."),
+    ("Primjerci ugovora", "Završne odredbe", "Ovaj Ugovor sastavljen je u 2 (dva) istovjetna primjerka, od kojih svaka ugovorna strana zadržava po 1 (jedan) primjerak."),
+]
+
+
+# Hrvatska slova izravnom zamjenom (replace je brži od translate); ostalo (rijetko) ide kroz svedi_naziv
+_HRVATSKA_SLOVA = (("č", "c"), ("ć", "c"), ("ž", "z"), ("š", "s"), ("đ", "d"))
+
+
+@lru_cache(maxsize=65536)
+def pojam(rijec):
+    """Skraćena svedena riječ (ključ indeksa)."""
+    if rijec.endswith("oscu"):
+        return rijec[:-4] + "ost"
+    for nastavak in _NASTAVCI:
+        if rijec.endswith(nastavak) and len(rijec) - len(nastavak) >= 3:
+            return rijec[:-len(nastavak)]
+    return rijec
+
+
+def pojmovi(tekst):
+    tekst = (tekst or "").lower()
+    for slovo, zamjena in _HRVATSKA_SLOVA:
+        tekst = tekst.replace(slovo, zamjena)
+    if not tekst.isascii():
+        tekst = svedi_naziv(tekst)
+    return {pojam(r) for r in set(_RIJEC.findall(tekst))}
+
+
+class _MapiraniIndeks:
+    """Indeks iz datoteke, čitan izravno iz mmap-a (bez učitavanja u memoriju)."""
+
+    def __init__(self, putanja):
+        import numpy as np
+
+        self._datoteka = open(putanja, "rb")
+        self._mm = mmap.mmap(self._datoteka.fileno(), 0, access=mmap.ACCESS_READ)
+        oznaka, self.broj_pojmova, self.zadnji_id = _ZAGLAVLJE.unpack_from(self._mm, 0)
+        if oznaka != _OZNAKA:
+            raise ValueError(f"{putanja} nije datoteka indeksa klauzula")
+        n = self.broj_pojmova + 1
+        pomak = _ZAGLAVLJE.size
+        self._pomaci_pojmova = np.frombuffer(self._mm, dtype="<u4", count=n, offset=pomak)
+        self._pomaci_popisa = np.frombuffer(self._mm, dtype="<u4", count=n, offset=pomak + 4 * n)
+        self._pojmovi_od = pomak + 8 * n
+        self._popisi_od = self._pojmovi_od + _poravnato(int(self._pomaci_pojmova[-1]))
+
+    def _pojam(self, i):
+        od = self._pojmovi_od
+        return self._mm[od + int(self._pomaci_pojmova[i]):od + int(self._pomaci_pojmova[i + 1])]
+
+    def popis(self, kljuc):
+        import numpy as np
+
+        trazeni = kljuc.encode("utf-8")
+        i = bisect_left(range(self.broj_pojmova), trazeni, key=self._pojam)
+        if i == self.broj_pojmova or self._pojam(i) != trazeni:
+            return np.empty(0, dtype="<u4")
+        od, do = int(self._pomaci_popisa[i]), int(self._pomaci_popisa[i + 1])
+        return np.frombuffer(self._mm, dtype="<u4", count=do - od, offset=self._popisi_od + 4 * od)
+
+    def stavke(self):
+        import numpy as np
+
+        for i in range(self.broj_pojmova):
+            od, do = int(self._pomaci_popisa[i]), int(self._pomaci_popisa[i + 1])
+            yield self._pojam(i).decode("utf-8"), np.frombuffer(self._mm, dtype="<u4", count=do - od, offset=self._popisi_od + 4 * od)
+
+    def zatvori(self):
+        # NumPy pogledi na mmap moraju nestati prije zatvaranja
+        self._pomaci_pojmova = self._pomaci_popisa = None
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # netko još drži pogled na popis; mapiranje se oslobađa s njim
+        self._datoteka.close()
+
+
+def _poravnato(n):
+    return (n + 3) & ~3
+
+
+def zapisi_indeks(putanja, popisi, zadnji_id):
+    """Zapisuje indeks {pojam: rastući popis id-ova} u datoteku."""
+    import numpy as np
+
+    poredani = sorted(popisi)
+    kodirani = [p.encode("utf-8") for p in poredani]
+    pomaci_pojmova = np.zeros(len(poredani) + 1, dtype="<u4")
+    np.cumsum([len(p) for p in kodirani], out=pomaci_pojmova[1:])
+    pomaci_popisa = np.zeros(len(poredani) + 1, dtype="<u4")
+    np.cumsum([len(popisi[p]) for p in poredani], out=pomaci_popisa[1:])
+    pojmovi_blob = b"".join(kodirani)
+    with open(putanja, "wb") as f:
+        f.write(_ZAGLAVLJE.pack(_OZNAKA, len(poredani), zadnji_id))
+        f.write(pomaci_pojmova.tobytes())
+        f.write(pomaci_popisa.tobytes())
+        f.write(pojmovi_blob + b"\0" * (_poravnato(len(pojmovi_blob)) - len(pojmovi_blob)))
+        for p in poredani:
+            f.write(np.asarray(popisi[p], dtype="<u4").tobytes())
+
+
+class KnjiznicaKlauzula:
+    """Klauzule u SQLite bazi + invertirani indeks (mmap datoteka i dodaci u memoriji)."""
+
+    def __init__(self, putanja=None, putanja_indeksa=None):
+        putanja = putanja or ZADANA_BAZA
+        self._veza = otvori(putanja)
+        self._veza.executescript(_SHEMA)
+        self._brava = threading.Lock()
+        self.putanja_indeksa = putanja_indeksa or (None if putanja == ":memory:" else f"{putanja}.klauzule")
+        self._mapirani = None
+        self._dodaci = {}  # pojam -> [id, ...] za klauzule koje nisu u datoteci
+        self._dodanih = 0
+        self._zadnji_id = 0
+        if self.putanja_indeksa and os.path.exists(self.putanja_indeksa):
+            self._mapirani = _MapiraniIndeks(self.putanja_indeksa)
+            self._zadnji_id = self._mapirani.zadnji_id
+        if self._veza.execute("SELECT 1 FROM klauzule LIMIT 1").fetchone():
+            with self._brava:
+                self._indeksiraj_nove()
+        else:
+            self.uvezi(ZADANE_KLAUZULE)
+        if self._dodanih > PRAG_ZAPISA:
+            self.zapisi_indeks()
+
+    def _indeksiraj_nove(self):
+        # Klauzule upisane nakon zadnjeg indeksiranja idu u memorijski indeks
+        for id_, naslov, tekst in self._veza.execute("SELECT id, naslov, tekst FROM klauzule WHERE id > ? ORDER BY id", (self._zadnji_id,)):
+            for p in pojmovi(f"{naslov} {tekst}"):
+                self._dodaci.setdefault(p, []).append(id_)
+            self._dodanih += 1
+            self._zadnji_id = id_
+
+    def dodaj(self, naslov, tekst, kategorija=""):
+        """Dodaje klauzulu i vraća njezin id; odmah je pretraživa."""
+        if not (naslov or "").strip() or not (tekst or "").strip():
+            raise ValueError("Klauzula mora imati naslov i tekst.")
+        with self._brava:
+            with self._veza:
+                id_ = self._veza.execute("INSERT INTO klauzule (naslov, kategorija, tekst) VALUES (?, ?, ?)", (naslov.strip(), kategorija or "", tekst.strip())).lastrowid
+            self._indeksiraj_nove()
+            prag = self._dodanih > PRAG_ZAPISA
+        if prag:
+            self.zapisi_indeks()
+        return id_
+
+    def uvezi(self, klauzule):
+        """Skupni unos (naslov, kategorija, tekst) u jednoj transakciji; vraća broj klauzula."""
+        with self._brava:
+            with self._veza:
+                n = self._veza.executemany("INSERT INTO klauzule (naslov, kategorija, tekst) VALUES (?, ?, ?)", klauzule).rowcount
+            self._indeksiraj_nove()
+            prag = self._dodanih > PRAG_ZAPISA
+        if prag:
+            self.zapisi_indeks()
+        return n
+
+    def zapisi_indeks(self):
+        """Spaja mapirani indeks i memorijske dodatke u novu datoteku i mapira je."""
+        import numpy as np
+
+        with self._brava:
+            if not self.putanja_indeksa:
+                return
+            popisi = dict(self._mapirani.stavke()) if self._mapirani is not None else {}
+            for p, ids in self._dodaci.items():
+                popisi[p] = np.concatenate([popisi[p], np.asarray(ids, dtype="<u4")]) if p in popisi else ids
+            # Nova datoteka zamjenjuje staru tek kad je cijela zapisana
+            privremena = f"{self.putanja_indeksa}.tmp"
+            zapisi_indeks(privremena, popisi, self._zadnji_id)
+            del popisi
+            if self._mapirani is not None:
+                self._mapirani.zatvori()
+            os.replace(privremena, self.putanja_indeksa)
+            self._mapirani = _MapiraniIndeks(self.putanja_indeksa)
+            self._dodaci, self._dodanih = {}, 0
+
+    def _popis(self, p):
+        import numpy as np
+
+        iz_datoteke = self._mapirani.popis(p) if self._mapirani is not None else np.empty(0, dtype="<u4")
+        dodani = self._dodaci.get(p)
+        return np.concatenate([iz_datoteke, np.asarray(dodani, dtype="<u4")]) if dodani else iz_datoteke
+
+    def trazi(self, upit, ograniceno=20):
+        """Klauzule koje sadrže sve pojmove upita (naslov ili tekst), najnovije prve."""
+        import numpy as np
+
+        trazeni = sorted(pojmovi(upit or ""))
+        if not trazeni:
+            return []
+        with self._brava:
+            popisi = sorted((self._popis(p) for p in trazeni), key=len)
+            pogoci = popisi[0]
+            for popis in popisi[1:]:
+                if not len(pogoci):
+                    break
+                pogoci = np.intersect1d(pogoci, popis, assume_unique=True)
+            ids = [int(i) for i in pogoci[::-1][:ograniceno]]
+            if not ids:
+                return []
+            redovi = self._veza.execute(f"SELECT id, naslov, kategorija, tekst FROM klauzule WHERE id IN ({', '.join('?' * len(ids))}) ORDER BY id DESC", ids).fetchall()
+        return [dict(zip(("id", "naslov", "kategorija", "tekst"), red)) for red in redovi]
+
+    def __len__(self):
+        with self._brava:
+            return self._veza.execute("SELECT COUNT(*) FROM klauzule").fetchone()[0]
+
+    def zatvori(self):
+        if self._mapirani is not None:
+            self._mapirani.zatvori()
+        self._veza.close()
@@ -0,0 +1,127 @@
+"""
+Knjiga dugovanja jednog dužnika: više računa, više (djelomičnih) uplata.
+
+Sve promjene (dospijeća računa, uplate, promjene stope) slažu se u jednu
+sortiranu vremensku crtu koja se prolazi jednom: O(n log n) za sortiranje,
+a kamata između dva događaja dohvaća se iz indeksa stopa u O(1).
+Uplata se prema čl. 172. ZOO prvo uračunava u troškove, zatim u kamatu i
+na kraju u glavnicu, a glavnica se zatvara od najstarijeg dospjelog računa
+(čl. 171. ZOO).
+"""
+from collections import deque
+from datetime import date
+
+import numpy as np
+
+from pravni_alat.kamate import ZADANA_TABLICA, u_dane
+
+# Redoslijed događaja istog dana: promjena stope, dospijeće, uplata, obračun.
+PROMJENA_STOPE, DOSPIJECE, UPLATA, OBRACUN = range(4)
+
+_EPOHA = date(1970, 1, 1).toordinal()
+
+
+def obracunaj_knjigu(racuni, uplate, obracun, troskovi=0.0, vrsta="ostali", tablica=None):
+    """
+    racuni: [{'oznaka', 'iznos', 'dospijece'}], uplate: [{'datum', 'iznos'}]
+    (datumi kao date ili 'YYYY-MM-DD'), obracun: datum obračuna.
+    Vraća {'glavnica', 'kamata', 'troskovi', 'preplata', 'specifikacija'},
+    gdje je specifikacija popis redaka sa stanjem nakon svakog događaja.
+    """
+    tablica = tablica or ZADANA_TABLICA
+    dan_obracuna = int(u_dane(obracun))
+
+    racuni = list(racuni)
+    uplate = list(uplate)
+    # Datumi se pretvaraju u redne brojeve dana jednim pozivom po popisu.
+    dani_racuna = u_dane([r['dospijece'] for r in racuni]).tolist()
+    dani_uplata = u_dane([u['datum'] for u in uplate]).tolist()
+
+    dogadaji = []
+    for r, dan in zip(racuni, dani_racuna):
+        if dan < dan_obracuna:
+            dogadaji.append((dan, DOSPIJECE, float(r['iznos']), r.get('oznaka', '')))
+    prvo_dospijece = min((d[0] for d in dogadaji), default=dan_obracuna)
+    if prvo_dospijece < tablica.pocetci[0]:
+        racun = f"Račun {next(d[3] for d in dogadaji if d[0] == prvo_dospijece)}".strip()
+        raise ValueError(f"{racun} dospijeva {date.fromordinal(prvo_dospijece + _EPOHA).strftime('%d.%m.%Y.')}, "
+                         f"prije početka tablice stopa ({tablica.pocetak.strftime('%d.%m.%Y.')}).")
+    for u, dan in zip(uplate, dani_uplata):
+        if dan < dan_obracuna:
+            dogadaji.append((dan, UPLATA, float(u['iznos']), u.get('opis', '')))
+    for p, pocetak in enumerate(tablica.pocetci.tolist()):
+        if prvo_dospijece < pocetak < dan_obracuna:
+            dogadaji.append((pocetak, PROMJENA_STOPE, float(tablica.stope[vrsta][p]), ''))
+    dogadaji.sort(key=lambda d: (d[0], d[1]))
+    dogadaji.append((dan_obracuna, OBRACUN, 0.0, ''))
+
+    # Kumulativ stopa-dana za sve događaje u jednom pozivu; dani prije prvog
+    # dospijeća ne nose kamatu pa se za njih indeks ne smije tražiti.
+    dani = np.array([d[0] for d in dogadaji], dtype=np.int64)
+    kumulativ = tablica.stopa_dani(np.maximum(dani, prvo_dospijece), vrsta).tolist()
+
+    otvoreni = deque()  # [oznaka, preostala glavnica], od najstarijeg
+    glavnica = kamata = preplata = 0.0
+    troskovi = float(troskovi)
+    specifikacija = []
+    datumi = {}  # redni broj dana -> 'dd.mm.gggg.', događaji se gomilaju na istim danima
+    prethodni = kumulativ[0]
+
+    for (dan, vrsta_dogadaja, iznos, opis), kum in zip(dogadaji, kumulativ):
+        obracunato = glavnica * (kum - prethodni) / 36500
+        kamata += obracunato
+        prethodni = kum
+
+        if vrsta_dogadaja == DOSPIJECE:
+            naziv = f"Dospijeće računa {opis}".strip()
+            # Ranija preplata odmah se uračunava u novi račun.
+            umanjenje = min(preplata, iznos)
+            preplata -= umanjenje
+            if iznos - umanjenje > 0:
+                otvoreni.append([opis, iznos - umanjenje])
+                glavnica += iznos - umanjenje
+        elif vrsta_dogadaja == UPLATA:
+            naziv = f"Uplata {opis}".strip()
+            ostatak = iznos
+            za_troskove = min(ostatak, troskovi)
+            troskovi -= za_troskove
+            ostatak -= za_troskove
+            za_kamatu = min(ostatak, kamata)
+            kamata -= za_kamatu
+            ostatak -= za_kamatu
+            while ostatak > 0 and otvoreni:
+                racun = otvoreni[0]
+                zatvoreno = min(ostatak, racun[1])
+                racun[1] -= zatvoreno
+                glavnica -= zatvoreno
+                ostatak -= zatvoreno
+                if racun[1] <= 0:
+                    otvoreni.popleft()
+            preplata += ostatak
+        elif vrsta_dogadaja == PROMJENA_STOPE:
+            naziv = f"Promjena stope na {iznos:.2f} %"
+            iznos = 0.0
+        else:
+            naziv = "Stanje na dan obračuna"
+
+        if dan not in datumi:
+            datumi[dan] = date.fromordinal(dan + _EPOHA).strftime('%d.%m.%Y.')
+        specifikacija.append({
+            'Datum': datumi[dan],
+            'Događaj': naziv,
+            'Iznos (EUR)': round(iznos, 2),
+            'Kamata razdoblja (EUR)': round(obracunato, 2),
+            'Glavnica (EUR)': round(glavnica, 2),
+            'Kamata (EUR)': round(kamata, 2),
+            'Troškovi (EUR)': round(troskovi, 2),
+        })
+
+    return {
+        'glavnica': glavnica,
+        'kamata': kamata,
+        'troskovi': troskovi,
+        'preplata': preplata,
+        'specifikacija': specifikacija,
+        'obracun': date.fromordinal(dan_obracuna + _EPOHA),
+        'verzija': tablica.verzija,
+    }
@@ -0,0 +1,56 @@
+"""
+Generatori dokumenata s procesno zajedničkom predmemorijom rezultata.
+
+Ista imena kao u pravni_alat.dokumenti i pravni_alat.docx, ali ponovljeni
+poziv s istim ulazima (npr. višestruki klik na "Generiraj") vraća već
+složen dokument. Predmemorija
+je zajednička svim sesijama u procesu i ograničena ukupnom veličinom ključeva i
+dokumenata, a ne samo brojem unosa: ključ pripremi_za_word i docx_iz_html je
+cijeli HTML, pa bi 256 velikih ugovora držalo stotine MB. Ograničenja i trajanje
+unosa mijenjaju se preko PREDMEMORIJA_DOKUMENATA.kapacitet, .najvise_bajtova,
+.najveca_stavka i .ttl.
+
+Generatori koji upisuju današnji datum imaju datum u ključu, a oni koji mogu
+računati zateznu kamatu i verziju tablice stopa. Skupne obrade (skupno,
+renderiranje) namjerno koriste nepredmemorirane generatore.
+
+Uz uključeno mjerenje (pravni_alat.mjerenje) svaki poziv, i pogodak i
+promašaj predmemorije, ide u histogram "generator", "word" ili "preuzimanje".
+"""
+import sys
+from datetime import date
+
+from pravni_alat import docx, dokumenti
+from pravni_alat.mjerenje import mjeri
+from pravni_alat.predmemorija import LRUPredmemorija, memoiziraj
+
+# Dokument veći od najveca_stavka (ključ + vrijednost) generira se svaki put iznova
+PREDMEMORIJA_DOKUMENATA = LRUPredmemorija(kapacitet=256, ttl=3600, najvise_bajtova=64 * 2**20, najveca_stavka=8 * 2**20)
+
+
+def _verzija_stopa():
+    # Bez uvoza kamata (NumPy): ako modul još nije učitan, tablica nije ni korištena.
+    kamate = sys.modules.get("pravni_alat.kamate")
+    return kamate.ZADANA_TABLICA.verzija if kamate else None
+
+
+_deterministicki = memoiziraj(PREDMEMORIJA_DOKUMENATA)
+_s_datumom = memoiziraj(PREDMEMORIJA_DOKUMENATA, dodatni_kljuc=date.today)
+_s_kamatom = memoiziraj(PREDMEMORIJA_DOKUMENATA, dodatni_kljuc=_verzija_stopa)
+_generator = mjeri("generator")
+
+generiraj_prilagodeni_ugovor = _generator(_deterministicki(dokumenti.generiraj_prilagodeni_ugovor))
+generiraj_tuzbu_pro = _generator(_s_kamatom(dokumenti.generiraj_tuzbu_pro))
+generiraj_ovrhu_pro = _generator(_s_kamatom(dokumenti.generiraj_ovrhu_pro))
+generiraj_zalbu_pro = _generator(_s_datumom(dokumenti.generiraj_zalbu_pro))
+generiraj_ugovor_standard = _generator(_s_datumom(dokumenti.generiraj_ugovor_standard))
+generiraj_ugovor_o_radu = _generator(_s_datumom(dokumenti.generiraj_ugovor_o_radu))
+generiraj_otkaz = _generator(_deterministicki(dokumenti.generiraj_otkaz))
+generiraj_tabularnu_doc = _generator(_deterministicki(dokumenti.generiraj_tabularnu_doc))
+generiraj_zk_prijedlog = _generator(_deterministicki(dokumenti.generiraj_zk_prijedlog))
+generiraj_brisovnu_tuzbu = _generator(_s_datumom(dokumenti.generiraj_brisovnu_tuzbu))
+
+# Ključ je sam HTML: kod pogotka generatora stiže isti objekt stringa čiji je
+# sažetak već izračunat, pa je provjera O(1) umjesto ponovnog sažimanja dokumenta.
+pripremi_za_word = mjeri("word")(memoiziraj(PREDMEMORIJA_DOKUMENATA, kljuc=lambda html_sadrzaj: html_sadrzaj)(dokumenti.pripremi_za_word))
+docx_iz_html = mjeri("preuzimanje")(memoiziraj(PREDMEMORIJA_DOKUMENATA, kljuc=lambda html_sadrzaj: html_sadrzaj)(docx.docx_iz_html))
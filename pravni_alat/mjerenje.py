@@ -0,0 +1,272 @@
+"""
+Mjerenje trajanja vrućih dijelova reruna: grana modula, generatori,
+pripremi_za_word i priprema preuzimanja.
+
+Trajanja se slažu u histograme s nepromjenjivim granicama (kao u
+Prometheusu), a prometheus_tekst() ih ispisuje u tekstualnom formatu za
+lokalni poslužitelj (pokreni_posluzitelj, putanja /metrics).
+
+Uključuje se varijablama okoline:
+  PRAVNI_ALAT_METRIKE          port ili adresa:port poslužitelja metrika (npr. 9464)
+  PRAVNI_ALAT_SPORI_RERUN_MS   uzorkovanje stoga za vrijeme reruna; reruni sporiji od
+                               ovoliko milisekundi zapisuju se u PRAVNI_ALAT_PROFILI
+                               kao sažeti stogovi (format za flamegraph/speedscope)
+
+Bez njih raspon() vraća zajednički prazan objekt, a mjeri() vraća funkciju
+nepromijenjenu, pa isključeno mjerenje ne košta gotovo ništa.
+"""
+import functools
+import os
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime
+
+METRIKE = os.environ.get("PRAVNI_ALAT_METRIKE", "")
+PRAG_SPOROG_RERUNA_MS = float(os.environ.get("PRAVNI_ALAT_SPORI_RERUN_MS") or 0)
+MAPA_PROFILA = os.environ.get("PRAVNI_ALAT_PROFILI", os.path.join(tempfile.gettempdir(), "pravni_alat_profili"))
+UKLJUCENO = bool(METRIKE or PRAG_SPOROG_RERUNA_MS)
+
+# Gornje granice razreda histograma u sekundama (+Inf se dodaje pri ispisu)
+GRANICE_S = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Razmak uzorkovanja stoga za vrijeme reruna
+RAZMAK_UZORKA_S = 0.005
+
+IME_METRIKE = "pravni_alat_trajanje_sekundi"
+
+
+class _Histogram:
+    __slots__ = ("brojevi", "zbroj_ns", "brava")
+    granice_ns = [round(g * 1e9) for g in GRANICE_S]
+
+    def __init__(self):
+        self.brojevi = [0] * (len(GRANICE_S) + 1)
+        self.zbroj_ns = 0
+        self.brava = threading.Lock()
+
+    def zabiljezi(self, ns):
+        razred = bisect_left(self.granice_ns, ns)
+        with self.brava:
+            self.brojevi[razred] += 1
+            self.zbroj_ns += ns
+
+
+_HISTOGRAMI = {}  # (vrsta, naziv) -> _Histogram
+_BRAVA_REGISTRA = threading.Lock()
+
+
+def _histogram(vrsta, naziv):
+    histogram = _HISTOGRAMI.get((vrsta, naziv))
+    if histogram is None:
+        with _BRAVA_REGISTRA:
+            histogram = _HISTOGRAMI.setdefault((vrsta, naziv), _Histogram())
+    return histogram
+
+
+class _Prazno:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tip, iznimka, trag):
+        return None
+
+
+_PRAZNO = _Prazno()
+
+
+class _Raspon:
+    __slots__ = ("histogram", "pocetak")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.pocetak = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, tip, iznimka, trag):
+        self.histogram.zabiljezi(time.perf_counter_ns() - self.pocetak)
+        return None
+
+
+def raspon(vrsta, naziv):
+    """Kontekst koji trajanje bloka upisuje u histogram (vrsta, naziv), npr. raspon("preuzimanje", "zapisi_docx")."""
+    if not UKLJUCENO:
+        return _PRAZNO
+    return _Raspon(_histogram(vrsta, naziv))
+
+
+def mjeri(vrsta, naziv=None):
+    """Dekorator: svaki poziv funkcije ide u histogram (vrsta, naziv ili ime funkcije); isključen vraća funkciju."""
+    def omotac(fn):
+        if not UKLJUCENO:
+            return fn
+        histogram = _histogram(vrsta, naziv or fn.__name__)
+
+        @functools.wraps(fn)
+        def mjereno(*args, **kwargs):
+            pocetak = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.zabiljezi(time.perf_counter_ns() - pocetak)
+        return mjereno
+    return omotac
+
+
+# --- Uzorkovanje sporih reruna ---
+
+def _stog(okvir):
+    dijelovi = []
+    while okvir is not None:
+        kod = okvir.f_code
+        dijelovi.append(f"{os.path.basename(kod.co_filename)}:{kod.co_name}")
+        okvir = okvir.f_back
+    return ";".join(reversed(dijelovi))
+
+
+class _Uzorkivac:
+    """Jedna pozadinska dretva uzorkuje stogove dretvi čiji rerun je u tijeku; miruje kad takvih nema."""
+
+    def __init__(self, razmak):
+        self.razmak = razmak
+        self._pracene = {}  # id dretve -> Counter stogova
+        self._brava = threading.Lock()
+        self._ima_pracenih = threading.Event()
+        self._dretva = None
+
+    def prati(self, id_dretve):
+        with self._brava:
+            self._pracene[id_dretve] = Counter()
+            self._ima_pracenih.set()
+            if self._dretva is None:
+                self._dretva = threading.Thread(target=self._petlja, name="uzorkivac", daemon=True)
+                self._dretva.start()
+
+    def prestani(self, id_dretve):
+        with self._brava:
+            stogovi = self._pracene.pop(id_dretve, None)
+            if not self._pracene:
+                self._ima_pracenih.clear()
+        return stogovi
+
+    def _petlja(self):
+        while True:
+            self._ima_pracenih.wait()
+            time.sleep(self.razmak)
+            with self._brava:
+                pracene = list(self._pracene.items())
+            okviri = sys._current_frames()
+            for id_dretve, stogovi in pracene:
+                okvir = okviri.get(id_dretve)
+                if okvir is not None:
+                    stogovi[_stog(okvir)] += 1
+
+
+_UZORKIVAC = _Uzorkivac(RAZMAK_UZORKA_S) if PRAG_SPOROG_RERUNA_MS else None
+
+
+def _zapisi_profil(naziv, trajanje_ns, stogovi):
+    ime = f"{datetime.now():%Y%m%d_%H%M%S_%f}_{''.join(z if z.isalnum() else '_' for z in naziv)}_{trajanje_ns // 1_000_000}ms.txt"
+    try:
+        os.makedirs(MAPA_PROFILA, exist_ok=True)
+        with open(os.path.join(MAPA_PROFILA, ime), "w", encoding="utf-8") as f:
+            f.writelines(f"{stog} {broj}\n" for stog, broj in stogovi.most_common())
+    except OSError:
+        pass  # profil je dijagnostika; nedostupna mapa ne smije srušiti rerun
+
+
+class _Rerun(_Raspon):
+    __slots__ = ("naziv",)
+
+    def __init__(self, histogram, naziv):
+        super().__init__(histogram)
+        self.naziv = naziv
+
+    def __enter__(self):
+        if _UZORKIVAC:
+            _UZORKIVAC.prati(threading.get_ident())
+        return super().__enter__()
+
+    def __exit__(self, tip, iznimka, trag):
+        trajanje = time.perf_counter_ns() - self.pocetak
+        self.histogram.zabiljezi(trajanje)
+        if _UZORKIVAC:
+            stogovi = _UZORKIVAC.prestani(threading.get_ident())
+            if stogovi and trajanje >= PRAG_SPOROG_RERUNA_MS * 1e6:
+                _zapisi_profil(self.naziv, trajanje, stogovi)
+        return None
+
+
+def rerun(modul):
+    """Kao raspon("modul", modul), uz uzorkovanje stoga i zapis profila sporih reruna (PRAVNI_ALAT_SPORI_RERUN_MS)."""
+    if not UKLJUCENO:
+        return _PRAZNO
+    return _Rerun(_histogram("modul", modul), modul)
+
+
+# --- Izvoz ---
+
+def _oznaka(vrijednost):
+    return vrijednost.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_tekst():
+    """Svi histogrami u tekstualnom formatu Prometheusa (0.0.4)."""
+    redovi = [
+        f"# HELP {IME_METRIKE} Trajanje mjerenih dijelova reruna (modul, generator, word, preuzimanje).",
+        f"# TYPE {IME_METRIKE} histogram",
+    ]
+    granice = [f"{g:g}" for g in GRANICE_S] + ["+Inf"]
+    with _BRAVA_REGISTRA:
+        histogrami = sorted(_HISTOGRAMI.items())
+    for (vrsta, naziv), histogram in histogrami:
+        with histogram.brava:
+            brojevi, zbroj_ns = list(histogram.brojevi), histogram.zbroj_ns
+        oznake = f'vrsta="{_oznaka(vrsta)}",naziv="{_oznaka(naziv)}"'
+        ukupno = 0
+        for granica, broj in zip(granice, brojevi):
+            ukupno += broj
+            redovi.append(f'{IME_METRIKE}_bucket{{{oznake},le="{granica}"}} {ukupno}')
+        redovi.append(f"{IME_METRIKE}_sum{{{oznake}}} {zbroj_ns / 1e9:.9g}")
+        redovi.append(f"{IME_METRIKE}_count{{{oznake}}} {ukupno}")
+    return "\n".join(redovi) + "\n"
+
+
+def pokreni_posluzitelj(adresa=None):
+    """
+    Pokreće HTTP poslužitelj s /metrics u pozadinskoj dretvi i vraća ga.
+    adresa: "port" ili "adresa:port" (zadano PRAVNI_ALAT_METRIKE; bez adrese sluša
+    samo 127.0.0.1). Vraća None ako metrike nisu uključene; zauzet port daje OSError.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    adresa = adresa or METRIKE
+    if not adresa:
+        return None
+    racunalo, _, port = adresa.rpartition(":")
+
+    class Rukovatelj(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            tijelo = prometheus_tekst().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(tijelo)))
+            self.end_headers()
+            self.wfile.write(tijelo)
+
+        def log_message(self, *argumenti):
+            pass
+
+    posluzitelj = ThreadingHTTPServer((racunalo or "127.0.0.1", int(port)), Rukovatelj)
+    posluzitelj.daemon_threads = True
+    threading.Thread(target=posluzitelj.serve_forever, name="metrike", daemon=True).start()
+    return posluzitelj
@@ -0,0 +1,277 @@
+"""
+Automatsko spremanje nacrta: stanje obrazaca (vrijednosti widgeta iz
+st.session_state i struktura personaliziranog ugovora) trajno se čuva u
+lokalnoj SQLite bazi, pa dugačak ugovor ili tužba prežive ponovno
+pokretanje poslužitelja i prekinutu vezu preglednika.
+
+Nacrt je ravan rječnik polje -> vrijednost (str, broj, bool, date, None).
+Svako polje je zaseban redak, pa se upisuju samo polja promijenjena od
+zadnjeg spremanja; vrijednost je kompaktan JSON, a dulji tekstovi sažimaju
+se zlibom. Upisi se odgađaju: promjene jednog nacrta skupljaju se dok
+korisnik ne zastane ODGODA_S sekundi (ali ne dulje od NAJDULJE_S), a
+zatim ih jedna pozadinska dretva upisuje zajedno s promjenama svih drugih
+nacrta u jednoj transakciji. Ako upis ne uspije (npr. baza je zaključana),
+promjene se vraćaju u red i upis se ponavlja nakon iste odgode.
+"""
+import atexit
+import json
+import logging
+import threading
+import time
+import zlib
+from datetime import date, datetime, timedelta
+
+from pravni_alat.baza import otvori
+
+ODGODA_S = 2.0
+NAJDULJE_S = 10.0
+# Nacrt koji se ovoliko ne koristi izbacuje se iz memorije (ostaje u bazi)
+ZADRZI_S = 600
+# Vrijednosti dulje od ovoliko bajtova spremaju se sažete
+SAZIMAJ_OD = 200
+# Prefiks polja strukture personaliziranog ugovora: struktura/<dio>/naslov, struktura/<dio>/<članak>
+STRUKTURA = "struktura/"
+
+_SHEMA = """
+CREATE TABLE IF NOT EXISTS nacrti (
+    nacrt TEXT PRIMARY KEY,
+    promijenjeno TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nacrti_polja (
+    nacrt TEXT NOT NULL,
+    polje TEXT NOT NULL,
+    vrijednost BLOB NOT NULL,
+    PRIMARY KEY (nacrt, polje)
+) WITHOUT ROWID;
+"""
+
+_OBRISANO = object()
+
+_dnevnik = logging.getLogger(__name__)
+
+
+def _u_json(vrijednost):
+    if isinstance(vrijednost, date):
+        return {'$datum': vrijednost.isoformat()}
+    raise TypeError(f"Vrijednost polja nacrta nije podržana: {type(vrijednost).__name__}")
+
+
+def _iz_jsona(objekt):
+    return date.fromisoformat(objekt['$datum']) if '$datum' in objekt else objekt
+
+
+def _provjeri(polje, vrijednost):
+    # datetime je podvrsta date, ali bi se vratio kao date bez vremena
+    if not (vrijednost is None or isinstance(vrijednost, (str, int, float)) or type(vrijednost) is date):
+        raise TypeError(f"Vrijednost polja nacrta {polje} nije podržana: {type(vrijednost).__name__}")
+
+
+def kodiraj(vrijednost):
+    """Kompaktni JSON; dulji se sažima zlibom (sažetak počinje bajtom 'x', koji JSON nikad nema na početku)."""
+    podaci = json.dumps(vrijednost, ensure_ascii=False, separators=(",", ":"), default=_u_json).encode("utf-8")
+    return zlib.compress(podaci) if len(podaci) > SAZIMAJ_OD else podaci
+
+
+def dekodiraj(podaci):
+    podaci = bytes(podaci)
+    if podaci[:1] == b"x":
+        podaci = zlib.decompress(podaci)
+    return json.loads(podaci, object_hook=_iz_jsona)
+
+
+def polja_strukture(struktura):
+    """Struktura ugovora [{'naslov', 'clanci'}] kao ravna polja nacrta (jedan članak = jedno polje)."""
+    polja = {}
+    for i, dio in enumerate(struktura):
+        polja[f"{STRUKTURA}{i}/naslov"] = dio['naslov']
+        for j, clanak in enumerate(dio['clanci']):
+            polja[f"{STRUKTURA}{i}/{j}"] = clanak
+    return polja
+
+
+def struktura_iz_polja(polja):
+    """Obrnuto od polja_strukture; None ako nacrt nema strukturu ugovora."""
+    dijelovi = {}
+    for polje, vrijednost in polja.items():
+        if not polje.startswith(STRUKTURA):
+            continue
+        i, _, j = polje[len(STRUKTURA):].partition("/")
+        dio = dijelovi.setdefault(int(i), {'naslov': "", 'clanci': {}})
+        if j == "naslov":
+            dio['naslov'] = vrijednost
+        else:
+            dio['clanci'][int(j)] = vrijednost
+    if not dijelovi:
+        return None
+    return [{'naslov': dio['naslov'], 'clanci': [tekst for _, tekst in sorted(dio['clanci'].items())]} for _, dio in sorted(dijelovi.items())]
+
+
+def _sada():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class Nacrti:
+    """Nacrti u SQLite bazi `putanja`; spremi() samo bilježi promjene, a upisuje ih pozadinska dretva."""
+
+    def __init__(self, putanja=None, odgoda=ODGODA_S, najdulje=NAJDULJE_S):
+        self.odgoda = odgoda
+        self.najdulje = najdulje
+        self._veza = otvori(putanja)
+        self._veza.executescript(_SHEMA)
+        # Redoslijed zaključavanja: _brava_veze pa _brava (upis mora ostati u redoslijedu promjena)
+        self._brava_veze = threading.Lock()
+        self._brava = threading.Lock()
+        self._uvjet = threading.Condition(self._brava)
+        self._stanje = {}      # nacrt -> {polje: vrijednost} kako je zadnje zabilježeno
+        self._promjene = {}    # nacrt -> {polje: vrijednost ili _OBRISANO} još neupisano
+        self._rokovi = {}      # nacrt -> (prva, zadnja neupisana promjena)
+        self._koristeno = {}   # nacrt -> zadnji pristup
+        self._zatvoren = False
+        self._dretva = threading.Thread(target=self._petlja, name="nacrti", daemon=True)
+        self._dretva.start()
+        atexit.register(self.zatvori)
+
+    def _procitaj(self, nacrt):
+        with self._brava_veze:
+            redovi = self._veza.execute("SELECT polje, vrijednost FROM nacrti_polja WHERE nacrt = ?", (nacrt,)).fetchall()
+        return {polje: dekodiraj(vrijednost) for polje, vrijednost in redovi}
+
+    def _u_memoriji(self, nacrt):
+        # Poziva se bez _brava; nacrt koji nije u memoriji čita se iz baze i prvo čitanje pobjeđuje
+        if nacrt not in self._stanje:
+            procitano = self._procitaj(nacrt)
+            with self._brava:
+                self._stanje.setdefault(nacrt, procitano)
+
+    def ucitaj(self, nacrt):
+        """Sva polja nacrta (prazan rječnik za nepoznat nacrt), uključujući još neupisane promjene."""
+        self._u_memoriji(nacrt)
+        with self._brava:
+            self._koristeno[nacrt] = time.monotonic()
+            return dict(self._stanje.get(nacrt, {}))
+
+    def spremi(self, nacrt, polja, zamijeni=()):
+        """
+        Bilježi trenutačno stanje nacrta i vraća broj promijenjenih polja.
+        Polja kojih nema u `polja` ostaju spremljena (npr. obrasci drugih
+        modula), osim onih koja počinju nekim prefiksom iz `zamijeni`.
+        Nepodržana vrijednost (vidi opis modula) odbija se odmah s TypeError,
+        a da se ništa ne zabilježi.
+        """
+        zamijeni = tuple(zamijeni)
+        self._u_memoriji(nacrt)
+        with self._brava:
+            sada = time.monotonic()
+            self._koristeno[nacrt] = sada
+            stanje = self._stanje.setdefault(nacrt, {})
+            promjene = {polje: v for polje, v in polja.items() if polje not in stanje or stanje[polje] != v}
+            for polje, v in promjene.items():
+                _provjeri(polje, v)
+            if zamijeni:
+                promjene.update((polje, _OBRISANO) for polje in stanje if polje.startswith(zamijeni) and polje not in polja)
+            if not promjene:
+                return 0
+            for polje, v in promjene.items():
+                if v is _OBRISANO:
+                    del stanje[polje]
+                else:
+                    stanje[polje] = v
+            self._promjene.setdefault(nacrt, {}).update(promjene)
+            self._rokovi[nacrt] = (self._rokovi.get(nacrt, (sada,))[0], sada)
+            self._uvjet.notify()
+        return len(promjene)
+
+    def _zapisi(self, nacrti=None):
+        """Upisuje neupisane promjene zadanih nacrta (zadano svih) u jednoj transakciji."""
+        with self._brava_veze:
+            with self._brava:
+                nacrti = list(self._promjene) if nacrti is None else nacrti
+                promjene = {n: self._promjene.pop(n) for n in nacrti if n in self._promjene}
+                for n in nacrti:
+                    self._rokovi.pop(n, None)
+            if not promjene:
+                return 0
+            try:
+                sada = _sada()
+                with self._veza:
+                    self._veza.executemany("INSERT OR REPLACE INTO nacrti_polja (nacrt, polje, vrijednost) VALUES (?, ?, ?)",
+                                           [(n, polje, kodiraj(v)) for n, p in promjene.items() for polje, v in p.items() if v is not _OBRISANO])
+                    self._veza.executemany("DELETE FROM nacrti_polja WHERE nacrt = ? AND polje = ?",
+                                           [(n, polje) for n, p in promjene.items() for polje, v in p.items() if v is _OBRISANO])
+                    self._veza.executemany("INSERT OR REPLACE INTO nacrti (nacrt, promijenjeno) VALUES (?, ?)", [(n, sada) for n in promjene])
+            except Exception:
+                self._vrati(promjene)
+                raise
+        return sum(len(p) for p in promjene.values())
+
+    def _vrati(self, promjene):
+        # Neupisane promjene idu ispred onih zabilježenih za vrijeme upisa; upis se ponavlja nakon odgode
+        with self._brava:
+            sada = time.monotonic()
+            for n, p in promjene.items():
+                self._promjene[n] = {**p, **self._promjene.get(n, {})}
+                self._rokovi.setdefault(n, (sada, sada))
+
+    def _petlja(self):
+        while True:
+            with self._uvjet:
+                while not self._zatvoren:
+                    sada = time.monotonic()
+                    rokovi = [(min(zadnja + self.odgoda, prva + self.najdulje), n) for n, (prva, zadnja) in self._rokovi.items()]
+                    dospjeli = [n for rok, n in rokovi if rok <= sada]
+                    if dospjeli:
+                        break
+                    self._uvjet.wait(min(rokovi)[0] - sada if rokovi else None)
+                else:
+                    return
+                # Nacrti bez neupisanih promjena koji se dugo ne koriste izlaze iz memorije
+                for n, koristeno in list(self._koristeno.items()):
+                    if sada - koristeno > ZADRZI_S and n not in self._promjene:
+                        del self._koristeno[n]
+                        self._stanje.pop(n, None)
+            try:
+                self._zapisi(dospjeli)
+            except Exception:
+                # Dretva mora preživjeti: promjene su vraćene u red i upis će se ponoviti
+                _dnevnik.exception("Upis nacrta nije uspio (%d nacrta); ponovni pokušaj za %.1f s", len(dospjeli), self.odgoda)
+
+    def zapisi_sve(self):
+        """
+        Odmah upisuje sve neupisane promjene (npr. prije gašenja); vraća broj
+        upisanih polja. Ako upis ne uspije, promjene ostaju u redu, a greška se prosljeđuje.
+        """
+        return self._zapisi()
+
+    def izbrisi(self, nacrt):
+        with self._brava_veze:
+            with self._brava:
+                for rjecnik in (self._stanje, self._promjene, self._rokovi, self._koristeno):
+                    rjecnik.pop(nacrt, None)
+            with self._veza:
+                self._veza.execute("DELETE FROM nacrti_polja WHERE nacrt = ?", (nacrt,))
+                self._veza.execute("DELETE FROM nacrti WHERE nacrt = ?", (nacrt,))
+
+    def pocisti(self, starije_od=timedelta(days=30)):
+        """Briše nacrte nepromijenjene dulje od `starije_od`; vraća broj obrisanih."""
+        granica = (datetime.now() - starije_od).isoformat(timespec="seconds")
+        with self._brava_veze, self._veza:
+            stari = [n for n, in self._veza.execute("SELECT nacrt FROM nacrti WHERE promijenjeno < ?", (granica,))]
+            self._veza.executemany("DELETE FROM nacrti_polja WHERE nacrt = ?", [(n,) for n in stari])
+            self._veza.executemany("DELETE FROM nacrti WHERE nacrt = ?", [(n,) for n in stari])
+        return len(stari)
+
+    def zatvori(self):
+        """Upisuje neupisane promjene i zaustavlja pozadinsku dretvu."""
+        with self._uvjet:
+            if self._zatvoren:
+                return
+            self._zatvoren = True
+            self._uvjet.notify()
+        self._dretva.join()
+        try:
+            self._zapisi()
+        except Exception:
+            _dnevnik.exception("Nacrti nisu upisani pri zatvaranju; neupisane promjene su izgubljene")
+        atexit.unregister(self.zatvori)
+        with self._brava_veze:
+            self._veza.close()
@@ -0,0 +1,54 @@
+"""
+Paket više dokumenata u jednoj ZIP arhivi, zapisan kao tok.
+
+Svaki dokument piše se izravno u svoj unos arhive (HTML dio po dio ili
+.docx), a arhiva izravno u izlaz (datoteku ili tok bez pozicioniranja), pa
+ni pojedini dokument ni cijela arhiva nisu nikad u memoriji. Isto služi za
+paket predmeta (npr. tabularna isprava + ZK prijedlog) i za skupne obrade s
+desecima tisuća datoteka.
+"""
+import time
+import zipfile
+
+from pravni_alat.docx import zapisi_docx
+from pravni_alat.dokumenti import pripremi_za_word_dijelovi
+
+OBLICI = ("docx", "doc", None)
+
+
+def zapisi_dokument(arhiva, ime, sadrzaj, oblik=None):
+    """
+    Zapisuje jedan dokument u otvorenu ZipFile arhivu.
+    sadrzaj: str, bytes ili niz str dijelova; oblik: "docx", "doc" (HTML za Word) ili None (kako jest).
+    Uz oblik="docx" bytes su već gotov .docx (npr. docx_iz_html) i zapisuju se kako jesu.
+    """
+    if oblik not in OBLICI:
+        raise ValueError(f"Nepoznat oblik dokumenta: {oblik}")
+    unos = zipfile.ZipInfo(ime, date_time=time.localtime()[:6])
+    # .docx je već sažet pa se sprema bez ponovnog sažimanja
+    unos.compress_type = zipfile.ZIP_STORED if oblik == "docx" else zipfile.ZIP_DEFLATED
+    with arhiva.open(unos, "w") as tok:
+        if oblik == "docx":
+            if isinstance(sadrzaj, bytes):
+                tok.write(sadrzaj)
+            else:
+                zapisi_docx(sadrzaj, tok)
+            return
+        dijelovi = [sadrzaj] if isinstance(sadrzaj, (str, bytes)) else sadrzaj
+        if oblik == "doc":
+            dijelovi = pripremi_za_word_dijelovi(dijelovi)
+        for dio in dijelovi:
+            tok.write(dio.encode("utf-8") if isinstance(dio, str) else dio)
+
+
+def zapisi_paket(dokumenti, izlaz, oblik="docx"):
+    """
+    Zapisuje niz (ime, sadrzaj) u ZIP `izlaz` (putanja ili binarni tok) i vraća broj dokumenata.
+    dokumenti može biti generator; dokumenti se generiraju tek kad dođu na red.
+    """
+    broj = 0
+    with zipfile.ZipFile(izlaz, "w", compression=zipfile.ZIP_DEFLATED) as arhiva:
+        for ime, sadrzaj in dokumenti:
+            zapisi_dokument(arhiva, ime, sadrzaj, oblik)
+            broj += 1
+    return broj
@@ -0,0 +1,106 @@
+"""
+Ograničena LRU predmemorija za dijelove dokumenata i gotove dokumente.
+
+Kad se prijeđe kapacitet (broj unosa) ili najvise_bajtova (zbroj veličina
+ključeva i vrijednosti), izbacuje se najdulje nekorišteni unos; vrijednost
+veća od najveca_stavka uopće se ne sprema. Uz ttl (sekunde) unos vrijedi samo
+zadano vrijeme. Pristup je zaštićen bravom jer
+Streamlit sesije rade u zasebnim dretvama, a vrijednost se računa izvan brave.
+"""
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def kanonski_kljuc(*dijelovi):
+    """Sažetak ulaza neovisan o redoslijedu ključeva u rječnicima (datumi i ostalo preko repr)."""
+    tekst = json.dumps(dijelovi, sort_keys=True, ensure_ascii=False, default=repr)
+    return hashlib.blake2b(tekst.encode("utf-8"), digest_size=16).digest()
+
+
+def velicina(objekt):
+    """Veličina ključa ili vrijednosti za ograničenje u bajtovima: len() stringa ili bajtova, zbroj za n-torke, inače 0."""
+    if isinstance(objekt, (str, bytes, bytearray)):
+        return len(objekt)
+    if isinstance(objekt, tuple):
+        return sum(velicina(o) for o in objekt)
+    return 0
+
+
+class LRUPredmemorija:
+    """Predmemorija s najviše `kapacitet` unosa (i opcionalno `najvise_bajtova`), opcionalnim ttl-om i brojačima."""
+
+    def __init__(self, kapacitet=1024, ttl=None, najvise_bajtova=None, najveca_stavka=None):
+        self.kapacitet = kapacitet
+        self.ttl = ttl
+        self.najvise_bajtova = najvise_bajtova
+        self.najveca_stavka = najveca_stavka
+        self._stavke = OrderedDict()  # kljuc -> (vrijednost, istek ili None, veličina)
+        self._bajtova = 0
+        self._brava = threading.Lock()
+        self.pogoci = 0
+        self.promasaji = 0
+        self.izbacivanja = 0
+        self.preskoceno = 0
+
+    def dohvati(self, kljuc, izracunaj):
+        """Vraća spremljenu vrijednost za `kljuc` ili je izračuna pozivom izracunaj()."""
+        with self._brava:
+            stavka = self._stavke.get(kljuc)
+            if stavka is not None and (stavka[1] is None or stavka[1] > time.monotonic()):
+                self.pogoci += 1
+                self._stavke.move_to_end(kljuc)
+                return stavka[0]
+            self.promasaji += 1
+        vrijednost = izracunaj()
+        istek = time.monotonic() + self.ttl if self.ttl else None
+        zauzece = velicina(kljuc) + velicina(vrijednost) if self.najvise_bajtova or self.najveca_stavka else 0
+        with self._brava:
+            if self.najveca_stavka and zauzece > self.najveca_stavka:
+                self.preskoceno += 1
+                return vrijednost
+            stara = self._stavke.pop(kljuc, None)
+            if stara is not None:
+                self._bajtova -= stara[2]
+            self._stavke[kljuc] = (vrijednost, istek, zauzece)
+            self._bajtova += zauzece
+            while len(self._stavke) > self.kapacitet or (self.najvise_bajtova and self._bajtova > self.najvise_bajtova):
+                _, izbacena = self._stavke.popitem(last=False)
+                self._bajtova -= izbacena[2]
+                self.izbacivanja += 1
+        return vrijednost
+
+    def brojaci(self):
+        return {'pogoci': self.pogoci, 'promasaji': self.promasaji, 'izbacivanja': self.izbacivanja,
+                'preskoceno': self.preskoceno, 'unosa': len(self), 'bajtova': self._bajtova}
+
+    def isprazni(self):
+        with self._brava:
+            self._stavke.clear()
+            self._bajtova = 0
+            self.pogoci = self.promasaji = self.izbacivanja = self.preskoceno = 0
+
+    def __len__(self):
+        return len(self._stavke)
+
+
+def memoiziraj(predmemorija, dodatni_kljuc=None, kljuc=None):
+    """
+    Dekorator: rezultat funkcije sprema se u `predmemorija`.
+    dodatni_kljuc: funkcija bez argumenata čija vrijednost ulazi u ključ (npr. date.today);
+    kljuc: vlastita funkcija ključa umjesto kanonski_kljuc(argumenti).
+    """
+    def omotac(fn):
+        @functools.wraps(fn)
+        def memoizirano(*args, **kwargs):
+            if kljuc is not None:
+                k = (fn.__qualname__, kljuc(*args, **kwargs))
+            else:
+                k = kanonski_kljuc(fn.__qualname__, dodatni_kljuc() if dodatni_kljuc else None, args, kwargs)
+            return predmemorija.dohvati(k, lambda: fn(*args, **kwargs))
+        memoizirano.predmemorija = predmemorija
+        return memoizirano
+    return omotac
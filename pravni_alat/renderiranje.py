@@ -0,0 +1,161 @@
+"""
+Paralelno generiranje dokumenata u zasebnim procesima (ProcessPoolExecutor).
+
+Generatori su čiste funkcije nad stringovima pa se poslovi mogu slobodno
+raspodijeliti na sve jezgre. Poslovi se šalju u paketima (manje IPC-a po
+dokumentu), a u letu je uvijek ograničen broj paketa pa ulaz može biti i
+generator s milijunima poslova.
+
+Posao je dict: {'vrsta': 'tuzba' | 'ovrha' | 'zk_prijedlog' | 'brisovna_tuzba',
+'argumenti': [...] ili {...}, 'ime': opcionalno ime dokumenta}.
+"""
+import heapq
+import multiprocessing
+import os
+import pickle
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+
+from pravni_alat.docx import docx_iz_html
+from pravni_alat.dokumenti import (
+    generiraj_brisovnu_tuzbu, generiraj_ovrhu_pro, generiraj_tuzbu_pro, generiraj_zk_prijedlog, pripremi_za_word,
+)
+
+GENERATORI = {
+    'tuzba': generiraj_tuzbu_pro,
+    'ovrha': generiraj_ovrhu_pro,
+    'zk_prijedlog': generiraj_zk_prijedlog,
+    'brisovna_tuzba': generiraj_brisovnu_tuzbu,
+}
+
+# dokument je None ako je posao pao; tada greska sadrži opis iznimke.
+# datoteka su bajtove gotovog .docx-a uz renderiraj(..., docx=True), inače None.
+Rezultat = namedtuple("Rezultat", ["indeks", "ime", "dokument", "greska", "datoteka"], defaults=(None,))
+
+
+def renderiraj_posao(posao, za_word=True):
+    generator = GENERATORI[posao['vrsta']]
+    argumenti = posao.get('argumenti', ())
+    doc = generator(**argumenti) if isinstance(argumenti, dict) else generator(*argumenti)
+    return pripremi_za_word(doc) if za_word else doc
+
+
+def _greska(e):
+    return f"{type(e).__name__}: {e}"
+
+
+def _renderiraj_paket(paket, za_word, docx=False):
+    # Izvodi se u radnom procesu. Svaki posao stiže zasebno serijaliziran,
+    # pa greška jednog posla ne ruši ostatak paketa.
+    rezultati = []
+    for indeks, ime, podaci in paket:
+        try:
+            doc = renderiraj_posao(pickle.loads(podaci), za_word and not docx)
+            rezultati.append(Rezultat(indeks, ime, doc, None, docx_iz_html(doc) if docx else None))
+        except Exception as e:
+            rezultati.append(Rezultat(indeks, ime, None, _greska(e)))
+    return rezultati
+
+
+def renderiraj(poslovi, radnika=None, velicina_paketa=64, poredano=True, za_word=True, paketa_u_letu=None,
+               nacin_pokretanja="spawn", docx=False):
+    """
+    Generira dokumente za sve poslove i vraća ih kao generator Rezultat-a.
+
+    radnika: broj procesa (zadano os.cpu_count()); velicina_paketa: poslova
+    po zadatku; poredano: rezultati redom ulaza ili čim su gotovi;
+    paketa_u_letu: koliko paketa najviše čeka na obradu (zadano 2 po radniku).
+    nacin_pokretanja: "spawn" je siguran i iz višedretvenog Streamlit
+    poslužitelja; "fork" brže pokreće radnike u samostalnim skriptama.
+    docx: radnik uz HTML (bez omotača za Word) složi i .docx u Rezultat.datoteka,
+    pa se i pretvorba u .docx raspodjeljuje po procesima.
+
+    Posao koji se ne može serijalizirati dobiva grešku bez slanja radniku.
+    Ako paket padne u cjelini (npr. radni proces se sruši i pool postane
+    BrokenProcessPool), pool se po potrebi ponovno pokreće, a poslovi tog
+    paketa obrađuju se jedan po jedan, pa grešku dobiva samo posao koji ju je izazvao.
+    """
+    radnika = radnika or os.cpu_count() or 1
+    paketa_u_letu = paketa_u_letu or 2 * radnika
+    ulaz = enumerate(poslovi)
+
+    def sljedeci_paket():
+        # (poslovi za radnika kao (indeks, ime, pickle), odmah neuspjeli Rezultat-i)
+        paket, odbijeni = [], []
+        for indeks, posao in islice(ulaz, velicina_paketa):
+            try:
+                paket.append((indeks, posao.get('ime'), pickle.dumps(posao, pickle.HIGHEST_PROTOCOL)))
+            except Exception as e:
+                odbijeni.append(Rezultat(indeks, posao.get('ime'), None, _greska(e)))
+        return paket, odbijeni
+
+    kontekst = multiprocessing.get_context(nacin_pokretanja)
+    izvrsitelj = None
+
+    def obnovi(pokvareni=None):
+        # Novi pool na početku i kad trenutni (`pokvareni`) padne; stariji pokvareni se zanemaruju
+        nonlocal izvrsitelj
+        if izvrsitelj is None or izvrsitelj is pokvareni:
+            if izvrsitelj is not None:
+                izvrsitelj.shutdown(wait=False, cancel_futures=True)
+            izvrsitelj = ProcessPoolExecutor(max_workers=radnika, mp_context=kontekst)
+        return izvrsitelj
+
+    def predaj(paket):
+        pool = obnovi()
+        try:
+            return pool.submit(_renderiraj_paket, paket, za_word, docx), pool
+        except BrokenProcessPool:
+            pool = obnovi(pool)
+            return pool.submit(_renderiraj_paket, paket, za_word, docx), pool
+
+    def pojedinacno(paket):
+        rezultati = []
+        for posao in paket:
+            indeks, ime, _ = posao
+            try:
+                future, _ = predaj([posao])
+                rezultati.extend(future.result())
+            except BrokenProcessPool as e:
+                obnovi(izvrsitelj)
+                rezultati.append(Rezultat(indeks, ime, None, _greska(e)))
+            except Exception as e:
+                rezultati.append(Rezultat(indeks, ime, None, _greska(e)))
+        return rezultati
+
+    def preuzmi(future, pool, paket, odbijeni):
+        try:
+            rezultati = future.result()
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                obnovi(pool)
+            rezultati = pojedinacno(paket)
+        return heapq.merge(rezultati, odbijeni, key=lambda r: r.indeks) if odbijeni else rezultati
+
+    u_letu = deque()  # (future, pool, paket, odbijeni) redom slanja
+
+    def posalji():
+        while len(u_letu) < paketa_u_letu:
+            paket, odbijeni = sljedeci_paket()
+            if not paket and not odbijeni:
+                return
+            u_letu.append((*predaj(paket), paket, odbijeni) if paket else (None, None, paket, odbijeni))
+
+    try:
+        posalji()
+        while u_letu:
+            if poredano:
+                gotovi = [u_letu.popleft()]
+            else:
+                zavrseni, _ = wait([par[0] for par in u_letu if par[0] is not None], return_when=FIRST_COMPLETED)
+                gotovi = [par for par in u_letu if par[0] is None or par[0] in zavrseni]
+                u_letu = deque(par for par in u_letu if par[0] is not None and par[0] not in zavrseni)
+            # Novi paketi idu u obradu prije čekanja na rezultat.
+            posalji()
+            for future, pool, paket, odbijeni in gotovi:
+                yield from (preuzmi(future, pool, paket, odbijeni) if future is not None else odbijeni)
+    finally:
+        if izvrsitelj is not None:
+            izvrsitelj.shutdown()
@@ -0,0 +1,146 @@
+"""
+Procesni rokovi: posljednji dan roka od dostave odluke (čl. 111.-112. ZPP).
+
+Rok određen u danima počinje teći prvog dana nakon dostave; ako posljednji
+dan pada u subotu, nedjelju ili na blagdan, rok ističe prvog sljedećeg
+radnog dana. Za rokove u radnim danima broje se samo radni dani.
+
+Kalendar se računa jednom za cijeli raspon godina: niz neradnih dana,
+indeks "prvi radni dan od dana k" i kumulativni broj radnih dana. Dodavanje
+N dana ili N radnih dana je zato nekoliko dohvata iz niza (O(1)), a isti
+kod radi nad NumPy nizovima za tisuće dostavljenih odluka odjednom.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+
+from pravni_alat.kamate import u_dane
+
+# Rokovi koje koriste dokumenti (dana od dostave)
+ROK_ZALBE = 15  # čl. 348. ZPP
+ROK_PRIGOVORA = 8  # prigovor protiv rješenja o ovrsi na temelju vjerodostojne isprave (OZ)
+
+
+def _broj_dana(dana):
+    # Rok je cijeli broj dana >= 0; razlomljen ili negativan rok bi tiho dao dan prije dostave
+    niz = np.asarray(dana)
+    if niz.dtype.kind not in "iu" and not (niz.dtype.kind == "f" and np.all(np.isfinite(niz) & (niz == np.floor(niz)))):
+        raise ValueError("Rok mora biti cijeli broj dana.")
+    niz = niz.astype(np.int64)
+    if np.any(niz < 0):
+        raise ValueError("Rok ne može biti negativan.")
+    return niz
+
+
+def uskrs(godina):
+    """Datum Uskrsa (gregorijanski kalendar, anonimni algoritam)."""
+    a, b, c = godina % 19, godina // 100, godina % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mjesec, dan = divmod(h + l - 7 * m + 114, 31)
+    return date(godina, mjesec, dan + 1)
+
+
+def blagdani(godina):
+    """Blagdani i neradni dani u RH (Zakon o blagdanima; popis od 2020. i prije)."""
+    nedjelja = uskrs(godina)
+    fiksni = [(1, 1), (1, 6), (5, 1), (6, 22), (8, 5), (8, 15), (11, 1), (12, 25), (12, 26)]
+    fiksni += [(5, 30), (11, 18)] if godina >= 2020 else [(6, 25), (10, 8)]
+    pomicni = [nedjelja, nedjelja + timedelta(days=1), nedjelja + timedelta(days=60)]  # Uskrs, Uskrsni ponedjeljak, Tijelovo
+    return sorted([date(godina, mj, d) for mj, d in fiksni] + pomicni)
+
+
+class Kalendar:
+    """
+    Radni dani za godine [od_godine, do_godine].
+
+    neradni[k] je True za subotu, nedjelju i blagdan, gdje je k redni broj
+    dana od 1.1. prve godine; prvi_radni[k] je redni broj prvog radnog dana
+    >= k; radnih_prije[k] je broj radnih dana u [0, k); radni[j] je redni broj
+    j-tog radnog dana.
+    """
+
+    def __init__(self, od_godine=2002, do_godine=2100):
+        self.pocetak = int(u_dane(date(od_godine, 1, 1)))
+        self.od_godine, self.do_godine = od_godine, do_godine
+        dana = int(u_dane(date(do_godine + 1, 1, 1))) - self.pocetak
+        # 1.1.1970. (dan 0) je četvrtak, pa je (dan + 3) % 7 redni broj dana u tjednu od ponedjeljka
+        dani_u_tjednu = (np.arange(self.pocetak, self.pocetak + dana) + 3) % 7
+        self.neradni = dani_u_tjednu >= 5
+        blagdani_dani = u_dane([b for godina in range(od_godine, do_godine + 1) for b in blagdani(godina)])
+        self.neradni[blagdani_dani - self.pocetak] = True
+        self.radni = np.flatnonzero(~self.neradni)
+        self.radnih_prije = np.concatenate(([0], np.cumsum(~self.neradni)))
+        # Dani nakon posljednjeg radnog dana u rasponu pokazuju izvan niza; rok() ih odbija
+        self.prvi_radni = np.append(self.radni, dana)[self.radnih_prije[:-1]]
+        # Iste tablice kao Python liste za pojedinačni rok (bez pretvorbe u NumPy po pozivu)
+        self._pocetak_datum = date(od_godine, 1, 1)
+        self._liste = (self.prvi_radni.tolist(), self.radni.tolist(), self.radnih_prije.tolist())
+
+    def _indeksi(self, dani, zadnji_pomak=0):
+        k = u_dane(dani) - self.pocetak
+        if np.any(k < 0) or np.any(k + zadnji_pomak >= len(self.neradni)):
+            raise ValueError(f"Kalendar pokriva samo godine {self.od_godine}.-{self.do_godine}.")
+        return k
+
+    def je_radni(self, dani):
+        return ~self.neradni[self._indeksi(dani)]
+
+    def rok(self, dostave, dana):
+        """Posljednji dan roka od `dana` dana od dostave (pomaknut na prvi radni dan)."""
+        dana = _broj_dana(dana)
+        k = self._indeksi(dostave, np.max(dana, initial=0)) + dana
+        zadnji = self.prvi_radni[k]
+        if np.any(zadnji >= len(self.neradni)):
+            raise ValueError(f"Kalendar pokriva samo godine {self.od_godine}.-{self.do_godine}.")
+        return (zadnji + self.pocetak).astype("datetime64[D]")
+
+    def rok_radnih(self, dostave, radnih):
+        """Posljednji dan roka od `radnih` radnih dana od dostave (dan dostave se ne broji)."""
+        radnih = _broj_dana(radnih)
+        j = self.radnih_prije[self._indeksi(dostave) + 1] + radnih - 1
+        if np.any(radnih < 1) or np.any(j >= len(self.radni)):
+            raise ValueError(f"Rok u radnim danima mora biti barem 1 dan i unutar godina {self.od_godine}.-{self.do_godine}.")
+        return (self.radni[j] + self.pocetak).astype("datetime64[D]")
+
+    def rok_datuma(self, dostava, dana, radni_dani=False):
+        """Isti račun kao rok()/rok_radnih() za jedan datetime.date, nad Python listama."""
+        prvi_radni, radni, radnih_prije = self._liste
+        if dana < 0:
+            raise ValueError("Rok ne može biti negativan.")
+        if radni_dani and dana < 1:
+            raise ValueError("Rok u radnim danima mora biti barem 1 dan.")
+        k = (dostava - self._pocetak_datum).days
+        try:
+            if k < 0:
+                raise IndexError
+            zadnji = radni[radnih_prije[k + 1] + dana - 1] if radni_dani else prvi_radni[k + dana]
+            if zadnji >= len(prvi_radni):
+                raise IndexError
+        except IndexError:
+            raise ValueError(f"Kalendar pokriva samo godine {self.od_godine}.-{self.do_godine}.") from None
+        return self._pocetak_datum + timedelta(days=zadnji)
+
+
+ZADANI_KALENDAR = Kalendar()
+
+
+def izracunaj_rok(dostava, dana, radni_dani=False, kalendar=None):
+    """Posljednji dan roka za jednu dostavu, kao datetime.date."""
+    kalendar = kalendar or ZADANI_KALENDAR
+    if isinstance(dostava, date):
+        if not float(dana).is_integer():
+            raise ValueError("Rok mora biti cijeli broj dana.")
+        return kalendar.rok_datuma(dostava if type(dostava) is date else dostava.date(), int(dana), radni_dani)
+    rok = kalendar.rok_radnih(dostava, dana) if radni_dani else kalendar.rok(dostava, dana)
+    return rok.astype(object)
+
+
+def izracunaj_rokove(dostave, dana, radni_dani=False, kalendar=None):
+    """Posljednji dani rokova za niz dostava (i niz ili jedan broj dana); vraća datetime64[D] niz."""
+    kalendar = kalendar or ZADANI_KALENDAR
+    return kalendar.rok_radnih(dostave, dana) if radni_dani else kalendar.rok(dostave, dana)
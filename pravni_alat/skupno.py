@@ -0,0 +1,229 @@
+"""
+Skupna izrada prijedloga za ovrhu iz CSV/XLSX datoteke.
+
+Redovi se čitaju jedan po jedan, svaki se generira postojećim generatorom
+(generiraj_ovrhu_pro) i odmah zapisuje u ZIP arhivu, pa ni ulazna datoteka
+ni gotovi dokumenti nikad nisu cijeli u memoriji.
+"""
+import csv
+import io
+import re
+import time
+import zipfile
+from datetime import date, datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from pravni_alat.dokumenti import escape_html
+from pravni_alat.paket import zapisi_dokument
+from pravni_alat.renderiranje import Rezultat, renderiraj, renderiraj_posao
+from pravni_alat.tarifa import STOPA_PDV, troskovnik
+
+# Stupci ulazne datoteke (zaglavlje u prvom retku). Obavezni su označeni u OBAVEZNI_STUPCI.
+STUPCI_OVRHE = [
+    "jb",
+    "ovrhovoditelj", "ovrhovoditelj_oib", "ovrhovoditelj_adresa",
+    "ovrsenik", "ovrsenik_oib", "ovrsenik_adresa",
+    "isprava", "datum_racuna", "glavnica", "dospijece",
+    "trosak_odvjetnik", "trosak_jb", "pdv",
+]
+OBAVEZNI_STUPCI = ["ovrhovoditelj", "ovrsenik", "isprava", "glavnica", "dospijece"]
+
+
+def citaj_csv(datoteka):
+    """Čita CSV (binarni ili tekstualni tok) red po red; razdjelnik ';' ili ','."""
+    if not isinstance(datoteka, io.TextIOBase):
+        datoteka = io.TextIOWrapper(datoteka, encoding="utf-8-sig", newline="")
+    prvi = datoteka.readline()
+    razdjelnik = ";" if prvi.count(";") > prvi.count(",") else ","
+    zaglavlje = [s.strip().lower() for s in next(csv.reader([prvi], delimiter=razdjelnik))]
+    for red in csv.reader(datoteka, delimiter=razdjelnik):
+        if any(red):
+            yield dict(zip(zaglavlje, red))
+
+
+def citaj_xlsx(datoteka):
+    """Čita XLSX u read-only načinu (openpyxl ne učitava cijeli list)."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("Za XLSX datoteke potreban je paket openpyxl (pip install openpyxl).")
+    knjiga = load_workbook(datoteka, read_only=True, data_only=True)
+    try:
+        redovi = knjiga.active.iter_rows(values_only=True)
+        zaglavlje = [str(s or "").strip().lower() for s in next(redovi)]
+        for red in redovi:
+            if any(v not in (None, "") for v in red):
+                yield dict(zip(zaglavlje, red))
+    finally:
+        knjiga.close()
+
+
+def citaj_redove(datoteka, ime):
+    return citaj_xlsx(datoteka) if ime.lower().endswith((".xlsx", ".xlsm")) else citaj_csv(datoteka)
+
+
+def procitaj_iznos(vrijednost):
+    """Iznos iz ćelije: broj, '1234.56', '1234,56' ili '1.234,56'; prazna ćelija je 0."""
+    if vrijednost in (None, ""):
+        return 0.0
+    if isinstance(vrijednost, (int, float)):
+        return float(vrijednost)
+    tekst = str(vrijednost).strip().replace(" ", "")
+    if "," in tekst:
+        tekst = tekst.replace(".", "").replace(",", ".")
+    return float(tekst)
+
+
+def procitaj_datum(vrijednost):
+    """Datum iz ćelije: date/datetime, '31.12.2024.', '31.12.2024' ili '2024-12-31'."""
+    if isinstance(vrijednost, datetime):
+        return vrijednost.date()
+    if isinstance(vrijednost, date):
+        return vrijednost
+    tekst = str(vrijednost or "").strip()
+    for oblik in ("%d.%m.%Y.", "%d.%m.%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(tekst, oblik).date()
+        except ValueError:
+            pass
+    raise ValueError(f"Neispravan datum: '{tekst}'")
+
+
+def _datum(vrijednost):
+    return procitaj_datum(vrijednost).strftime("%d.%m.%Y.")
+
+
+def _stranka(red, uloga):
+    # Isti oblik bloka kao unos_stranke u sučelju.
+    return f"<b>{escape_html(red[uloga])}</b><br>Adresa: {escape_html(red.get(uloga + '_adresa'))}<br>OIB: {escape_html(red.get(uloga + '_oib'))}"
+
+
+def red_u_ovrhu(red):
+    """Pretvara jedan red ulazne datoteke u argumente za generiraj_ovrhu_pro."""
+    red = {k: (v.strip() if isinstance(v, str) else v) for k, v in red.items() if k}
+    nedostaje = [s for s in OBAVEZNI_STUPCI if red.get(s) in (None, "")]
+    if nedostaje:
+        raise ValueError(f"Nedostaju stupci: {', '.join(nedostaje)}")
+    # Prazni stupci troškova popunjavaju se po tarifi za glavnicu
+    tarifa = troskovnik('ovrha', procitaj_iznos(red["glavnica"]))
+    odvjetnik = tarifa['stavka'] if red.get("trosak_odvjetnik") in (None, "") else procitaj_iznos(red["trosak_odvjetnik"])
+    jb_nagrada = tarifa['materijalni'] if red.get("trosak_jb") in (None, "") else procitaj_iznos(red["trosak_jb"])
+    pdv = (odvjetnik + jb_nagrada) * STOPA_PDV if str(red.get("pdv") or "").lower() in ("1", "da", "true", "x") else 0.0
+    trazbina = {
+        'glavnica': procitaj_iznos(red["glavnica"]),
+        'datum_racuna': _datum(red.get("datum_racuna") or red["dospijece"]),
+        'dospjece': _datum(red["dospijece"]),
+    }
+    return (red.get("jb") or "", _stranka(red, "ovrhovoditelj"), _stranka(red, "ovrsenik"), trazbina,
+            red["isprava"], {'stavka': odvjetnik, 'materijalni': jb_nagrada, 'pdv': pdv, 'pristojba': 0})
+
+
+def ime_datoteke(broj, red, oblik="docx"):
+    naziv = re.sub(r"[^\w]+", "_", str(red.get("ovrsenik") or ""), flags=re.UNICODE).strip("_")[:40]
+    return f"{broj:06d}_Ovrha_{naziv or 'dokument'}.{oblik}"
+
+
+def vrsni_rss_mb():
+    """Najveća zauzeta radna memorija procesa (MB), ili None ako nije dostupno."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _poslovi_ovrhe(redovi, greske, oblik):
+    # Redovi koji se ne mogu pročitati bilježe se odmah, bez slanja na generiranje.
+    for broj, red in enumerate(redovi, start=1):
+        try:
+            yield {'vrsta': 'ovrha', 'argumenti': red_u_ovrhu(red), 'ime': ime_datoteke(broj, red, oblik), 'broj': broj}
+        except (ValueError, KeyError) as e:
+            greske.append((broj, '', str(e)))
+
+
+def _zapamti_ulaze(poslovi, ulazi):
+    # Argumenti posla čekaju (po imenu dokumenta) dok gotov dokument ne stigne u arhivu
+    for posao in poslovi:
+        ulazi[posao['ime']] = posao['argumenti']
+        yield posao
+
+
+def skupna_ovrha(redovi, izlaz, napredak=None, radnika=None, arhiva=None, oblik="docx"):
+    """
+    Generira prijedlog za ovrhu za svaki red i zapisuje ga u ZIP `izlaz`
+    (putanja ili binarni tok), kao .docx (pravni_alat.docx) ili, uz
+    oblik="doc", kao HTML za Word. Neispravni redovi ne prekidaju obradu
+    nego se popisuju u greske.csv unutar arhive.
+    Uz radnika > 1 dokumenti se generiraju (i pretvaraju u .docx) u zasebnim
+    procesima (pravni_alat.renderiranje), a u arhivu se i dalje upisuju redom.
+    Uz `arhiva` (pravni_alat.arhiva.Arhiva) svaki dokument se sprema i u nju
+    (kao i u sučelju, bez omotača za Word), zajedno s argumentima iz svog reda.
+    Vraća izvješće: broj redova, broj grešaka, trajanje, redova/s, vršni RSS.
+    """
+    pocetak = time.perf_counter()
+    obradeno = 0
+    # Napredak broji pročitane ulazne redove: gotove dokumente i redove odbijene već pri čitanju
+    # (njih nikad nema među rezultatima, pa bi ih brojač rezultata preskočio)
+    neispravni = []
+    greske = []
+    if oblik not in ("docx", "doc"):
+        raise ValueError(f"Nepoznat oblik dokumenta: {oblik}")
+    poslovi = _poslovi_ovrhe(redovi, neispravni, oblik)
+    ulazi = {}
+    if arhiva is not None:
+        poslovi = _zapamti_ulaze(poslovi, ulazi)
+    if radnika and radnika > 1:
+        rezultati = renderiraj(poslovi, radnika=radnika, za_word=False, docx=oblik == "docx")
+    else:
+        rezultati = _renderiraj_redom(poslovi)
+    with zipfile.ZipFile(izlaz, "w", compression=zipfile.ZIP_DEFLATED) as zip_arhiva:
+        broj = 0
+        for broj, rezultat in enumerate(rezultati, start=1):
+            if rezultat.greska:
+                greske.append(('', rezultat.ime, rezultat.greska))
+                ulazi.pop(rezultat.ime, None)
+            else:
+                sadrzaj = rezultat.dokument if rezultat.datoteka is None else rezultat.datoteka
+                zapisi_dokument(zip_arhiva, rezultat.ime, sadrzaj, oblik=oblik)
+                if arhiva is not None:
+                    arhiva.spremi('ovrha', rezultat.dokument, {'argumenti': list(ulazi.pop(rezultat.ime))}, ime=rezultat.ime)
+                obradeno += 1
+            if napredak and broj % 500 == 0:
+                napredak(broj + len(neispravni))
+        if napredak:
+            napredak(broj + len(neispravni))
+        greske = neispravni + greske
+        if greske:
+            with zip_arhiva.open("greske.csv", "w") as f:
+                tekst = io.TextIOWrapper(f, encoding="utf-8", newline="")
+                pisac = csv.writer(tekst, delimiter=";")
+                pisac.writerow(["red", "dokument", "greska"])
+                pisac.writerows(greske)
+                tekst.flush()
+                tekst.detach()
+    trajanje = time.perf_counter() - pocetak
+    return {
+        'redova': obradeno,
+        'gresaka': len(greske),
+        'trajanje_s': trajanje,
+        'redova_u_sekundi': obradeno / trajanje if trajanje else 0.0,
+        'vrsni_rss_mb': vrsni_rss_mb(),
+    }
+
+
+def skupna_ovrha_iz_datoteke(podaci, ime, izlaz, napredak=None, **kwargs):
+    """
+    Kao skupna_ovrha, ali iz sadržaja CSV/XLSX datoteke (bytes) i njezina imena,
+    npr. za zadatak u drugom procesu (generator redova ne može se serijalizirati).
+    """
+    return skupna_ovrha(citaj_redove(io.BytesIO(podaci), ime), izlaz, napredak=napredak, **kwargs)
+
+
+def _renderiraj_redom(poslovi):
+    for posao in poslovi:
+        try:
+            yield Rezultat(posao['broj'], posao['ime'], renderiraj_posao(posao, za_word=False), None)
+        except (ValueError, KeyError) as e:
+            yield Rezultat(posao['broj'], posao['ime'], None, str(e))
@@ -0,0 +1,161 @@
+"""
+Imenik stranaka (SQLite) s provjerom OIB-a.
+
+Stranke se spremaju jednom i zatim dohvaćaju po OIB-u, MBS-u ili početku
+naziva. Naziv se za pretraživanje svodi na mala slova bez dijakritika
+(Đurđević -> durdevic), a pretraga po početku je raspon nad indeksom
+(naziv_kljuc >= upit AND naziv_kljuc < upit + '\\uffff'), pa je brzina ista
+i uz milijun stranaka.
+
+OIB se provjerava kontrolnom znamenkom po ISO 7064, MOD 11,10; za uvoz
+postoji i vektorizirana provjera cijelog stupca (NumPy).
+"""
+import threading
+import unicodedata
+from datetime import datetime
+
+from pravni_alat.baza import otvori
+
+TIPOVI = ("Fizička", "Pravna")
+
+_SHEMA = """
+CREATE TABLE IF NOT EXISTS stranke (
+    id INTEGER PRIMARY KEY,
+    tip TEXT NOT NULL,
+    naziv TEXT NOT NULL,
+    naziv_kljuc TEXT NOT NULL,
+    oib TEXT NOT NULL UNIQUE,
+    mbs TEXT,
+    adresa TEXT,
+    zastupnik TEXT,
+    azurirano TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS stranke_mbs ON stranke(mbs);
+CREATE INDEX IF NOT EXISTS stranke_naziv_kljuc ON stranke(naziv_kljuc);
+"""
+
+_STUPCI = ("id", "tip", "naziv", "oib", "mbs", "adresa", "zastupnik")
+
+# Slova koja NFKD ne rastavlja na osnovno slovo + dijakritik
+_DODATNO_SVODENJE = str.maketrans({"đ": "d", "Đ": "d", "ø": "o", "Ø": "o", "ł": "l", "Ł": "l", "ß": "ss"})
+
+
+def svedi_naziv(naziv):
+    """Mala slova bez dijakritika i suvišnih razmaka (ključ za pretraživanje)."""
+    tekst = unicodedata.normalize("NFKD", (naziv or "").translate(_DODATNO_SVODENJE).lower())
+    return " ".join("".join(z for z in tekst if not unicodedata.combining(z)).split())
+
+
+def provjeri_oib(oib):
+    """Provjera kontrolne znamenke OIB-a (ISO 7064, MOD 11,10)."""
+    oib = str(oib or "").strip()
+    if len(oib) != 11 or not (oib.isascii() and oib.isdigit()):
+        return False
+    ostatak = 10
+    for znamenka in oib[:10]:
+        ostatak = (ostatak + int(znamenka)) % 10 or 10
+        ostatak = ostatak * 2 % 11
+    return (11 - ostatak) % 10 == int(oib[10])
+
+
+def provjeri_oibe(oibi):
+    """
+    Vektorizirana provjera: vraća NumPy niz bool iste duljine kao `oibi`.
+    Sve znamenke obrađuju se odjednom po stupcu (10 koraka bez obzira na broj OIB-a).
+    """
+    import numpy as np
+
+    oibi = [str(o or "").strip() for o in oibi]
+    ispravni = np.zeros(len(oibi), dtype=bool)
+    oblik = np.array([len(o) == 11 and o.isascii() and o.isdigit() for o in oibi], dtype=bool)
+    if not oblik.any():
+        return ispravni
+    znamenke = np.frombuffer("".join(o for o, u_redu in zip(oibi, oblik) if u_redu).encode("ascii"), dtype=np.uint8)
+    znamenke = znamenke.reshape(-1, 11).astype(np.int16) - ord("0")
+    ostatak = np.full(len(znamenke), 10, dtype=np.int16)
+    for stupac in range(10):
+        ostatak = (ostatak + znamenke[:, stupac]) % 10
+        ostatak[ostatak == 0] = 10
+        ostatak = ostatak * 2 % 11
+    ispravni[oblik] = (11 - ostatak) % 10 == znamenke[:, 10]
+    return ispravni
+
+
+class RegistarStranaka:
+    """Imenik stranaka u SQLite bazi; jedna instanca može se dijeliti među sesijama."""
+
+    def __init__(self, putanja=None):
+        self._veza = otvori(putanja)
+        self._veza.executescript(_SHEMA)
+        self._brava = threading.Lock()
+
+    def spremi(self, stranka):
+        """
+        Sprema ili ažurira stranku (ključ je OIB) i vraća njezin id.
+        stranka: {'tip', 'naziv', 'oib', 'mbs', 'adresa', 'zastupnik'}
+        """
+        if not provjeri_oib(stranka.get('oib')):
+            raise ValueError(f"Neispravan OIB: '{stranka.get('oib') or ''}'")
+        if stranka.get('tip') not in TIPOVI:
+            raise ValueError(f"Nepoznat tip stranke: '{stranka.get('tip')}'")
+        with self._brava, self._veza:
+            red = self._veza.execute(
+                "INSERT INTO stranke (tip, naziv, naziv_kljuc, oib, mbs, adresa, zastupnik, azurirano) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(oib) DO UPDATE SET tip = excluded.tip, naziv = excluded.naziv, naziv_kljuc = excluded.naziv_kljuc, "
+                "mbs = excluded.mbs, adresa = excluded.adresa, zastupnik = excluded.zastupnik, azurirano = excluded.azurirano RETURNING id",
+                self._red(stranka)).fetchone()
+        return red[0]
+
+    def uvezi(self, stranke):
+        """
+        Skupni uvoz (jedna transakcija). OIB-i se provjeravaju vektorizirano;
+        neispravni se preskaču. Vraća (broj uvezenih, popis neispravnih OIB-a).
+        """
+        stranke = [s for s in stranke if s.get('tip') in TIPOVI]
+        ispravni = provjeri_oibe([s.get('oib') for s in stranke])
+        with self._brava, self._veza:
+            self._veza.executemany(
+                "INSERT INTO stranke (tip, naziv, naziv_kljuc, oib, mbs, adresa, zastupnik, azurirano) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(oib) DO UPDATE SET tip = excluded.tip, naziv = excluded.naziv, naziv_kljuc = excluded.naziv_kljuc, "
+                "mbs = excluded.mbs, adresa = excluded.adresa, zastupnik = excluded.zastupnik, azurirano = excluded.azurirano",
+                (self._red(s) for s, u_redu in zip(stranke, ispravni) if u_redu))
+        return int(ispravni.sum()), [s.get('oib') for s, u_redu in zip(stranke, ispravni) if not u_redu]
+
+    def trazi(self, upit, ograniceno=10):
+        """Stranke čiji naziv (bez dijakritika) ili OIB počinje upitom."""
+        upit = (upit or "").strip()
+        if not upit:
+            return []
+        if upit.isdigit():
+            uvjet, kljuc = "oib >= ? AND oib < ?", upit
+        else:
+            uvjet, kljuc = "naziv_kljuc >= ? AND naziv_kljuc < ?", svedi_naziv(upit)
+        with self._brava:
+            redovi = self._veza.execute(
+                f"SELECT {', '.join(_STUPCI)} FROM stranke WHERE {uvjet} ORDER BY {uvjet.split()[0]} LIMIT ?",
+                (kljuc, kljuc + "\uffff", ograniceno)).fetchall()
+        return [dict(zip(_STUPCI, red)) for red in redovi]
+
+    def po_oib(self, oib):
+        return self._jedna("oib = ?", oib)
+
+    def po_mbs(self, mbs):
+        return self._jedna("mbs = ?", mbs)
+
+    def _jedna(self, uvjet, vrijednost):
+        with self._brava:
+            red = self._veza.execute(f"SELECT {', '.join(_STUPCI)} FROM stranke WHERE {uvjet} LIMIT 1", (vrijednost,)).fetchone()
+        return dict(zip(_STUPCI, red)) if red else None
+
+    def __len__(self):
+        with self._brava:
+            return self._veza.execute("SELECT COUNT(*) FROM stranke").fetchone()[0]
+
+    def zatvori(self):
+        self._veza.close()
+
+    @staticmethod
+    def _red(stranka):
+        naziv = (stranka.get('naziv') or "").strip()
+        return (stranka['tip'], naziv, svedi_naziv(naziv), str(stranka['oib']).strip(), stranka.get('mbs') or None,
+                stranka.get('adresa') or "", stranka.get('zastupnik') or "", datetime.now().isoformat(timespec="seconds"))
@@ -0,0 +1,154 @@
+"""
+Troškovi postupka po tarifi: nagrada odvjetnika (bodovi x vrijednost boda),
+nagrada javnog bilježnika i sudska pristojba prema vrsti dokumenta i
+vrijednosti predmeta spora (VPS).
+
+Svaka ljestvica je poredani popis gornjih granica razreda, pa je razred
+za VPS jedno binarno pretraživanje (bisect za jedan dokument, NumPy
+searchsorted za cijeli portfelj tražbina odjednom). Iznad najvišeg razreda
+iznos raste postotkom od viška, do propisanog najvišeg iznosa.
+
+Iznosi su u EUR. Ljestvice se pri izmjeni Tarife o nagradama i naknadi troškova
+za rad odvjetnika, Pravilnika o nagradama javnih bilježnika i Uredbe o Tarifi
+sudskih pristojbi mijenjaju samo ovdje; generatori i sučelje ih ne ponavljaju.
+"""
+import math
+from bisect import bisect_left
+from collections import namedtuple
+
+VRIJEDNOST_BODA = 2.00
+STOPA_PDV = 0.25
+
+Troskovi = namedtuple("Troskovi", ["bodova", "stavka", "materijalni", "pdv", "pristojba", "ukupno"])
+
+
+class Ljestvica:
+    """Razredi (gornja granica VPS-a, iznos); iznad zadnje granice iznos + stopa * višak, najviše `najvise`."""
+
+    def __init__(self, razredi, stopa_iznad=0.0, najvise=None):
+        granice = [g for g, _ in razredi]
+        if granice != sorted(granice) or len(set(granice)) != len(granice):
+            raise ValueError("Granice razreda moraju biti strogo rastuće.")
+        self.granice = granice
+        self.iznosi = [i for _, i in razredi]
+        self.stopa_iznad = stopa_iznad
+        self.najvise = najvise
+
+    def __call__(self, vps):
+        """Iznos za jedan VPS (bisect)."""
+        i = bisect_left(self.granice, vps)
+        if i < len(self.granice):
+            return self.iznosi[i]
+        iznos = self.iznosi[-1] + self.stopa_iznad * (vps - self.granice[-1])
+        return iznos if self.najvise is None else min(iznos, self.najvise)
+
+    def niz(self, vpsovi):
+        """Iznosi za niz VPS-ova (NumPy searchsorted, jedan prolaz)."""
+        import numpy as np
+
+        vpsovi = np.asarray(vpsovi, dtype=float)
+        i = np.searchsorted(np.asarray(self.granice, dtype=float), vpsovi, side="left")
+        iznosi = np.asarray(self.iznosi, dtype=float)
+        if math.isinf(self.granice[-1]):
+            return iznosi[i]
+        iznad = iznosi[-1] + self.stopa_iznad * (vpsovi - self.granice[-1])
+        if self.najvise is not None:
+            iznad = np.minimum(iznad, self.najvise)
+        return np.where(i < len(self.granice), iznosi[np.minimum(i, len(self.granice) - 1)], iznad)
+
+
+# Odvjetnička tarifa, Tbr. 7 t. 1 (tužba i odgovor na tužbu), u bodovima
+BODOVI_PARNICA = Ljestvica([
+    (100.00, 25), (250.00, 50), (500.00, 75), (1000.00, 100), (2000.00, 150), (4000.00, 250),
+    (7000.00, 400), (10000.00, 500), (13500.00, 750),
+], stopa_iznad=0.01, najvise=2500)
+
+# Uredba o Tarifi sudskih pristojbi, Tar. br. 1 (tužba, žalba protiv presude)
+PRISTOJBA_PARNICA = Ljestvica([
+    (398.17, 13.27), (796.34, 26.54), (1194.51, 39.82), (1592.67, 53.09), (1990.84, 66.36),
+], stopa_iznad=0.01, najvise=663.61)
+
+# Nagrada javnog bilježnika za rješenje o ovrsi na temelju vjerodostojne isprave
+NAGRADA_JB_OVRHA = Ljestvica([
+    (132.72, 13.27), (663.61, 26.54), (1327.23, 39.82), (2654.46, 53.09),
+], stopa_iznad=0.005, najvise=199.08)
+
+# Tar. br. 14 (prijedlog za upis prava vlasništva) i Tbr. 22 (ZK prijedlog) ne ovise o VPS-u
+PRISTOJBA_ZK = Ljestvica([(math.inf, 26.54)])
+BODOVI_ZK = Ljestvica([(math.inf, 100)])
+NISTA = Ljestvica([(math.inf, 0.0)])
+
+# vrsta dokumenta: (bodovi, udio bodova, nagrada JB, sudska pristojba)
+TARIFA = {
+    'tuzba': (BODOVI_PARNICA, 1.0, NISTA, PRISTOJBA_PARNICA),
+    'brisovna_tuzba': (BODOVI_PARNICA, 1.0, NISTA, PRISTOJBA_PARNICA),
+    'zalba': (BODOVI_PARNICA, 1.25, NISTA, PRISTOJBA_PARNICA),
+    'ovrha': (BODOVI_PARNICA, 0.5, NAGRADA_JB_OVRHA, NISTA),
+    'zk_prijedlog': (BODOVI_ZK, 1.0, NISTA, PRISTOJBA_ZK),
+}
+
+
+def _na_cent(iznos):
+    # Zaokruživanje "pola gore" kao na računima; isti izraz za broj i NumPy niz
+    return math.floor(iznos * 100 + 0.5) / 100
+
+
+def _na_cent_niz(iznosi):
+    import numpy as np
+
+    return np.floor(iznosi * 100 + 0.5) / 100
+
+
+def troskovnik(vrsta, vps, pdv=True):
+    """Troškovi jednog dokumenta kao dict za formatiraj_troskovnik (stavka, materijalni, pdv, pristojba)."""
+    try:
+        bodovi, udio, nagrada_jb, pristojba = TARIFA[vrsta]
+    except KeyError:
+        raise ValueError(f"Nepoznata vrsta dokumenta za tarifu: {vrsta}")
+    bodova = bodovi(vps) * udio
+    stavka = _na_cent(bodova * VRIJEDNOST_BODA)
+    materijalni = _na_cent(nagrada_jb(vps))
+    return {
+        'bodova': bodova,
+        'stavka': stavka,
+        'materijalni': materijalni,
+        'pdv': _na_cent((stavka + materijalni) * STOPA_PDV) if pdv else 0.0,
+        'pristojba': _na_cent(pristojba(vps)),
+    }
+
+
+def obracunaj_troskove(vrste, vpsovi, pdv=True):
+    """
+    Troškovi za cijeli portfelj tražbina jednim pozivom. `vrste` je jedna
+    vrsta za sve ili niz iste duljine kao `vpsovi`; `pdv` bool ili niz bool.
+    Vraća Troskovi s NumPy nizovima (EUR, zaokruženo na cent).
+    """
+    import numpy as np
+
+    vpsovi = np.asarray(vpsovi, dtype=float)
+    vrste = np.asarray(vrste, dtype=str)
+    if vrste.ndim == 0 and str(vrste) not in TARIFA:
+        raise ValueError(f"Nepoznata vrsta dokumenta za tarifu: {vrste}")
+    bodova, materijalni, pristojba = np.zeros(vpsovi.shape), np.zeros(vpsovi.shape), np.zeros(vpsovi.shape)
+    pokriveno = 0
+    # Vrsta je malo, pa je jedna usporedba niza po vrsti brža od grupiranja (np.unique sortira stringove)
+    for vrsta, (bodovi, udio, nagrada_jb, sudska) in TARIFA.items():
+        maska = vrste == vrsta
+        if vrste.ndim == 0:
+            if not maska:
+                continue
+            maska = slice(None)
+        elif not maska.any():
+            continue
+        bodova[maska] = bodovi.niz(vpsovi[maska]) * udio
+        materijalni[maska] = nagrada_jb.niz(vpsovi[maska])
+        pristojba[maska] = sudska.niz(vpsovi[maska])
+        pokriveno += vpsovi.size if isinstance(maska, slice) else int(maska.sum())
+    if pokriveno != vpsovi.size:
+        nepoznate = sorted(set(np.broadcast_to(vrste, vpsovi.shape).ravel()) - set(TARIFA))
+        raise ValueError(f"Nepoznata vrsta dokumenta za tarifu: {', '.join(nepoznate)}")
+    stavka = _na_cent_niz(bodova * VRIJEDNOST_BODA)
+    materijalni = _na_cent_niz(materijalni)
+    iznos_pdv = np.where(pdv, _na_cent_niz((stavka + materijalni) * STOPA_PDV), 0.0)
+    pristojba = _na_cent_niz(pristojba)
+    return Troskovi(bodova, stavka, materijalni, iznos_pdv, pristojba, stavka + materijalni + iznos_pdv + pristojba)
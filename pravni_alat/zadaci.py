@@ -0,0 +1,257 @@
+"""
+Red zadataka u pozadini: dugotrajni poslovi (skupna izrada, obračun knjige,
+izvoz paketa) izvršavaju se u radnim dretvama, a ne u Streamlit reranu.
+Računski zahtjevni poslovi (posalji(..., u_procesu=True)) dretva predaje
+zasebnom procesu, pa ne drže GIL procesa koji poslužuje stranice.
+
+Rukovatelj gumba samo preda zadatak i dobije njegov id; stranica zatim
+svakih nekoliko trenutaka čita stanje i napredak iz tablice zadataka i
+preuzima rezultat kad je zadatak gotov. Stanje se vodi u SQLite tablici
+(ista baza kao imenik stranaka), pa ga vide sve sesije i dretve, a
+izlazne datoteke zadataka leže u zasebnoj mapi dok se ne počiste.
+
+Vrijednost koju funkcija vrati drži se u memoriji procesa (zadnjih
+MAKS_REZULTATA); nakon ponovnog pokretanja ostaju stanje, poruka i
+izlazna datoteka, a nedovršeni zadaci procesa koji više ne postoji
+označavaju se kao prekinuti.
+"""
+import os
+import socket
+import tempfile
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from pravni_alat.baza import ZADANA_BAZA, otvori
+
+CEKA, RADI, GOTOVO, GRESKA = "ceka", "radi", "gotovo", "greska"
+ZAVRSENA_STANJA = (GOTOVO, GRESKA)
+
+ZADANA_MAPA = os.environ.get("PRAVNI_ALAT_ZADACI", os.path.join(tempfile.gettempdir(), "pravni_alat_zadaci"))
+MAKS_REZULTATA = 100
+# Napredak se upisuje u bazu najviše ovoliko puta u sekundi po zadatku
+_RAZMAK_NAPRETKA_S = 0.25
+
+_SHEMA = """
+CREATE TABLE IF NOT EXISTS zadaci (
+    id INTEGER PRIMARY KEY,
+    vrsta TEXT NOT NULL,
+    stanje TEXT NOT NULL,
+    napredak INTEGER NOT NULL DEFAULT 0,
+    ukupno INTEGER,
+    poruka TEXT,
+    datoteka TEXT,
+    racunalo TEXT NOT NULL,
+    proces INTEGER NOT NULL,
+    stvoreno TEXT NOT NULL,
+    zavrseno TEXT
+);
+CREATE INDEX IF NOT EXISTS zadaci_stanje ON zadaci (stanje);
+"""
+_STUPCI = ("id", "vrsta", "stanje", "napredak", "ukupno", "poruka", "datoteka", "stvoreno", "zavrseno")
+
+
+def _prima_napredak(funkcija):
+    import inspect
+
+    try:
+        return 'napredak' in inspect.signature(funkcija).parameters
+    except (TypeError, ValueError):  # ugrađene funkcije bez potpisa
+        return False
+
+
+def _proces_zivi(pid):
+    if pid == os.getpid() or os.name == "nt":  # na Windowsu os.kill(pid, 0) gasi proces
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _sada():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _pokreni(funkcija, argumenti, kwargs, datoteka):
+    # U radnoj dretvi ili u radnom procesu; izlaznu datoteku otvara onaj tko izvodi funkciju
+    if datoteka:
+        with open(datoteka, "wb") as izlaz:
+            return funkcija(*argumenti, izlaz=izlaz, **kwargs)
+    return funkcija(*argumenti, **kwargs)
+
+
+class _NapredakProcesa:
+    """napredak(n, ukupno=None) za zadatak u drugom procesu: upisuje izravno u bazu, vlastitom vezom."""
+
+    def __init__(self, putanja, id_):
+        self.putanja = putanja
+        self.id_ = id_
+        self.zadnji = 0.0
+        self.veza = None
+
+    def __call__(self, n, ukupno=None):
+        sada = time.monotonic()
+        if sada - self.zadnji < _RAZMAK_NAPRETKA_S:
+            return
+        self.zadnji = sada
+        if self.veza is None:
+            self.veza = otvori(self.putanja)
+        with self.veza:
+            self.veza.execute("UPDATE zadaci SET napredak = ?, ukupno = ? WHERE id = ?", (n, ukupno, self.id_))
+
+
+class RedZadataka:
+    """
+    Zadaci u `radnika` dretvi (i najviše toliko radnih procesa za zadatke
+    u_procesu); stanje u SQLite bazi `putanja`, izlazne datoteke u mapi `mapa`.
+    """
+
+    def __init__(self, putanja=None, mapa=None, radnika=2):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.mapa = mapa or ZADANA_MAPA
+        os.makedirs(self.mapa, exist_ok=True)
+        self._putanja = putanja or ZADANA_BAZA
+        self._veza = otvori(putanja)
+        self._veza.executescript(_SHEMA)
+        self._brava = threading.Lock()
+        self._izvrsitelj = ThreadPoolExecutor(max_workers=radnika, thread_name_prefix="zadatak")
+        self._radnika = radnika
+        self._procesi = None  # ProcessPoolExecutor, pokreće se s prvim zadatkom u_procesu
+        self._rezultati = OrderedDict()
+        self._racunalo = socket.gethostname()
+        with self._brava, self._veza:
+            # Zadaci ugašenog procesa na ovom računalu više nemaju dretvu koja bi ih dovršila;
+            # zadaci drugih živih procesa (više Streamlit poslužitelja nad istom bazom) se ne diraju
+            nedovrseni = self._veza.execute("SELECT id, proces FROM zadaci WHERE stanje IN (?, ?) AND racunalo = ?", (CEKA, RADI, self._racunalo)).fetchall()
+            self._veza.executemany("UPDATE zadaci SET stanje = ?, poruka = ?, zavrseno = ? WHERE id = ?",
+                                   [(GRESKA, "Prekinuto ponovnim pokretanjem aplikacije.", _sada(), id_) for id_, pid in nedovrseni if not _proces_zivi(pid)])
+
+    def posalji(self, vrsta, funkcija, *argumenti, izlaz=None, u_procesu=False, **kwargs):
+        """
+        Predaje funkcija(*argumenti, **kwargs) radnoj dretvi i vraća id zadatka.
+        Uz `izlaz` (nastavak, npr. ".zip") funkcija dobiva otvorenu binarnu
+        datoteku kao izlaz=..., a njezina putanja je u stanju zadatka. Ako
+        funkcija prima `napredak`, dobiva povratni poziv napredak(n, ukupno=None).
+        Uz u_procesu=True funkcija se izvodi u radnom procesu (spawn): funkcija,
+        argumenti i rezultat moraju se moći serijalizirati (pickle).
+        """
+        datoteka = None
+        with self._brava, self._veza:
+            id_ = self._veza.execute("INSERT INTO zadaci (vrsta, stanje, racunalo, proces, stvoreno) VALUES (?, ?, ?, ?, ?)",
+                                     (vrsta, CEKA, self._racunalo, os.getpid(), _sada())).lastrowid
+            if izlaz:
+                datoteka = os.path.join(self.mapa, f"{id_}{izlaz}")
+                self._veza.execute("UPDATE zadaci SET datoteka = ? WHERE id = ?", (datoteka, id_))
+        if _prima_napredak(funkcija):
+            if not u_procesu:
+                kwargs['napredak'] = self._napredak(id_)
+            elif self._putanja != ":memory:":  # baza u memoriji nije vidljiva drugom procesu
+                kwargs['napredak'] = _NapredakProcesa(self._putanja, id_)
+        self._izvrsitelj.submit(self._izvrsi, id_, funkcija, argumenti, kwargs, datoteka, u_procesu)
+        return id_
+
+    def _predaj_procesu(self, *posao):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        with self._brava:
+            if self._procesi is None:
+                # spawn: fork iz višedretvenog poslužitelja može naslijediti zaključane brave
+                self._procesi = ProcessPoolExecutor(max_workers=self._radnika, mp_context=multiprocessing.get_context("spawn"))
+            procesi = self._procesi
+        try:
+            return procesi.submit(_pokreni, *posao).result()
+        except BrokenProcessPool:
+            # Radni proces je pao; sljedeći zadatak dobiva novi pool
+            with self._brava:
+                if self._procesi is procesi:
+                    self._procesi = None
+            procesi.shutdown(wait=False)
+            raise
+
+    def _azuriraj(self, id_, **stupci):
+        with self._brava, self._veza:
+            self._veza.execute(f"UPDATE zadaci SET {', '.join(f'{s} = ?' for s in stupci)} WHERE id = ?", (*stupci.values(), id_))
+
+    def _napredak(self, id_):
+        zadnji = [0.0]
+
+        def napredak(n, ukupno=None):
+            sada = time.monotonic()
+            if sada - zadnji[0] >= _RAZMAK_NAPRETKA_S:
+                zadnji[0] = sada
+                self._azuriraj(id_, napredak=n, ukupno=ukupno)
+        return napredak
+
+    def _izvrsi(self, id_, funkcija, argumenti, kwargs, datoteka, u_procesu):
+        self._azuriraj(id_, stanje=RADI)
+        try:
+            if u_procesu:
+                rezultat = self._predaj_procesu(funkcija, argumenti, kwargs, datoteka)
+            else:
+                rezultat = _pokreni(funkcija, argumenti, kwargs, datoteka)
+        except Exception as e:
+            # ValueError su poruke za korisnika (neispravan unos); ostalo je greška u programu
+            poruka = str(e) if isinstance(e, ValueError) else "".join(traceback.format_exception_only(e)).strip()
+            self._azuriraj(id_, stanje=GRESKA, poruka=poruka, zavrseno=_sada())
+            if datoteka and os.path.exists(datoteka):
+                os.unlink(datoteka)
+            return
+        with self._brava:
+            self._rezultati[id_] = rezultat
+            while len(self._rezultati) > MAKS_REZULTATA:
+                self._rezultati.popitem(last=False)
+        self._azuriraj(id_, stanje=GOTOVO, zavrseno=_sada())
+
+    def stanje(self, id_):
+        """Zapis zadatka (id, vrsta, stanje, napredak, ukupno, poruka, datoteka, stvoreno, zavrseno) ili None."""
+        with self._brava:
+            red = self._veza.execute(f"SELECT {', '.join(_STUPCI)} FROM zadaci WHERE id = ?", (id_,)).fetchone()
+        return dict(zip(_STUPCI, red)) if red else None
+
+    def rezultat(self, id_):
+        """Vrijednost koju je funkcija vratila (None ako zadatak nije gotov ili je rezultat istisnut)."""
+        with self._brava:
+            return self._rezultati.get(id_)
+
+    def cekaj(self, id_, najdulje=None, razmak=0.05):
+        """Čeka da zadatak završi (za skripte i testove) i vraća njegovo stanje."""
+        kraj = None if najdulje is None else time.monotonic() + najdulje
+        while True:
+            zadatak = self.stanje(id_)
+            if zadatak is None or zadatak['stanje'] in ZAVRSENA_STANJA or (kraj is not None and time.monotonic() >= kraj):
+                return zadatak
+            time.sleep(razmak)
+
+    def popis(self, ograniceno=20):
+        """Najnoviji zadaci, za pregled opterećenja."""
+        with self._brava:
+            redovi = self._veza.execute(f"SELECT {', '.join(_STUPCI)} FROM zadaci ORDER BY id DESC LIMIT ?", (ograniceno,)).fetchall()
+        return [dict(zip(_STUPCI, red)) for red in redovi]
+
+    def pocisti(self, starije_od=timedelta(days=1)):
+        """Briše završene zadatke starije od `starije_od` i njihove izlazne datoteke; vraća broj obrisanih."""
+        granica = (datetime.now() - starije_od).isoformat(timespec="seconds")
+        with self._brava, self._veza:
+            redovi = self._veza.execute("SELECT id, datoteka FROM zadaci WHERE stanje IN (?, ?) AND zavrseno < ?", (*ZAVRSENA_STANJA, granica)).fetchall()
+            for id_, datoteka in redovi:
+                if datoteka and os.path.exists(datoteka):
+                    os.unlink(datoteka)
+                self._rezultati.pop(id_, None)
+            self._veza.executemany("DELETE FROM zadaci WHERE id = ?", [(id_,) for id_, _ in redovi])
+        return len(redovi)
+
+    def zatvori(self, cekaj=True):
+        self._izvrsitelj.shutdown(wait=cekaj)
+        if self._procesi is not None:
+            self._procesi.shutdown(wait=cekaj)
+        with self._brava:
+            self._veza.close()
@@ -0,0 +1,67 @@
+"""Arhiva dokumenata (pravni_alat.arhiva): ključevi pretraživanja i trazi()."""
+import pytest
+
+from pravni_alat.arhiva import Arhiva, kljucevi_pretrage, svedi_oznaku
+
+VJEROVNIK = "<b>Vjerovnik d.o.o.</b><br>OIB: 12345678903"
+
+
+def ulazi_zalbe(duznik_oib, broj):
+    return {'argumenti': [VJEROVNIK, f"Dužnik, OIB {duznik_oib}", "Općinski sud u Zagrebu", {'broj': broj}]}
+
+
+@pytest.fixture
+def arhiva(tmp_path):
+    arhiva = Arhiva(str(tmp_path))
+    yield arhiva
+    arhiva.zatvori()
+
+
+@pytest.mark.parametrize("oznaka", ["P-123/2024", "p 123 / 2024", "P123/2024", "P – 123/2024", " P-123/2024. "])
+def test_svedi_oznaku(oznaka):
+    assert svedi_oznaku(oznaka) == "P-123/2024"
+
+
+def test_kljucevi_pretrage():
+    assert kljucevi_pretrage('zalba', ulazi_zalbe("00000000001", "p 5/2023")) == [
+        ('oib', "00000000001"), ('oib', "12345678903"), ('poslovni_broj', "P-5/2023")]
+    # Dvanaest znamenki nije OIB; ulazi drugačijeg oblika daju samo OIB-e
+    assert kljucevi_pretrage('zalba', {'argumenti': ["OIB: 123456789031", "OIB:12345678903"]}) == [('oib', "12345678903")]
+    assert kljucevi_pretrage('zk_prijedlog', {'argumenti': [None, None, None, {'ko': "Črnomerec", 'cestica': "123/4"}]}) == [
+        ('nekretnina', "crnomerec|123/4")]
+    assert kljucevi_pretrage('tabularna', {'argumenti': [None, None, "Trnje", ""]}) == []
+
+
+def test_trazi_po_oibu_i_poslovnom_broju(arhiva):
+    prvi = arhiva.spremi('zalba', "<p>1</p>", ulazi_zalbe("00000000001", "P-1/2024"), ime="prvi")
+    drugi = arhiva.spremi('zalba', "<p>2</p>", ulazi_zalbe("69435151530", "P-2/2024"), ime="drugi")
+    treci = arhiva.spremi('ovrha', "<p>3</p>", {'argumenti': [VJEROVNIK]}, ime="treci")
+    # Isti dokument s istim ulazima ne dodaje se ponovno
+    assert arhiva.spremi('zalba', "<p>1</p>", ulazi_zalbe("00000000001", "P-1/2024")) == prvi
+    assert len(arhiva) == 3
+
+    assert [d['id'] for d in arhiva.trazi(oib="12345678903")] == [treci, drugi, prvi]
+    assert [d['ime'] for d in arhiva.trazi(oib=" 69435151530 ")] == ["drugi"]
+    assert [d['id'] for d in arhiva.trazi(poslovni_broj="p 1 / 2024")] == [prvi]
+    # Svi uvjeti moraju vrijediti
+    assert [d['id'] for d in arhiva.trazi(oib="12345678903", poslovni_broj="P-2/2024")] == [drugi]
+    assert arhiva.trazi(oib="00000000001", poslovni_broj="P-2/2024") == []
+    assert [d['id'] for d in arhiva.trazi(oib="12345678903", ograniceno=2)] == [treci, drugi]
+    assert arhiva.trazi() == []
+    assert arhiva.dokument(drugi) == "<p>2</p>"
+
+
+def test_trazi_po_nekretnini_i_z_broju(arhiva):
+    trnje = arhiva.spremi('zk_prijedlog', "<p>a</p>", {'argumenti': [None, None, None, {'ko': "Trnje", 'cestica': "100/1"}]})
+    trnje_druga = arhiva.spremi('tabularna', "<p>b</p>", {'argumenti': [None, None, "TRNJE", "200"]})
+    # "Trnjeslav" ima isti prefiks, ali je druga k.o.
+    druga_ko = arhiva.spremi('zk_prijedlog', "<p>c</p>", {'argumenti': [None, None, None, {'ko': "Trnjeslav", 'cestica': "100/1"}]})
+    brisovna = arhiva.spremi('brisovna_tuzba', "<p>d</p>", {'argumenti': [None, None, None, None, {'ko': "Trnje", 'cestica': "100/1"}, {'z_broj': "Z-77/2023"}]})
+
+    assert [d['id'] for d in arhiva.trazi(ko="Trnje", cestica="100/1")] == [brisovna, trnje]
+    assert [d['id'] for d in arhiva.trazi(ko=" trnje ")] == [brisovna, trnje_druga, trnje]
+    assert [d['id'] for d in arhiva.trazi(ko="Trnjeslav")] == [druga_ko]
+    assert [d['id'] for d in arhiva.trazi(z_broj="z 77/2023", ko="Trnje")] == [brisovna]
+    assert arhiva.trazi(z_broj="Z-77/2023", ko="Trnjeslav") == []
+    with pytest.raises(ValueError):
+        arhiva.trazi(cestica="100/1")
@@ -0,0 +1,51 @@
+"""Word dokument (pravni_alat.docx): WordprocessingML iz HTML-a generatora."""
+import io
+import zipfile
+from xml.etree import ElementTree
+
+from pravni_alat.docx import docx_iz_html
+from pravni_alat.dokumenti import generiraj_ovrhu_pro
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def raspon(tc):
+    spajanje = tc.find(f"{W}tcPr/{W}gridSpan")
+    return 1 if spajanje is None else int(spajanje.get(f"{W}val"))
+
+
+def tijelo(html_sadrzaj):
+    with zipfile.ZipFile(io.BytesIO(docx_iz_html(html_sadrzaj))) as paket:
+        return ElementTree.fromstring(paket.read("word/document.xml")).find(f"{W}body")
+
+
+def test_odlomci_i_stilovi():
+    body = tijelo("<div class='header-doc'>Naslov</div><div class='justified'>Prvi<br>drugi & <b>treći</b></div>")
+    naslov, tekst = body.findall(f"{W}p")
+    assert naslov.find(f"{W}pPr/{W}pStyle").get(f"{W}val") == "Naslov"
+    assert [r.findtext(f"{W}t") if r.find(f"{W}br") is None else "<br>" for r in tekst.findall(f"{W}r")] == ["Prvi", "<br>", "drugi & ", "treći"]
+    assert tekst.findall(f"{W}r")[-1].find(f"{W}rPr/{W}b") is not None
+
+
+def test_tablica_ima_mrezu_stupaca():
+    body = tijelo('<table><tr><td width="70%">a</td><td>b</td><td>c</td></tr><tr><td colspan="2">d</td><td>e</td></tr></table><div>nakon</div>')
+    tablica = body.find(f"{W}tbl")
+    # Redoslijed po shemi: tblPr, tblGrid, pa redovi; tablica ostaje na svom mjestu u tijelu
+    assert [dijete.tag for dijete in tablica] == [f"{W}tblPr", f"{W}tblGrid", f"{W}tr", f"{W}tr"]
+    assert [dijete.tag for dijete in body] == [f"{W}tbl", f"{W}p", f"{W}sectPr"]
+    # Širina teksta A4 uz margine 2,5 cm je 9070 dxa: 70 % i po 15 % za stupce bez širine
+    assert [int(s.get(f"{W}w")) for s in tablica.find(f"{W}tblGrid")] == [6349, 1360, 1360]
+    assert [[raspon(tc) for tc in red.findall(f"{W}tc")] for red in tablica.findall(f"{W}tr")] == [[1, 1, 1], [2, 1]]
+
+
+def test_ugnijezdena_tablica_i_dokument_generatora():
+    body = tijelo("<table><tr><td><table><tr><td>x</td><td>y</td></tr></table></td></tr></table>")
+    vanjska = body.find(f"{W}tbl")
+    assert len(vanjska.find(f"{W}tblGrid")) == 1
+    assert len(vanjska.find(f"{W}tr/{W}tc/{W}tbl/{W}tblGrid")) == 2
+    troskovi = {'stavka': 50.0, 'materijalni': 13.27, 'pdv': 15.82, 'pristojba': 0}
+    trazbina = {'glavnica': 100.0, 'datum_racuna': '01.01.2024.', 'dospjece': '01.02.2024.', 'kamata_do': None}
+    body = tijelo(generiraj_ovrhu_pro("Sud", "Vjerovnik", "Dužnik", trazbina, "Račun 1", troskovi))
+    for tablica in body.iter(f"{W}tbl"):
+        stupaca = len(tablica.find(f"{W}tblGrid"))
+        assert stupaca == max(sum(map(raspon, red.findall(f"{W}tc"))) for red in tablica.findall(f"{W}tr"))
@@ -0,0 +1,34 @@
+"""Dokumenti (pravni_alat.dokumenti): escape_html i format_text za tekst u HTML-u dokumenata."""
+import html
+
+import pytest
+
+from pravni_alat.dokumenti import escape_html, format_text
+
+
+@pytest.mark.parametrize("tekst, ocekivano", [
+    (None, ""),
+    ("", ""),
+    ("Ivan Horvat", "Ivan Horvat"),
+    ("A & B d.o.o.", "A &amp; B d.o.o."),
+    ("<script>alert(1)</script>", "&lt;script&gt;alert(1)&lt;/script&gt;"),
+    # & se zamjenjuje prvi, pa već zamijenjeni znakovi nisu dvostruko zamijenjeni
+    ("&lt;", "&amp;lt;"),
+    ("a < b > c & d", "a &lt; b &gt; c &amp; d"),
+    ('"navodnici" i \'apostrofi\'', '"navodnici" i \'apostrofi\''),
+    (12.5, "12.5"),
+    (0, "0"),
+])
+def test_escape_html(tekst, ocekivano):
+    assert escape_html(tekst) == ocekivano
+
+
+def test_escape_html_kao_standardna_biblioteka():
+    tekst = "Šifra <b>&</b> čćžšđ ŠĐ > \n"
+    assert escape_html(tekst) == html.escape(tekst, quote=False)
+
+
+def test_format_text():
+    assert format_text("Ilica 1\nZagreb & <okolica>") == "Ilica 1<br>Zagreb &amp; &lt;okolica&gt;"
+    assert format_text(None) == ""
+    assert format_text("") == ""
@@ -0,0 +1,137 @@
+"""Izvodi (pravni_alat.izvodi): čitanje camt.053 izvoda i povezivanje uplata s računima."""
+import csv
+import io
+import zipfile
+from datetime import date
+
+import pytest
+
+from pravni_alat import izvodi
+from pravni_alat.izvodi import citaj_camt053, citaj_racune, svedi_referencu, uskladi, uvezi
+
+CAMT053 = """<?xml version="1.0" encoding="UTF-8"?>
+<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.08"><BkToCstmrStmt><Stmt>
+  <Ntry><Amt Ccy="EUR">100.00</Amt><CdtDbtInd>CRDT</CdtDbtInd><Sts><Cd>BOOK</Cd></Sts><ValDt><Dt>2024-03-01</Dt></ValDt>
+    <NtryDtls><TxDtls><RltdPties><Dbtr><Nm>Ana Anić</Nm></Dbtr></RltdPties>
+      <RmtInf><Strd><CdtrRefInf><Ref>HR01 1-2024</Ref></CdtrRefInf></Strd></RmtInf></TxDtls></NtryDtls></Ntry>
+  <Ntry><Amt Ccy="EUR">50.00</Amt><CdtDbtInd>CRDT</CdtDbtInd><Sts><Cd>BOOK</Cd></Sts><BookgDt><DtTm>2024-03-02T10:15:00</DtTm></BookgDt>
+    <NtryDtls>
+      <TxDtls><AmtDtls><TxAmt><Amt Ccy="EUR">30.00</Amt></TxAmt></AmtDtls><RmtInf><Ustrd>Plaćanje računa 2-2024</Ustrd></RmtInf></TxDtls>
+      <TxDtls><Amt Ccy="EUR">20.00</Amt><RltdPties><Dbtr><Pty><Nm>Ivo Ivić</Nm></Pty></Dbtr></RltdPties></TxDtls>
+    </NtryDtls></Ntry>
+  <Ntry><Amt Ccy="EUR">70.00</Amt><CdtDbtInd>CRDT</CdtDbtInd><Sts><Cd>PDNG</Cd></Sts><ValDt><Dt>2024-03-03</Dt></ValDt></Ntry>
+  <Ntry><Amt Ccy="USD">80.00</Amt><CdtDbtInd>CRDT</CdtDbtInd><Sts><Cd>BOOK</Cd></Sts><ValDt><Dt>2024-03-03</Dt></ValDt></Ntry>
+  <Ntry><Amt Ccy="EUR">15.00</Amt><CdtDbtInd>DBIT</CdtDbtInd><Sts><Cd>BOOK</Cd></Sts><ValDt><Dt>2024-03-04</Dt></ValDt></Ntry>
+  <Ntry><Amt Ccy="EUR">100.00</Amt><CdtDbtInd>DBIT</CdtDbtInd><RvslInd>true</RvslInd><Sts><Cd>BOOK</Cd></Sts><ValDt><Dt>2024-03-05</Dt></ValDt>
+    <AddtlNtryInf>Storno</AddtlNtryInf>
+    <NtryDtls><TxDtls><RmtInf><Strd><CdtrRefInf><Ref>HR01 1-2024</Ref></CdtrRefInf></Strd></RmtInf></TxDtls></NtryDtls></Ntry>
+</Stmt></BkToCstmrStmt></Document>"""
+
+# Starija verzija: Sts je tekst, a skupna stavka bez iznosa po transakciji je jedna uplata
+CAMT053_V02 = """<?xml version="1.0" encoding="UTF-8"?>
+<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.02"><BkToCstmrStmt><Stmt>
+  <Ntry><Amt Ccy="EUR">12.50</Amt><CdtDbtInd>CRDT</CdtDbtInd><Sts>BOOK</Sts><ValDt><Dt>2024-04-01</Dt></ValDt>
+    <NtryDtls><TxDtls><RmtInf><Ustrd>prva</Ustrd></RmtInf></TxDtls><TxDtls><RmtInf><Ustrd>druga</Ustrd></RmtInf></TxDtls></NtryDtls></Ntry>
+</Stmt></BkToCstmrStmt></Document>"""
+
+
+def test_svedi_referencu():
+    assert svedi_referencu("HR01 123-2024") == "123-2024"
+    assert svedi_referencu(" rf18 5390 0754 7034.") == "539007547034"
+    assert svedi_referencu(None) == ""
+
+
+def test_citaj_camt053():
+    uplate = list(citaj_camt053(io.BytesIO(CAMT053.encode("utf-8"))))
+    assert [(u['datum'], u['iznos'], u['referenca'], u['platitelj'], u['opis']) for u in uplate] == [
+        (date(2024, 3, 1), 100.0, "HR01 1-2024", "Ana Anić", ""),
+        (date(2024, 3, 2), 30.0, "", "", "Plaćanje računa 2-2024"),
+        (date(2024, 3, 2), 20.0, "", "Ivo Ivić", ""),
+        (date(2024, 3, 5), -100.0, "HR01 1-2024", "", "Storno"),
+    ]
+    assert list(citaj_camt053(io.BytesIO(CAMT053_V02.encode("utf-8")))) == [
+        {'datum': date(2024, 4, 1), 'iznos': 12.5, 'referenca': "", 'platitelj': "", 'opis': "prva"}]
+
+
+def racuni():
+    return list(citaj_racune([
+        {'kupac': "Ana Anić", 'oib': "00000000001", 'broj_racuna': "1-2024", 'dospijece': "01.02.2024.", 'iznos': "100,00", 'poziv_na_broj': "HR01 1-2024"},
+        {'kupac': "Ana Anić", 'oib': "00000000001", 'broj_racuna': "3-2024", 'dospijece': "01.03.2024.", 'iznos': "40,00", 'poziv_na_broj': ""},
+        # Poziv na broj jednak je broju drugog računa, pa je referenca 3-2024 dvoznačna
+        {'kupac': "Ivo  IVIĆ", 'oib': "", 'broj_racuna': "2-2024", 'dospijece': "15.02.2024.", 'iznos': "60,00", 'poziv_na_broj': "HR01 3-2024"},
+    ]))
+
+
+def test_citaj_racune():
+    prvi = racuni()[0]
+    assert prvi == {'duznik': "Ana Anić", 'oib': "00000000001", 'adresa': "", 'racun': "1-2024", 'datum_racuna': date(2024, 2, 1),
+                    'dospijece': date(2024, 2, 1), 'iznos': 100.0, 'referenca': "HR01 1-2024"}
+    with pytest.raises(ValueError, match="dospijece"):
+        list(citaj_racune([{'kupac': "A", 'iznos': "1"}]))
+    with pytest.raises(ValueError, match="Red 3"):
+        list(citaj_racune([{'kupac': "A", 'iznos': "1", 'dospijece': "01.01.2024."}, {'kupac': "B", 'iznos': "1", 'dospijece': "nije datum"}]))
+
+
+def test_uskladi():
+    nepovezane = []
+    uplate = [
+        {'datum': date(2024, 3, 1), 'iznos': 100.0, 'referenca': "HR01 1-2024", 'platitelj': "Ana", 'opis': ""},
+        {'datum': date(2024, 3, 2), 'iznos': 60.0, 'referenca': "HR00 2-2024", 'platitelj': "", 'opis': ""},
+        # Bez reference račun se traži među riječima opisa
+        {'datum': date(2024, 3, 3), 'iznos': 25.0, 'referenca': "", 'platitelj': "", 'opis': "Plaćanje (1-2024)"},
+        # Dvoznačna i nepoznata referenca ne povezuju se
+        {'datum': date(2024, 3, 4), 'iznos': 7.0, 'referenca': "HR01 3-2024", 'platitelj': "", 'opis': ""},
+        {'datum': date(2024, 3, 4), 'iznos': 9.0, 'referenca': "HR01 99-2024", 'platitelj': "", 'opis': "nepoznato"},
+        # Storno uplate po računu 2-2024; storno bez odgovarajuće uplate ostaje nepovezan
+        {'datum': date(2024, 3, 5), 'iznos': -60.0, 'referenca': "2-2024", 'platitelj': "", 'opis': ""},
+        {'datum': date(2024, 3, 6), 'iznos': -5.0, 'referenca': "1-2024", 'platitelj': "", 'opis': ""},
+    ]
+    knjige, izvjestaj = uskladi(racuni(), uplate, nepovezane.append)
+    assert izvjestaj == {'racuna': 3, 'duznika': 2, 'uplata': 7, 'povezano': 3, 'nepovezano': 3, 'iznos_nepovezano': 11.0,
+                         'stornirano': 1, 'dvoznacnih_referenci': 1}
+    assert [u['iznos'] for u in nepovezane] == [7.0, 9.0, -5.0]
+    assert sorted(knjige) == ["00000000001", "ivo ivic"]
+    ana = knjige["00000000001"]
+    assert [(u['iznos'], u['racun'], u['opis']) for u in ana['uplate']] == [(100.0, "1-2024", "Ana (1-2024)"), (25.0, "1-2024", "1-2024")]
+    assert [(r['oznaka'], r['placeno']) for r in ana['racuni']] == [("1-2024", 125.0), ("3-2024", 0.0)]
+    assert knjige["ivo ivic"]['uplate'] == []
+    assert knjige["ivo ivic"]['racuni'][0]['placeno'] == 0.0
+
+
+
+def test_citaj_camt053_uklanja_obradene_izvode(monkeypatch):
+    # Datoteka s više izvoda: nakon čitanja u stablu ne smije ostati ni jedan Stmt ni GrpHdr
+    stmt = CAMT053[CAMT053.index("<Stmt>"):CAMT053.index("</BkToCstmrStmt>")]
+    xml = CAMT053.replace("<BkToCstmrStmt>", "<BkToCstmrStmt><GrpHdr><MsgId>1</MsgId></GrpHdr>").replace(stmt, stmt * 50)
+    korijen = []
+    iterparse = izvodi.iterparse
+
+    def s_korijenom(datoteka, events):
+        for dogadaj, element in iterparse(datoteka, events):
+            if not korijen:
+                korijen.append(element)
+            yield dogadaj, element
+
+    monkeypatch.setattr(izvodi, "iterparse", s_korijenom)
+    assert len(list(citaj_camt053(io.BytesIO(xml.encode("utf-8"))))) == 4 * 50
+    assert [len(dijete) for dijete in korijen[0]] == [0]
+
+
+def test_uvezi_racun_prije_tablice_stopa():
+    # Račun dospio prije tablice stopa ne prekida uvoz: dužnik ostaje u sažetku s napomenom
+    racuni = [
+        {'kupac': "Ana Anić", 'oib': "00000000001", 'broj_racuna': "1-2024", 'dospijece': "01.02.2024.", 'iznos': "100,00", 'poziv_na_broj': ""},
+        {'kupac': "Stari Dug", 'oib': "69435151530", 'broj_racuna': "9-2021", 'dospijece': "01.06.2021.", 'iznos': "50,00", 'poziv_na_broj': ""},
+    ]
+    izlaz = io.BytesIO()
+    rezultat = uvezi(racuni, [(io.BytesIO(CAMT053.encode("utf-8")), "izvod.xml")], izlaz, date(2024, 8, 1))
+    assert rezultat['izvjestaj']['neobracunato'] == 1
+    ana, stari = rezultat['sazetak']
+    assert (ana['dužnik'], ana['napomena']) == ("Ana Anić", "")
+    assert ana['kamata'] > 0
+    assert (stari['dužnik'], stari['glavnica'], stari['kamata']) == ("Stari Dug", None, None)
+    assert "01.06.2021." in stari['napomena']
+    with zipfile.ZipFile(izlaz) as arhiva:
+        redovi = list(csv.DictReader(io.TextIOWrapper(arhiva.open("ovrhe.csv"), encoding="utf-8-sig"), delimiter=";"))
+    # Uplata za 1-2024 u izvodu je stornirana, pa su oba računa i dalje za ovrhu
+    assert [r['ovrsenik'] for r in redovi] == ["Ana Anić", "Stari Dug"]
@@ -0,0 +1,83 @@
+"""Zatezna kamata (pravni_alat.kamate): poznati iznosi po tablici RAZDOBLJA_STOPA."""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from pravni_alat.kamate import TablicaStopa, ZADANA_TABLICA, izracunaj_kamate, izracunaj_kamatu
+
+
+def test_jedno_razdoblje():
+    # 1.1.-1.7.2024. = 182 dana po 7,50 %
+    kamata, razdoblja = izracunaj_kamatu(1000.0, date(2024, 1, 1), date(2024, 7, 1))
+    assert kamata == pytest.approx(1000 * 7.50 * 182 / 36500)
+    assert razdoblja == [{'Razdoblje od': '01.01.2024.', 'Stopa (%)': 7.50, 'Dana': 182, 'Kamata (EUR)': 37.40}]
+
+
+def test_preko_granice_razdoblja():
+    # 31 dan po 7,00 % (prosinac 2023.) i 31 dan po 7,50 % (siječanj 2024.)
+    kamata, razdoblja = izracunaj_kamatu(10000.0, date(2023, 12, 1), date(2024, 2, 1))
+    assert kamata == pytest.approx(10000 * (7.00 * 31 + 7.50 * 31) / 36500)
+    assert [(r['Razdoblje od'], r['Dana']) for r in razdoblja] == [('01.07.2023.', 31), ('01.01.2024.', 31)]
+
+
+def test_trgovacki_ugovori():
+    # 1.1.-1.7.2023. = 181 dan po 10,50 %
+    kamata, _ = izracunaj_kamatu(1000.0, date(2023, 1, 1), date(2023, 7, 1), vrsta="trgovacki")
+    assert kamata == pytest.approx(1000 * 10.50 * 181 / 36500)
+
+
+def test_nakon_posljednjeg_razdoblja_vrijedi_posljednja_stopa():
+    kamata, _ = izracunaj_kamatu(100.0, date(2025, 7, 1), date(2026, 7, 1))
+    assert kamata == pytest.approx(5.15)
+
+
+def test_obracun_prije_dospijeca_nema_kamate():
+    kamata, razdoblja = izracunaj_kamatu(1000.0, date(2024, 5, 1), date(2024, 5, 1))
+    assert kamata == 0
+    assert razdoblja == []
+
+
+def test_niz_trazbina_indeks_i_razdoblja_se_slazu():
+    glavnice = [1000.0, 250.5, 99999.99]
+    dospijeca = ["2023-02-14", "2024-06-30", "2023-01-01"]
+    obracuni = ["2025-03-01", "2024-07-02", "2026-01-01"]
+    obracun = izracunaj_kamate(glavnice, dospijeca, obracuni)
+    np.testing.assert_allclose(obracun.po_razdobljima.sum(axis=1), obracun.ukupno)
+    np.testing.assert_allclose(izracunaj_kamate(glavnice, dospijeca, obracuni, po_razdobljima=False).ukupno, obracun.ukupno)
+    # 30.6. po 7,50 % i 1.7. po 7,25 %
+    assert obracun.ukupno[1] == pytest.approx(250.5 * (7.50 + 7.25) / 36500)
+    assert obracun.verzija == ZADANA_TABLICA.verzija
+
+
+def test_dospijece_prije_tablice():
+    with pytest.raises(ValueError, match="01.12.2022."):
+        izracunaj_kamatu(1000.0, date(2022, 12, 1), date(2023, 2, 1))
+
+
+def test_dospijece_prije_tablice_ne_rusi_niz():
+    obracun = izracunaj_kamate([1000.0, 1000.0, 500.0], ["2024-01-01", "2021-06-30", "2020-01-01"], ["2024-07-01", "2024-07-01", "2019-01-01"])
+    # Samo druga tražbina nije pokrivena; treća nema dana kamate pa je 0
+    assert obracun.nepokriveno.tolist() == [False, True, False]
+    assert obracun.ukupno[0] == pytest.approx(1000 * 7.50 * 182 / 36500)
+    assert np.isnan(obracun.ukupno[1]) and np.isnan(obracun.po_razdobljima[1]).all()
+    assert obracun.ukupno[2] == 0
+    samo_ukupno = izracunaj_kamate([1000.0, 1000.0], ["2024-01-01", "2021-06-30"], ["2024-07-01", "2024-07-01"], po_razdobljima=False)
+    assert samo_ukupno.nepokriveno.tolist() == [False, True]
+    assert samo_ukupno.ukupno[0] == pytest.approx(obracun.ukupno[0])
+
+
+def test_nepoznata_vrsta_odnosa():
+    with pytest.raises(ValueError):
+        izracunaj_kamate([1000.0], ["2024-01-01"], ["2024-02-01"], vrsta="potrosacki")
+
+
+def test_dodano_razdoblje():
+    tablica = TablicaStopa([(date(2024, 1, 1), 4.0, 9.0)])
+    tablica.dodaj_razdoblje(date(2024, 1, 11), 6.0, 11.0)
+    assert tablica.verzija == "2024-01-11"
+    # 10 dana po 4 % i 5 dana po 6 %
+    kamata, _ = izracunaj_kamatu(36500.0, date(2024, 1, 1), date(2024, 1, 16), tablica=tablica)
+    assert kamata == pytest.approx(10 * 4.0 + 5 * 6.0)
+    with pytest.raises(ValueError):
+        tablica.dodaj_razdoblje(date(2024, 1, 5), 1.0, 2.0)
@@ -0,0 +1,67 @@
+"""Knjiga dugovanja (pravni_alat.knjiga): uračunavanje uplata (čl. 171.-172. ZOO) i kamata između događaja."""
+from datetime import date
+
+import pytest
+
+from pravni_alat.kamate import izracunaj_kamatu
+from pravni_alat.knjiga import obracunaj_knjigu
+
+
+def test_bez_uplata_kao_jedna_trazbina():
+    stanje = obracunaj_knjigu([{'oznaka': "1/2024", 'iznos': 1000.0, 'dospijece': date(2024, 1, 1)}], [], date(2024, 7, 1))
+    assert stanje['glavnica'] == 1000.0
+    assert stanje['kamata'] == pytest.approx(izracunaj_kamatu(1000.0, date(2024, 1, 1), date(2024, 7, 1))[0])
+    assert [r['Događaj'] for r in stanje['specifikacija']] == ["Dospijeće računa 1/2024", "Stanje na dan obračuna"]
+    assert stanje['obracun'] == date(2024, 7, 1)
+
+
+def test_uplata_prvo_troskovi_pa_kamata_pa_glavnica():
+    stanje = obracunaj_knjigu([{'oznaka': "1", 'iznos': 1000.0, 'dospijece': "2024-01-01"}],
+                              [{'datum': "2024-04-01", 'iznos': 500.0}], "2024-07-01", troskovi=100.0)
+    # Do uplate 91 dan po 7,50 %; uplata podmiruje 100 troškova, kamatu, a ostatak ide u glavnicu
+    kamata_do_uplate = 1000 * 7.50 * 91 / 36500
+    glavnica = 1000 - (500 - 100 - kamata_do_uplate)
+    assert stanje['troskovi'] == 0
+    assert stanje['glavnica'] == pytest.approx(glavnica)
+    # Od 1.4. do 1.7. još 91 dan na ostatak glavnice
+    assert stanje['kamata'] == pytest.approx(glavnica * 7.50 * 91 / 36500)
+    assert stanje['preplata'] == 0
+
+
+def test_glavnica_se_zatvara_od_najstarijeg_racuna():
+    racuni = [{'oznaka': "B", 'iznos': 300.0, 'dospijece': "2024-02-01"}, {'oznaka': "A", 'iznos': 200.0, 'dospijece': "2024-01-01"}]
+    # Uplata na dan dospijeća prvog računa: još nema kamate, pa cijela ide u glavnicu računa A
+    stanje = obracunaj_knjigu(racuni, [{'datum': "2024-01-01", 'iznos': 200.0}], "2024-03-01")
+    assert stanje['glavnica'] == pytest.approx(300.0)
+    # Kamata teče samo na račun B, od 1.2. (29 dana po 7,50 %)
+    assert stanje['kamata'] == pytest.approx(300 * 7.50 * 29 / 36500)
+
+
+def test_preplata_se_uracunava_u_kasniji_racun():
+    racuni = [{'oznaka': "1", 'iznos': 100.0, 'dospijece': "2024-01-10"}, {'oznaka': "2", 'iznos': 100.0, 'dospijece': "2024-03-01"}]
+    stanje = obracunaj_knjigu(racuni, [{'datum': "2024-01-10", 'iznos': 150.0}], "2024-03-01")
+    assert stanje['glavnica'] == 0
+    assert stanje['preplata'] == pytest.approx(50.0)
+    stanje = obracunaj_knjigu(racuni, [{'datum': "2024-01-10", 'iznos': 150.0}], "2024-03-02")
+    assert stanje['glavnica'] == pytest.approx(50.0)
+    assert stanje['preplata'] == 0
+
+
+def test_promjena_stope_u_specifikaciji():
+    stanje = obracunaj_knjigu([{'oznaka': "1", 'iznos': 1000.0, 'dospijece': "2024-06-01"}], [], "2024-08-01")
+    promjene = [r for r in stanje['specifikacija'] if r['Događaj'].startswith("Promjena stope")]
+    assert [(r['Datum'], r['Događaj']) for r in promjene] == [("01.07.2024.", "Promjena stope na 7.25 %")]
+    # 30 dana po 7,50 % i 31 dan po 7,25 %
+    assert stanje['kamata'] == pytest.approx(1000 * (7.50 * 30 + 7.25 * 31) / 36500)
+
+
+def test_racun_nakon_obracuna_se_ne_broji():
+    stanje = obracunaj_knjigu([{'oznaka': "1", 'iznos': 1000.0, 'dospijece': "2024-09-01"}], [], "2024-08-01")
+    assert stanje['glavnica'] == 0
+    assert stanje['kamata'] == 0
+
+
+def test_racun_prije_tablice_stopa():
+    racuni = [{'oznaka': "7/2022", 'iznos': 100.0, 'dospijece': "2022-11-15"}, {'oznaka': "1", 'iznos': 100.0, 'dospijece': "2024-01-01"}]
+    with pytest.raises(ValueError, match=r"Račun 7/2022 dospijeva 15\.11\.2022\., prije početka tablice stopa \(01\.01\.2023\.\)"):
+        obracunaj_knjigu(racuni, [], "2024-07-01")
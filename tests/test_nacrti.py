@@ -0,0 +1,115 @@
+"""Nacrti (pravni_alat.nacrti): odgođeni upis u bazu i oporavak od neuspjelog upisa."""
+import logging
+import sqlite3
+import time
+from datetime import date, datetime
+
+import pytest
+
+from pravni_alat.nacrti import Nacrti, dekodiraj, kodiraj
+
+
+class ZakljucanaVeza:
+    """Veza koja prvih `neuspjeha` transakcija odbija kao zaključanu bazu."""
+
+    def __init__(self, veza, neuspjeha):
+        self.veza, self.neuspjeha = veza, neuspjeha
+
+    def __getattr__(self, ime):
+        return getattr(self.veza, ime)
+
+    def __enter__(self):
+        return self.veza.__enter__()
+
+    def __exit__(self, *iznimka):
+        return self.veza.__exit__(*iznimka)
+
+    def executemany(self, *argumenti):
+        if self.neuspjeha:
+            self.neuspjeha -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return self.veza.executemany(*argumenti)
+
+
+def cekaj(uvjet, najdulje=5.0):
+    kraj = time.monotonic() + najdulje
+    while not uvjet():
+        assert time.monotonic() < kraj, "isteklo vrijeme čekanja"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def putanja(tmp_path):
+    return str(tmp_path / "nacrti.sqlite3")
+
+
+def procitano(putanja, nacrt):
+    veza = sqlite3.connect(putanja)
+    try:
+        return {polje: dekodiraj(v) for polje, v in veza.execute("SELECT polje, vrijednost FROM nacrti_polja WHERE nacrt = ?", (nacrt,))}
+    finally:
+        veza.close()
+
+
+def test_kodiranje():
+    for vrijednost in ("kratko", "dugo " * 100, 12.5, True, None, date(2024, 3, 15)):
+        assert dekodiraj(kodiraj(vrijednost)) == vrijednost
+    assert kodiraj("dugo " * 100)[:1] == b"x"
+
+
+def test_odgodeni_upis(putanja):
+    nacrti = Nacrti(putanja, odgoda=0.05, najdulje=1.0)
+    try:
+        assert nacrti.spremi("a", {'ime': "Ana", 'datum': date(2024, 3, 15)}) == 2
+        assert nacrti.spremi("a", {'ime': "Ana"}) == 0
+        assert nacrti.ucitaj("a") == {'ime': "Ana", 'datum': date(2024, 3, 15)}
+        cekaj(lambda: procitano(putanja, "a") == {'ime': "Ana", 'datum': date(2024, 3, 15)})
+    finally:
+        nacrti.zatvori()
+
+
+def test_neuspjeli_upis_se_ponavlja(putanja, caplog):
+    nacrti = Nacrti(putanja, odgoda=0.05, najdulje=1.0)
+    veza = nacrti._veza = ZakljucanaVeza(nacrti._veza, neuspjeha=2)
+    try:
+        with caplog.at_level(logging.ERROR, logger="pravni_alat.nacrti"):
+            nacrti.spremi("a", {'ime': "Ana", 'oib': "00000000001"})
+            cekaj(lambda: veza.neuspjeha == 0)
+            # Promjena zabilježena nakon neuspjelog upisa ne smije se izgubiti ni pregaziti starijom
+            nacrti.spremi("a", {'ime': "Ana Anić"})
+            cekaj(lambda: procitano(putanja, "a") == {'ime': "Ana Anić", 'oib': "00000000001"})
+        assert nacrti._dretva.is_alive()
+        assert "database is locked" in caplog.text
+        # Dretva i dalje upisuje nove promjene
+        nacrti.spremi("b", {'ime': "Ivo"})
+        cekaj(lambda: procitano(putanja, "b") == {'ime': "Ivo"})
+    finally:
+        nacrti.zatvori()
+
+
+def test_zapisi_sve_prosljeduje_gresku_i_cuva_promjene(putanja):
+    nacrti = Nacrti(putanja, odgoda=60, najdulje=60)
+    nacrti._veza = ZakljucanaVeza(nacrti._veza, neuspjeha=1)
+    try:
+        nacrti.spremi("a", {'ime': "Ana"})
+        with pytest.raises(sqlite3.OperationalError):
+            nacrti.zapisi_sve()
+        assert procitano(putanja, "a") == {}
+        assert nacrti.zapisi_sve() == 1
+        assert procitano(putanja, "a") == {'ime': "Ana"}
+    finally:
+        nacrti.zatvori()
+
+
+def test_nepodrzana_vrijednost_odbija_se_pri_biljezenju(putanja):
+    nacrti = Nacrti(putanja, odgoda=60, najdulje=60)
+    try:
+        for vrijednost in ({'a': 1}, ["x"], datetime(2024, 3, 15, 10, 0), b"bajtovi"):
+            with pytest.raises(TypeError, match="polja nacrta los"):
+                nacrti.spremi("a", {'ime': "Ana", 'los': vrijednost})
+        # Ništa od odbijenog poziva nije zabilježeno
+        assert nacrti.ucitaj("a") == {}
+        assert nacrti.spremi("a", {'ime': "Ana"}) == 1
+        assert nacrti.zapisi_sve() == 1
+    finally:
+        nacrti.zatvori()
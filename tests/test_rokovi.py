@@ -0,0 +1,78 @@
+"""Rokovi (pravni_alat.rokovi): Uskrs, blagdani RH i pomicanje posljednjeg dana roka na radni dan."""
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from pravni_alat.rokovi import Kalendar, ROK_ZALBE, blagdani, izracunaj_rok, izracunaj_rokove, uskrs
+
+
+@pytest.mark.parametrize("godina, datum", [(2000, date(2000, 4, 23)), (2019, date(2019, 4, 21)), (2024, date(2024, 3, 31)), (2025, date(2025, 4, 20))])
+def test_uskrs(godina, datum):
+    assert uskrs(godina) == datum
+
+
+def test_blagdani_prije_i_nakon_2020():
+    assert date(2024, 5, 30) in blagdani(2024) and date(2024, 11, 18) in blagdani(2024)
+    assert date(2024, 6, 25) not in blagdani(2024)
+    assert date(2019, 6, 25) in blagdani(2019) and date(2019, 10, 8) in blagdani(2019)
+    # Tijelovo je 60 dana nakon Uskrsa
+    assert uskrs(2024) + timedelta(days=60) == date(2024, 5, 30)
+    assert date(2025, 6, 19) in blagdani(2025)
+
+
+@pytest.mark.parametrize("dostava, rok", [
+    # Rok pada u subotu 30.3., a slijede Uskrs i Uskrsni ponedjeljak
+    (date(2024, 3, 15), date(2024, 4, 2)),
+    # Radni dan, bez pomicanja
+    (date(2024, 5, 8), date(2024, 5, 23)),
+    # Božić i Sveti Stjepan
+    (date(2024, 12, 10), date(2024, 12, 27)),
+    # Nova godina pada u srijedu
+    (date(2024, 12, 17), date(2025, 1, 2)),
+])
+def test_rok_zalbe(dostava, rok):
+    assert izracunaj_rok(dostava, ROK_ZALBE) == rok
+    assert izracunaj_rok(datetime.combine(dostava, datetime.min.time()), ROK_ZALBE) == rok
+
+
+def test_rok_u_radnim_danima():
+    # Veliki petak nije blagdan u RH; dan dostave se ne broji, Uskrsni ponedjeljak preskače se
+    assert izracunaj_rok(date(2024, 3, 29), 3, radni_dani=True) == date(2024, 4, 4)
+    assert izracunaj_rok(date(2024, 3, 30), 1, radni_dani=True) == date(2024, 4, 2)
+
+
+def test_niz_rokova_kao_pojedinacni():
+    dostave = np.arange("2023-01-01", "2025-01-01", dtype="datetime64[D]")
+    for radni_dani, dana in ((False, ROK_ZALBE), (True, 8)):
+        rokovi = izracunaj_rokove(dostave, dana, radni_dani=radni_dani)
+        assert rokovi.tolist() == [izracunaj_rok(d, dana, radni_dani=radni_dani) for d in dostave.tolist()]
+    assert izracunaj_rokove(np.array(["2024-03-15", "2024-03-15"], dtype="datetime64[D]"), [15, 8]).tolist() == [date(2024, 4, 2), date(2024, 3, 25)]
+
+
+def test_izvan_kalendara_i_neispravan_rok():
+    kalendar = Kalendar(2024, 2024)
+    assert izracunaj_rok(date(2024, 3, 15), 15, kalendar=kalendar) == date(2024, 4, 2)
+    with pytest.raises(ValueError):
+        izracunaj_rok(date(2024, 12, 20), 15, kalendar=kalendar)
+    with pytest.raises(ValueError):
+        izracunaj_rok(date(2023, 12, 20), 15, kalendar=kalendar)
+    with pytest.raises(ValueError):
+        izracunaj_rok(date(2024, 3, 15), 0, radni_dani=True)
+    with pytest.raises(ValueError):
+        izracunaj_rokove(np.array(["2024-12-20"], dtype="datetime64[D]"), 15, kalendar=kalendar)
+
+
+@pytest.mark.parametrize("dana", [-1, 2.5, float("nan")])
+def test_negativan_ili_razlomljen_rok(dana):
+    dostave = np.array(["2024-03-15", "2024-05-08"], dtype="datetime64[D]")
+    with pytest.raises(ValueError, match="Rok"):
+        izracunaj_rok(date(2024, 3, 15), dana)
+    with pytest.raises(ValueError, match="Rok"):
+        izracunaj_rok(np.datetime64("2024-03-15"), dana)
+    with pytest.raises(ValueError, match="Rok"):
+        izracunaj_rokove(dostave, [ROK_ZALBE, dana])
+    with pytest.raises(ValueError, match="Rok"):
+        izracunaj_rokove(dostave, dana, radni_dani=True)
+    # Cijeli broj kao float je dopušten
+    assert izracunaj_rok(date(2024, 3, 15), 15.0) == date(2024, 4, 2)
@@ -0,0 +1,37 @@
+"""Skupne ovrhe (pravni_alat.skupno): ZIP s prijedlozima i greske.csv za neispravne redove."""
+import io
+import zipfile
+
+import pytest
+
+from pravni_alat.skupno import skupna_ovrha
+
+
+def redovi():
+    zajednicko = {'ovrhovoditelj': "Vjerovnik d.o.o.", 'isprava': "Račun 1-2024", 'glavnica': "100,00", 'dospijece': "01.02.2024."}
+    return [
+        {**zajednicko, 'ovrsenik': "Ana Anić"},
+        {**zajednicko, 'ovrsenik': "Ivo Ivić", 'glavnica': "nije iznos"},
+        {**zajednicko, 'ovrsenik': "Petar Perić"},
+    ]
+
+
+@pytest.mark.parametrize("radnika", [1, 2])
+def test_prijedlozi_kao_docx(radnika):
+    izlaz = io.BytesIO()
+    izvjestaj = skupna_ovrha(redovi(), izlaz, radnika=radnika)
+    assert (izvjestaj['redova'], izvjestaj['gresaka']) == (2, 1)
+    with zipfile.ZipFile(izlaz) as arhiva:
+        assert arhiva.namelist() == ["000001_Ovrha_Ana_Anić.docx", "000003_Ovrha_Petar_Perić.docx", "greske.csv"]
+        with zipfile.ZipFile(io.BytesIO(arhiva.read("000001_Ovrha_Ana_Anić.docx"))) as docx:
+            assert "Ana Anić" in docx.read("word/document.xml").decode("utf-8")
+
+
+def test_prijedlozi_kao_html_za_word():
+    izlaz = io.BytesIO()
+    skupna_ovrha(redovi()[:1], izlaz, oblik="doc")
+    with zipfile.ZipFile(izlaz) as arhiva:
+        assert arhiva.namelist() == ["000001_Ovrha_Ana_Anić.doc"]
+        assert arhiva.read("000001_Ovrha_Ana_Anić.doc").decode("utf-8").lstrip().startswith("<html")
+    with pytest.raises(ValueError):
+        skupna_ovrha(redovi(), io.BytesIO(), oblik="pdf")
@@ -0,0 +1,42 @@
+"""Stranke (pravni_alat.stranke): kontrolna znamenka OIB-a i ključ za pretraživanje naziva."""
+import random
+
+import pytest
+
+from pravni_alat.stranke import provjeri_oib, provjeri_oibe, svedi_naziv
+
+
+@pytest.mark.parametrize("oib, ispravan", [
+    ("12345678903", True),
+    ("12345678901", False),
+    # Deset nula: ostaci 9, 7, 3, 6, 1, 2, 4, 8, 5, 10, kontrolna znamenka (11 - 10) % 10 = 1
+    ("00000000001", True),
+    ("00000000000", False),
+    (" 12345678903 ", True),
+    (12345678903, True),
+    ("1234567890", False),
+    ("123456789030", False),
+    ("1234567890a", False),
+    # Unicode znamenke prolaze str.isdigit(), ali nisu OIB (puna širina, arapsko-indijske)
+    ("1234567890３", False),
+    ("١٢٣٤٥٦٧٨٩٠٣", False),
+    ("", False),
+    (None, False),
+])
+def test_provjeri_oib(oib, ispravan):
+    assert provjeri_oib(oib) is ispravan
+
+
+def test_provjeri_oibe_kao_pojedinacno():
+    # Unicode znamenke (npr. puna širina) prolaze str.isdigit(), ali nisu OIB
+    oibi = ["12345678903", None, "1234567890３", "12345678901", " 12345678903 ", ""]
+    assert provjeri_oibe(oibi).tolist() == [True, False, False, False, True, False]
+    slucajni = [f"{random.randrange(10**11):011d}" for _ in range(2000)]
+    assert provjeri_oibe(slucajni).tolist() == [provjeri_oib(o) for o in slucajni]
+    assert provjeri_oibe([]).tolist() == []
+
+
+def test_svedi_naziv():
+    assert svedi_naziv("  Đuro  ĆEVAPČIĆ d.o.o. ") == "duro cevapcic d.o.o."
+    assert svedi_naziv("Žitnjak Ø Łódź") == "zitnjak o lodz"
+    assert svedi_naziv(None) == ""
@@ -0,0 +1,55 @@
+"""Red zadataka (pravni_alat.zadaci): zadaci u dretvama i u zasebnim procesima."""
+import os
+import zipfile
+
+import pytest
+
+from pravni_alat.arhiva import Arhiva
+from pravni_alat.skupno import skupna_ovrha_iz_datoteke
+from pravni_alat.zadaci import GOTOVO, GRESKA, RedZadataka
+
+CSV = ("ovrhovoditelj;ovrsenik;isprava;glavnica;dospijece\n"
+       "Vjerovnik d.o.o.;Ana Anić;Račun 1;100,00;01.02.2024.\n"
+       "Vjerovnik d.o.o.;Ivo Ivić;Račun 2;200,00;01.03.2024.\n").encode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def red(tmp_path_factory):
+    mapa = tmp_path_factory.mktemp("zadaci")
+    red = RedZadataka(str(mapa / "baza.sqlite3"), str(mapa / "izlaz"))
+    yield red
+    red.zatvori()
+
+
+def test_zadatak_u_dretvi(red):
+    id_ = red.posalji('zbroj', sum, [1, 2, 3])
+    assert red.cekaj(id_, najdulje=10)['stanje'] == GOTOVO
+    assert red.rezultat(id_) == 6
+
+
+def test_zadatak_u_procesu(red):
+    id_ = red.posalji('pid', os.getpid, u_procesu=True)
+    assert red.cekaj(id_, najdulje=60)['stanje'] == GOTOVO
+    assert red.rezultat(id_) != os.getpid()
+
+
+def test_skupna_ovrha_u_procesu_s_napretkom_i_arhivom(red, tmp_path):
+    arhiva = Arhiva(str(tmp_path / "arhiva"))
+    id_ = red.posalji('skupna_ovrha', skupna_ovrha_iz_datoteke, CSV, "ovrhe.csv", izlaz=".zip", u_procesu=True, arhiva=arhiva)
+    zadatak = red.cekaj(id_, najdulje=60)
+    assert zadatak['stanje'] == GOTOVO, zadatak['poruka']
+    # Napredak je radni proces upisao izravno u bazu
+    assert zadatak['napredak'] == 2
+    assert red.rezultat(id_)['redova'] == 2
+    with zipfile.ZipFile(zadatak['datoteka']) as izlaz:
+        assert len(izlaz.namelist()) == 2
+    # Arhiva je u procesu otvorena iznova nad istom mapom
+    assert len(arhiva) == 2
+    arhiva.zatvori()
+
+
+def test_greska_u_procesu(red):
+    id_ = red.posalji('skupna_ovrha', skupna_ovrha_iz_datoteke, CSV, "ovrhe.csv", izlaz=".zip", u_procesu=True, oblik="pdf")
+    zadatak = red.cekaj(id_, najdulje=60)
+    assert (zadatak['stanje'], zadatak['poruka']) == (GRESKA, "Nepoznat oblik dokumenta: pdf")
+    assert not os.path.exists(zadatak['datoteka'])
@@ -1,150 +1,99 @@
+import csv
+import io
+import os
+import sqlite3
+import tempfile
+import uuid
 import streamlit as st
 from datetime import date
+from itertools import islice
+
+from pravni_alat.arhiva import Arhiva
+from pravni_alat.docx import DOCX_MIME, zapisi_docx
+from pravni_alat.izvodi import uvezi
+from pravni_alat.dokumenti import css_stilovi, escape_html, generiraj_prilagodeni_ugovor_dijelovi
+# Generatori s procesno zajedničkom predmemorijom (ponovljeni klik s istim unosom ne slaže dokument iznova)
+from pravni_alat.memoizacija import (
+    docx_iz_html, generiraj_tuzbu_pro, generiraj_ovrhu_pro, generiraj_zalbu_pro,
+    generiraj_ugovor_standard, generiraj_ugovor_o_radu, generiraj_otkaz, generiraj_tabularnu_doc, generiraj_zk_prijedlog,
+    generiraj_brisovnu_tuzbu,
+)
+from pravni_alat.kamate import ZADANA_TABLICA, izracunaj_kamatu
+from pravni_alat.mjerenje import pokreni_posluzitelj, raspon, rerun
+from pravni_alat.nacrti import STRUKTURA, Nacrti, polja_strukture, struktura_iz_polja
+from pravni_alat.klauzule import KnjiznicaKlauzula
+from pravni_alat.knjiga import obracunaj_knjigu
+from pravni_alat.paket import zapisi_paket
+from pravni_alat.predmemorija import LRUPredmemorija
+from pravni_alat.rokovi import ROK_PRIGOVORA, ROK_ZALBE, izracunaj_rok, izracunaj_rokove
+from pravni_alat.skupno import OBAVEZNI_STUPCI, STUPCI_OVRHE, citaj_redove, procitaj_datum, skupna_ovrha_iz_datoteke
+from pravni_alat.stranke import RegistarStranaka, provjeri_oib
+from pravni_alat.tarifa import STOPA_PDV, VRIJEDNOST_BODA, troskovnik
+from pravni_alat.zadaci import CEKA, GRESKA, ZAVRSENA_STANJA, RedZadataka
 
 # -----------------------------------------------------------------------------
 # 1. KONFIGURACIJA I CSS
 # -----------------------------------------------------------------------------
 st.set_page_config(page_title="LegalTech Suite Pro", page_icon="⚖️", layout="wide")
 
-# CSS - Dizajn prilagođen za Word
-css_stilovi = """
-<style>
-    body {
-        font-family: 'Times New Roman', serif;
-        font-size: 12pt;
-        line-height: 1.15;
-    }
-    .legal-doc { 
-        background-color: white; 
-        padding: 60px; 
-        color: black;
-        border: 1px solid #ddd;
-        box-shadow: 0 0 10px rgba(0,0,0,0.1);
-    }
-    .header-doc { 
-        text-align: center; 
-        font-weight: bold; 
-        font-size: 14pt;
-        margin-bottom: 20px; 
-        text-transform: uppercase;
-        font-family: 'Times New Roman', serif;
-    }
-    
-    .party-info {
-        text-align: left; 
-        margin-bottom: 15px;
-        font-family: 'Times New Roman', serif;
-    }
-
-    .doc-body {
-        text-align: justify;
-        text-justify: inter-word;
-        margin-bottom: 10px;
-        font-family: 'Times New Roman', serif;
-    }
-
-    .justified {
-        text-align: justify;
-        text-justify: inter-word;
-    }
-
-    .section-title {
-        font-weight: bold;
-        margin-top: 15px;
-        margin-bottom: 5px;
-        font-family: 'Times New Roman', serif;
-        text-transform: uppercase;
-        font-size: 11pt;
-    }
-    
-    .cost-table {
-        margin-top: 20px;
-        border-collapse: collapse;
-        width: 100%;
-        font-family: 'Courier New', monospace;
-        font-size: 10pt;
-    }
-    .cost-table td {
-        border-bottom: 1px solid #ddd;
-        padding: 5px;
-    }
-    
-    .clausula {
-        font-weight: bold;
-        font-style: italic;
-        background-color: #f9f9f9;
-        padding: 10px;
-        border-left: 3px solid #333;
-    }
-    
-    .signature-row {
-        display: flex;
-        justify-content: space-between;
-        margin-top: 50px;
-    }
-    .signature-block {
-        text-align: center;
-        width: 45%;
-    }
-</style>
-"""
-
 st.markdown(css_stilovi, unsafe_allow_html=True)
 
+# Koliko dijelova (zaglavlje, naslovi, članci) personaliziranog ugovora se prikazuje u pregledu
+MAKS_DIJELOVA_PREGLEDA = 200
+# Koliko HTML tekstova članaka jedna sesija čuva za pregled (LRU)
+KAPACITET_PREDMEMORIJE_CLANAKA = 2000
+# Vrsta odnosa za zakonsku zateznu kamatu (oznaka -> vrsta u pravni_alat.kamate); prva je zadana u svim modulima
+VRSTE_ODNOSA = {"Ostali odnosi": "ostali", "Trgovački ugovori": "trgovacki"}
+
 # -----------------------------------------------------------------------------
 # 2. POMOĆNE FUNKCIJE
 # -----------------------------------------------------------------------------
 
-def pripremi_za_word(html_sadrzaj):
-    return f"""
-    <html xmlns:o='urn:schemas-microsoft-com:office:office' xmlns:w='urn:schemas-microsoft-com:office:word' xmlns='http://www.w3.org/TR/REC-html40'>
-    <head>
-        <meta charset="utf-8">
-        <title>Dokument</title>
-        {css_stilovi}
-        <xml>
-            <w:WordDocument>
-                <w:View>Print</w:View>
-                <w:Zoom>100</w:Zoom>
-                <w:DoNotOptimizeForBrowser/>
-            </w:WordDocument>
-        </xml>
-    </head>
-    <body>
-        <div class="legal-doc">
-            {html_sadrzaj}
-        </div>
-    </body>
-    </html>
-    """
-
-def format_text(text):
-    if text:
-        return text.replace('\n', '<br>')
-    return ""
-
-def formatiraj_troskovnik(troskovi):
-    if not troskovi: return ""
-    stavka = troskovi.get('stavka', 0.0)
-    pdv = troskovi.get('pdv', 0.0)
-    materijalni = troskovi.get('materijalni', 0.0)
-    pristojba = troskovi.get('pristojba', 0.0)
-    ukupno = stavka + pdv + materijalni + pristojba
-    
-    html = f"""
-    <div class='section-title' style='margin-top: 30px;'>POPIS TROŠKOVA POSTUPKA:</div>
-    <table class='cost-table'>
-        <tr><td width="70%">1. Sastav podneska/isprave (Tbr. Tarife):</td><td width="30%" align="right">{stavka:.2f} EUR</td></tr>
-    """
-    # ISPRAVAK: Zamijenjeni vanjski navodnici u jednostruke da se ne sudaraju s HTML navodnicima
-    if pdv > 0: html += f'<tr><td>2. PDV (25%) na stavku 1.:</td><td align="right">{pdv:.2f} EUR</td></tr>'
-    if materijalni > 0: html += f'<tr><td>3. Materijalni troškovi / JB Nagrada:</td><td align="right">{materijalni:.2f} EUR</td></tr>'
-    if pristojba > 0: html += f'<tr><td>4. Sudska pristojba:</td><td align="right">{pristojba:.2f} EUR</td></tr>'
-    html += f'<tr style="font-weight: bold; background-color: #f0f0f0;"><td style="padding: 10px;">UKUPNO:</td><td style="padding: 10px;" align="right">{ukupno:.2f} EUR</td></tr></table>'
-    return html
+@st.cache_resource
+def imenik_stranaka():
+    # Jedan imenik (SQLite veza) za sve sesije procesa
+    return RegistarStranaka()
+
+def odabir_iz_imenika(oznaka, key_prefix):
+    # Pretraga imenika; odabrana stranka upisuje se u polja obrasca prije nego se ona iscrtaju
+    upit = st.text_input(f"🔎 Traži u imeniku ({oznaka})", key=f"{key_prefix}_trazi", placeholder="Početak naziva ili OIB-a")
+    if not upit:
+        return
+    pronadene = imenik_stranaka().trazi(upit)
+    if not pronadene:
+        st.caption("Nema stranke u imeniku.")
+        return
+    opcije = {f"{s['naziv']} (OIB {s['oib']})": s for s in pronadene}
+    odabir = st.selectbox("Pronađene stranke", ["—"] + list(opcije), key=f"{key_prefix}_odabir", label_visibility="collapsed")
+    if odabir == "—" or st.session_state.get(f"{key_prefix}_primijenjeno") == odabir:
+        return
+    s = opcije[odabir]
+    st.session_state[f"{key_prefix}_primijenjeno"] = odabir
+    if s['tip'] == "Fizička":
+        st.session_state[f"{key_prefix}_tip"] = "Fizička osoba"
+        st.session_state[f"{key_prefix}_ime"] = s['naziv']
+        st.session_state[f"{key_prefix}_oib"] = s['oib']
+        st.session_state[f"{key_prefix}_adresa"] = s['adresa']
+    else:
+        st.session_state[f"{key_prefix}_tip"] = "Pravna osoba"
+        st.session_state[f"{key_prefix}_tvrtka"] = s['naziv']
+        st.session_state[f"{key_prefix}_oib_pravna"] = s['oib']
+        st.session_state[f"{key_prefix}_mbs"] = s['mbs'] or ""
+        st.session_state[f"{key_prefix}_zastupnik"] = s['zastupnik']
+        st.session_state[f"{key_prefix}_sjediste"] = s['adresa']
+
+def spremi_u_imenik(stranka, key_prefix):
+    if not stranka['oib']:
+        return
+    if not provjeri_oib(stranka['oib']):
+        st.warning(f"OIB {stranka['oib']} nije ispravan (kontrolna znamenka).")
+    elif st.button("💾 Spremi u imenik", key=f"{key_prefix}_spremi"):
+        imenik_stranaka().spremi(stranka)
+        st.toast(f"Stranka {stranka['naziv']} spremljena u imenik.")
 
 def unos_stranke(oznaka, key_prefix):
     st.markdown(f"**{oznaka}**")
+    odabir_iz_imenika(oznaka, key_prefix)
     tip = st.radio(f"Tip ({oznaka})", ["Fizička osoba", "Pravna osoba"], key=f"{key_prefix}_tip", horizontal=True, label_visibility="collapsed")
     col1, col2 = st.columns(2)
     has_valid_data = False
@@ -153,9 +102,10 @@ def unos_stranke(oznaka, key_prefix):
         ime = col1.text_input(f"Ime i Prezime", key=f"{key_prefix}_ime")
         oib = col2.text_input(f"OIB", max_chars=11, key=f"{key_prefix}_oib")
         adresa = st.text_input(f"Adresa (Ulica, Grad)", key=f"{key_prefix}_adresa")
+        spremi_u_imenik({'tip': "Fizička", 'naziv': ime, 'oib': oib, 'adresa': adresa}, key_prefix)
         if ime and oib:
             has_valid_data = True
-            return f"<b>{ime}</b><br>Adresa: {adresa}<br>OIB: {oib}", "Fizička", has_valid_data
+            return f"<b>{escape_html(ime)}</b><br>Adresa: {escape_html(adresa)}<br>OIB: {escape_html(oib)}", "Fizička", has_valid_data
         return "____________________ (ime), OIB: ____________________", "Fizička", has_valid_data
     else: 
         tvrtka = col1.text_input(f"Tvrtka", key=f"{key_prefix}_tvrtka")
@@ -163,560 +113,801 @@ def unos_stranke(oznaka, key_prefix):
         mbs = col1.text_input(f"MBS", key=f"{key_prefix}_mbs")
         zastupnik = col2.text_input(f"Zastupan po", key=f"{key_prefix}_zastupnik")
         sjediste = st.text_input(f"Sjedište", key=f"{key_prefix}_sjediste")
+        spremi_u_imenik({'tip': "Pravna", 'naziv': tvrtka, 'oib': oib, 'mbs': mbs, 'adresa': sjediste, 'zastupnik': zastupnik}, key_prefix)
         if tvrtka and oib:
             has_valid_data = True
-            return f"<b>{tvrtka}</b><br>Sjedište: {sjediste}<br>OIB: {oib}, MBS: {mbs}<br>Zastupana po: {zastupnik}", "Pravna", has_valid_data
+            return f"<b>{escape_html(tvrtka)}</b><br>Sjedište: {escape_html(sjediste)}<br>OIB: {escape_html(oib)}, MBS: {escape_html(mbs)}<br>Zastupana po: {escape_html(zastupnik)}", "Pravna", has_valid_data
         return "____________________ (tvrtka), OIB: ____________________", "Pravna", has_valid_data
 
+@st.cache_resource
+def knjiznica_klauzula():
+    # Indeks se mapira iz datoteke jednom po procesu
+    return KnjiznicaKlauzula()
+
+def umetni_klauzulu(i, tekst):
+    # Poziva se iz on_click, prije iscrtavanja polja; staro stanje polja se briše pa ono preuzima novi tekst
+    clanci = st.session_state.custom_contract[i]['clanci']
+    if clanci and not clanci[-1].strip():
+        clanci[-1] = tekst
+    else:
+        clanci.append(tekst)
+    st.session_state.pop(f"cl_{i}_{len(clanci) - 1}", None)
+
+def odabir_klauzule(dijelovi):
+    with st.expander("📚 Knjižnica klauzula"):
+        upit = st.text_input("Traži klauzulu", key="kl_trazi", placeholder="npr. nadležnost, ugovorna kazna, viša sila")
+        if upit:
+            pronadene = knjiznica_klauzula().trazi(upit)
+            if not pronadene:
+                st.caption("Nema klauzule za zadani upit.")
+            elif not dijelovi:
+                st.caption("Dodajte dio ugovora u koji se klauzula umeće.")
+            oznake = [f"Dio {i+1}: {d['naslov'] or '(bez naslova)'}" for i, d in enumerate(dijelovi)]
+            for k in pronadene if dijelovi else []:
+                col_tekst, col_dio, col_btn = st.columns([4, 2, 1])
+                col_tekst.markdown(f"**{k['naslov']}** · {k['kategorija']}")
+                col_tekst.caption(k['tekst'])
+                dio = col_dio.selectbox("U dio", range(len(dijelovi)), index=len(dijelovi) - 1, format_func=oznake.__getitem__, key=f"kl_dio_{k['id']}", label_visibility="collapsed")
+                col_btn.button("Umetni", key=f"kl_umetni_{k['id']}", on_click=umetni_klauzulu, args=(dio, k['tekst']))
+        with st.form("kl_nova", clear_on_submit=True):
+            st.markdown("**Nova klauzula u knjižnici**")
+            col_naslov, col_kat = st.columns(2)
+            naslov = col_naslov.text_input("Naslov klauzule")
+            kategorija = col_kat.text_input("Kategorija")
+            tekst = st.text_area("Tekst klauzule", height=100)
+            if st.form_submit_button("💾 Spremi klauzulu"):
+                if naslov.strip() and tekst.strip():
+                    knjiznica_klauzula().dodaj(naslov, tekst, kategorija)
+                    st.toast(f"Klauzula {naslov} spremljena u knjižnicu.")
+                else:
+                    st.warning("Klauzula mora imati naslov i tekst.")
+
+@st.cache_resource
+def arhiva_dokumenata():
+    return Arhiva()
+
+def arhiviraj(vrsta, generator, *argumenti):
+    # Generira dokument i sprema ga u arhivu zajedno s ulazima; greška arhive ne sprječava preuzimanje
+    doc = generator(*argumenti)
+    try:
+        arhiva_dokumenata().spremi(vrsta, doc, {'argumenti': list(argumenti)})
+    except (OSError, sqlite3.Error) as e:
+        st.warning(f"Dokument nije spremljen u arhivu: {e}")
+    return doc
+
+def arhiviraj_dijelove(vrsta, dijelovi, *argumenti):
+    # Kao arhiviraj, za dokument koji se piše dio po dio: dijelovi usput prolaze kroz arhivu, bez spajanja u jedan string
+    dijelovi = iter(dijelovi)
+    try:
+        yield from arhiva_dokumenata().prati(vrsta, dijelovi, {'argumenti': list(argumenti)})
+    except (OSError, sqlite3.Error) as e:
+        st.warning(f"Dokument nije spremljen u arhivu: {e}")
+        yield from dijelovi
+
+@st.cache_resource
+def red_zadataka():
+    red = RedZadataka()
+    red.pocisti()
+    return red
+
+@st.cache_resource
+def spremnik_nacrta():
+    # Nacrti svih sesija procesa; promjene upisuje jedna pozadinska dretva kad korisnik zastane
+    nacrti = Nacrti()
+    nacrti.pocisti()
+    return nacrti
+
+POLJA_STRANKE = ("tip", "ime", "oib", "adresa", "tvrtka", "oib_pravna", "mbs", "zastupnik", "sjediste")
+
+def polja_stranaka(*prefiksi):
+    return [f"{p}_{polje}" for p in prefiksi for polje in POLJA_STRANKE]
+
+# Ključevi widgeta koji se automatski spremaju u nacrt, po modulu (uz njih i struktura personaliziranog ugovora)
+POLJA_SASTAVLJACA = ["sastavljac_status", "sastavljac_odvjetnik"]
+POLJA_NACRTA = {
+    "Ugovori": ["ugovor_kategorija", "cust_naslov", "cust_urbroj", "cust_mjesto", "cust_datum", "cust_rok", "cust_uloga1", "cust_uloga2"] + polja_stranaka("cust_s1", "cust_s2"),
+    "Tužbe": POLJA_SASTAVLJACA + ["t_sud", "t_vps", "t_dospijece", "t_vrsta", "t_cinjenice", "t_dokazi", "t_kamata_do", "t_kamata_vrsta"] + polja_stranaka("t1", "t2"),
+    "Žalbe": ["z_sud_prvi", "z_sud_drugi", "z_broj_presude", "z_datum_presude", "z_mjesto", "z_dostava", "z_tuzitelj", "z_tuzenik", "z_opseg",
+              "z_razlog_povreda", "z_razlog_stanje", "z_razlog_pravo", "z_obrazlozenje", "z_trosak", "z_vps"],
+    "Zemljišne": POLJA_SASTAVLJACA + ["zk_usluga", "zkt_ko", "zkt_cestica", "zkt_ulozak", "zkt_opis", "zkt_datum",
+                                      "zkp_sud", "zkp_ko", "zkp_ulozak", "zkp_cestica", "zkp_opis", "zkp_ugovor", "zkp_tabularna",
+                                      "zkb_sud", "zkb_ko", "zkb_ulozak", "zkb_cestica", "zkb_opis", "zkb_z_broj", "zkb_datum_uknjizbe", "zkb_razlog", "zkb_znao", "zkb_vps"]
+                 + polja_stranaka("tp", "tk", "zk_p", "zk_pr", "bt_t", "bt_tu"),
+}
+
+def zadano(kljuc, vrijednost):
+    # Zadana vrijednost widgeta koji se vraća iz nacrta ide samo kroz session_state (ne value=), pa vraćena vrijednost
+    # ne sudara se sa zadanom; vraća ključ za key=
+    st.session_state.setdefault(kljuc, vrijednost)
+    return kljuc
+
+def vrati_nacrt():
+    # Prvi rerun sesije: nacrt iz adrese (?nacrt=...) upisuje se u session_state prije iscrtavanja widgeta,
+    # pa ponovno spajanje (ili ponovno pokrenut poslužitelj) nastavlja gdje je korisnik stao
+    if 'nacrt' in st.session_state:
+        return
+    nacrt = st.query_params.get("nacrt")
+    if nacrt:
+        polja = spremnik_nacrta().ucitaj(nacrt)
+        struktura = struktura_iz_polja(polja)
+        if struktura:
+            st.session_state.custom_contract = struktura
+        for kljuc, vrijednost in polja.items():
+            if not kljuc.startswith(STRUKTURA):
+                st.session_state[kljuc] = vrijednost
+    else:
+        nacrt = uuid.uuid4().hex
+        st.query_params["nacrt"] = nacrt
+    st.session_state.nacrt = nacrt
+
+def spremi_nacrt(modul):
+    # Bilježi polja aktivnog modula; spremnik upisuje samo promijenjena polja (polja drugih modula ostaju spremljena)
+    odjeljak = next((o for o in POLJA_NACRTA if o in modul), None)
+    polja = {k: st.session_state[k] for k in ["modul", *POLJA_NACRTA.get(odjeljak, [])] if k in st.session_state}
+    zamijeni = ()
+    if odjeljak == "Ugovori" and 'custom_contract' in st.session_state:
+        polja.update(polja_strukture(st.session_state.custom_contract))
+        zamijeni = (STRUKTURA,)
+    spremnik_nacrta().spremi(st.session_state.nacrt, polja, zamijeni)
+
+def novi_nacrt():
+    # Poziva se iz on_click: prazni polja nacrta (i članke ugovora) i nastavlja pod novom adresom; stari nacrt ostaje spremljen
+    polja = {k for popis in POLJA_NACRTA.values() for k in popis}
+    for kljuc in [k for k in st.session_state if k in polja or k.startswith(("naslov_", "cl_"))]:
+        del st.session_state[kljuc]
+    st.session_state.pop('custom_contract', None)
+    st.session_state.nacrt = uuid.uuid4().hex
+    st.query_params["nacrt"] = st.session_state.nacrt
+
+@st.cache_resource
+def posluzitelj_metrika():
+    # Jedan /metrics po procesu (PRAVNI_ALAT_METRIKE); zauzet port, npr. drugog procesa poslužitelja, ne ruši aplikaciju
+    try:
+        return pokreni_posluzitelj()
+    except OSError:
+        return None
+
+@st.fragment(run_every=1)
+def napredak_zadatka(id_, opis):
+    # Osvježava se sam svake sekunde; kad zadatak završi, ponovno pokreće stranicu da prikaže rezultat
+    zadatak = red_zadataka().stanje(id_)
+    if zadatak is None or zadatak['stanje'] in ZAVRSENA_STANJA:
+        st.rerun()
+    if zadatak['stanje'] == CEKA:
+        st.info(f"⏳ {opis}: čeka na slobodnog radnika...")
+    elif zadatak['ukupno']:
+        st.progress(min(zadatak['napredak'] / zadatak['ukupno'], 1.0), text=f"⏳ {opis}: {zadatak['napredak']} / {zadatak['ukupno']}")
+    else:
+        obradeno = f" (obrađeno {zadatak['napredak']})" if zadatak['napredak'] else ""
+        st.info(f"⏳ {opis}: u tijeku{obradeno}...")
+
+def zavrseni_zadatak(kljuc, opis):
+    # Završeni zadatak čiji je id u st.session_state[kljuc], ili None dok traje (tada prikazuje napredak).
+    # Rerun ne čeka na zadatak: stanje se samo pročita, a napredak_zadatka se osvježava sam
+    id_ = st.session_state.get(kljuc)
+    zadatak = red_zadataka().stanje(id_) if id_ is not None else None
+    if zadatak is None:
+        st.session_state.pop(kljuc, None)
+        return None
+    if zadatak['stanje'] in ZAVRSENA_STANJA:
+        return zadatak
+    napredak_zadatka(id_, opis)
+    return None
+
+def prikaz_roka(oznaka, dostava, dana):
+    # Posljednji dan roka (subota, nedjelja i blagdani pomiču ga na prvi radni dan)
+    try:
+        rok = izracunaj_rok(dostava, dana)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    preostalo = (rok - date.today()).days
+    poruka = f"{oznaka} ({dana} dana od dostave {dostava.strftime('%d.%m.%Y.')}): posljednji dan **{rok.strftime('%d.%m.%Y.')}**"
+    if preostalo < 0:
+        st.error(f"{poruka} — rok je istekao.")
+    elif preostalo <= 3:
+        st.warning(f"{poruka} — preostalo dana: {preostalo}.")
+    else:
+        st.info(f"{poruka} — preostalo dana: {preostalo}.")
+
 def zaglavlje_sastavljaca():
     with st.expander("ℹ️ PODACI O ZASTUPANJU (Punomoćnik)", expanded=False):
-        status = st.radio("Dokument sastavlja:", ["Stranka osobno", "Odvjetnik po punomoći"], horizontal=True)
+        status = st.radio("Dokument sastavlja:", ["Stranka osobno", "Odvjetnik po punomoći"], horizontal=True, key="sastavljac_status")
         if status == "Odvjetnik po punomoći":
-            odvjetnik = st.text_input("Podaci o odvjetniku/uredu")
-            return f"<br>Zastupan po punomoćniku: {odvjetnik}<br>"
+            odvjetnik = st.text_input("Podaci o odvjetniku/uredu", key="sastavljac_odvjetnik")
+            return f"<br>Zastupan po punomoćniku: {escape_html(odvjetnik)}<br>"
         return ""
 
 # -----------------------------------------------------------------------------
-# 3. GENERATORI DOKUMENATA (PRO VERZIJE)
-# -----------------------------------------------------------------------------
-
-# === NOVI GENERATOR: PRILAGOĐENI UGOVOR ===
-def generiraj_prilagodeni_ugovor(naslov, mjesto, datum, rok_vazenja, s1, s2, urbroj, struktura):
-    """
-    Generira ugovor na temelju dinamičke strukture koju je korisnik složio.
-    """
-    datum_str = datum.strftime("%d.%m.%Y.")
-    rok_str = f"<br>Ugovor vrijedi do: <b>{rok_vazenja.strftime('%d.%m.%Y.')}</b>" if rok_vazenja else "<br>Ugovor se sklapa na neodređeno vrijeme."
-    urbroj_str = f"<div style='text-align: right; font-size: 10pt;'>UrBroj: {urbroj}</div><br>" if urbroj else ""
-
-    html = f"""
-    {urbroj_str}
-    <div class='header-doc'>{naslov.upper()}</div>
-    <div class='justified'>
-    Sklopljen u mjestu <b>{mjesto}</b>, dana {datum_str} godine.
-    <br><br>
-    <b>IZMEĐU:</b>
-    <br><br>
-    1. <b>{s1['uloga']}:</b><br>
-    {s1['tekst']}
-    <br><br>
-    2. <b>{s2['uloga']}:</b><br>
-    {s2['tekst']}
-    <br><br>
-    {rok_str}
-    </div>
-    <br>
-    """
-    
-    # Dinamičko generiranje članaka
-    brojac_clanka = 1
-    rimski_brojevi = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X", "XI", "XII"]
-
-    for i, dio in enumerate(struktura):
-        # Naslov dijela (npr. I. OPĆI UVJETI)
-        oznaka_dijela = rimski_brojevi[i] if i < len(rimski_brojevi) else f"{i+1}"
-        
-        # Prikaz naslova dijela (ako postoji)
-        if dio['naslov']:
-            html += f"<div class='header-doc' style='font-size: 12pt; margin-top: 30px; margin-bottom: 10px;'>{oznaka_dijela}. {dio['naslov'].upper()}</div>"
-        
-        # Članci unutar dijela
-        for tekst_clanka in dio['clanci']:
-            if tekst_clanka.strip(): # Samo ako ima teksta
-                html += f"""
-                <div class='section-title' style='text-align: center;'>Članak {brojac_clanka}.</div>
-                <div class='justified'>{format_text(tekst_clanka)}</div>
-                """
-                brojac_clanka += 1
-
-    # Potpisi
-    html += f"""
-    <div class='signature-row'>
-        <div class='signature-block'>
-            <b>{s1['uloga'].upper()}</b>
-            <br><br><br>
-            ______________________
-        </div>
-        <div class='signature-block'>
-            <b>{s2['uloga'].upper()}</b>
-            <br><br><br>
-            ______________________
-        </div>
-    </div>
-    """
-    return html
-
-# === OSTALI GENERATORI ===
-def generiraj_tuzbu_pro(sud, zastupanje, tuzitelj, tuzenik, vps, vrsta, data, troskovi_dict):
-    troskovnik_html = formatiraj_troskovnik(troskovi_dict)
-    return f"""
-    <div style="font-weight: bold; font-size: 14px;">{sud.upper()}</div>
-    <div style="font-size: 12px;">{zastupanje}</div>
-    <br>
-    <div class='justified'>
-    <b>TUŽITELJ:</b> {tuzitelj}<br>
-    <b>TUŽENIK:</b> {tuzenik}
-    <br><br>
-    <b>Radi:</b> {vrsta}<br>
-    <b>Vrijednost predmeta spora (VPS): {vps:,.2f} EUR</b>
-    </div>
-    <br>
-    <div class='header-doc'>TUŽBA</div>
-    <div class='section-title'>I. ČINJENIČNI NAVODI</div>
-    <div class='justified'>{format_text(data['cinjenice'])}</div>
-    <div class='section-title'>II. DOKAZI</div>
-    <div class='justified'>Predlaže se izvođenje sljedećih dokaza:<br>{format_text(data['dokazi'])}</div>
-    <div class='section-title'>III. TUŽBENI ZAHTJEV</div>
-    <div class='justified'>Slijedom navedenog, budući da Tuženik nije podmirio svoju dospjelu obvezu, Tužitelj predlaže da naslovni Sud donese sljedeću<br><br>
-    <div style="text-align: center; font-weight: bold;">PRESUDU</div><br>
-    <b>I. Nalaže se Tuženiku</b> da Tužitelju isplati iznos od <b>{vps:,.2f} EUR</b> zajedno sa zakonskom zateznom kamatom koja teče od dana dospijeća {data['datum_dospijeca']} pa do isplate, po stopi određenoj zakonom.<br><br>
-    <b>II. Nalaže se Tuženiku</b> da Tužitelju naknadi troškove ovog parničnog postupka, u roku od 15 dana, zajedno sa zateznom kamatom od dana donošenja presude do isplate.
-    </div>
-    {troskovnik_html}
-    <br><br>
-    <div class='signature-row'><div style='display:inline-block; width: 50%;'><b>PRILOZI:</b><br>1. Punomoć<br>2. Dokaz o uplati pristojbe<br>3. Dokazi navedeni u točki II.</div> 
-    <div class='signature-block'><b>TUŽITELJ</b><br>(po punomoćniku)<br><br>______________________</div></div>
-    """
-
-def generiraj_ovrhu_pro(jb, ovrhovoditelj, ovrsenik, trazbina, isprava, troskovi_dict):
-    troskovnik_html = formatiraj_troskovnik(troskovi_dict)
-    ukupno_trosak = troskovi_dict.get('stavka', 0) + troskovi_dict.get('pdv', 0) + troskovi_dict.get('materijalni', 0) + troskovi_dict.get('pristojba', 0)
-    return f"""
-    <div style="font-weight: bold;">JAVNOM BILJEŽNIKU {jb.upper()}</div>
-    <br>
-    <div class='justified'><b>OVRHOVODITELJ:</b> {ovrhovoditelj}<br><b>OVRŠENIK:</b> {ovrsenik}<br><br><b>Radi:</b> Ovrhe na temelju vjerodostojne isprave<br><b>Vrijednost tražbine: {trazbina['glavnica']:,.2f} EUR</b></div>
-    <br><div class='header-doc'>PRIJEDLOG ZA OVRHU<br><span style='font-size:11pt; font-weight:normal'>na temelju vjerodostojne isprave</span></div>
-    <div class='justified'>Na temelju vjerodostojne isprave – <b>{isprava}</b> od dana {trazbina['datum_racuna']}, iz koje proizlazi dospjela tražbina Ovrhovoditelja prema Ovršeniku, Ovrhovoditelj predlaže da Javni bilježnik donese sljedeće:</div>
-    <div style='border: 2px solid black; padding: 15px; margin: 20px 0;'><div class='header-doc' style='margin:0;'>RJEŠENJE O OVRSI</div><div style='text-align:center; font-size:10pt;'>(na temelju vjerodostojne isprave)</div><br>
-    <div class='justified'><b>I. NALAŽE SE Ovršeniku</b> da Ovrhovoditelju u roku od osam dana od dana dostave ovog rješenja namiri tražbinu u iznosu od <b>{trazbina['glavnica']:,.2f} EUR</b>, zajedno sa zakonskim zateznim kamatama koje teku od dana dospijeća <b>{trazbina['dospjece']}</b> pa do isplate, kao i da mu naknadi troškove ovog postupka u iznosu od <b>{ukupno_trosak:.2f} EUR</b>.<br><br>
-    <b>II. ODREĐUJE SE OVRHA</b> radi naplate tražbine iz točke I. ovog rješenja i troškova postupka. Ovrha će se provesti na novčanim sredstvima Ovršenika po svim računima kod banaka, te na cjelokupnoj imovini Ovršenika.</div></div>
-    {troskovnik_html}
-    <br><br><div class='signature-row'><div style='display:inline-block; width: 50%;'></div><div class='signature-block'><b>OVRHOVODITELJ</b><br><br><br>______________________</div></div>
-    """
-
-def generiraj_zalbu_pro(sud_prvi, sud_drugi, stranke, podaci_o_presudi, razlozi, tekst_obrazlozenja, troskovnik):
-    troskovnik_html = formatiraj_troskovnik(troskovnik)
-    danas = date.today().strftime("%d.%m.%Y.")
-    razlozi_html = "<ul>" + "".join([f"<li>{r}</li>" for r in razlozi]) + "</ul>"
-    return f"""
-    <div style="font-weight: bold; font-size: 14px;">{sud_drugi.upper()}</div><div>(kao drugostupanjskom sudu)</div><br><div>putem</div><br><div style="font-weight: bold;">{sud_prvi.upper()}</div><div>(kao prvostupanjskog suda)</div><br><br>
-    <div class='justified'><b>PRAVNA STVAR:</b><br><b>TUŽITELJ:</b> {stranke['tuzitelj']}<br><b>TUŽENIK:</b> {stranke['tuzenik']}<br><b>Poslovni broj: {podaci_o_presudi['broj']}</b></div><br>
-    <div class='header-doc'>ŽALBA</div><div style="text-align: center;">protiv presude {sud_prvi} poslovni broj {podaci_o_presudi['broj']} od dana {podaci_o_presudi['datum']}</div><br>
-    <div class='justified'>Žalitelj ovime pravovremeno, u otvorenom zakonskom roku, podnosi žalbu protiv navedene presude {podaci_o_presudi['opseg']} zbog sljedećih zakonskih razloga (čl. 353. ZPP):</div>
-    {razlozi_html}
-    <div class='section-title'>I. OBRAZLOŽENJE</div><div class='justified'>{format_text(tekst_obrazlozenja)}</div>
-    <div class='section-title'>II. PRIJEDLOG</div><div class='justified'>Slijedom navedenog, predlaže se da naslovni drugostupanjski sud ovu žalbu uvaži, pobijanu presudu ukine i predmet vrati prvostupanjskom sudu na ponovno suđenje.</div>
-    {troskovnik_html}
-    <br><br><div style="text-align: right;">U {podaci_o_presudi['mjesto']}, dana {danas}</div>
-    <table width="100%"><tr><td width="50%"></td><td width="50%" align="center"><b>ŽALITELJ</b><br>(po punomoćniku)<br><br>______________________</td></tr></table>
-    """
-
-def generiraj_ugovor_standard(tip_ugovora, stranka1, stranka2, podaci, opcije, troskovi_dict=None):
-    datum = date.today().strftime("%d.%m.%Y.")
-    dodatni_tekst = f"<br><b>Kapara:</b> Ugovorne strane potvrđuju da je Kupac isplatio kaparu u iznosu od {opcije['iznos_kapare']} EUR." if opcije.get('kapara') else ""
-    solemnizacija_clanak = """<div class='section-title'>Članak (Solemnizacija)</div><div class='doc-body'>Ugovorne strane suglasne su da se ovaj Ugovor solemnizira (potvrdi) kod Javnog bilježnika.</div>""" if opcije.get('solemnizacija') else ""
-    titles = {"Kupoprodaja": ("UGOVOR O KUPOPRODAJI", "PRODAVATELJ", "KUPAC"), "Najam/Zakup": ("UGOVOR O NAJMU", "NAJMODAVAC", "NAJMOPRIMAC"), "Ugovor o djelu (Usluga)": ("UGOVOR O DJELU", "NARUČITELJ", "IZVOĐAČ"), "Zajam": ("UGOVOR O ZAJMU", "ZAJMODAVAC", "ZAJMOPRIMAC")}
-    naslov, u1, u2 = titles[tip_ugovora]
-    trosak_prikaz = formatiraj_troskovnik(troskovi_dict) if troskovi_dict else ""
-    return f"""<div class='header-doc'>{naslov}</div><div class='doc-body'>Sklopljen u {podaci['mjesto']}, dana {datum}, između:</div><div class='party-info'>1. <b>{u1}:</b><br>{stranka1}<br><br>2. <b>{u2}:</b><br>{stranka2}</div><div class='section-title'>Članak 1.</div><div class='doc-body'>{format_text(podaci['predmet_clanak'])}</div><div class='section-title'>Članak 2.</div><div class='doc-body'>{format_text(podaci['cijena_clanak'])}{dodatni_tekst}</div><div class='section-title'>Članak 3.</div><div class='doc-body'>{format_text(podaci['rok_clanak'])}</div>{solemnizacija_clanak}<br><br>{trosak_prikaz}<br><table width="100%"><tr><td width="50%" align="center"><b>{u1}</b><br><br>__________</td><td width="50%" align="center"><b>{u2}</b><br><br>__________</td></tr></table>"""
-
-def generiraj_ugovor_o_radu(poslodavac, radnik, podaci):
-    datum = date.today().strftime("%d.%m.%Y.")
-    vrsta_tekst = "NA NEODREĐENO VRIJEME"
-    clanak_trajanje = "Ugovor se sklapa na neodređeno vrijeme."
-    if podaci.get('vrsta') == "Određeno":
-        vrsta_tekst = "NA ODREĐENO VRIJEME"
-        clanak_trajanje = f"Ugovor se sklapa na određeno vrijeme do {podaci.get('datum_do', '_______')}, zbog: {podaci.get('razlog_odredeno', 'povećanog opsega posla')}."
-    probni_rad_txt = f"Ugovara se probni rad u trajanju od {podaci.get('probni_rad_mj', 3)} mjeseca/mjeseci." if podaci.get('probni_rad') else ""
-    return f"""
-    <div class='header-doc'>UGOVOR O RADU<br><span style='font-size: 12pt; font-weight: normal;'>{vrsta_tekst}</span></div>
-    <div class='justified'>Sklopljen u {podaci.get('mjesto_sklapanja', 'Zagrebu')}, dana {datum} godine, između:<br><br>1. <b>POSLODAVAC:</b><br>{poslodavac}<br><br>2. <b>RADNIK:</b><br>{radnik}</div>
-    <div class='section-title'>Članak 1. (Predmet i početak rada)</div><div class='justified'>Radnik počinje s radom dana <b>{podaci.get('datum_start', '_______')}</b>. {clanak_trajanje} {probni_rad_txt}</div>
-    <div class='section-title'>Članak 2. (Mjesto i opis poslova)</div><div class='justified'>Radnik će obavljati poslove na radnom mjestu: <b>{podaci.get('naziv_radnog_mjesta', '_______')}</b>.<br><b>Opis poslova:</b> {podaci.get('opis_posla', 'Opisani u opisu radnog mjesta kod Poslodavca')}.<br>Mjesto rada je: {podaci.get('mjesto_rada', 'u sjedištu Poslodavca i na terenu po potrebi')}.</div>
-    <div class='section-title'>Članak 3. (Radno vrijeme i odmori)</div><div class='justified'>Radnik će raditi u punom radnom vremenu od {podaci.get('radno_vrijeme', 40)} sati tjedno. Radnik ima pravo na dnevni odmor (stanku) u trajanju od 30 minuta.</div>
-    <div class='section-title'>Članak 4. (Plaća i naknade)</div><div class='justified'>Za obavljeni rad Poslodavac će Radniku isplaćivati osnovnu bruto plaću u iznosu od <b>{podaci.get('bruto_placa', 0):.2f} EUR</b> mjesečno.</div>
-    <div class='section-title'>Članak 5. (Godišnji odmor)</div><div class='justified'>Radnik ima pravo na plaćeni godišnji odmor u trajanju od najmanje {podaci.get('godisnji_odmor', 20)} radnih dana.</div>
-    <div class='section-title'>Članak 6. (Završne odredbe)</div><div class='justified'>Ovaj Ugovor sastavljen je u 3 (tri) istovjetna primjerka.</div>
-    <div class='signature-row'><div class='signature-block'><b>ZA POSLODAVCA</b><br><br><br>______________________</div><div class='signature-block'><b>RADNIK</b><br><br><br>______________________</div></div>
-    """
-
-def generiraj_otkaz(poslodavac, radnik, podaci):
-    return f"""<div class='header-doc'>ODLUKA O OTKAZU</div><div class='doc-body'>1. Otkazuje se ugovor radniku {radnik}.</div><div class='section-title'>Obrazloženje</div><div class='doc-body'>{podaci['tekst_obrazlozenja']}</div><br><br><table width="100%"><tr><td align="center"><b>POSLODAVAC</b><br>__________</td></tr></table>"""
-
-def generiraj_tabularnu_doc(prod, kup, ko, cest, ul, opis, dat):
-    return f"""<div class='header-doc'>TABULARNA IZJAVA<br><span style='font-size: 11pt; font-weight: normal;'>(Clausula Intabulandi)</span></div><div class='party-info'><b>PRODAVATELJ:</b><br>{prod}</div><div class='party-info'><b>KUPAC:</b><br>{kup}</div><div class='doc-body'>Temeljem Ugovora od {dat} za nekretninu u K.O. {ko}, k.č.br {cest}. {f'<br>Opis u naravi: {opis}' if opis else ''}</div><div class='doc-body clausula'>Ja, PRODAVATELJ, ovime izričito ovlašćujem KUPCA da zatraži uknjižbu prava vlasništva.</div><br><br><table width="100%"><tr><td width="40%"></td><td width="60%" align="center"><b>PRODAVATELJ</b><br>(Ovjera JB)<br><br>_________________</td></tr></table>"""
-
-def generiraj_zk_prijedlog(sud, predlagatelj, protustranka, nekretnina, dokumenti, troskovi_dict):
-    troskovnik_html = formatiraj_troskovnik(troskovi_dict)
-    return f"""<div style="font-weight: bold; font-size: 14px;">{sud.upper()}</div><div style="font-size: 12px;">Zemljišnoknjižni odjel</div><br><br><div class='party-info'><b>PREDLAGATELJ:</b><br>{predlagatelj}</div><div class='party-info'><b>PROTUSTRANKA:</b><br>{protustranka}</div><br><div class='header-doc'>ZEMLJIŠNOKNJIŽNI PRIJEDLOG<br><span style='font-size: 12pt; font-weight: normal;'>za uknjižbu prava vlasništva</span></div><div class='doc-body'>Predlagatelj predlaže da naslovni sud, na temelju priloženih isprava, u zemljišnim knjigama za nekretninu upisanu kao:<br><br><b>Katastarska općina (k.o.):</b> {nekretnina['ko']}<br><b>Broj zk. uloška:</b> {nekretnina['ulozak']}<br><b>Broj čestice (k.č.br.):</b> {nekretnina['cestica']}{f", u naravi {nekretnina['opis']}" if nekretnina['opis'] else ""}<br><br>provede upis, odnosno dozvoli:</div><div class='section-title' style='text-align: center; border: 1px solid black; padding: 10px; margin: 20px 0;'>UKNJIŽBU PRAVA VLASNIŠTVA<br>u korist Predlagatelja (u cijelosti / 1/1 dijela).</div><div class='doc-body'>Predlagatelj prilaže izvornike/ovjerene preslike isprava koje su temelj za upis.</div><div class='section-title'>POPIS PRILOGA:</div><div class='doc-body'><ol><li>{dokumenti['ugovor']}</li><li>{dokumenti['tabularna']}</li><li>Dokaz o uplati sudske pristojbe</li><li>Dokaz o državljanstvu / OIB (preslika osobne iskaznice)</li></ol></div>{troskovnik_html}<br><br><table width="100%" border="0"><tr><td width="50%"></td><td width="50%" align="center"><b>PREDLAGATELJ</b><br>(potpis nije nužno ovjeravati)<br><br>______________________</td></tr></table>"""
-
-def generiraj_brisovnu_tuzbu(sud, zastupanje, tuzitelj, tuzenik, nekretnina, podaci_spora, troskovi_dict):
-    datum = date.today().strftime("%d.%m.%Y.")
-    troskovnik_html = formatiraj_troskovnik(troskovi_dict)
-    tekst_savjesnost = "Tuženik je prilikom stjecanja bio nesavjestan..." if podaci_spora['tuzenik_znao'] else "Tužba se podnosi u zakonskom roku..."
-    return f"""<div style="font-weight: bold; font-size: 14px; text-align: left;">{sud.upper()}</div><div style="font-size: 12px; text-align: left;">{zastupanje}</div><br><div class='party-info'><b>PRAVNA STVAR:</b><br><b>TUŽITELJ:</b> {tuzitelj}<br><b>TUŽENIK:</b> {tuzenik}</div><div class='party-info'><b>Radi:</b> Brisanja uknjižbe i uspostave prijašnjeg ZK stanja<br><b>Vrijednost predmeta spora (VPS): {podaci_spora['vps']:,.2f} EUR</b></div><br><div class='header-doc'>BRISOVNA TUŽBA</div><div class='section-title'>I. ČINJENIČNI NAVODI</div><div class='doc-body'>Tužitelj je bio isključivi vlasnik nekretnine upisane u <b>zk.ul. {nekretnina['ulozak']}, k.o. {nekretnina['ko']}, k.č.br. {nekretnina['cestica']}</b>.<br><br>Dana {podaci_spora['datum_uknjizbe']}, u zemljišnim knjigama naslovnog suda, pod brojem <b>{podaci_spora['z_broj']}</b>, provedena je nevaljana uknjižba prava vlasništva u korist Tuženika na temelju isprave: {podaci_spora['isprava']}.<br><br>Tužitelj tvrdi da je navedena isprava ništetna iz sljedećih razloga:<br><i>{podaci_spora['razlog_nevaljanosti']}</i><br><br>{tekst_savjesnost}</div><div class='section-title'>DOKAZI:</div><div class='doc-body'>1. ZK izvadak.<br>2. Uvid u ZK spis broj {podaci_spora['z_broj']}.<br>3. {podaci_spora['isprava']}.</div><div class='section-title'>II. TUŽBENI ZAHTJEV</div><div class='doc-body'>Slijedom navedenog, Tužitelj predlaže da Sud donese sljedeću</div><div style="text-align: center; font-weight: bold; margin: 10px 0;">PRESUDU</div><div class='doc-body'><b>I. Utvrđuje se da je ništetan</b> {podaci_spora['isprava']}.<br><br><b>II. Utvrđuje se da je nevaljana uknjižba</b> prava vlasništva u korist tuženika, provedena pod brojem {podaci_spora['z_broj']}.<br><br><b>III. Nalaže se brisanje uknjižbe</b> i uspostava prijašnjeg stanja.<br><br><b>IV.</b> Nalaže se Tuženiku naknaditi trošak.</div>{troskovnik_html}<br><br><div style="text-align:right;">U {podaci_spora['mjesto']}, dana {datum}</div><table width="100%" border="0"><tr><td width="50%"></td><td width="50%" align="center"><b>TUŽITELJ</b><br><br><br>______________________</td></tr></table>"""
-
-# -----------------------------------------------------------------------------
-# 4. GLAVNA APLIKACIJA (GUI)
+# 3. GLAVNA APLIKACIJA (GUI)
 # -----------------------------------------------------------------------------
 
+posluzitelj_metrika()
+vrati_nacrt()
 st.sidebar.title("NAVIGACIJA")
 modul = st.sidebar.radio(
     "ODABERI USLUGU:",
-    ["📝 Ugovori i Odluke", "⚖️ Tužbe", "🔨 Ovršni Prijedlog", "📜 Žalbe", "🏠 Zemljišne knjige", "🧮 Kamate"]
+    ["📝 Ugovori i Odluke", "⚖️ Tužbe", "🔨 Ovršni Prijedlog", "📜 Žalbe", "🏠 Zemljišne knjige", "🧮 Kamate", "🗄️ Arhiva"],
+    key="modul"
 )
+st.sidebar.button("🗒️ Novi prazan nacrt", on_click=novi_nacrt, help="Uneseni podaci automatski se spremaju; ista adresa ih vraća i nakon prekida veze.")
 
-# --- 1. UGOVORI ---
-if "Ugovori" in modul:
-    st.header("Sastavljanje Ugovora i Odluka")
+# Trajanje grane modula (i profil sporog reruna) uz uključeno mjerenje (pravni_alat.mjerenje)
+with rerun(modul.split(" ", 1)[1]):
+    # --- 1. UGOVORI ---
+    if "Ugovori" in modul:
+        st.header("Sastavljanje Ugovora i Odluka")
     
-    # Prilagođena navigacija za Ugovore (NOVA OPCIJA PRVA)
-    kategorija = st.radio("Kategorija prava:", ["Slobodna forma (Personalizirani ugovor)", "Građansko pravo (Predlošci)", "Radno pravo"], horizontal=True)
+        # Prilagođena navigacija za Ugovore (NOVA OPCIJA PRVA)
+        kategorija = st.radio("Kategorija prava:", ["Slobodna forma (Personalizirani ugovor)", "Građansko pravo (Predlošci)", "Radno pravo"], horizontal=True, key="ugovor_kategorija")
     
-    # =================================================================
-    # A) SLOBODNA FORMA - NOVI MODUL
-    # =================================================================
-    if kategorija == "Slobodna forma (Personalizirani ugovor)":
-        st.subheader("Izrada Ugovora po mjeri")
-        st.info("Ovaj modul omogućuje potpunu slobodu kreiranja članaka i poglavlja.")
-
-        # Inicijalizacija stanja za dinamička polja
-        if 'custom_contract' not in st.session_state:
-            st.session_state.custom_contract = [
-                {'naslov': 'Opći uvjeti', 'clanci': ['']} # Početno stanje
-            ]
-
-        # 1. ZAGLAVLJE
-        with st.expander("1. Zaglavlje ugovora", expanded=True):
-            col_naslov, col_urbroj = st.columns([2, 1])
-            naslov_ugovora = col_naslov.text_input("Naslov Ugovora", "UGOVOR O POSLOVNOJ SURADNJI")
-            urbroj = col_urbroj.text_input("UrBroj (Opcionalno)", placeholder="npr. 2024-01-01")
+        # =================================================================
+        # A) SLOBODNA FORMA - NOVI MODUL
+        # =================================================================
+        if kategorija == "Slobodna forma (Personalizirani ugovor)":
+            st.subheader("Izrada Ugovora po mjeri")
+            st.info("Ovaj modul omogućuje potpunu slobodu kreiranja članaka i poglavlja.")
+
+            # Inicijalizacija stanja za dinamička polja
+            if 'custom_contract' not in st.session_state:
+                st.session_state.custom_contract = [
+                    {'naslov': 'Opći uvjeti', 'clanci': ['']} # Početno stanje
+                ]
+            # HTML tekstova članaka po sesiji; pregled ponovno renderira samo promijenjene članke
+            if 'predmemorija_clanaka' not in st.session_state:
+                st.session_state.predmemorija_clanaka = LRUPredmemorija(KAPACITET_PREDMEMORIJE_CLANAKA)
+
+            # 1. ZAGLAVLJE
+            with st.expander("1. Zaglavlje ugovora", expanded=True):
+                col_naslov, col_urbroj = st.columns([2, 1])
+                naslov_ugovora = col_naslov.text_input("Naslov Ugovora", key=zadano("cust_naslov", "UGOVOR O POSLOVNOJ SURADNJI"))
+                urbroj = col_urbroj.text_input("UrBroj (Opcionalno)", placeholder="npr. 2024-01-01", key="cust_urbroj")
             
-            c1, c2, c3 = st.columns(3)
-            mjesto = c1.text_input("Mjesto sklapanja", "Zagreb")
-            datum = c2.date_input("Datum sklapanja")
-            rok_vazenja = c3.date_input("Vrijedi do (Opcionalno)", value=None)
-
-        # 2. STRANKE (S ULOGAMA)
-        with st.expander("2. Stranke", expanded=True):
-            col_s1, col_s2 = st.columns(2)
+                c1, c2, c3 = st.columns(3)
+                mjesto = c1.text_input("Mjesto sklapanja", key=zadano("cust_mjesto", "Zagreb"))
+                datum = c2.date_input("Datum sklapanja", key="cust_datum")
+                rok_vazenja = c3.date_input("Vrijedi do (Opcionalno)", value=None, key="cust_rok")
+
+            # 2. STRANKE (S ULOGAMA)
+            with st.expander("2. Stranke", expanded=True):
+                col_s1, col_s2 = st.columns(2)
             
-            with col_s1:
-                st.markdown("### Prva strana")
-                uloga1 = st.text_input("Uloga (npr. Naručitelj)", "Naručitelj")
-                s1_tekst, _, _ = unos_stranke("Podaci prve strane", "cust_s1")
+                with col_s1:
+                    st.markdown("### Prva strana")
+                    uloga1 = st.text_input("Uloga (npr. Naručitelj)", key=zadano("cust_uloga1", "Naručitelj"))
+                    s1_tekst, _, _ = unos_stranke("Podaci prve strane", "cust_s1")
             
-            with col_s2:
-                st.markdown("### Druga strana")
-                uloga2 = st.text_input("Uloga (npr. Izvođač)", "Izvođač")
-                s2_tekst, _, _ = unos_stranke("Podaci druge strane", "cust_s2")
-
-        # 3. DINAMIČKI SADRŽAJ (SRCE APLIKACIJE)
-        st.markdown("---")
-        st.subheader("3. Sadržaj Ugovora")
+                with col_s2:
+                    st.markdown("### Druga strana")
+                    uloga2 = st.text_input("Uloga (npr. Izvođač)", key=zadano("cust_uloga2", "Izvođač"))
+                    s2_tekst, _, _ = unos_stranke("Podaci druge strane", "cust_s2")
+
+            # 3. DINAMIČKI SADRŽAJ (SRCE APLIKACIJE)
+            st.markdown("---")
+            st.subheader("3. Sadržaj Ugovora")
+            odabir_klauzule(st.session_state.custom_contract)
         
-        # Iteracija kroz poglavlja (Rimski brojevi)
-        for i, poglavlje in enumerate(st.session_state.custom_contract):
-            oznaka = ["I", "II", "III", "IV", "V", "VI", "VII"][i] if i < 7 else f"{i+1}"
-            st.markdown(f"#### Dio {i+1} (Rimski {oznaka})")
+            # Iteracija kroz poglavlja (Rimski brojevi)
+            for i, poglavlje in enumerate(st.session_state.custom_contract):
+                oznaka = ["I", "II", "III", "IV", "V", "VI", "VII"][i] if i < 7 else f"{i+1}"
+                st.markdown(f"#### Dio {i+1} (Rimski {oznaka})")
             
-            # Naslov poglavlja i gumb za brisanje
-            col_pog_naslov, col_pog_btn = st.columns([4, 1])
-            novi_naslov = col_pog_naslov.text_input(f"Naslov dijela {i+1}", value=poglavlje['naslov'], key=f"naslov_{i}")
-            poglavlje['naslov'] = novi_naslov # Ažuriranje
+                # Naslov poglavlja i gumb za brisanje
+                col_pog_naslov, col_pog_btn = st.columns([4, 1])
+                novi_naslov = col_pog_naslov.text_input(f"Naslov dijela {i+1}", value=poglavlje['naslov'], key=f"naslov_{i}")
+                poglavlje['naslov'] = novi_naslov # Ažuriranje
             
-            if col_pog_btn.button("🗑️ Obriši dio", key=f"del_sec_{i}"):
-                st.session_state.custom_contract.pop(i)
-                st.rerun()
-
-            # Iteracija kroz članke unutar poglavlja
-            for j, clanak in enumerate(poglavlje['clanci']):
-                cl_text = st.text_area(f"Članak (Dio {i+1})", value=clanak, height=100, key=f"cl_{i}_{j}", placeholder="Unesite tekst članka...")
-                st.session_state.custom_contract[i]['clanci'][j] = cl_text # Ažuriranje
+                if col_pog_btn.button("🗑️ Obriši dio", key=f"del_sec_{i}"):
+                    st.session_state.custom_contract.pop(i)
+                    st.rerun()
+
+                # Iteracija kroz članke unutar poglavlja
+                for j, clanak in enumerate(poglavlje['clanci']):
+                    cl_text = st.text_area(f"Članak (Dio {i+1})", value=clanak, height=100, key=f"cl_{i}_{j}", placeholder="Unesite tekst članka...")
+                    st.session_state.custom_contract[i]['clanci'][j] = cl_text # Ažuriranje
             
-            # Gumb za dodavanje članka
-            c_add, _ = st.columns([2, 4])
-            if c_add.button(f"➕ Dodaj Članak u Dio {i+1}", key=f"add_art_{i}"):
-                st.session_state.custom_contract[i]['clanci'].append("")
-                st.rerun()
+                # Gumb za dodavanje članka
+                c_add, _ = st.columns([2, 4])
+                if c_add.button(f"➕ Dodaj Članak u Dio {i+1}", key=f"add_art_{i}"):
+                    st.session_state.custom_contract[i]['clanci'].append("")
+                    st.rerun()
             
-            st.divider()
+                st.divider()
 
-        # Gumb za dodavanje novog dijela
-        if st.button("➕ DODAJ NOVI DIO UGOVORA (npr. Naknada, Rokovi...)"):
-            st.session_state.custom_contract.append({'naslov': '', 'clanci': ['']})
-            st.rerun()
+            # Gumb za dodavanje novog dijela
+            if st.button("➕ DODAJ NOVI DIO UGOVORA (npr. Naknada, Rokovi...)"):
+                st.session_state.custom_contract.append({'naslov': '', 'clanci': ['']})
+                st.rerun()
 
-        # GENERIRANJE
-        st.markdown("---")
-        if st.button("Generiraj Personalizirani Ugovor", type="primary"):
+            # GENERIRANJE
+            st.markdown("---")
             s1_data = {'uloga': uloga1, 'tekst': s1_tekst}
             s2_data = {'uloga': uloga2, 'tekst': s2_tekst}
-            
-            doc = generiraj_prilagodeni_ugovor(naslov_ugovora, mjesto, datum, rok_vazenja, s1_data, s2_data, urbroj, st.session_state.custom_contract)
-            
-            st.markdown(f"<div class='legal-doc'>{doc}</div>", unsafe_allow_html=True)
-            word = pripremi_za_word(doc)
-            st.download_button("💾 Preuzmi Word (.doc)", word, "Moj_Ugovor.doc")
-
-    # =================================================================
-    # B) STANDARDNI UGOVORI (STARI KOD)
-    # =================================================================
-    elif kategorija == "Građansko pravo (Predlošci)":
-        st.subheader("Građansko pravo")
-        tip = st.selectbox("Odaberite vrstu ugovora:", ["Kupoprodaja", "Najam/Zakup", "Ugovor o djelu (Usluga)", "Zajam"])
+            argumenti = (naslov_ugovora, mjesto, datum, rok_vazenja, s1_data, s2_data, urbroj, st.session_state.custom_contract)
+            pregled_uzivo = st.checkbox("Pregled uživo (osvježava se pri svakoj izmjeni)", key="cust_pregled")
+            generiraj = st.button("Generiraj Personalizirani Ugovor", type="primary")
+
+            if pregled_uzivo or generiraj:
+                # Pregled prikazuje samo početak velikih ugovora; cijeli dokument ide dio po dio u datoteku
+                with raspon("generator", "generiraj_prilagodeni_ugovor_dijelovi"):
+                    pregled = list(islice(generiraj_prilagodeni_ugovor_dijelovi(*argumenti, predmemorija=st.session_state.predmemorija_clanaka), MAKS_DIJELOVA_PREGLEDA + 1))
+                st.markdown(f"<div class='legal-doc'>{''.join(pregled[:MAKS_DIJELOVA_PREGLEDA])}</div>", unsafe_allow_html=True)
+                if len(pregled) > MAKS_DIJELOVA_PREGLEDA: st.caption(f"Pregled je skraćen na prvih {MAKS_DIJELOVA_PREGLEDA} dijelova; Word dokument sadrži cijeli ugovor.")
+                del pregled
+
+            if generiraj:
+                with tempfile.NamedTemporaryFile(suffix=".docx", delete=False) as izlaz, raspon("preuzimanje", "zapisi_docx"):
+                    zapisi_docx(arhiviraj_dijelove('prilagodeni_ugovor', generiraj_prilagodeni_ugovor_dijelovi(*argumenti), *argumenti), izlaz)
+                with open(izlaz.name, "rb") as f:
+                    st.download_button("💾 Preuzmi Word (.docx)", f, "Moj_Ugovor.docx", mime=DOCX_MIME)
+                os.unlink(izlaz.name)
+
+        # =================================================================
+        # B) STANDARDNI UGOVORI (STARI KOD)
+        # =================================================================
+        elif kategorija == "Građansko pravo (Predlošci)":
+            st.subheader("Građansko pravo")
+            tip = st.selectbox("Odaberite vrstu ugovora:", ["Kupoprodaja", "Najam/Zakup", "Ugovor o djelu (Usluga)", "Zajam"])
         
-        c1, c2 = st.columns(2)
-        s1, _, _ = unos_stranke("PRVA STRANA", "u1")
-        s2, _, _ = unos_stranke("DRUGA STRANA", "u2")
-        opcije = {'kapara': st.checkbox("Kapara?"), 'solemnizacija': st.checkbox("Solemnizacija?")}
-        if opcije['kapara']: opcije['iznos_kapare'] = st.number_input("Iznos kapare")
+            c1, c2 = st.columns(2)
+            s1, _, _ = unos_stranke("PRVA STRANA", "u1")
+            s2, _, _ = unos_stranke("DRUGA STRANA", "u2")
+            opcije = {'kapara': st.checkbox("Kapara?"), 'solemnizacija': st.checkbox("Solemnizacija?")}
+            if opcije['kapara']: opcije['iznos_kapare'] = st.number_input("Iznos kapare")
         
-        data = {'mjesto': "Zagreb"}
-        if tip == "Kupoprodaja":
-            data['predmet_clanak'] = st.text_area("Predmet Ugovora", placeholder="Opišite predmet (npr. Vozilo marke BMW, šasija...)")
-            data['cijena_clanak'] = f"Cijena: {st.number_input('Cijena')} EUR."
-            data['rok_clanak'] = "Odmah po isplati cijene."
-        elif tip == "Najam/Zakup":
-            data['predmet_clanak'] = st.text_input("Prostor (Adresa i opis)")
-            data['cijena_clanak'] = f"Mjesečna najamnina/zakupnina: {st.number_input('Mjesečni iznos')} EUR."
-            data['rok_clanak'] = "Trajanje ugovora: 1 godina (ili upišite drugo)."
-        elif tip == "Ugovor o djelu (Usluga)":
-            data['predmet_clanak'] = st.text_area("Opis posla/usluge")
-            data['cijena_clanak'] = f"Honorar (neto/bruto): {st.number_input('Iznos honorara')} EUR."
-            data['rok_clanak'] = "Rok izvršenja posla: 30 dana."
-        elif tip == "Zajam":
-            data['predmet_clanak'] = "Predmet ugovora je novčani zajam."
-            data['cijena_clanak'] = f"Glavnica zajma: {st.number_input('Iznos zajma')} EUR."
-            data['rok_clanak'] = f"Rok povrata: {st.date_input('Datum povrata').strftime('%d.%m.%Y.')}"
-
-        st.markdown("---")
-        add_trosak = st.checkbox("Dodaj troškovnik sastava ugovora (za odvjetnike)")
-        troskovi = None
-        if add_trosak:
-            col_t1, col_t2 = st.columns(2)
-            sastav = col_t1.number_input("Cijena sastava", 0.0)
-            pdv_ug = col_t1.checkbox("PDV?", value=True)
-            pdv_iznos = sastav * 0.25 if pdv_ug else 0
-            troskovi = {'stavka': sastav, 'pdv': pdv_iznos}
-
-        if st.button("Generiraj Ugovor"):
-            doc = generiraj_ugovor_standard(tip, s1, s2, data, opcije, troskovi)
-            st.markdown(f"<div class='legal-doc'>{doc}</div>", unsafe_allow_html=True)
-            word = pripremi_za_word(doc)
-            st.download_button("Preuzmi", word, f"{tip}.doc")
+            data = {'mjesto': "Zagreb"}
+            if tip == "Kupoprodaja":
+                data['predmet_clanak'] = st.text_area("Predmet Ugovora", placeholder="Opišite predmet (npr. Vozilo marke BMW, šasija...)")
+                data['cijena_clanak'] = f"Cijena: {st.number_input('Cijena')} EUR."
+                data['rok_clanak'] = "Odmah po isplati cijene."
+            elif tip == "Najam/Zakup":
+                data['predmet_clanak'] = st.text_input("Prostor (Adresa i opis)")
+                data['cijena_clanak'] = f"Mjesečna najamnina/zakupnina: {st.number_input('Mjesečni iznos')} EUR."
+                data['rok_clanak'] = "Trajanje ugovora: 1 godina (ili upišite drugo)."
+            elif tip == "Ugovor o djelu (Usluga)":
+                data['predmet_clanak'] = st.text_area("Opis posla/usluge")
+                data['cijena_clanak'] = f"Honorar (neto/bruto): {st.number_input('Iznos honorara')} EUR."
+                data['rok_clanak'] = "Rok izvršenja posla: 30 dana."
+            elif tip == "Zajam":
+                data['predmet_clanak'] = "Predmet ugovora je novčani zajam."
+                data['cijena_clanak'] = f"Glavnica zajma: {st.number_input('Iznos zajma')} EUR."
+                data['rok_clanak'] = f"Rok povrata: {st.date_input('Datum povrata').strftime('%d.%m.%Y.')}"
+
+            st.markdown("---")
+            add_trosak = st.checkbox("Dodaj troškovnik sastava ugovora (za odvjetnike)")
+            troskovi = None
+            if add_trosak:
+                col_t1, col_t2 = st.columns(2)
+                sastav = col_t1.number_input("Cijena sastava", 0.0)
+                pdv_ug = col_t1.checkbox("PDV?", value=True)
+                pdv_iznos = sastav * STOPA_PDV if pdv_ug else 0
+                troskovi = {'stavka': sastav, 'pdv': pdv_iznos}
+
+            if st.button("Generiraj Ugovor"):
+                doc = arhiviraj('ugovor_standard', generiraj_ugovor_standard, tip, s1, s2, data, opcije, troskovi)
+                st.markdown(f"<div class='legal-doc'>{doc}</div>", unsafe_allow_html=True)
+                word = docx_iz_html(doc)
+                st.download_button("Preuzmi", word, f"{tip}.docx", mime=DOCX_MIME)
 
-    elif kategorija == "Radno pravo":
-        st.subheader("Radno pravo")
-        tip = st.selectbox("Odaberite dokument:", ["Ugovor o radu", "Odluka o otkazu"])
+        elif kategorija == "Radno pravo":
+            st.subheader("Radno pravo")
+            tip = st.selectbox("Odaberite dokument:", ["Ugovor o radu", "Odluka o otkazu"])
         
-        if tip == "Ugovor o radu":
-            c1, c2 = st.columns(2)
-            p, _, _ = unos_stranke("POSLODAVAC", "p")
-            r, _, _ = unos_stranke("RADNIK", "r")
+            if tip == "Ugovor o radu":
+                c1, c2 = st.columns(2)
+                p, _, _ = unos_stranke("POSLODAVAC", "p")
+                r, _, _ = unos_stranke("RADNIK", "r")
             
-            col_d1, col_d2 = st.columns(2)
-            datum_start = col_d1.date_input("Početak rada")
-            mjesto_sklapanja = col_d2.text_input("Mjesto sklapanja", "Zagreb")
+                col_d1, col_d2 = st.columns(2)
+                datum_start = col_d1.date_input("Početak rada")
+                mjesto_sklapanja = col_d2.text_input("Mjesto sklapanja", "Zagreb")
             
-            podaci = {'vrsta': st.radio("Vrsta", ["Neodređeno", "Određeno"]), 'datum_do': None, 'razlog_odredeno': "", 'probni_rad': False}
-            if podaci['vrsta'] == "Određeno": 
-                d_do = st.date_input("Do (Datum)")
-                podaci['datum_do'] = d_do.strftime('%d.%m.%Y.')
-                podaci['razlog_odredeno'] = st.text_input("Razlog za određeno (npr. zamjena)")
+                podaci = {'vrsta': st.radio("Vrsta", ["Neodređeno", "Određeno"]), 'datum_do': None, 'razlog_odredeno': "", 'probni_rad': False}
+                if podaci['vrsta'] == "Određeno": 
+                    d_do = st.date_input("Do (Datum)")
+                    podaci['datum_do'] = d_do.strftime('%d.%m.%Y.')
+                    podaci['razlog_odredeno'] = st.text_input("Razlog za određeno (npr. zamjena)")
             
-            c_prob, c_go = st.columns(2)
-            podaci['probni_rad'] = c_prob.checkbox("Probni rad")
-            if podaci['probni_rad']: podaci['probni_rad_mj'] = c_prob.number_input("Trajanje (mjeseci)", 1, 6, 3)
-            podaci['godisnji_odmor'] = c_go.number_input("Godišnji odmor (dana)", value=24)
-            podaci['naziv_radnog_mjesta'] = st.text_input("Radno mjesto")
-            podaci['opis_posla'] = st.text_area("Opis poslova (kratko)")
-            podaci['mjesto_rada'] = st.text_input("Mjesto rada", "sjedište Poslodavca")
-            c_sat, c_pla = st.columns(2)
-            podaci['radno_vrijeme'] = c_sat.number_input("Tjedno radno vrijeme (sati)", value=40)
-            podaci['bruto_placa'] = c_pla.number_input("Bruto plaća (EUR)")
-            podaci['datum_start'] = datum_start.strftime('%d.%m.%Y.')
-            podaci['mjesto_sklapanja'] = mjesto_sklapanja
+                c_prob, c_go = st.columns(2)
+                podaci['probni_rad'] = c_prob.checkbox("Probni rad")
+                if podaci['probni_rad']: podaci['probni_rad_mj'] = c_prob.number_input("Trajanje (mjeseci)", 1, 6, 3)
+                podaci['godisnji_odmor'] = c_go.number_input("Godišnji odmor (dana)", value=24)
+                podaci['naziv_radnog_mjesta'] = st.text_input("Radno mjesto")
+                podaci['opis_posla'] = st.text_area("Opis poslova (kratko)")
+                podaci['mjesto_rada'] = st.text_input("Mjesto rada", "sjedište Poslodavca")
+                c_sat, c_pla = st.columns(2)
+                podaci['radno_vrijeme'] = c_sat.number_input("Tjedno radno vrijeme (sati)", value=40)
+                podaci['bruto_placa'] = c_pla.number_input("Bruto plaća (EUR)")
+                podaci['datum_start'] = datum_start.strftime('%d.%m.%Y.')
+                podaci['mjesto_sklapanja'] = mjesto_sklapanja
             
-            if st.button("Generiraj Ugovor o radu"):
-                doc = generiraj_ugovor_o_radu(p, r, podaci)
+                if st.button("Generiraj Ugovor o radu"):
+                    doc = arhiviraj('ugovor_o_radu', generiraj_ugovor_o_radu, p, r, podaci)
+                    st.markdown(f"<div class='legal-doc'>{doc}</div>", unsafe_allow_html=True)
+                    word = docx_iz_html(doc)
+                    st.download_button("Preuzmi", word, "Ugovor_o_radu.docx", mime=DOCX_MIME)
+
+            elif tip == "Odluka o otkazu":
+                vrsta = st.selectbox("Vrsta otkaza", ["Poslovno uvjetovani", "Osobno uvjetovani", "Skrivljeno ponašanje", "Izvanredni otkaz"])
+                c1, c2 = st.columns(2)
+                p, _, _ = unos_stranke("POSLODAVAC", "po")
+                r, _, _ = unos_stranke("RADNIK", "ro")
+                podaci = {'vrsta_otkaza': vrsta, 'mjesto': "Zagreb", 'tekst_obrazlozenja': st.text_area("Obrazloženje otkaza (Obavezno detaljno)"), 'otkazni_rok': st.text_input("Otkazni rok")}
+                if st.button("Generiraj Otkaz"):
+                    doc = arhiviraj('otkaz', generiraj_otkaz, p, r, podaci)
+                    st.markdown(f"<div class='legal-doc'>{doc}</div>", unsafe_allow_html=True)
+                    word = docx_iz_html(doc)
+                    st.download_button("Preuzmi", word, "Otkaz.docx", mime=DOCX_MIME)
+
+    # --- 2. TUŽBE ---
+    elif "Tužbe" in modul:
+        st.header("Tužba (Parnični postupak)")
+        st.info("Ispunite detalje za generiranje potpune tužbe s troškovnikom i petitumom.")
+        zastupanje = zaglavlje_sastavljaca()
+        col1, col2 = st.columns(2)
+        with col1: t1, _, _ = unos_stranke("TUŽITELJ", "t1")
+        with col2: t2, _, _ = unos_stranke("TUŽENIK", "t2")
+        st.subheader("1. Predmet spora")
+        sud = st.text_input("Naslovni sud", key=zadano("t_sud", "OPĆINSKI GRAĐANSKI SUD U ZAGREBU"))
+        vps = st.number_input("Vrijednost spora (Glavnica duga)", min_value=0.0, key="t_vps")
+        datum_dospijeca = st.date_input("Datum dospijeća (Od kada teku kamate?)", key="t_dospijece")
+        vrsta = st.text_input("Radi (kratki opis)", key=zadano("t_vrsta", "Isplate (Dugovanja)"))
+        st.subheader("2. Sadržaj (Obrazloženje)")
+        cinjenice = st.text_area("I. Činjenice (Kronologija)", height=150, placeholder="Opišite nastanak duga...", key="t_cinjenice")
+        dokazi = st.text_area("II. Dokazi", placeholder="- Ugovor o kupoprodaji\n- Račun broj 10/2023...", key="t_dokazi")
+        st.subheader("3. Troškovnik")
+        # Iznosi po tarifi za upisani VPS; mogu se ručno promijeniti (nova promjena VPS-a ih ponovno postavlja)
+        tarifa = troskovnik('tuzba', vps)
+        col_tr1, col_tr2, col_tr3 = st.columns(3)
+        trosak_sastav = col_tr1.number_input("Sastav tužbe (EUR)", 0.0, value=tarifa['stavka'], help=f"Tarifa: {tarifa['bodova']:g} bodova × {VRIJEDNOST_BODA:.2f} EUR")
+        trosak_pdv = trosak_sastav * STOPA_PDV if col_tr2.checkbox("Dodaj PDV (25%)", value=True) else 0.0
+        trosak_pristojba = col_tr3.number_input("Sudska pristojba (EUR)", 0.0, value=tarifa['pristojba'])
+        col_k1, col_k2 = st.columns(2)
+        kamata_do = date.today() if col_k1.checkbox("Navedi obračun zatezne kamate do danas", key="t_kamata_do") else None
+        kamata_vrsta = VRSTE_ODNOSA[col_k2.radio("Vrsta odnosa", list(VRSTE_ODNOSA), horizontal=True, key="t_kamata_vrsta")]
+        specifikacija = None
+        if 'knjiga_dugovanja' in st.session_state and st.checkbox("Priloži specifikaciju iz knjige dugovanja (🧮 Kamate)", key="t_specifikacija"):
+            specifikacija = st.session_state.knjiga_dugovanja
+        if st.button("Generiraj Tužbu"):
+            try:
+                doc = arhiviraj('tuzba', generiraj_tuzbu_pro, sud, zastupanje, t1, t2, vps, vrsta, {'cinjenice': cinjenice, 'dokazi': dokazi, 'datum_dospijeca': datum_dospijeca.strftime('%d.%m.%Y.'), 'kamata_do': kamata_do, 'kamata_vrsta': kamata_vrsta, 'specifikacija': specifikacija}, {'stavka': trosak_sastav, 'pdv': trosak_pdv, 'pristojba': trosak_pristojba})
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                st.markdown(f"<div class='legal-doc'>{doc}</div>", unsafe_allow_html=True)
+                word = docx_iz_html(doc)
+                st.download_button("Preuzmi Word", word, "Tuzba.docx", mime=DOCX_MIME)
+
+    # --- 3. OVRHE ---
+    elif "Ovršni" in modul:
+        st.header("Prijedlog za Ovrhu (Vjerodostojna isprava)")
+        nacin_ovrhe = st.radio("Način rada:", ["Pojedinačni prijedlog", "Skupno (CSV/XLSX)", "Uvoz izvoda i računa", "Rokovi za prigovor"], horizontal=True)
+        if nacin_ovrhe == "Pojedinačni prijedlog":
+            jb = st.text_input("Javni bilježnik (Ime, Prezime, Grad)", placeholder="Ivan Horvat, Zagreb")
+            col1, col2 = st.columns(2)
+            with col1: o1, _, _ = unos_stranke("OVRHOVODITELJ (Vjerovnik)", "o1")
+            with col2: o2, _, _ = unos_stranke("OVRŠENIK (Dužnik)", "o2")
+            st.subheader("1. Dugovanje")
+            c1, c2, c3 = st.columns(3)
+            opis_isprave = c1.text_input("Vjerodostojna isprava", placeholder="Račun br. 100-2024")
+            dat_racuna = c2.date_input("Datum izdavanja računa")
+            glavnica = c3.number_input("Glavnica duga (EUR)", min_value=0.0)
+            dospjece = st.date_input("Datum dospijeća")
+            st.subheader("2. Troškovnik")
+            tarifa = troskovnik('ovrha', glavnica)
+            ct1, ct2, ct3 = st.columns(3)
+            trosak_odvjetnik = ct1.number_input("Odvjetnik", 0.0, value=tarifa['stavka'], help=f"Tarifa: {tarifa['bodova']:g} bodova × {VRIJEDNOST_BODA:.2f} EUR")
+            trosak_jb_nagrada = ct2.number_input("JB Nagrada", 0.0, value=tarifa['materijalni'])
+            trosak_pdv = (trosak_odvjetnik + trosak_jb_nagrada) * STOPA_PDV if ct3.checkbox("Obračunaj PDV?") else 0.0
+            col_k1, col_k2 = st.columns(2)
+            kamata_do = date.today() if col_k1.checkbox("Navedi obračun zatezne kamate do danas") else None
+            kamata_vrsta = VRSTE_ODNOSA[col_k2.radio("Vrsta odnosa", list(VRSTE_ODNOSA), horizontal=True, key="o_kamata_vrsta")]
+            specifikacija = None
+            if 'knjiga_dugovanja' in st.session_state and st.checkbox("Priloži specifikaciju iz knjige dugovanja (🧮 Kamate)", key="o_specifikacija"):
+                specifikacija = st.session_state.knjiga_dugovanja
+            if st.button("Generiraj Ovršni Prijedlog"):
+                try:
+                    doc = arhiviraj('ovrha', generiraj_ovrhu_pro, jb, o1, o2, {'glavnica': glavnica, 'datum_racuna': dat_racuna.strftime('%d.%m.%Y.'), 'dospjece': dospjece.strftime('%d.%m.%Y.'), 'kamata_do': kamata_do, 'kamata_vrsta': kamata_vrsta, 'specifikacija': specifikacija}, opis_isprave, {'stavka': trosak_odvjetnik, 'materijalni': trosak_jb_nagrada, 'pdv': trosak_pdv, 'pristojba': 0})
+                except ValueError as e:
+                    st.error(str(e))
+                else:
+                    st.markdown(f"<div class='legal-doc'>{doc}</div>", unsafe_allow_html=True)
+                    word = docx_iz_html(doc)
+                    st.download_button("Preuzmi Word", word, "Ovrha.docx", mime=DOCX_MIME)
+
+        elif nacin_ovrhe == "Uvoz izvoda i računa":
+            st.info("Uplate s bankovnih izvoda (camt.053 XML ili CSV) povezuju se s otvorenim računima po pozivu na broj ili broju računa u opisu plaćanja. Rezultat je ovrhe.csv za skupni način rada i popis nepovezanih uplata.")
+            c1, c2 = st.columns(2)
+            racuni_datoteka = c1.file_uploader("Otvoreni računi iz knjigovodstva (CSV/XLSX)", type=["csv", "xlsx"], key="uvoz_racuni")
+            izvodi_datoteke = c2.file_uploader("Bankovni izvodi (XML, CSV, ZIP ili GZ)", type=["xml", "csv", "zip", "gz"], accept_multiple_files=True, key="uvoz_izvodi")
+            c1, c2, c3 = st.columns(3)
+            ovrhovoditelj = {'ovrhovoditelj': c1.text_input("Ovrhovoditelj", key="uvoz_ovrhovoditelj"), 'ovrhovoditelj_oib': c2.text_input("OIB ovrhovoditelja", max_chars=11, key="uvoz_ovrhovoditelj_oib"), 'ovrhovoditelj_adresa': c3.text_input("Adresa ovrhovoditelja", key="uvoz_ovrhovoditelj_adresa")}
+            datum_obracuna = st.date_input("Datum obračuna kamata", key="uvoz_obracun")
+            if racuni_datoteka and izvodi_datoteke and st.button("Uskladi uplate s računima"):
+                # Računi ionako moraju biti u memoriji za usklađivanje, pa se čitaju odmah i šalju procesu kao popis
+                racuni = list(citaj_redove(io.BytesIO(racuni_datoteka.getvalue()), racuni_datoteka.name))
+                izvodi = [(io.BytesIO(d.getvalue()), d.name) for d in izvodi_datoteke]
+                st.session_state.zadatak_uvoza = red_zadataka().posalji('uvoz_izvoda', uvezi, racuni, izvodi, izlaz=".zip", u_procesu=True, obracun=datum_obracuna, ovrhovoditelj=ovrhovoditelj)
+            zadatak = zavrseni_zadatak('zadatak_uvoza', "Usklađivanje uplata")
+            if zadatak and zadatak['stanje'] == GRESKA:
+                st.error(zadatak['poruka'])
+            elif zadatak:
+                rezultat = red_zadataka().rezultat(zadatak['id'])
+                if rezultat:
+                    izvjestaj = rezultat['izvjestaj']
+                    c1, c2, c3, c4 = st.columns(4)
+                    c1.metric("Uplata", izvjestaj['uplata'])
+                    c2.metric("Povezano", izvjestaj['povezano'])
+                    c3.metric("Nepovezano", izvjestaj['nepovezano'], f"{izvjestaj['iznos_nepovezano']:.2f} EUR", delta_color="off")
+                    c4.metric("Redova za ovrhu", izvjestaj['redova_ovrhe'])
+                    if izvjestaj['dvoznacnih_referenci']: st.warning(f"Referenci koje se ponavljaju na više računa: {izvjestaj['dvoznacnih_referenci']} (uplate s njima nisu povezane).")
+                    if izvjestaj['neobracunato']: st.warning(f"Dužnika bez obračuna kamate: {izvjestaj['neobracunato']} (razlog u stupcu napomena).")
+                    st.dataframe(rezultat['sazetak'], use_container_width=True)
+                with open(zadatak['datoteka'], "rb") as f:
+                    st.download_button("💾 Preuzmi ovrhe.csv i nepovezane uplate (ZIP)", f, "Uskladivanje.zip", mime="application/zip")
+
+        elif nacin_ovrhe == "Rokovi za prigovor":
+            prikaz_roka("Rok za prigovor ovršenika", st.date_input("Datum dostave rješenja o ovrsi"), ROK_PRIGOVORA)
+            st.markdown("**Skupno za dostavljena rješenja**")
+            st.caption("CSV ili XLSX sa stupcem 'dostava' (datum dostave); ostali stupci se prenose u rezultat.")
+            datoteka = st.file_uploader("Datoteka s dostavama", type=["csv", "xlsx"], key="rokovi_datoteka")
+            if datoteka:
+                redovi = [red for red in citaj_redove(datoteka, datoteka.name) if red.get("dostava") not in (None, "")]
+                try:
+                    dostave = [procitaj_datum(red["dostava"]) for red in redovi]
+                    rokovi = izracunaj_rokove(dostave, ROK_PRIGOVORA)
+                except ValueError as e:
+                    st.error(str(e))
+                else:
+                    for red, dostava, rok in zip(redovi, dostave, rokovi.astype(object)):
+                        red['dostava'] = dostava.strftime('%d.%m.%Y.')
+                        red['rok_prigovora'] = rok.strftime('%d.%m.%Y.')
+                        red['istekao'] = "DA" if rok < date.today() else "NE"
+                    st.dataframe(redovi, use_container_width=True)
+                    if redovi:
+                        izlaz = io.StringIO()
+                        pisac = csv.DictWriter(izlaz, fieldnames=list(redovi[0]), delimiter=";", extrasaction="ignore")
+                        pisac.writeheader()
+                        pisac.writerows(redovi)
+                        st.download_button("💾 Preuzmi rokove (CSV)", izlaz.getvalue().encode("utf-8-sig"), "Rokovi_prigovora.csv", mime="text/csv")
+
+        else:
+            st.info(f"Prvi redak datoteke je zaglavlje sa stupcima: {', '.join(STUPCI_OVRHE)}. Obavezni su: {', '.join(OBAVEZNI_STUPCI)}.")
+            datoteka = st.file_uploader("CSV ili XLSX datoteka s dužnicima", type=["csv", "xlsx"])
+            radnika = st.number_input("Broj procesa za generiranje", 1, os.cpu_count() or 1, 1)
+            u_arhivu = st.checkbox("Spremi prijedloge u arhivu", value=True)
+            if datoteka and st.button("Generiraj ZIP s prijedlozima"):
+                # Radni proces dobiva sadržaj datoteke i sam čita redove jedan po jedan
+                st.session_state.zadatak_ovrhe = red_zadataka().posalji('skupna_ovrha', skupna_ovrha_iz_datoteke, datoteka.getvalue(), datoteka.name, izlaz=".zip", u_procesu=True, radnika=radnika, arhiva=arhiva_dokumenata() if u_arhivu else None)
+            zadatak = zavrseni_zadatak('zadatak_ovrhe', "Generiranje prijedloga")
+            if zadatak and zadatak['stanje'] == GRESKA:
+                st.error(zadatak['poruka'])
+            elif zadatak:
+                izvjestaj = red_zadataka().rezultat(zadatak['id'])
+                if izvjestaj:
+                    st.success(f"Generirano {izvjestaj['redova']} prijedloga ({izvjestaj['redova_u_sekundi']:.0f} redova/s).")
+                    if izvjestaj['gresaka']: st.warning(f"Neispravnih redova: {izvjestaj['gresaka']} (popis u greske.csv unutar arhive).")
+                    if izvjestaj['vrsni_rss_mb']: st.caption(f"Vršna memorija procesa: {izvjestaj['vrsni_rss_mb']:.0f} MB")
+                with open(zadatak['datoteka'], "rb") as f:
+                    st.download_button("💾 Preuzmi ZIP", f, "Ovrhe.zip", mime="application/zip")
+
+    # --- 4. ŽALBE ---
+    elif "Žalbe" in modul:
+        st.header("Pravni lijekovi: Žalba na presudu")
+        with st.expander("1. Podaci o sudu i presudi", expanded=True):
+            col_s1, col_s2 = st.columns(2)
+            sud_prvi = col_s1.text_input("Prvostupanjski sud", key=zadano("z_sud_prvi", "OPĆINSKI GRAĐANSKI SUD U ZAGREBU"))
+            sud_drugi = col_s2.text_input("Drugostupanjski sud", key=zadano("z_sud_drugi", "ŽUPANIJSKI SUD U ..."))
+            c1, c2 = st.columns(2)
+            broj_presude = c1.text_input("Poslovni broj presude", key="z_broj_presude")
+            datum_presude = c2.text_input("Datum donošenja presude", key="z_datum_presude")
+            mjesto = st.text_input("Mjesto sastava žalbe", key=zadano("z_mjesto", "Zagreb"))
+            prikaz_roka("Rok za žalbu", st.date_input("Datum dostave presude", key="z_dostava"), ROK_ZALBE)
+        with st.expander("2. Stranke", expanded=False):
+            col_tuz, col_tuzen = st.columns(2)
+            stranke = {'tuzitelj': col_tuz.text_input("Tužitelj", key="z_tuzitelj"), 'tuzenik': col_tuzen.text_input("Tuženik", key="z_tuzenik")}
+        with st.expander("3. Sadržaj žalbe", expanded=True):
+            opseg = st.radio("Pobijate li presudu:", ["u cijelosti", "u dijelu odluke o trošku", "u dosuđujućem dijelu"], horizontal=True, key="z_opseg")
+            st.markdown("**Žalbeni razlozi:**")
+            r1 = st.checkbox("Bitna povreda odredaba parničnog postupka", key="z_razlog_povreda")
+            r2 = st.checkbox("Pogrešno ili nepotpuno utvrđeno činjenično stanje", key="z_razlog_stanje")
+            r3 = st.checkbox("Pogrešna primjena materijalnog prava", key="z_razlog_pravo")
+            razlozi_lista = [r for r, checked in [("Zbog bitne povrede odredaba parničnog postupka", r1), ("Zbog pogrešno ili nepotpuno utvrđenog činjeničnog stanja", r2), ("Zbog pogrešne primjene materijalnog prava", r3)] if checked]
+            if not razlozi_lista: razlozi_lista.append("(Navesti razloge)")
+            obrazlozenje = st.text_area("OBRAZLOŽENJE", height=300, key="z_obrazlozenje")
+        with st.expander("4. Troškovnik žalbe", expanded=False):
+            troskovnik_data = {'stavka': 0.0, 'pdv': 0.0, 'pristojba': 0.0}
+            if st.checkbox("Potražujem trošak", key=zadano("z_trosak", True)):
+                vps_zalbe = st.number_input("Vrijednost predmeta spora (EUR)", min_value=0.0, key="z_vps")
+                tarifa = troskovnik('zalba', vps_zalbe)
+                col_tr1, col_tr2 = st.columns(2)
+                troskovnik_data['stavka'] = col_tr1.number_input("Cijena sastava", min_value=0.0, value=tarifa['stavka'], help=f"Tarifa: {tarifa['bodova']:g} bodova × {VRIJEDNOST_BODA:.2f} EUR")
+                if col_tr1.checkbox("Dodaj PDV"): troskovnik_data['pdv'] = troskovnik_data['stavka'] * STOPA_PDV
+                troskovnik_data['pristojba'] = col_tr2.number_input("Sudska pristojba", min_value=0.0, value=tarifa['pristojba'])
+        if st.button("Generiraj Žalbu"):
+            doc_html = arhiviraj('zalba', generiraj_zalbu_pro, sud_prvi, sud_drugi, stranke, {'broj': broj_presude, 'datum': datum_presude, 'opseg': opseg, 'mjesto': mjesto}, razlozi_lista, obrazlozenje, troskovnik_data)
+            st.markdown(f"<div class='legal-doc'>{doc_html}</div>", unsafe_allow_html=True)
+            st.download_button("💾 Preuzmi Žalbu", docx_iz_html(doc_html), "Zalba.docx", mime=DOCX_MIME)
+
+    # --- 5. ZEMLJIŠNE KNJIGE ---
+    elif "Zemljišne" in modul:
+        st.header("Zemljišne knjige")
+        zk_usluga = st.selectbox("Odaberite ZK uslugu:", ["Tabularna isprava", "ZK Prijedlog (Uknjižba)", "Brisovna tužba"], key="zk_usluga")
+        # Dokumenti predmeta (ime datoteke -> HTML) za zajedničko preuzimanje u jednom ZIP-u
+        if 'zk_paket' not in st.session_state:
+            st.session_state.zk_paket = {}
+    
+        if zk_usluga == "Tabularna isprava":
+            c1, c2 = st.columns(2)
+            prod, _, _ = unos_stranke("PRODAVATELJ", "tp")
+            kup, _, _ = unos_stranke("KUPAC", "tk")
+            c1, c2, c3 = st.columns(3)
+            ko = c1.text_input("K.O.", key="zkt_ko")
+            cest = c2.text_input("Čestica", key="zkt_cestica")
+            ul = c3.text_input("Uložak", key="zkt_ulozak")
+            opis = st.text_area("Opis u naravi", key="zkt_opis")
+            dat = st.date_input("Datum ugovora", key="zkt_datum")
+            if st.button("Generiraj Tabularnu"):
+                doc = arhiviraj('tabularna', generiraj_tabularnu_doc, prod, kup, ko, cest, ul, opis, dat.strftime('%d.%m.%Y.'))
                 st.markdown(f"<div class='legal-doc'>{doc}</div>", unsafe_allow_html=True)
-                word = pripremi_za_word(doc)
-                st.download_button("Preuzmi", word, "Ugovor_o_radu.doc")
+                st.download_button("Preuzmi", docx_iz_html(doc), "Tabularna.docx", mime=DOCX_MIME)
+                st.session_state.zk_paket["Tabularna.docx"] = doc
 
-        elif tip == "Odluka o otkazu":
-            vrsta = st.selectbox("Vrsta otkaza", ["Poslovno uvjetovani", "Osobno uvjetovani", "Skrivljeno ponašanje", "Izvanredni otkaz"])
+        elif zk_usluga == "ZK Prijedlog (Uknjižba)":
+            sud = st.text_input("Sud", key=zadano("zkp_sud", "OPĆINSKI SUD U ZAGREBU"))
+            c1, c2, c3 = st.columns(3)
+            ko = c1.text_input("K.O.", key=zadano("zkp_ko", "Centar"))
+            ulozak = c2.text_input("ZK uložak", key="zkp_ulozak")
+            cestica = c3.text_input("Čestica", key="zkp_cestica")
+            opis = st.text_area("Opis u naravi", key="zkp_opis")
             c1, c2 = st.columns(2)
-            p, _, _ = unos_stranke("POSLODAVAC", "po")
-            r, _, _ = unos_stranke("RADNIK", "ro")
-            podaci = {'vrsta_otkaza': vrsta, 'mjesto': "Zagreb", 'tekst_obrazlozenja': st.text_area("Obrazloženje otkaza (Obavezno detaljno)"), 'otkazni_rok': st.text_input("Otkazni rok")}
-            if st.button("Generiraj Otkaz"):
-                doc = generiraj_otkaz(p, r, podaci)
+            pred, _, _ = unos_stranke("PREDLAGATELJ", "zk_p")
+            prot, _, _ = unos_stranke("PROTUSTRANKA", "zk_pr")
+            ug = st.text_input("Ugovor info", key="zkp_ugovor")
+            tab = st.text_input("Tabularna info", key="zkp_tabularna")
+            pristojba = st.number_input("ZK pristojba", 0.0, value=troskovnik('zk_prijedlog', 0)['pristojba'])
+            if st.button("Generiraj Prijedlog"):
+                doc = arhiviraj('zk_prijedlog', generiraj_zk_prijedlog, sud, pred, prot, {'ko': ko, 'ulozak': ulozak, 'cestica': cestica, 'opis': opis}, {'ugovor': ug, 'tabularna': tab}, {'pristojba': pristojba})
                 st.markdown(f"<div class='legal-doc'>{doc}</div>", unsafe_allow_html=True)
-                word = pripremi_za_word(doc)
-                st.download_button("Preuzmi", word, "Otkaz.doc")
-
-# --- 2. TUŽBE ---
-elif "Tužbe" in modul:
-    st.header("Tužba (Parnični postupak)")
-    st.info("Ispunite detalje za generiranje potpune tužbe s troškovnikom i petitumom.")
-    zastupanje = zaglavlje_sastavljaca()
-    col1, col2 = st.columns(2)
-    with col1: t1, _, _ = unos_stranke("TUŽITELJ", "t1")
-    with col2: t2, _, _ = unos_stranke("TUŽENIK", "t2")
-    st.subheader("1. Predmet spora")
-    sud = st.text_input("Naslovni sud", "OPĆINSKI GRAĐANSKI SUD U ZAGREBU")
-    vps = st.number_input("Vrijednost spora (Glavnica duga)", min_value=0.0)
-    datum_dospijeca = st.date_input("Datum dospijeća (Od kada teku kamate?)")
-    vrsta = st.text_input("Radi (kratki opis)", "Isplate (Dugovanja)")
-    st.subheader("2. Sadržaj (Obrazloženje)")
-    cinjenice = st.text_area("I. Činjenice (Kronologija)", height=150, placeholder="Opišite nastanak duga...")
-    dokazi = st.text_area("II. Dokazi", placeholder="- Ugovor o kupoprodaji\n- Račun broj 10/2023...")
-    st.subheader("3. Troškovnik")
-    col_tr1, col_tr2, col_tr3 = st.columns(3)
-    trosak_sastav = col_tr1.number_input("Sastav tužbe (EUR)", 0.0)
-    trosak_pdv = trosak_sastav * 0.25 if col_tr2.checkbox("Dodaj PDV (25%)", value=True) else 0.0
-    trosak_pristojba = col_tr3.number_input("Sudska pristojba (EUR)", 0.0)
-    if st.button("Generiraj Tužbu"):
-        doc = generiraj_tuzbu_pro(sud, zastupanje, t1, t2, vps, vrsta, {'cinjenice': cinjenice, 'dokazi': dokazi, 'datum_dospijeca': datum_dospijeca.strftime('%d.%m.%Y.')}, {'stavka': trosak_sastav, 'pdv': trosak_pdv, 'pristojba': trosak_pristojba})
-        st.markdown(f"<div class='legal-doc'>{doc}</div>", unsafe_allow_html=True)
-        word = pripremi_za_word(doc)
-        st.download_button("Preuzmi Word", word, "Tuzba.doc")
-
-# --- 3. OVRHE ---
-elif "Ovršni" in modul:
-    st.header("Prijedlog za Ovrhu (Vjerodostojna isprava)")
-    jb = st.text_input("Javni bilježnik (Ime, Prezime, Grad)", placeholder="Ivan Horvat, Zagreb")
-    col1, col2 = st.columns(2)
-    with col1: o1, _, _ = unos_stranke("OVRHOVODITELJ (Vjerovnik)", "o1")
-    with col2: o2, _, _ = unos_stranke("OVRŠENIK (Dužnik)", "o2")
-    st.subheader("1. Dugovanje")
-    c1, c2, c3 = st.columns(3)
-    opis_isprave = c1.text_input("Vjerodostojna isprava", placeholder="Račun br. 100-2024")
-    dat_racuna = c2.date_input("Datum izdavanja računa")
-    glavnica = c3.number_input("Glavnica duga (EUR)", min_value=0.0)
-    dospjece = st.date_input("Datum dospijeća")
-    st.subheader("2. Troškovnik")
-    ct1, ct2, ct3 = st.columns(3)
-    trosak_odvjetnik = ct1.number_input("Odvjetnik", 0.0)
-    trosak_jb_nagrada = ct2.number_input("JB Nagrada", 0.0)
-    trosak_pdv = (trosak_odvjetnik + trosak_jb_nagrada) * 0.25 if ct3.checkbox("Obračunaj PDV?") else 0.0
-    if st.button("Generiraj Ovršni Prijedlog"):
-        doc = generiraj_ovrhu_pro(jb, o1, o2, {'glavnica': glavnica, 'datum_racuna': dat_racuna.strftime('%d.%m.%Y.'), 'dospjece': dospjece.strftime('%d.%m.%Y.')}, opis_isprave, {'stavka': trosak_odvjetnik, 'materijalni': trosak_jb_nagrada, 'pdv': trosak_pdv, 'pristojba': 0})
-        st.markdown(f"<div class='legal-doc'>{doc}</div>", unsafe_allow_html=True)
-        word = pripremi_za_word(doc)
-        st.download_button("Preuzmi Word", word, "Ovrha.doc")
-
-# --- 4. ŽALBE ---
-elif "Žalbe" in modul:
-    st.header("Pravni lijekovi: Žalba na presudu")
-    with st.expander("1. Podaci o sudu i presudi", expanded=True):
-        col_s1, col_s2 = st.columns(2)
-        sud_prvi = col_s1.text_input("Prvostupanjski sud", value="OPĆINSKI GRAĐANSKI SUD U ZAGREBU")
-        sud_drugi = col_s2.text_input("Drugostupanjski sud", value="ŽUPANIJSKI SUD U ...")
-        c1, c2 = st.columns(2)
-        broj_presude = c1.text_input("Poslovni broj presude")
-        datum_presude = c2.text_input("Datum donošenja presude")
-        mjesto = st.text_input("Mjesto sastava žalbe", value="Zagreb")
-    with st.expander("2. Stranke", expanded=False):
-        col_tuz, col_tuzen = st.columns(2)
-        stranke = {'tuzitelj': col_tuz.text_input("Tužitelj"), 'tuzenik': col_tuzen.text_input("Tuženik")}
-    with st.expander("3. Sadržaj žalbe", expanded=True):
-        opseg = st.radio("Pobijate li presudu:", ["u cijelosti", "u dijelu odluke o trošku", "u dosuđujućem dijelu"], horizontal=True)
-        st.markdown("**Žalbeni razlozi:**")
-        r1 = st.checkbox("Bitna povreda odredaba parničnog postupka")
-        r2 = st.checkbox("Pogrešno ili nepotpuno utvrđeno činjenično stanje")
-        r3 = st.checkbox("Pogrešna primjena materijalnog prava")
-        razlozi_lista = [r for r, checked in [("Zbog bitne povrede odredaba parničnog postupka", r1), ("Zbog pogrešno ili nepotpuno utvrđenog činjeničnog stanja", r2), ("Zbog pogrešne primjene materijalnog prava", r3)] if checked]
-        if not razlozi_lista: razlozi_lista.append("(Navesti razloge)")
-        obrazlozenje = st.text_area("OBRAZLOŽENJE", height=300)
-    with st.expander("4. Troškovnik žalbe", expanded=False):
-        troskovnik_data = {'stavka': 0.0, 'pdv': 0.0, 'pristojba': 0.0}
-        if st.checkbox("Potražujem trošak", value=True):
-            col_tr1, col_tr2 = st.columns(2)
-            troskovnik_data['stavka'] = col_tr1.number_input("Cijena sastava", min_value=0.0)
-            if col_tr1.checkbox("Dodaj PDV"): troskovnik_data['pdv'] = troskovnik_data['stavka'] * 0.25
-            troskovnik_data['pristojba'] = col_tr2.number_input("Sudska pristojba", min_value=0.0)
-    if st.button("Generiraj Žalbu"):
-        doc_html = generiraj_zalbu_pro(sud_prvi, sud_drugi, stranke, {'broj': broj_presude, 'datum': datum_presude, 'opseg': opseg, 'mjesto': mjesto}, razlozi_lista, obrazlozenje, troskovnik_data)
-        st.markdown(f"<div class='legal-doc'>{doc_html}</div>", unsafe_allow_html=True)
-        st.download_button("💾 Preuzmi Žalbu", pripremi_za_word(doc_html), "Zalba.doc")
-
-# --- 5. ZEMLJIŠNE KNJIGE ---
-elif "Zemljišne" in modul:
-    st.header("Zemljišne knjige")
-    zk_usluga = st.selectbox("Odaberite ZK uslugu:", ["Tabularna isprava", "ZK Prijedlog (Uknjižba)", "Brisovna tužba"])
-    
-    if zk_usluga == "Tabularna isprava":
-        c1, c2 = st.columns(2)
-        prod, _, _ = unos_stranke("PRODAVATELJ", "tp")
-        kup, _, _ = unos_stranke("KUPAC", "tk")
-        c1, c2, c3 = st.columns(3)
-        ko = c1.text_input("K.O.")
-        cest = c2.text_input("Čestica")
-        ul = c3.text_input("Uložak")
-        opis = st.text_area("Opis u naravi")
-        dat = st.date_input("Datum ugovora")
-        if st.button("Generiraj Tabularnu"):
-            doc = generiraj_tabularnu_doc(prod, kup, ko, cest, ul, opis, dat.strftime('%d.%m.%Y.'))
-            st.markdown(f"<div class='legal-doc'>{doc}</div>", unsafe_allow_html=True)
-            st.download_button("Preuzmi", pripremi_za_word(doc), "Tabularna.doc")
+                st.download_button("Preuzmi", docx_iz_html(doc), "ZK_Prijedlog.docx", mime=DOCX_MIME)
+                st.session_state.zk_paket["ZK_Prijedlog.docx"] = doc
 
-    elif zk_usluga == "ZK Prijedlog (Uknjižba)":
-        sud = st.text_input("Sud", "OPĆINSKI SUD U ZAGREBU")
-        c1, c2, c3 = st.columns(3)
-        ko = c1.text_input("K.O.", "Centar")
-        ulozak = c2.text_input("ZK uložak")
-        cestica = c3.text_input("Čestica")
-        opis = st.text_area("Opis u naravi")
-        c1, c2 = st.columns(2)
-        pred, _, _ = unos_stranke("PREDLAGATELJ", "zk_p")
-        prot, _, _ = unos_stranke("PROTUSTRANKA", "zk_pr")
-        ug = st.text_input("Ugovor info")
-        tab = st.text_input("Tabularna info")
-        pristojba = st.number_input("ZK pristojba", 0.0)
-        if st.button("Generiraj Prijedlog"):
-            doc = generiraj_zk_prijedlog(sud, pred, prot, {'ko': ko, 'ulozak': ulozak, 'cestica': cestica, 'opis': opis}, {'ugovor': ug, 'tabularna': tab}, {'pristojba': pristojba})
-            st.markdown(f"<div class='legal-doc'>{doc}</div>", unsafe_allow_html=True)
-            st.download_button("Preuzmi", pripremi_za_word(doc), "ZK_Prijedlog.doc")
+        elif zk_usluga == "Brisovna tužba":
+            zastupanje = zaglavlje_sastavljaca()
+            sud = st.text_input("Nadležni sud", key="zkb_sud")
+            c1, c2 = st.columns(2)
+            tuzitelj, _, _ = unos_stranke("TUŽITELJ", "bt_t")
+            tuzenik, _, _ = unos_stranke("TUŽENIK", "bt_tu")
+            c1, c2, c3 = st.columns(3)
+            ko = c1.text_input("K.O.", key="zkb_ko")
+            ulozak = c2.text_input("Uložak", key="zkb_ulozak")
+            cestica = c3.text_input("Čestica", key="zkb_cestica")
+            opis = st.text_area("Opis u naravi", key="zkb_opis")
+            c1, c2 = st.columns(2)
+            z_broj = c1.text_input("Z-broj", key="zkb_z_broj")
+            dat_uknj = c2.date_input("Datum uknjižbe", key="zkb_datum_uknjizbe")
+            razlog = st.text_area("Razlog nevaljanosti", key="zkb_razlog")
+            tuzenik_znao = st.radio("Je li tuženik znao?", ["DA", "NE"], key="zkb_znao")
+            vps = st.number_input("VPS", key=zadano("zkb_vps", 10000.0))
+            tarifa = troskovnik('brisovna_tuzba', vps)
+            sastav = st.number_input("Cijena sastava", 0.0, value=tarifa['stavka'], help=f"Tarifa: {tarifa['bodova']:g} bodova × {VRIJEDNOST_BODA:.2f} EUR")
+            pdv = sastav * STOPA_PDV
+            pristojba = st.number_input("Pristojba", 0.0, value=tarifa['pristojba'])
+            if st.button("Generiraj Tužbu"):
+                doc = arhiviraj('brisovna_tuzba', generiraj_brisovnu_tuzbu, sud, zastupanje, tuzitelj, tuzenik, {'ko': ko, 'ulozak': ulozak, 'cestica': cestica, 'opis': opis}, {'vps': vps, 'z_broj': z_broj, 'datum_uknjizbe': dat_uknj.strftime('%d.%m.%Y.'), 'isprava': "Ugovor", 'datum_isprave': "...", 'razlog_nevaljanosti': razlog, 'tuzenik_znao': "DA" in tuzenik_znao, 'mjesto': "Zagreb"}, {'stavka': sastav, 'pdv': pdv, 'pristojba': pristojba})
+                st.markdown(f"<div class='legal-doc'>{doc}</div>", unsafe_allow_html=True)
+                st.download_button("Preuzmi", docx_iz_html(doc), "Brisovna.docx", mime=DOCX_MIME)
+                st.session_state.zk_paket["Brisovna.docx"] = doc
 
-    elif zk_usluga == "Brisovna tužba":
-        zastupanje = zaglavlje_sastavljaca()
-        sud = st.text_input("Nadležni sud")
-        c1, c2 = st.columns(2)
-        tuzitelj, _, _ = unos_stranke("TUŽITELJ", "bt_t")
-        tuzenik, _, _ = unos_stranke("TUŽENIK", "bt_tu")
+        if st.session_state.zk_paket:
+            st.markdown("---")
+            st.subheader("Paket predmeta")
+            st.caption("Generirani dokumenti: " + ", ".join(st.session_state.zk_paket))
+            c1, c2 = st.columns(2)
+            if c1.button("Pripremi ZIP paket"):
+                st.session_state.zadatak_paketa = red_zadataka().posalji('paket', zapisi_paket, list(st.session_state.zk_paket.items()), izlaz=".zip", u_procesu=True)
+            if c2.button("Isprazni paket"):
+                st.session_state.zk_paket = {}
+                st.session_state.pop('zadatak_paketa', None)
+                st.rerun()
+            zadatak = zavrseni_zadatak('zadatak_paketa', "Priprema paketa")
+            if zadatak and zadatak['stanje'] == GRESKA:
+                st.error(zadatak['poruka'])
+            elif zadatak:
+                with open(zadatak['datoteka'], "rb") as f:
+                    st.download_button("💾 Preuzmi paket (ZIP)", f, "ZK_predmet.zip", mime="application/zip")
+
+    # --- 6. KAMATE ---
+    elif "Kamate" in modul:
+        st.header("Kalkulator Kamata")
+        nacin = st.radio("Način obračuna:", ["Jedna tražbina", "Knjiga dugovanja (više računa i uplata)"], horizontal=True)
+        vrsta_odnosa = VRSTE_ODNOSA[st.radio("Vrsta odnosa", list(VRSTE_ODNOSA), horizontal=True)]
+
+        if nacin == "Jedna tražbina":
+            iznos = st.number_input("Glavnica")
+            d1 = st.date_input("Dospijeće")
+            d2 = st.date_input("Obračun")
+            st.caption(f"Stope zakonske zatezne kamate po polugodištima od {ZADANA_TABLICA.pocetak.strftime('%d.%m.%Y.')} (tablica {ZADANA_TABLICA.verzija}).")
+            if st.button("Izračunaj"):
+                dana = (d2-d1).days
+                if dana > 0:
+                    try:
+                        kamata, razdoblja = izracunaj_kamatu(iznos, d1, d2, vrsta_odnosa)
+                    except ValueError as e:
+                        st.error(str(e))
+                    else:
+                        st.success(f"Kamata: {kamata:.2f} EUR (za {dana} dana)")
+                        st.metric("Ukupno dugovanje", f"{iznos + kamata:.2f} EUR")
+                        st.table(razdoblja)
+                else: st.error("Datum obračuna mora biti poslije dospijeća.")
+
+        else:
+            st.info("Uplate se uračunavaju redom: troškovi, kamata, glavnica (čl. 172. ZOO), od najstarijeg dospjelog računa.")
+            st.markdown("**Računi**")
+            racuni = st.data_editor({"Račun": ["R-1"], "Iznos (EUR)": [0.0], "Dospijeće": [date.today()]}, num_rows="dynamic", key="knjiga_racuni")
+            st.markdown("**Uplate**")
+            uplate = st.data_editor({"Opis": [""], "Iznos (EUR)": [0.0], "Datum": [date.today()]}, num_rows="dynamic", key="knjiga_uplate")
+            c1, c2 = st.columns(2)
+            troskovi_knjige = c1.number_input("Dosadašnji troškovi (EUR)", 0.0)
+            d_obracun = c2.date_input("Datum obračuna", key="knjiga_obracun")
+            if st.button("Obračunaj knjigu"):
+                st.session_state.zadatak_knjige = red_zadataka().posalji(
+                    'knjiga', obracunaj_knjigu,
+                    [{'oznaka': o or '', 'iznos': i, 'dospijece': d} for o, i, d in zip(racuni["Račun"], racuni["Iznos (EUR)"], racuni["Dospijeće"]) if i and d],
+                    [{'opis': o or '', 'iznos': i, 'datum': d} for o, i, d in zip(uplate["Opis"], uplate["Iznos (EUR)"], uplate["Datum"]) if i and d],
+                    d_obracun, troskovi_knjige, vrsta_odnosa, u_procesu=True)
+            zadatak = zavrseni_zadatak('zadatak_knjige', "Obračun knjige")
+            if zadatak:
+                del st.session_state.zadatak_knjige
+                if zadatak['stanje'] == GRESKA:
+                    st.error(zadatak['poruka'])
+                elif red_zadataka().rezultat(zadatak['id']) is not None:
+                    st.session_state.knjiga_dugovanja = red_zadataka().rezultat(zadatak['id'])
+            if 'knjiga_dugovanja' in st.session_state:
+                knjiga = st.session_state.knjiga_dugovanja
+                c1, c2, c3 = st.columns(3)
+                c1.metric("Preostala glavnica", f"{knjiga['glavnica']:.2f} EUR")
+                c2.metric("Kamata", f"{knjiga['kamata']:.2f} EUR")
+                c3.metric("Troškovi", f"{knjiga['troskovi']:.2f} EUR")
+                if knjiga['preplata'] > 0: st.warning(f"Preplata: {knjiga['preplata']:.2f} EUR")
+                st.dataframe(knjiga['specifikacija'])
+                st.caption("Specifikacija se može priložiti tužbi i ovršnom prijedlogu.")
+
+    # --- 7. ARHIVA ---
+    elif "Arhiva" in modul:
+        st.header("Arhiva dokumenata")
+        arhiva = arhiva_dokumenata()
+        statistika = arhiva.statistika()
         c1, c2, c3 = st.columns(3)
-        ko = c1.text_input("K.O.")
-        ulozak = c2.text_input("Uložak")
-        cestica = c3.text_input("Čestica")
-        opis = st.text_area("Opis u naravi")
-        c1, c2 = st.columns(2)
-        z_broj = c1.text_input("Z-broj")
-        dat_uknj = c2.date_input("Datum uknjižbe")
-        razlog = st.text_area("Razlog nevaljanosti")
-        tuzenik_znao = st.radio("Je li tuženik znao?", ["DA", "NE"])
-        vps = st.number_input("VPS", 10000.0)
-        sastav = st.number_input("Cijena sastava", 0.0)
-        pdv = sastav * 0.25
-        pristojba = st.number_input("Pristojba", 0.0)
-        if st.button("Generiraj Tužbu"):
-            doc = generiraj_brisovnu_tuzbu(sud, zastupanje, tuzitelj, tuzenik, {'ko': ko, 'ulozak': ulozak, 'cestica': cestica, 'opis': opis}, {'vps': vps, 'z_broj': z_broj, 'datum_uknjizbe': dat_uknj.strftime('%d.%m.%Y.'), 'isprava': "Ugovor", 'datum_isprave': "...", 'razlog_nevaljanosti': razlog, 'tuzenik_znao': "DA" in tuzenik_znao, 'mjesto': "Zagreb"}, {'stavka': sastav, 'pdv': pdv, 'pristojba': pristojba})
+        c1.metric("Dokumenata", statistika['dokumenata'])
+        c2.metric("Jedinstveni sadržaj", f"{statistika['izvorno'] / 1e6:.1f} MB")
+        c3.metric("Na disku", f"{statistika['na_disku'] / 1e6:.1f} MB")
+        with st.expander("🔎 Pretraga", expanded=True):
+            c1, c2, c3 = st.columns(3)
+            kriteriji = {'oib': c1.text_input("OIB", max_chars=11), 'poslovni_broj': c2.text_input("Poslovni broj", placeholder="npr. P-123/2024"), 'z_broj': c3.text_input("Z-broj", placeholder="npr. Z-1234/2020")}
+            c1, c2 = st.columns(2)
+            kriteriji['ko'] = c1.text_input("Katastarska općina")
+            kriteriji['cestica'] = c2.text_input("Čestica (k.č.br.)", help="Bez čestice prikazuju se dokumenti za sve čestice u k.o.")
+        if any(kriteriji.values()):
+            try:
+                zadnji = arhiva.trazi(**kriteriji, ograniceno=100)
+            except ValueError as e:
+                st.error(str(e))
+                zadnji = []
+            st.caption(f"Pronađeno dokumenata: {len(zadnji)}{' (prikazano najnovijih 100)' if len(zadnji) == 100 else ''}")
+        else:
+            zadnji = arhiva.popis(ograniceno=100)
+        if not zadnji:
+            if not any(kriteriji.values()):
+                st.info("Arhiva je prazna. Svaki generirani dokument sprema se ovdje zajedno s unesenim podacima.")
+        else:
+            opcije = {f"#{d['id']} · {d['vrsta']} · {d['stvoreno'].replace('T', ' ')}": d['id'] for d in zadnji}
+            odabran = opcije[st.selectbox("Dokument", list(opcije))]
+            doc = arhiva.dokument(odabran)
             st.markdown(f"<div class='legal-doc'>{doc}</div>", unsafe_allow_html=True)
-            st.download_button("Preuzmi", pripremi_za_word(doc), "Brisovna.doc")
-
-# --- 6. KAMATE ---
-elif "Kamate" in modul:
-    st.header("Kalkulator Kamata")
-    iznos = st.number_input("Glavnica")
-    stopa = st.number_input("Stopa (%)", value=12.0)
-    # ISPRAVAK: Maknuto slovo 'A' s kraja linije
-    d1 = st.date_input("Dospijeće")
-    d2 = st.date_input("Obračun")
-    if st.button("Izračunaj"):
-        dana = (d2-d1).days
-        if dana > 0:
-            kamata = (iznos * stopa * dana)/36500
-            st.success(f"Kamata: {kamata:.2f} EUR (za {dana} dana)")
-            st.metric("Ukupno dugovanje", f"{iznos + kamata:.2f} EUR")
-        else: st.error("Datum obračuna mora biti poslije dospijeća.")
+            st.download_button("Preuzmi Word", docx_iz_html(doc), f"Arhiva_{odabran}.docx", mime=DOCX_MIME)
+            with st.expander("Uneseni podaci"):
+                st.json(arhiva.ulazi(odabran) or {}, expanded=False)
+
+# Nacrt se bilježi na kraju svakog reruna (upis u bazu je odgođen, vidi pravni_alat.nacrti)
+spremi_nacrt(modul)